@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Cart, CartItem
+from .models import AbandonedCart, Cart, CartItem
 
 
 class CartItemInline(admin.TabularInline):
@@ -15,3 +15,12 @@ class CartAdmin(admin.ModelAdmin):
 
 admin.site.register(Cart, CartAdmin)
 admin.site.register(CartItem)
+
+
+class AbandonedCartAdmin(admin.ModelAdmin):
+    list_display = ('cart_id', 'user', 'total_items', 'total_amount', 'cart_updated_at', 'abandoned_at', 'recovered_at')
+    list_filter = ('abandoned_at', 'recovered_at')
+    readonly_fields = ('cart_id', 'items', 'cart_created_at', 'cart_updated_at', 'abandoned_at')
+
+
+admin.site.register(AbandonedCart, AbandonedCartAdmin)
@@ -0,0 +1,48 @@
+"""
+Django management command để snapshot và xóa các giỏ hàng bị bỏ dở
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from cart.services.sweeper import DEFAULT_BATCH_SIZE, run_periodic_sweep, sweep_abandoned_carts
+
+
+class Command(BaseCommand):
+    help = 'Snapshot idle carts into AbandonedCart and delete them in bounded batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Idle days before a cart is abandoned (default: CART_ABANDON_AFTER_DAYS or 30)',
+        )
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None)
+        parser.add_argument('--no-snapshot', action='store_true', help='Delete without AbandonedCart snapshots')
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Run continuously, sweeping every N seconds (0 = sweep once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        sweep_options = {
+            'idle_for': timedelta(days=options['days']) if options['days'] is not None else None,
+            'batch_size': options['batch_size'],
+            'max_batches': options['max_batches'],
+            'snapshot': not options['no_snapshot'],
+        }
+
+        interval = options['interval']
+        if interval > 0:
+            self.stdout.write(f'Sweeping abandoned carts every {interval}s...')
+            run_periodic_sweep(interval, **sweep_options)
+            return
+
+        result = sweep_abandoned_carts(**sweep_options)
+        self.stdout.write(
+            self.style.SUCCESS(f'Swept {result.carts} abandoned carts ({result.snapshots} snapshots)')
+        )
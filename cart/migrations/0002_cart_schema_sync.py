@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0001_initial'),
+        ('products', '0010_product_schema_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='cart',
+            options={'ordering': ['-updated_at'], 'verbose_name': 'Cart', 'verbose_name_plural': 'Carts'},
+        ),
+        migrations.AlterModelOptions(
+            name='cartitem',
+            options={'ordering': ['created_at'], 'verbose_name': 'Cart Item', 'verbose_name_plural': 'Cart Items'},
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='session_key',
+            field=models.CharField(blank=True, help_text='Session key for anonymous users', max_length=40, null=True),
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+        migrations.AddField(
+            model_name='cartitem',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Created At'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='cartitem',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+        migrations.AlterField(
+            model_name='cart',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='cart',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cart', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AlterField(
+            model_name='cartitem',
+            name='cart',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='cart.cart', verbose_name='Cart'),
+        ),
+        migrations.AlterField(
+            model_name='cartitem',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='products.product', verbose_name='Product'),
+        ),
+        migrations.AlterField(
+            model_name='cartitem',
+            name='quantity',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Quantity'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='cartitem',
+            unique_together={('cart', 'product')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_cart_schema_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cart',
+            name='session_key',
+            field=models.CharField(blank=True, db_index=True, help_text='Session key for anonymous users', max_length=40, null=True),
+        ),
+        migrations.AlterField(
+            model_name='cart',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='cart', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+    ]
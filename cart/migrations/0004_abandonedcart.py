@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_anonymous_carts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AbandonedCart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cart_id', models.PositiveIntegerField(verbose_name='Cart ID')),
+                ('session_key', models.CharField(blank=True, max_length=40, null=True)),
+                ('items', models.JSONField(default=list)),
+                ('total_items', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('cart_created_at', models.DateTimeField(verbose_name='Cart Created At')),
+                ('cart_updated_at', models.DateTimeField(verbose_name='Cart Updated At')),
+                ('abandoned_at', models.DateTimeField(auto_now_add=True, verbose_name='Abandoned At')),
+                ('recovered_at', models.DateTimeField(blank=True, null=True, verbose_name='Recovered At')),
+            ],
+            options={
+                'verbose_name': 'Abandoned Cart',
+                'verbose_name_plural': 'Abandoned Carts',
+                'ordering': ['-abandoned_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['updated_at', 'id'], name='cart_cart_updated_6737cf_idx'),
+        ),
+        migrations.AddField(
+            model_name='abandonedcart',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='abandoned_carts', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AddIndex(
+            model_name='abandonedcart',
+            index=models.Index(fields=['user', '-abandoned_at'], name='cart_abando_user_id_b7ac7d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='abandonedcart',
+            index=models.Index(fields=['abandoned_at'], name='cart_abando_abandon_ebe15c_idx'),
+        ),
+    ]
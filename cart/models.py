@@ -1,19 +1,26 @@
 from django.db import models
 from django.core.validators import MinValueValidator
-from decimal import Decimal
-from products.models import Product
+from products.models import Product, primary_image_prefetch
 from users.models import User
 
+from .services.mutations import ADD, REMOVE, SET, CartChange, apply_cart_changes, clear_cart, touch_cart
+from .services.totals import get_cart_totals
+
 
 class Cart(models.Model):
     """
     Model representing a shopping cart for a user.
     Each user has one cart that persists across sessions.
+    
+    Giỏ hàng anonymous lưu trong `cart.services.storage`; với backend
+    'database' chúng là Cart không có user, định danh bằng `session_key`.
     """
     user = models.OneToOneField(
         User, 
         on_delete=models.CASCADE,
         related_name='cart',
+        null=True,
+        blank=True,
         verbose_name='User'
     )
     
@@ -21,40 +28,48 @@ class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
-    # Session tracking for potential future use
+    # Session key của giỏ hàng anonymous (CART_STORE_BACKEND='database')
     session_key = models.CharField(
         max_length=40, 
         blank=True, 
         null=True,
+        db_index=True,
         help_text="Session key for anonymous users"
     )
     
     def __str__(self):
+        if self.user_id is None:
+            return f"Anonymous cart {self.session_key}"
         return f"Cart for {self.user.email}"
     
+    # Các totals tính từ items đã prefetch hoặc một query aggregate
+    # (xem `cart.services.totals`); cần nhiều giá trị thì gọi `get_totals()` một lần
+    
+    def get_totals(self):
+        """Returns: CartTotals (total_items, total_amount, lines_count)"""
+        return get_cart_totals(self)
+    
     @property
     def total_items(self):
         """Total number of items in cart"""
-        return self.items.aggregate(
-            total=models.Sum('quantity')
-        )['total'] or 0
+        return self.get_totals().total_items
     
     @property
     def total_amount(self):
         """Total amount of all items in cart"""
-        total = Decimal('0.00')
-        for item in self.items.select_related('product').all():
-            total += item.subtotal
-        return total
+        return self.get_totals().total_amount
     
     @property
     def is_empty(self):
         """Check if cart is empty"""
-        return not self.items.exists()
+        return self.get_totals().lines_count == 0
+    
+    # Các thay đổi items đi qua `cart.services.mutations`: một transaction,
+    # ghi theo lô và cập nhật updated_at một lần
     
     def clear(self):
         """Clear all items from cart"""
-        self.items.all().delete()
+        clear_cart(self)
     
     def add_item(self, product, quantity=1):
         """
@@ -67,16 +82,8 @@ class Cart(models.Model):
         Returns:
             CartItem: The created or updated cart item
         """
-        cart_item, created = self.items.get_or_create(
-            product=product,
-            defaults={'quantity': quantity}
-        )
-        
-        if not created:
-            cart_item.quantity += quantity
-            cart_item.save()
-        
-        return cart_item
+        apply_cart_changes(self, [CartChange(ADD, product.pk, quantity)])
+        return self.items.get(product=product)
     
     def remove_item(self, product):
         """
@@ -85,7 +92,7 @@ class Cart(models.Model):
         Args:
             product: Product instance to remove
         """
-        self.items.filter(product=product).delete()
+        apply_cart_changes(self, [CartChange(REMOVE, product.pk)])
     
     def update_item_quantity(self, product, quantity):
         """
@@ -98,22 +105,21 @@ class Cart(models.Model):
         Returns:
             CartItem or None: Updated cart item or None if quantity is 0
         """
-        try:
-            cart_item = self.items.get(product=product)
-            if quantity <= 0:
-                cart_item.delete()
-                return None
-            else:
-                cart_item.quantity = quantity
-                cart_item.save()
-                return cart_item
-        except CartItem.DoesNotExist:
+        if not self.items.filter(product=product).exists():
+            return None
+        apply_cart_changes(self, [CartChange(SET, product.pk, max(quantity, 0))])
+        if quantity <= 0:
             return None
+        return self.items.get(product=product)
     
     class Meta:
         verbose_name = 'Cart'
         verbose_name_plural = 'Carts'
         ordering = ['-updated_at']
+        indexes = [
+            # Admin list (-updated_at) và sweeper tìm carts idle (updated_at < cutoff)
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
 
 class CartItem(models.Model):
@@ -141,7 +147,7 @@ class CartItem(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
     def __str__(self):
-        return f"{self.product.name} x {self.quantity} in {self.cart.user.email}'s cart"
+        return f"{self.product.name} x {self.quantity} in {self.cart}"
     
     @property
     def subtotal(self):
@@ -149,18 +155,74 @@ class CartItem(models.Model):
         return self.product.price * self.quantity
     
     def save(self, *args, **kwargs):
-        # Update cart's updated_at when cart item changes
+        # Update cart's updated_at when cart item changes (không load cart)
         super().save(*args, **kwargs)
-        self.cart.save(update_fields=['updated_at'])
+        touch_cart(self.cart_id)
     
     def delete(self, *args, **kwargs):
         # Update cart's updated_at when cart item is deleted
-        cart = self.cart
-        super().delete(*args, **kwargs)
-        cart.save(update_fields=['updated_at'])
+        cart_id = self.cart_id
+        result = super().delete(*args, **kwargs)
+        touch_cart(cart_id)
+        return result
     
     class Meta:
         verbose_name = 'Cart Item'
         verbose_name_plural = 'Cart Items'
         unique_together = ('cart', 'product')  # Prevent duplicate products in same cart
         ordering = ['created_at']
+
+
+class AbandonedCart(models.Model):
+    """
+    Snapshot của giỏ hàng bị bỏ dở, tạo bởi sweeper
+    (`cart.services.sweeper`) trước khi xóa Cart/CartItems, dùng cho
+    các chiến dịch nhắc khách quay lại (recovery).
+    """
+    cart_id = models.PositiveIntegerField(verbose_name='Cart ID')
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='abandoned_carts',
+        verbose_name='User'
+    )
+    session_key = models.CharField(max_length=40, blank=True, null=True)
+    # [{product_id, name, sku, price, quantity}, ...] tại thời điểm snapshot
+    items = models.JSONField(default=list)
+    total_items = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    cart_created_at = models.DateTimeField(verbose_name='Cart Created At')
+    cart_updated_at = models.DateTimeField(verbose_name='Cart Updated At')
+    abandoned_at = models.DateTimeField(auto_now_add=True, verbose_name='Abandoned At')
+    recovered_at = models.DateTimeField(null=True, blank=True, verbose_name='Recovered At')
+    
+    def __str__(self):
+        return f"Abandoned cart {self.cart_id} ({self.total_items} items)"
+    
+    class Meta:
+        verbose_name = 'Abandoned Cart'
+        verbose_name_plural = 'Abandoned Carts'
+        ordering = ['-abandoned_at']
+        indexes = [
+            models.Index(fields=['user', '-abandoned_at']),
+            models.Index(fields=['abandoned_at']),
+        ]
+
+
+def cart_items_prefetch(lookup='items'):
+    """
+    Prefetch cart items kèm các relations mà CartSerializer đọc (product,
+    category, seller, primary image); totals của cart tính từ list này.
+
+    Example:
+        Cart.objects.prefetch_related(cart_items_prefetch())
+    """
+    return models.Prefetch(
+        lookup,
+        queryset=CartItem.objects.select_related(
+            'product__category', 'product__seller'
+        ).prefetch_related(primary_image_prefetch('product__images'))
+    )
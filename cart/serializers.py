@@ -1,11 +1,13 @@
 from django.db.models import Sum
 from products.models import Product
-from products.serializers import ProductSummarySerializer
+from products.serializers import ProductItemListSerializer, ProductSummarySerializer
 from rest_framework import serializers
 from typing import Union
 from decimal import Decimal
 
 from .models import Cart, CartItem
+from .services.mutations import ADD, MAX_QUANTITY, OPERATIONS, SET
+from .services.totals import totals_from_items
 
 
 class CartItemSerializer(serializers.ModelSerializer):
@@ -19,6 +21,7 @@ class CartItemSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CartItem
+        list_serializer_class = ProductItemListSerializer
         fields = [
             'id', 'product', 'quantity', 'unit_price', 'subtotal', 
             'product_available', 'created_at', 'updated_at'
@@ -103,6 +106,31 @@ class CartItemUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
+class CartItemChangeSerializer(serializers.Serializer):
+    """
+    Một thay đổi trong bulk update giỏ hàng.
+    
+    - `add`: cộng thêm `quantity`
+    - `set` (mặc định): đặt số lượng bằng `quantity`, 0 để xóa
+    - `remove`: xóa product khỏi giỏ hàng
+    """
+    op = serializers.ChoiceField(choices=OPERATIONS, default=SET)
+    product_id = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(required=False, default=0, min_value=0, max_value=MAX_QUANTITY)
+    
+    def validate(self, data):
+        if data['op'] == ADD and data['quantity'] < 1:
+            raise serializers.ValidationError({'quantity': "Số lượng phải lớn hơn 0"})
+        return data
+
+
+class CartItemsUpdateSerializer(serializers.Serializer):
+    """
+    Serializer cho bulk update giỏ hàng (`PATCH /api/v1/cart/me/items/`).
+    """
+    items = CartItemChangeSerializer(many=True, allow_empty=False, max_length=100)
+
+
 class CartSummarySerializer(serializers.ModelSerializer):
     """
     Serializer cho tóm tắt giỏ hàng (read-only).
@@ -115,11 +143,16 @@ class CartSummarySerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'item_count', 'total_amount', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
     
+    def to_representation(self, instance):
+        # Totals tính một lần (một query aggregate hoặc cache) cho mọi fields
+        self._totals = instance.get_totals()
+        return super().to_representation(instance)
+    
     def get_item_count(self, obj: Cart) -> int:
-        return obj.total_items
+        return self._totals.total_items
     
     def get_total_amount(self, obj: Cart) -> str:
-        return str(obj.total_amount)
+        return str(self._totals.total_amount)
 
 
 class CartSerializer(serializers.ModelSerializer):
@@ -140,14 +173,56 @@ class CartSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'user', 'user_email', 'created_at', 'updated_at']
     
+    def to_representation(self, instance):
+        # Totals tính một lần cho total_items/total_amount/is_empty; với cart đã
+        # prefetch items (`cart_items_prefetch()`) không phát sinh query
+        self._totals = instance.get_totals()
+        return super().to_representation(instance)
+    
     def get_total_items(self, obj: Cart) -> int:
-        return obj.total_items
+        return self._totals.total_items
     
     def get_total_amount(self, obj: Cart) -> Decimal:
-        return obj.total_amount
+        return self._totals.total_amount
     
     def get_is_empty(self, obj: Cart) -> bool:
-        return obj.is_empty
+        return self._totals.lines_count == 0
+
+
+class SessionCartSerializer(serializers.Serializer):
+    """
+    Serializer cho giỏ hàng anonymous (`cart.services.storage`).
+    
+    Instance là dict {'session_key', 'items'} với items là các CartItem
+    chưa lưu (`load_cart_items`).
+    """
+    session_key = serializers.CharField(read_only=True, allow_null=True)
+    items = CartItemSerializer(many=True, read_only=True)
+    total_items = serializers.SerializerMethodField(read_only=True)
+    total_amount = serializers.SerializerMethodField(read_only=True)
+    is_empty = serializers.SerializerMethodField(read_only=True)
+    
+    def to_representation(self, instance):
+        self._totals = totals_from_items(instance['items'])
+        return super().to_representation(instance)
+    
+    def get_total_items(self, obj) -> int:
+        return self._totals.total_items
+    
+    def get_total_amount(self, obj) -> Decimal:
+        return self._totals.total_amount
+    
+    def get_is_empty(self, obj) -> bool:
+        return self._totals.lines_count == 0
+
+
+class CartMergeSerializer(serializers.Serializer):
+    """
+    Serializer cho việc merge giỏ hàng anonymous vào giỏ hàng của user.
+    
+    `session_key` mặc định lấy từ header `X-Cart-Session`.
+    """
+    session_key = serializers.CharField(max_length=40, required=False)
 
 
 class CartCheckoutSerializer(serializers.Serializer):
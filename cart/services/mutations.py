@@ -0,0 +1,195 @@
+"""
+Cart Mutations
+
+Áp dụng nhiều thay đổi cart items (thêm, đặt số lượng, xóa) trong một
+transaction:
+
+1. Lock row của cart (`select_for_update`) để các mutations cùng lúc trên
+   một giỏ hàng chạy tuần tự
+2. Load các cart items và products liên quan bằng một query mỗi loại
+3. Áp dụng các thay đổi theo thứ tự trong memory, kiểm tra số lượng và tồn kho
+4. Ghi bằng `bulk_create`/`bulk_update`/một `delete()` và cập nhật
+   `Cart.updated_at` một lần
+
+Số queries không phụ thuộc số thay đổi. Lỗi ở bất kỳ thay đổi nào rollback
+toàn bộ (`CartMutationError`).
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from products.models import Product
+
+from .totals import invalidate_cart_totals
+
+ADD = 'add'
+SET = 'set'
+REMOVE = 'remove'
+OPERATIONS = (ADD, SET, REMOVE)
+
+MAX_QUANTITY = 999
+
+CartChange = namedtuple('CartChange', ['op', 'product_id', 'quantity'], defaults=[0])
+
+
+class CartMutationError(Exception):
+    """
+    Thay đổi giỏ hàng không hợp lệ (product không tồn tại, vượt tồn kho...).
+
+    Attributes:
+        message (str): Thông báo cho user
+        errors (dict): Lỗi theo product id
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors or {}
+
+
+def as_changes(changes):
+    """Chuyển list dict (`op`, `product_id`, `quantity`) thành list CartChange."""
+    return [change if isinstance(change, CartChange) else CartChange(**change) for change in changes]
+
+
+def touch_cart(cart_id):
+    """Cập nhật `Cart.updated_at` (conditional GET của cart) bằng một `UPDATE`."""
+    from ..models import Cart
+
+    Cart.objects.filter(pk=cart_id).update(updated_at=timezone.now())
+    invalidate_cart_totals(cart_id)
+
+
+def _resolve_quantities(changes, current):
+    """
+    Số lượng cuối cùng của từng product sau khi áp dụng các thay đổi theo thứ tự.
+
+    Returns:
+        dict: {product_id: quantity}, 0 nghĩa là xóa khỏi giỏ hàng
+    """
+    quantities = dict(current)
+    for change in changes:
+        if change.op != REMOVE and change.quantity < 0:
+            raise CartMutationError("Số lượng không hợp lệ", {change.product_id: "Số lượng không được âm"})
+        if change.op == ADD:
+            quantities[change.product_id] = quantities.get(change.product_id, 0) + change.quantity
+        elif change.op == SET:
+            quantities[change.product_id] = change.quantity
+        elif change.op == REMOVE:
+            quantities[change.product_id] = 0
+        else:
+            raise CartMutationError(f"Thao tác '{change.op}' không hợp lệ")
+    return quantities
+
+
+def _validate(quantities, products):
+    errors = {}
+    for product_id, quantity in quantities.items():
+        if quantity == 0:
+            continue
+        product = products.get(product_id)
+        if product is None:
+            errors[product_id] = "Sản phẩm không tồn tại"
+        elif product.status != 'active':
+            errors[product_id] = f"Sản phẩm '{product.name}' không còn được bán"
+        elif quantity > MAX_QUANTITY:
+            errors[product_id] = f"Số lượng không được quá {MAX_QUANTITY}"
+        elif product.track_inventory and product.stock < quantity:
+            errors[product_id] = f"Chỉ còn {product.stock} sản phẩm trong kho"
+    if errors:
+        raise CartMutationError("Không thể cập nhật giỏ hàng", errors)
+
+
+def resolve_changes(changes, current):
+    """
+    Áp dụng các thay đổi lên số lượng hiện tại và kiểm tra các products bị
+    thay đổi (một query). Dùng chung cho giỏ hàng trong database và
+    `cart.services.storage`.
+
+    Args:
+        changes (list[CartChange]): Các thay đổi theo thứ tự
+        current (dict): {product_id: quantity} hiện tại
+
+    Returns:
+        tuple: (quantities, changed, products) với `changed` chỉ gồm các
+        products có số lượng khác `current` và `products` là
+        {product_id: Product} của các products còn trong giỏ hàng
+
+    Raises:
+        CartMutationError: Product không hợp lệ hoặc vượt tồn kho
+    """
+    quantities = _resolve_quantities(changes, current)
+    changed = {
+        product_id: quantity for product_id, quantity in quantities.items()
+        if quantity != current.get(product_id, 0)
+    }
+    if not changed:
+        return quantities, changed, {}
+
+    products = Product.objects.in_bulk([product_id for product_id, quantity in changed.items() if quantity])
+    _validate(changed, products)
+    return quantities, changed, products
+
+
+@transaction.atomic
+def apply_cart_changes(cart, changes):
+    """
+    Áp dụng các thay đổi cart items của một giỏ hàng.
+
+    Args:
+        cart: Cart
+        changes (list[CartChange]): Các thay đổi theo thứ tự; `quantity` của
+            `set` bằng 0 tương đương `remove`
+
+    Returns:
+        dict: {product_id: quantity} sau khi áp dụng (0 = đã xóa)
+
+    Raises:
+        CartMutationError: Product không hợp lệ hoặc vượt tồn kho
+    """
+    from ..models import Cart, CartItem
+
+    changes = as_changes(changes)
+    if not changes:
+        return {}
+
+    Cart.objects.select_for_update().filter(pk=cart.pk).values_list('pk', flat=True).get()
+    product_ids = {change.product_id for change in changes}
+    items = {
+        item.product_id: item
+        for item in CartItem.objects.filter(cart=cart, product_id__in=product_ids)
+    }
+    current = {product_id: item.quantity for product_id, item in items.items()}
+    quantities, changed, products = resolve_changes(changes, current)
+    if not changed:
+        return quantities
+
+    now = timezone.now()
+    to_create, to_update, to_delete = [], [], []
+    for product_id, quantity in changed.items():
+        item = items.get(product_id)
+        if quantity == 0:
+            to_delete.append(item.pk)
+        elif item is None:
+            to_create.append(CartItem(cart=cart, product=products[product_id], quantity=quantity))
+        else:
+            item.quantity = quantity
+            item.updated_at = now
+            to_update.append(item)
+
+    if to_delete:
+        CartItem.objects.filter(pk__in=to_delete).delete()
+    if to_update:
+        CartItem.objects.bulk_update(to_update, ['quantity', 'updated_at'])
+    if to_create:
+        CartItem.objects.bulk_create(to_create)
+    touch_cart(cart.pk)
+    return quantities
+
+
+@transaction.atomic
+def clear_cart(cart):
+    """Xóa tất cả items của giỏ hàng và cập nhật `Cart.updated_at`."""
+    cart.items.all().delete()
+    touch_cart(cart.pk)
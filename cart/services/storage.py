@@ -0,0 +1,280 @@
+"""
+Cart Storage
+
+Lưu giỏ hàng của khách chưa đăng nhập (anonymous) ngoài database chính:
+phần lớn các giỏ hàng này bị bỏ dở, ghi mỗi lần thêm sản phẩm xuống
+PostgreSQL là không cần thiết. Giỏ hàng chỉ được ghi vào database khi
+khách đăng nhập (`merge_session_cart`), sau đó checkout như giỏ hàng của user.
+
+Mỗi giỏ hàng được định danh bằng một session key (header `X-Cart-Session`)
+và lưu dưới dạng {product_id: quantity}.
+
+Backend được chọn qua setting `CART_STORE_BACKEND`:
+- 'cache' (mặc định khi cache được chia sẻ giữa processes): lưu trong
+  Django cache (Redis/Memcached), hết hạn sau `CART_STORE_TIMEOUT` giây
+  (mặc định 7 ngày) kể từ lần ghi cuối
+- 'database' (mặc định khi cache chỉ tồn tại trong process, ví dụ
+  LocMemCache): lưu thành Cart không có user (`Cart.session_key`)
+- 'local': dict trong process có TTL, dùng cho tests và môi trường dev
+
+Thay đổi được kiểm tra giống giỏ hàng trong database
+(`cart.services.mutations.resolve_changes`).
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.crypto import get_random_string
+
+from core.utils.cache import is_shared_cache, require_shared_cache
+from products.models import Product
+
+from .mutations import MAX_QUANTITY, SET, CartChange, apply_cart_changes, as_changes, resolve_changes
+
+SESSION_HEADER = 'X-Cart-Session'
+
+SESSION_KEY_LENGTH = 32
+
+
+def get_cart_store_timeout():
+    return getattr(settings, 'CART_STORE_TIMEOUT', 7 * 24 * 3600)
+
+
+def new_session_key():
+    return get_random_string(SESSION_KEY_LENGTH)
+
+
+class BaseCartStore:
+    """
+    Interface của một cart store.
+
+    Subclasses implement `load`, `save` và `delete`; `apply` đọc, kiểm tra
+    và ghi lại toàn bộ giỏ hàng.
+    """
+
+    def load(self, session_key):
+        """Returns: dict {product_id: quantity}, rỗng nếu không có hoặc đã hết hạn"""
+        raise NotImplementedError
+
+    def save(self, session_key, quantities):
+        raise NotImplementedError
+
+    def delete(self, session_key):
+        raise NotImplementedError
+
+    def apply(self, session_key, changes):
+        """
+        Áp dụng các thay đổi lên giỏ hàng.
+
+        Returns:
+            dict: {product_id: quantity} sau khi áp dụng
+
+        Raises:
+            CartMutationError: Product không hợp lệ hoặc vượt tồn kho
+        """
+        quantities, changed, _ = resolve_changes(as_changes(changes), self.load(session_key))
+        quantities = {product_id: quantity for product_id, quantity in quantities.items() if quantity}
+        if changed:
+            if quantities:
+                self.save(session_key, quantities)
+            else:
+                self.delete(session_key)
+        return quantities
+
+
+class LocalCartStore(BaseCartStore):
+    """Giỏ hàng trong memory của process hiện tại, hết hạn sau `timeout` giây."""
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or get_cart_store_timeout()
+        self._carts = {}
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        expired = [key for key, (expires_at, _) in self._carts.items() if expires_at <= now]
+        for key in expired:
+            del self._carts[key]
+
+    def load(self, session_key):
+        with self._lock:
+            entry = self._carts.get(session_key)
+            if entry is None or entry[0] <= time.monotonic():
+                return {}
+            return dict(entry[1])
+
+    def save(self, session_key, quantities):
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            self._carts[session_key] = (now + self.timeout, dict(quantities))
+
+    def delete(self, session_key):
+        with self._lock:
+            self._carts.pop(session_key, None)
+
+
+class CacheCartStore(BaseCartStore):
+    """
+    Giỏ hàng trong Django cache, một key cho mỗi session.
+
+    Mỗi lần ghi đặt lại timeout, giỏ hàng không được dùng sẽ bị cache
+    evict mà không cần job dọn dẹp. Hai request cùng lúc trên một session
+    có thể ghi đè nhau (last write wins).
+    """
+
+    key_prefix = 'cart:store'
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or get_cart_store_timeout()
+
+    def cache_key(self, session_key):
+        return f'{self.key_prefix}:{session_key}'
+
+    def load(self, session_key):
+        return dict(cache.get(self.cache_key(session_key)) or {})
+
+    def save(self, session_key, quantities):
+        cache.set(self.cache_key(session_key), dict(quantities), timeout=self.timeout)
+
+    def delete(self, session_key):
+        cache.delete(self.cache_key(session_key))
+
+
+class DatabaseCartStore(BaseCartStore):
+    """Giỏ hàng là một Cart không có user, định danh bằng `Cart.session_key`."""
+
+    def get_queryset(self, session_key):
+        from ..models import Cart
+
+        return Cart.objects.filter(user__isnull=True, session_key=session_key)
+
+    def load(self, session_key):
+        from ..models import CartItem
+
+        return dict(
+            CartItem.objects.filter(cart__user__isnull=True, cart__session_key=session_key)
+            .values_list('product_id', 'quantity')
+        )
+
+    def save(self, session_key, quantities):
+        self.delete(session_key)
+        self.apply(session_key, [CartChange(SET, product_id, quantity) for product_id, quantity in quantities.items()])
+
+    def delete(self, session_key):
+        self.get_queryset(session_key).delete()
+
+    @transaction.atomic
+    def apply(self, session_key, changes):
+        from ..models import Cart
+
+        cart = self.get_queryset(session_key).first()
+        if cart is None:
+            cart = Cart.objects.create(session_key=session_key)
+        quantities = apply_cart_changes(cart, changes)
+        return {product_id: quantity for product_id, quantity in quantities.items() if quantity}
+
+
+CART_STORE_BACKENDS = {
+    'cache': CacheCartStore,
+    'database': DatabaseCartStore,
+    'local': LocalCartStore,
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_cart_store():
+    """
+    Trả về cart store theo setting `CART_STORE_BACKEND`.
+
+    Mặc định 'cache' khi cache là cache chia sẻ, ngược lại 'database'.
+    'cache' trên cache chỉ tồn tại trong process bị từ chối vì giỏ hàng sẽ
+    mất khi request tiếp theo tới process khác.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                default = 'cache' if is_shared_cache() else 'database'
+                backend = getattr(settings, 'CART_STORE_BACKEND', default)
+                if backend == 'cache':
+                    require_shared_cache("CART_STORE_BACKEND='cache'")
+                _store = CART_STORE_BACKENDS[backend]()
+    return _store
+
+
+def reset_cart_store():
+    """Bỏ store instance hiện tại (dùng khi đổi setting trong tests)."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def load_cart_items(quantities):
+    """
+    CartItems chưa lưu (không có pk) cho {product_id: quantity} của store,
+    products được load kèm các relations mà CartItemSerializer đọc.
+    Products đã bị xóa được bỏ qua.
+    """
+    from products.models import primary_image_prefetch
+
+    from ..models import CartItem
+
+    if not quantities:
+        return []
+    products = (
+        Product.objects.filter(pk__in=list(quantities))
+        .select_related('category', 'seller')
+        .prefetch_related(primary_image_prefetch('images'))
+        .order_by('pk')
+    )
+    return [CartItem(product=product, quantity=quantities[product.pk]) for product in products]
+
+
+def merge_session_cart(session_key, user):
+    """
+    Ghi giỏ hàng anonymous vào giỏ hàng của user khi đăng nhập.
+
+    Số lượng được cộng vào items hiện có, giới hạn theo tồn kho và
+    MAX_QUANTITY; products không còn bán bị bỏ qua. Giỏ hàng anonymous bị
+    xóa khỏi store sau khi merge.
+
+    Args:
+        session_key (str): Session key của giỏ hàng anonymous
+        user: User vừa đăng nhập
+
+    Returns:
+        tuple: (cart, skipped) với `skipped` là list product ids bị bỏ qua hoặc
+        chỉ merge được một phần; cart là None nếu không có giỏ hàng anonymous
+    """
+    from ..models import Cart
+
+    store = get_cart_store()
+    quantities = store.load(session_key) if session_key else {}
+    if not quantities:
+        return None, []
+
+    cart, _ = Cart.objects.get_or_create(user=user)
+    current = dict(cart.items.filter(product_id__in=quantities).values_list('product_id', 'quantity'))
+    products = Product.objects.in_bulk(list(quantities))
+
+    changes, skipped = [], []
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
+        if product is None or product.status != 'active':
+            skipped.append(product_id)
+            continue
+        target = min(current.get(product_id, 0) + quantity, MAX_QUANTITY)
+        if product.track_inventory:
+            target = min(target, product.stock)
+        if target < current.get(product_id, 0) + quantity:
+            skipped.append(product_id)
+        if target > current.get(product_id, 0):
+            changes.append(CartChange(SET, product_id, target))
+
+    apply_cart_changes(cart, changes)
+    store.delete(session_key)
+    return cart, skipped
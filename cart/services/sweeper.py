@@ -0,0 +1,146 @@
+"""
+Abandoned Cart Sweeper
+
+Dọn các giỏ hàng không thay đổi quá `CART_ABANDON_AFTER_DAYS` ngày
+(mặc định 30):
+
+1. Chọn tối đa `batch_size` carts idle theo index (updated_at, id), lock
+   bằng `select_for_update(skip_locked=True)` để bỏ qua carts đang được ghi
+2. Snapshot các carts có items thành AbandonedCart (một `bulk_create`)
+   cho các chiến dịch recovery
+3. Xóa Cart và CartItems của batch
+
+Mỗi batch chạy trong transaction riêng nên không có transaction dài lock
+bảng; chạy định kỳ bằng `manage.py sweep_abandoned_carts --interval N`
+hoặc gọi `sweep_abandoned_carts()` từ scheduler.
+"""
+import logging
+import time
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .totals import invalidate_cart_totals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+SweepResult = namedtuple('SweepResult', ['carts', 'snapshots'])
+
+
+def get_abandon_after():
+    return timedelta(days=getattr(settings, 'CART_ABANDON_AFTER_DAYS', 30))
+
+
+def _snapshot_batch(carts):
+    """AbandonedCart (chưa lưu) cho các carts có items, một query cho items."""
+    from ..models import AbandonedCart, CartItem
+
+    items_per_cart = defaultdict(list)
+    rows = CartItem.objects.filter(cart_id__in=[cart['id'] for cart in carts]).values_list(
+        'cart_id', 'product_id', 'product__name', 'product__sku', 'product__price', 'quantity'
+    ).order_by('cart_id', 'id')
+    for cart_id, product_id, name, sku, price, quantity in rows:
+        items_per_cart[cart_id].append({
+            'product_id': product_id,
+            'name': name,
+            'sku': sku,
+            'price': str(price),
+            'quantity': quantity,
+        })
+
+    snapshots = []
+    for cart in carts:
+        items = items_per_cart.get(cart['id'])
+        if not items:
+            continue
+        snapshots.append(AbandonedCart(
+            cart_id=cart['id'],
+            user_id=cart['user_id'],
+            session_key=cart['session_key'],
+            items=items,
+            total_items=sum(item['quantity'] for item in items),
+            total_amount=sum((Decimal(item['price']) * item['quantity'] for item in items), Decimal('0.00')),
+            cart_created_at=cart['created_at'],
+            cart_updated_at=cart['updated_at'],
+        ))
+    return snapshots
+
+
+@transaction.atomic
+def sweep_batch(cutoff, batch_size=DEFAULT_BATCH_SIZE, snapshot=True):
+    """
+    Snapshot và xóa một batch carts có `updated_at < cutoff`.
+
+    Returns:
+        SweepResult: (số carts đã xóa, số snapshots đã tạo)
+    """
+    from ..models import AbandonedCart, Cart
+
+    queryset = Cart.objects.filter(updated_at__lt=cutoff).order_by('updated_at', 'id')
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    carts = list(queryset.values('id', 'user_id', 'session_key', 'created_at', 'updated_at')[:batch_size])
+    if not carts:
+        return SweepResult(0, 0)
+
+    snapshots = _snapshot_batch(carts) if snapshot else []
+    if snapshots:
+        AbandonedCart.objects.bulk_create(snapshots)
+
+    cart_ids = [cart['id'] for cart in carts]
+    Cart.objects.filter(pk__in=cart_ids).delete()
+    invalidate_cart_totals(*cart_ids)
+    return SweepResult(len(cart_ids), len(snapshots))
+
+
+def sweep_abandoned_carts(idle_for=None, batch_size=DEFAULT_BATCH_SIZE, max_batches=None, snapshot=True, now=None):
+    """
+    Dọn tất cả carts idle lâu hơn `idle_for` theo từng batch.
+
+    Args:
+        idle_for (timedelta, optional): Mặc định `CART_ABANDON_AFTER_DAYS`
+        batch_size (int): Số carts tối đa mỗi transaction
+        max_batches (int, optional): Giới hạn số batch của lần chạy này
+        snapshot (bool): Tạo AbandonedCart trước khi xóa
+
+    Returns:
+        SweepResult: Tổng số carts đã xóa và snapshots đã tạo
+    """
+    cutoff = (now or timezone.now()) - (idle_for if idle_for is not None else get_abandon_after())
+    carts = snapshots = batches = 0
+    while max_batches is None or batches < max_batches:
+        result = sweep_batch(cutoff, batch_size=batch_size, snapshot=snapshot)
+        carts += result.carts
+        snapshots += result.snapshots
+        batches += 1
+        if result.carts < batch_size:
+            break
+    return SweepResult(carts, snapshots)
+
+
+def run_periodic_sweep(interval, iterations=None, **options):
+    """
+    Dọn abandoned carts định kỳ mỗi `interval` giây.
+
+    Args:
+        interval (int): Số giây giữa hai lần dọn.
+        iterations (int, optional): Số lần dọn, None để chạy liên tục.
+        **options: Truyền cho `sweep_abandoned_carts`.
+    """
+    count = 0
+    while iterations is None or count < iterations:
+        try:
+            result = sweep_abandoned_carts(**options)
+            if result.carts:
+                logger.info("Swept %s abandoned carts (%s snapshots)", result.carts, result.snapshots)
+        except Exception:
+            logger.exception("Abandoned cart sweep failed")
+        count += 1
+        if iterations is None or count < iterations:
+            time.sleep(interval)
@@ -0,0 +1,100 @@
+"""
+Cart Totals
+
+Read model cho tổng của giỏ hàng (số lượng, tổng tiền, số dòng) thay cho
+các properties chạy một query mỗi lần gọi:
+
+- Cart đã prefetch items (`cart_items_prefetch()`): tính từ list đã load,
+  không query thêm
+- Không prefetch: một query `aggregate` cho cả ba giá trị, có thể cache
+  theo `CART_TOTALS_CACHE_TIMEOUT` (giây, mặc định 0 = không cache)
+
+Cache bị xóa khi cart items thay đổi (`CartItem.save()/delete()`, `Cart.clear()`,
+checkout), và xóa lại sau khi transaction commit. Giá product thay đổi được
+phản ánh sau tối đa timeout của cache.
+"""
+from collections import namedtuple
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import Coalesce
+
+CART_TOTALS_CACHE_PREFIX = 'cart:totals:'
+
+CartTotals = namedtuple('CartTotals', ['total_items', 'total_amount', 'lines_count'])
+
+EMPTY_TOTALS = CartTotals(0, Decimal('0.00'), 0)
+
+
+def get_cart_totals_cache_timeout():
+    return getattr(settings, 'CART_TOTALS_CACHE_TIMEOUT', 0)
+
+
+def cart_totals_cache_key(cart_id):
+    return f'{CART_TOTALS_CACHE_PREFIX}{cart_id}'
+
+
+def totals_from_items(items):
+    """Tổng của các cart items đã load kèm product."""
+    total_items, total_amount, lines_count = 0, Decimal('0.00'), 0
+    for item in items:
+        total_items += item.quantity
+        total_amount += item.product.price * item.quantity
+        lines_count += 1
+    return CartTotals(total_items, total_amount, lines_count)
+
+
+def aggregate_cart_totals(cart_id):
+    """Tổng của giỏ hàng bằng một query."""
+    from ..models import CartItem
+
+    totals = CartItem.objects.filter(cart_id=cart_id).aggregate(
+        total_items=Coalesce(Sum('quantity'), 0),
+        total_amount=Coalesce(
+            Sum(F('quantity') * F('product__price'), output_field=DecimalField(max_digits=12, decimal_places=2)),
+            Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2)
+        ),
+        lines_count=Count('pk'),
+    )
+    return CartTotals(totals['total_items'], totals['total_amount'], totals['lines_count'])
+
+
+def get_cart_totals(cart):
+    """
+    Returns:
+        CartTotals: (total_items, total_amount, lines_count)
+    """
+    prefetched = getattr(cart, '_prefetched_objects_cache', {}).get('items')
+    if prefetched is not None:
+        return totals_from_items(prefetched)
+    if cart.pk is None:
+        return EMPTY_TOTALS
+
+    timeout = get_cart_totals_cache_timeout()
+    if timeout:
+        totals = cache.get(cart_totals_cache_key(cart.pk))
+        if totals is not None:
+            return CartTotals(*totals)
+
+    totals = aggregate_cart_totals(cart.pk)
+    if timeout:
+        cache.set(cart_totals_cache_key(cart.pk), tuple(totals), timeout)
+    return totals
+
+
+def invalidate_cart_totals(*cart_ids):
+    """
+    Xóa totals đã cache của các giỏ hàng.
+
+    Trong transaction, keys được xóa ngay (cho các lần đọc trong cùng
+    transaction) và xóa lại sau khi commit: request đồng thời có thể đã cache
+    totals của dữ liệu chưa commit.
+    """
+    if cart_ids and get_cart_totals_cache_timeout():
+        keys = [cart_totals_cache_key(cart_id) for cart_id in cart_ids]
+        cache.delete_many(keys)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: cache.delete_many(keys))
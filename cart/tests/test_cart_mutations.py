@@ -0,0 +1,109 @@
+"""
+Tests cho cart mutations (bulk update items, cập nhật timestamp của cart).
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from cart.services.mutations import ADD, REMOVE, SET, CartChange, CartMutationError, apply_cart_changes
+from cart.viewsets import CartSelfViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+class CartMutationsTest(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.cart = Cart.objects.create(user=self.user)
+        self.products = [
+            Product.objects.create(
+                name=f'Product {index}', description='x', price=Decimal('10.00'),
+                seller=seller, status='active', stock=5, sku=f'SKU-{index}'
+            )
+            for index in range(10)
+        ]
+
+    def quantities(self):
+        return dict(CartItem.objects.filter(cart=self.cart).values_list('product_id', 'quantity'))
+
+    def patch(self, items):
+        request = self.factory.patch('/api/v1/cart/me/items/', {'items': items}, format='json')
+        force_authenticate(request, user=self.user)
+        response = CartSelfViewSet.as_view({'patch': 'update_items'})(request)
+        response.render()
+        return response
+
+    def test_applies_changes_in_order(self):
+        first, second, third = self.products[:3]
+        CartItem.objects.create(cart=self.cart, product=first, quantity=1)
+        CartItem.objects.create(cart=self.cart, product=second, quantity=1)
+
+        response = self.patch([
+            {'op': 'add', 'product_id': first.pk, 'quantity': 2},
+            {'op': 'remove', 'product_id': second.pk},
+            {'product_id': third.pk, 'quantity': 4},
+            {'op': 'add', 'product_id': third.pk, 'quantity': 1},
+        ])
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.quantities(), {first.pk: 3, third.pk: 5})
+        self.assertEqual(response.data['data']['total_items'], 8)
+
+    def test_query_count_does_not_depend_on_changes(self):
+        with CaptureQueriesContext(connection) as small:
+            apply_cart_changes(self.cart, [CartChange(ADD, self.products[0].pk, 1)])
+
+        CartItem.objects.create(cart=self.cart, product=self.products[1], quantity=1)
+        CartItem.objects.create(cart=self.cart, product=self.products[2], quantity=1)
+        changes = [CartChange(SET, product.pk, 2) for product in self.products]
+        changes += [CartChange(REMOVE, self.products[1].pk)]
+        with CaptureQueriesContext(connection) as large:
+            apply_cart_changes(self.cart, changes)
+
+        self.assertEqual(len(self.quantities()), 9)
+        # Batch lớn có thêm delete và bulk_update
+        self.assertLessEqual(len(large), len(small) + 2)
+        cart_updates = [query for query in large if query['sql'].startswith('UPDATE "cart_cart"')]
+        self.assertEqual(len(cart_updates), 1)
+
+    def test_invalid_change_rolls_back(self):
+        CartItem.objects.create(cart=self.cart, product=self.products[0], quantity=1)
+        updated_at = Cart.objects.get(pk=self.cart.pk).updated_at
+
+        response = self.patch([
+            {'op': 'add', 'product_id': self.products[0].pk, 'quantity': 2},
+            {'product_id': self.products[1].pk, 'quantity': 6},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(self.products[1].pk, response.data['errors'])
+        self.assertEqual(self.quantities(), {self.products[0].pk: 1})
+        self.assertEqual(Cart.objects.get(pk=self.cart.pk).updated_at, updated_at)
+
+        with self.assertRaises(CartMutationError):
+            apply_cart_changes(self.cart, [CartChange(ADD, 0, 1)])
+
+    def test_item_writes_touch_cart_without_saving_it(self):
+        updated_at = Cart.objects.get(pk=self.cart.pk).updated_at
+        item = CartItem.objects.create(cart=self.cart, product=self.products[0], quantity=1)
+        with CaptureQueriesContext(connection) as queries:
+            item.quantity = 2
+            item.save()
+        self.assertFalse([query for query in queries if query['sql'].startswith('SELECT')])
+        self.assertGreater(Cart.objects.get(pk=self.cart.pk).updated_at, updated_at)
+
+        self.cart.clear()
+        self.assertEqual(self.quantities(), {})
@@ -0,0 +1,154 @@
+"""
+Tests cho cart store của giỏ hàng anonymous và merge khi đăng nhập.
+"""
+import os
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from cart.services.storage import (
+    DatabaseCartStore, LocalCartStore, get_cart_store, merge_session_cart, reset_cart_store
+)
+from cart.viewsets import CartSelfViewSet, CartSessionViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+class CartStoreTestMixin:
+
+    def setUp(self):
+        cache.clear()
+        reset_cart_store()
+        self.addCleanup(reset_cart_store)
+
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.products = [
+            Product.objects.create(
+                name=f'Product {index}', description='x', price=Decimal('10.00'),
+                seller=seller, status='active', stock=5, sku=f'SKU-{index}'
+            )
+            for index in range(3)
+        ]
+
+    def patch(self, items, session_key=None):
+        headers = {'HTTP_X_CART_SESSION': session_key} if session_key else {}
+        request = self.factory.patch('/api/v1/cart/session/items/', {'items': items}, format='json', **headers)
+        response = CartSessionViewSet.as_view({'patch': 'update_items'})(request)
+        response.render()
+        return response
+
+
+@override_settings(CART_STORE_BACKEND='local')
+class LocalCartStoreTest(CartStoreTestMixin, TestCase):
+
+    def test_anonymous_cart_does_not_write_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch([{'op': 'add', 'product_id': self.products[0].pk, 'quantity': 2}])
+
+        self.assertEqual(response.status_code, 200, response.data)
+        session_key = response.data['data']['session_key']
+        self.assertEqual(response['X-Cart-Session'], session_key)
+        self.assertEqual(response.data['data']['total_items'], 2)
+        self.assertFalse([
+            query for query in queries
+            if query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ])
+        self.assertFalse(Cart.objects.exists())
+
+        response = self.patch([{'product_id': self.products[1].pk, 'quantity': 6}], session_key)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(get_cart_store().load(session_key), {self.products[0].pk: 2})
+
+    def test_merge_on_login(self):
+        session_key = self.patch([
+            {'product_id': self.products[0].pk, 'quantity': 4},
+            {'product_id': self.products[1].pk, 'quantity': 1},
+        ]).data['data']['session_key']
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.products[0], quantity=3)
+        Product.objects.filter(pk=self.products[1].pk).update(status='inactive')
+
+        request = self.factory.post('/api/v1/cart/me/merge/', {}, format='json', HTTP_X_CART_SESSION=session_key)
+        force_authenticate(request, user=self.user)
+        response = CartSelfViewSet.as_view({'post': 'merge'})(request)
+        response.render()
+
+        self.assertEqual(response.status_code, 200, response.data)
+        # 3 + 4 giới hạn theo tồn kho 5, product inactive bị bỏ qua
+        self.assertEqual(
+            dict(cart.items.values_list('product_id', 'quantity')), {self.products[0].pk: 5}
+        )
+        self.assertCountEqual(response.data['data']['skipped_product_ids'], [self.products[0].pk, self.products[1].pk])
+        self.assertEqual(get_cart_store().load(session_key), {})
+        self.assertEqual(merge_session_cart(session_key, self.user), (None, []))
+
+    def test_expired_carts_are_evicted(self):
+        store = LocalCartStore(timeout=-1)
+        store.save('expired', {self.products[0].pk: 1})
+        self.assertEqual(store.load('expired'), {})
+        store.save('other', {self.products[0].pk: 1})
+        self.assertNotIn('expired', store._carts)
+
+
+@override_settings(
+    CART_STORE_BACKEND='cache',
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'test_cart_store'),
+    }},
+)
+class CacheCartStoreTest(CartStoreTestMixin, TestCase):
+
+    def test_changes_are_kept_in_cache(self):
+        session_key = self.patch([{'op': 'add', 'product_id': self.products[0].pk, 'quantity': 1}]).data['data']['session_key']
+        response = self.patch([
+            {'op': 'add', 'product_id': self.products[0].pk, 'quantity': 1},
+            {'product_id': self.products[2].pk, 'quantity': 3},
+        ], session_key)
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(get_cart_store().load(session_key), {self.products[0].pk: 2, self.products[2].pk: 3})
+        self.assertFalse(Cart.objects.exists())
+
+
+class DefaultCartStoreTest(CartStoreTestMixin, TestCase):
+
+    def test_process_local_cache_falls_back_to_database(self):
+        """Test LocMemCache không được dùng để lưu giỏ hàng anonymous"""
+        self.assertIsInstance(get_cart_store(), DatabaseCartStore)
+
+        reset_cart_store()
+        with override_settings(CART_STORE_BACKEND='cache'):
+            with self.assertRaises(ImproperlyConfigured):
+                get_cart_store()
+
+
+@override_settings(CART_STORE_BACKEND='database')
+class DatabaseCartStoreTest(CartStoreTestMixin, TestCase):
+
+    def test_anonymous_cart_is_stored_without_user(self):
+        session_key = self.patch([{'product_id': self.products[0].pk, 'quantity': 2}]).data['data']['session_key']
+
+        cart = Cart.objects.get(session_key=session_key)
+        self.assertIsNone(cart.user_id)
+        self.assertEqual(get_cart_store().load(session_key), {self.products[0].pk: 2})
+
+        merged, skipped = merge_session_cart(session_key, self.user)
+        self.assertEqual(dict(merged.items.values_list('product_id', 'quantity')), {self.products[0].pk: 2})
+        self.assertEqual(skipped, [])
+        self.assertFalse(Cart.objects.filter(session_key=session_key).exists())
@@ -0,0 +1,72 @@
+"""
+Tests cho abandoned cart sweeper.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cart.models import AbandonedCart, Cart, CartItem
+from cart.services.sweeper import sweep_abandoned_carts
+from products.models import Product
+
+User = get_user_model()
+
+
+class CartSweeperTest(TestCase):
+
+    def setUp(self):
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.product = Product.objects.create(
+            name='Product', description='x', price=Decimal('12.50'),
+            seller=seller, status='active', stock=10, sku='SKU'
+        )
+
+    def create_cart(self, name, idle_days, quantity=2):
+        user = User.objects.create_user(username=name, email=f'{name}@example.com', password='password')
+        cart = Cart.objects.create(user=user)
+        if quantity:
+            CartItem.objects.create(cart=cart, product=self.product, quantity=quantity)
+        Cart.objects.filter(pk=cart.pk).update(updated_at=timezone.now() - timedelta(days=idle_days))
+        return cart
+
+    def test_snapshots_and_deletes_idle_carts_in_batches(self):
+        idle = [self.create_cart(f'idle{index}', idle_days=40) for index in range(3)]
+        empty = self.create_cart('empty', idle_days=40, quantity=0)
+        active = self.create_cart('active', idle_days=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = sweep_abandoned_carts(idle_for=timedelta(days=30), batch_size=2)
+
+        self.assertEqual(result, (4, 3))
+        # Mỗi batch xóa tối đa batch_size carts trong transaction riêng
+        cart_deletes = [query for query in queries if query['sql'].startswith('DELETE FROM "cart_cart"')]
+        self.assertEqual(len(cart_deletes), 2)
+        self.assertEqual(list(Cart.objects.values_list('pk', flat=True)), [active.pk])
+        self.assertEqual(CartItem.objects.filter(cart_id__in=[cart.pk for cart in idle]).count(), 0)
+        self.assertFalse(AbandonedCart.objects.filter(cart_id=empty.pk).exists())
+
+        snapshot = AbandonedCart.objects.get(cart_id=idle[0].pk)
+        self.assertEqual(snapshot.user_id, idle[0].user_id)
+        self.assertEqual(snapshot.total_items, 2)
+        self.assertEqual(snapshot.total_amount, Decimal('25.00'))
+        self.assertEqual(snapshot.items[0]['sku'], 'SKU')
+
+    def test_command_respects_max_batches(self):
+        for index in range(3):
+            self.create_cart(f'idle{index}', idle_days=40)
+        out = StringIO()
+
+        call_command('sweep_abandoned_carts', '--batch-size', '1', '--max-batches', '2', '--no-snapshot', stdout=out)
+
+        self.assertIn('Swept 2 abandoned carts (0 snapshots)', out.getvalue())
+        self.assertEqual(Cart.objects.count(), 1)
+        self.assertFalse(AbandonedCart.objects.exists())
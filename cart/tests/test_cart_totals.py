@@ -0,0 +1,105 @@
+"""
+Tests cho totals của giỏ hàng (read model, cached totals).
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from cart.services.totals import cart_totals_cache_key
+from cart.viewsets import CartSelfViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+class CartTotalsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.cart = Cart.objects.create(user=self.user)
+
+    def add_products(self, count, quantity=2):
+        start = Product.objects.count()
+        for index in range(start, start + count):
+            product = Product.objects.create(
+                name=f'Product {index}', description='x', price=Decimal('10.00') + index,
+                seller=self.seller, status='active', stock=10, sku=f'SKU-{index}'
+            )
+            CartItem.objects.create(cart=self.cart, product=product, quantity=quantity)
+
+    def get(self, action):
+        request = self.factory.get('/api/v1/cart/me/')
+        force_authenticate(request, user=self.user)
+        response = CartSelfViewSet.as_view({'get': action})(request)
+        response.render()
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['data']
+
+    def test_cart_detail_queries_do_not_depend_on_item_count(self):
+        self.add_products(2)
+        with CaptureQueriesContext(connection) as small:
+            data = self.get('list')
+        self.assertEqual(data['total_items'], 4)
+        self.assertEqual(data['total_amount'], Decimal('42.00'))
+        self.assertFalse(data['is_empty'])
+
+        self.add_products(6)
+        with CaptureQueriesContext(connection) as large:
+            data = self.get('list')
+        self.assertEqual(len(data['items']), 8)
+        self.assertEqual(data['total_items'], 16)
+        self.assertEqual(len(small), len(large))
+
+    def test_totals_use_single_aggregate(self):
+        self.add_products(3)
+        cart = Cart.objects.get(pk=self.cart.pk)
+        with self.assertNumQueries(1):
+            totals = cart.get_totals()
+        self.assertEqual(totals, (6, Decimal('66.00'), 3))
+
+        empty = Cart.objects.create(user=self.seller)
+        self.assertTrue(empty.is_empty)
+        self.assertEqual(empty.total_amount, Decimal('0.00'))
+
+    @override_settings(CART_TOTALS_CACHE_TIMEOUT=60)
+    def test_cached_totals_invalidated_on_item_change(self):
+        self.add_products(2)
+        self.assertEqual(self.get('summary')['item_count'], 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get('summary')
+        self.assertFalse([query for query in queries if 'SUM(' in query['sql']])
+
+        item = CartItem.objects.filter(cart=self.cart).first()
+        item.quantity = 5
+        item.save()
+        self.assertEqual(self.get('summary')['item_count'], 7)
+
+        item.delete()
+        self.assertEqual(self.get('summary')['item_count'], 2)
+
+    @override_settings(CART_TOTALS_CACHE_TIMEOUT=60)
+    def test_totals_cached_before_commit_are_invalidated_on_commit(self):
+        self.add_products(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            item = CartItem.objects.get(cart=self.cart)
+            item.quantity = 5
+            item.save()
+            # Request đồng thời cache totals trước khi transaction commit
+            cache.set(cart_totals_cache_key(self.cart.pk), (2, Decimal('20.00'), 1), 60)
+
+        self.assertIsNone(cache.get(cart_totals_cache_key(self.cart.pk)))
+        self.assertEqual(self.get('summary')['item_count'], 5)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .viewsets import CartSelfViewSet, CartAdminViewSet, CartItemAdminViewSet
+from .viewsets import CartSelfViewSet, CartSessionViewSet, CartAdminViewSet, CartItemAdminViewSet
 
 # Legacy imports for backward compatibility
 from .views import (
@@ -34,9 +34,15 @@ urlpatterns = [
         'get': 'summary'    # GET /api/v1/cart/me/summary/ - Tóm tắt giỏ hàng
     }), name='cart-self-summary'),
     
+    # Cart quote
+    path('me/quote/', CartSelfViewSet.as_view({
+        'get': 'quote'      # GET /api/v1/cart/me/quote/ - Tổng tiền giỏ hàng
+    }), name='cart-self-quote'),
+    
     # Cart items management
     path('me/items/', CartSelfViewSet.as_view({
-        'post': 'add_item' # POST /api/v1/cart/me/items/ - Thêm sản phẩm
+        'post': 'add_item',       # POST /api/v1/cart/me/items/ - Thêm sản phẩm
+        'patch': 'update_items'   # PATCH /api/v1/cart/me/items/ - Cập nhật nhiều sản phẩm
     }), name='cart-self-add-item'),
     
     path('me/items/<int:item_id>/', CartSelfViewSet.as_view({
@@ -50,6 +56,20 @@ urlpatterns = [
         'delete': 'clear'   # DELETE /api/v1/cart/me/clear/ - Xóa tất cả
     }), name='cart-self-clear'),
     
+    path('me/merge/', CartSelfViewSet.as_view({
+        'post': 'merge'     # POST /api/v1/cart/me/merge/ - Gộp giỏ hàng anonymous
+    }), name='cart-self-merge'),
+    
+    # Anonymous cart (cart store, header X-Cart-Session)
+    path('session/', CartSessionViewSet.as_view({
+        'get': 'list',      # GET /api/v1/cart/session/ - Xem giỏ hàng
+        'delete': 'clear'   # DELETE /api/v1/cart/session/ - Xóa giỏ hàng
+    }), name='cart-session'),
+    
+    path('session/items/', CartSessionViewSet.as_view({
+        'patch': 'update_items'   # PATCH /api/v1/cart/session/items/ - Cập nhật nhiều sản phẩm
+    }), name='cart-session-items'),
+    
     path('me/checkout/', CartSelfViewSet.as_view({
         'post': 'checkout'  # POST /api/v1/cart/me/checkout/ - Checkout
     }), name='cart-self-checkout'),
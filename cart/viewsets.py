@@ -6,23 +6,31 @@ tuân thủ định dạng response và quy ước API đã được thiết l
 """
 
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, Sum, F
+from django.db.models import Count, Q, Sum, F, prefetch_related_objects
 from rest_framework import permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from core.viewsets.base import StandardizedModelViewSet
+from core.viewsets.base import StandardizedModelViewSet, StandardizedViewSet
 from core.mixins.swagger_helpers import SwaggerSchemaMixin
 from core.optimization.mixins import QueryOptimizationMixin
 from core.optimization.decorators import log_slow_queries, cached_property_with_ttl
 from core.permissions import IsOwner
+from core.decorators.api import idempotent
+from orders.serializers import PricingOptionsSerializer
+from orders.services.pricing import PricingError, quote_cart_items
 
-from .models import Cart, CartItem
+from .models import Cart, CartItem, cart_items_prefetch
 from .serializers import (
     CartSerializer, CartSummarySerializer, CartItemSerializer,
-    CartItemCreateSerializer, CartItemUpdateSerializer, CartCheckoutSerializer
+    CartItemCreateSerializer, CartItemUpdateSerializer, CartItemsUpdateSerializer,
+    CartCheckoutSerializer, CartMergeSerializer, SessionCartSerializer
+)
+from .services.mutations import ADD, REMOVE, SET, CartChange, CartMutationError, apply_cart_changes
+from .services.storage import (
+    SESSION_HEADER, get_cart_store, load_cart_items, merge_session_cart, new_session_key
 )
 
 
@@ -36,15 +44,21 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     Endpoints:
     - GET /api/v1/cart/me/ - Xem giỏ hàng hiện tại
     - POST /api/v1/cart/me/items/ - Thêm sản phẩm vào giỏ hàng
+    - PATCH /api/v1/cart/me/items/ - Cập nhật nhiều sản phẩm cùng lúc
     - PUT/PATCH /api/v1/cart/me/items/{id}/ - Cập nhật số lượng sản phẩm
     - DELETE /api/v1/cart/me/items/{id}/ - Xóa sản phẩm khỏi giỏ hàng
     - DELETE /api/v1/cart/me/clear/ - Xóa tất cả sản phẩm
     - GET /api/v1/cart/me/summary/ - Tóm tắt giỏ hàng
+    - GET /api/v1/cart/me/quote/ - Tổng tiền (discount, shipping, tax) của giỏ hàng
+    - POST /api/v1/cart/me/merge/ - Gộp giỏ hàng anonymous vào giỏ hàng của user
     - POST /api/v1/cart/me/checkout/ - Checkout giỏ hàng
     """
     serializer_class = CartSerializer
     permission_classes = [permissions.IsAuthenticated]
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
+    # Cart.updated_at đổi khi items thay đổi; giá/tên products lấy từ product.updated_at
+    conditional_get_actions = ('list', 'summary')
+    last_modified_related_fields = ('items__updated_at', 'items__product__updated_at')
     
     def get_queryset(self):
         """Chỉ trả về cart của user hiện tại."""
@@ -57,18 +71,48 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         cart, created = Cart.objects.get_or_create(user=self.request.user)
         return cart
     
+    def get_cart_data(self, cart):
+        """
+        Data của CartSerializer: items (kèm products) được prefetch một lần và
+        totals tính từ chính list đó, số queries không phụ thuộc số items.
+        """
+        prefetch_related_objects([cart], cart_items_prefetch())
+        return self.get_serializer(cart).data
+    
+    def apply_changes(self, cart, changes):
+        """
+        Áp dụng thay đổi cart items (`cart.services.mutations`).
+        
+        Returns:
+            Response lỗi nếu thay đổi không hợp lệ, ngược lại None
+        """
+        try:
+            apply_cart_changes(cart, changes)
+        except CartMutationError as exc:
+            return self.error_response(
+                message=exc.message,
+                errors=exc.errors or None,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return None
+    
     def list(self, request, *args, **kwargs):
         """
         Xem thông tin giỏ hàng hiện tại.
         Nếu giỏ hàng chưa tồn tại, sẽ tạo mới.
         """
         cart = self.get_cart()
-        serializer = self.get_serializer(cart)
-        return self.success_response(
-            data=serializer.data,
+        validators = self.get_conditional_validators(instance=cart)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+        
+        response = self.success_response(
+            data=self.get_cart_data(cart),
             message="Thông tin giỏ hàng",
             status_code=status.HTTP_200_OK
         )
+        return self.set_conditional_headers(response, validators)
     
     @action(detail=False, methods=['get'])
     def summary(self, request):
@@ -76,12 +120,52 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         Lấy tóm tắt giỏ hàng (không bao gồm chi tiết items).
         """
         cart = self.get_cart()
+        validators = self.get_conditional_validators(instance=cart)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+        
         serializer = CartSummarySerializer(cart)
-        return self.success_response(
+        response = self.success_response(
             data=serializer.data,
             message="Tóm tắt giỏ hàng",
             status_code=status.HTTP_200_OK
         )
+        return self.set_conditional_headers(response, validators)
+    
+    @extend_schema(parameters=[PricingOptionsSerializer])
+    @action(detail=False, methods=['get'])
+    def quote(self, request):
+        """
+        Tính tổng tiền của giỏ hàng với coupon/voucher và địa chỉ giao hàng.
+        
+        Dùng cùng pricing engine với tạo đơn hàng nên số tiền trả về trùng với
+        đơn hàng được tạo từ giỏ hàng này.
+        
+        Query params:
+            - coupon_code, voucher_code: Mã giảm giá (tùy chọn)
+            - country, province: Địa chỉ giao hàng để tính phí vận chuyển
+            - shipping_method_id: Phương thức vận chuyển (mặc định rẻ nhất)
+        """
+        serializer = PricingOptionsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        options = {key: value for key, value in serializer.validated_data.items() if value}
+        
+        items = CartItem.objects.filter(cart__user=request.user).select_related('product').order_by('product_id')
+        try:
+            quote, _, _ = quote_cart_items(items, request.user, **options)
+        except PricingError as exc:
+            return self.error_response(
+                message=exc.message,
+                errors=exc.errors,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return self.success_response(
+            data=quote,
+            message="Tổng tiền giỏ hàng",
+            status_code=status.HTTP_200_OK
+        )
     
     @action(detail=False, methods=['post'], url_path='items')
     def add_item(self, request):
@@ -96,23 +180,47 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         cart = self.get_cart()
-        product_id = serializer.validated_data.get('product_id')
-        quantity = serializer.validated_data.get('quantity', 1)
-        
-        # Get product
-        product = get_object_or_404(Product, id=product_id)
-        
-        # Add item to cart using model method
-        cart_item = cart.add_item(product, quantity)
+        change = CartChange(
+            ADD, serializer.validated_data['product_id'], serializer.validated_data.get('quantity', 1)
+        )
+        error = self.apply_changes(cart, [change])
+        if error is not None:
+            return error
         
         # Return updated cart
-        cart_serializer = self.get_serializer(cart)
         return self.success_response(
-            data=cart_serializer.data,
+            data=self.get_cart_data(cart),
             message="Đã thêm sản phẩm vào giỏ hàng",
             status_code=status.HTTP_200_OK
         )
     
+    @add_item.mapping.patch
+    def update_items(self, request):
+        """
+        Cập nhật nhiều sản phẩm trong giỏ hàng cùng lúc.
+        
+        Các thay đổi được áp dụng theo thứ tự trong một transaction và
+        `updated_at` của giỏ hàng chỉ đổi một lần; một thay đổi không hợp lệ
+        thì không thay đổi nào được áp dụng.
+        
+        Body:
+            - items: [{"op": "add"|"set"|"remove", "product_id": 1, "quantity": 2}, ...]
+        """
+        serializer = CartItemsUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        cart = self.get_cart()
+        changes = [CartChange(**change) for change in serializer.validated_data['items']]
+        error = self.apply_changes(cart, changes)
+        if error is not None:
+            return error
+        
+        return self.success_response(
+            data=self.get_cart_data(cart),
+            message="Đã cập nhật giỏ hàng",
+            status_code=status.HTTP_200_OK
+        )
+    
     @action(detail=False, methods=['put', 'patch'], url_path='items/(?P<item_id>[^/.]+)')
     def update_item(self, request, item_id=None):
         """
@@ -125,16 +233,19 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
             - quantity: Số lượng mới
         """
         cart = self.get_cart()
-        cart_item = get_object_or_404(CartItem, id=item_id, cart=cart)
+        cart_item = get_object_or_404(CartItem.objects.select_related('product'), id=item_id, cart=cart)
         
         serializer = CartItemUpdateSerializer(cart_item, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        if 'quantity' in serializer.validated_data:
+            change = CartChange(SET, cart_item.product_id, serializer.validated_data['quantity'])
+            error = self.apply_changes(cart, [change])
+            if error is not None:
+                return error
         
         # Return updated cart
-        cart_serializer = self.get_serializer(cart)
         return self.success_response(
-            data=cart_serializer.data,
+            data=self.get_cart_data(cart),
             message="Đã cập nhật giỏ hàng",
             status_code=status.HTTP_200_OK
         )
@@ -150,12 +261,11 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         cart = self.get_cart()
         cart_item = get_object_or_404(CartItem, id=item_id, cart=cart)
         
-        cart_item.delete()
+        apply_cart_changes(cart, [CartChange(REMOVE, cart_item.product_id)])
         
         # Return updated cart
-        cart_serializer = self.get_serializer(cart)
         return self.success_response(
-            data=cart_serializer.data,
+            data=self.get_cart_data(cart),
             message="Đã xóa sản phẩm khỏi giỏ hàng",
             status_code=status.HTTP_200_OK
         )
@@ -169,14 +279,39 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         cart.clear()
         
         # Return empty cart
-        cart_serializer = self.get_serializer(cart)
         return self.success_response(
-            data=cart_serializer.data,
+            data=self.get_cart_data(cart),
             message="Đã xóa tất cả sản phẩm trong giỏ hàng",
             status_code=status.HTTP_200_OK
         )
     
     @action(detail=False, methods=['post'])
+    def merge(self, request):
+        """
+        Merge giỏ hàng anonymous (`X-Cart-Session`) vào giỏ hàng của user.
+        
+        Gọi sau khi đăng nhập; `POST /api/v1/auth/login/` với header
+        `X-Cart-Session` đã tự merge.
+        
+        Body:
+            - session_key: Session key của giỏ hàng anonymous (tùy chọn, mặc định lấy từ header)
+        """
+        serializer = CartMergeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        session_key = serializer.validated_data.get('session_key') or request.headers.get(SESSION_HEADER)
+        
+        merged, skipped = merge_session_cart(session_key, request.user)
+        cart = merged or self.get_cart()
+        data = self.get_cart_data(cart)
+        data['skipped_product_ids'] = skipped
+        return self.success_response(
+            data=data,
+            message="Đã gộp giỏ hàng" if merged else "Không có giỏ hàng để gộp",
+            status_code=status.HTTP_200_OK
+        )
+    
+    @action(detail=False, methods=['post'])
+    @idempotent()
     def checkout(self, request):
         """
         Checkout giỏ hàng - chuyển sang tạo đơn hàng.
@@ -213,6 +348,70 @@ class CartSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         )
 
 
+@extend_schema(tags=['Cart'])
+class CartSessionViewSet(StandardizedViewSet):
+    """
+    ViewSet cho giỏ hàng của khách chưa đăng nhập.
+    
+    Giỏ hàng được lưu trong cart store (`cart.services.storage`, setting
+    `CART_STORE_BACKEND`) thay vì database và định danh bằng header
+    `X-Cart-Session`. Lần ghi đầu tiên không có header sẽ tạo session key mới,
+    trả về trong response (`session_key` và header `X-Cart-Session`).
+    
+    Endpoints:
+    - GET /api/v1/cart/session/ - Xem giỏ hàng
+    - DELETE /api/v1/cart/session/ - Xóa giỏ hàng
+    - PATCH /api/v1/cart/session/items/ - Cập nhật nhiều sản phẩm cùng lúc
+    """
+    permission_classes = [permissions.AllowAny]
+    
+    def get_session_key(self):
+        return self.request.headers.get(SESSION_HEADER) or None
+    
+    def get_cart_response(self, session_key, quantities, message):
+        data = SessionCartSerializer(
+            {'session_key': session_key, 'items': load_cart_items(quantities)},
+            context={'request': self.request}
+        ).data
+        response = self.success_response(data=data, message=message, status_code=status.HTTP_200_OK)
+        if session_key:
+            response[SESSION_HEADER] = session_key
+        return response
+    
+    def list(self, request):
+        """Xem giỏ hàng anonymous."""
+        session_key = self.get_session_key()
+        quantities = get_cart_store().load(session_key) if session_key else {}
+        return self.get_cart_response(session_key, quantities, "Thông tin giỏ hàng")
+    
+    def update_items(self, request):
+        """
+        Cập nhật nhiều sản phẩm trong giỏ hàng anonymous.
+        
+        Body giống `PATCH /api/v1/cart/me/items/`.
+        """
+        serializer = CartItemsUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        session_key = self.get_session_key() or new_session_key()
+        try:
+            quantities = get_cart_store().apply(session_key, serializer.validated_data['items'])
+        except CartMutationError as exc:
+            return self.error_response(
+                message=exc.message,
+                errors=exc.errors or None,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return self.get_cart_response(session_key, quantities, "Đã cập nhật giỏ hàng")
+    
+    def clear(self, request):
+        """Xóa giỏ hàng anonymous."""
+        session_key = self.get_session_key()
+        if session_key:
+            get_cart_store().delete(session_key)
+        return self.get_cart_response(session_key, {}, "Đã xóa tất cả sản phẩm trong giỏ hàng")
+
+
 @extend_schema(tags=['Cart Management'])
 class CartItemAdminViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     """
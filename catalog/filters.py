@@ -0,0 +1,36 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .services.category_tree import get_subtree_category_ids
+
+
+class CategorySubtreeFilter(BaseFilterBackend):
+    """
+    Lọc objects thuộc một category hoặc bất kỳ category con cháu nào.
+
+    Nhận id hoặc slug qua query param `category_tree`. Danh sách categories
+    trong subtree được lấy từ category tree snapshot nên filter chỉ thêm
+    một điều kiện `IN` vào query, không tốn query nào để duyệt cây.
+    """
+    category_param = 'category_tree'
+    category_field = 'category_id'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.category_param, '').strip()
+        if not value:
+            return queryset
+
+        category_ids = get_subtree_category_ids(value)
+        return queryset.filter(**{f'{self.category_field}__in': category_ids})
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.category_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Id hoặc slug của category, bao gồm cả các category con cháu',
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
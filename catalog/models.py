@@ -2,8 +2,12 @@ from django.db import models
 from django.utils.text import slugify
 from django.urls import reverse
 
+from core.utils.slugs import UniqueSlugMixin
 
-class Category(models.Model):
+from .services.category_tree import get_category_tree, load_descendants
+
+
+class Category(UniqueSlugMixin, models.Model):
     """
     Product category with hierarchical structure support.
     """
@@ -26,28 +30,27 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     def get_absolute_url(self):
         return reverse('catalog:category-detail', kwargs={'slug': self.slug})
 
     @property
     def get_descendants(self):
-        """Returns all descendants of this category"""
-        descendants = []
-        children = self.children.all()
-        
-        for child in children:
-            descendants.append(child)
-            descendants.extend(child.get_descendants)
-            
-        return descendants
+        """Returns all descendants of this category (one query, tree from cache)"""
+        return load_descendants(self)
+
+    def get_descendant_ids(self, include_self=False):
+        """Returns ids of all descendants without querying the database"""
+        tree = get_category_tree()
+        if include_self:
+            return tree.subtree_ids(self.pk)
+        return tree.descendant_ids(self.pk)
+
+    def get_breadcrumbs(self):
+        """Returns [{'id', 'name', 'slug'}, ...] from the root to this category"""
+        return get_category_tree().breadcrumbs(self.pk)
 
 
-class Brand(models.Model):
+class Brand(UniqueSlugMixin, models.Model):
     """
     Product brand information model.
     """
@@ -65,16 +68,11 @@ class Brand(models.Model):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     def get_absolute_url(self):
         return reverse('catalog:brand-detail', kwargs={'slug': self.slug})
 
 
-class Tag(models.Model):
+class Tag(UniqueSlugMixin, models.Model):
     """
     Product tag model.
     """
@@ -90,16 +88,11 @@ class Tag(models.Model):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     def get_absolute_url(self):
         return reverse('catalog:tag-detail', kwargs={'slug': self.slug})
 
 
-class Attribute(models.Model):
+class Attribute(UniqueSlugMixin, models.Model):
     """
     Product attribute model for dynamic attributes.
     """
@@ -117,11 +110,6 @@ class Attribute(models.Model):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     def get_absolute_url(self):
         return reverse('catalog:attribute-detail', kwargs={'slug': self.slug})
 
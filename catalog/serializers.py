@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from core.validators.common import validate_slug
 from .models import Category, Brand, Tag, Attribute, AttributeValue
 
@@ -52,16 +52,22 @@ class CategorySerializer(serializers.ModelSerializer):
     children = RecursiveCategorySerializer(many=True, read_only=True)
     parent_name = serializers.SerializerMethodField(read_only=True)
     products_count = serializers.SerializerMethodField(read_only=True)
+    breadcrumbs = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description', 'parent', 'parent_name', 'is_active', 
-                 'children', 'products_count', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'parent_name', 'children', 'products_count', 'created_at', 'updated_at']
+                 'children', 'products_count', 'breadcrumbs', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'parent_name', 'children', 'products_count', 'breadcrumbs',
+                            'created_at', 'updated_at']
     
     def get_parent_name(self, obj: Category) -> Optional[str]:
         return obj.parent.name if obj.parent else None
     
+    def get_breadcrumbs(self, obj: Category) -> List[Dict[str, Any]]:
+        # Lấy từ category tree snapshot, không tốn query
+        return obj.get_breadcrumbs()
+    
     def get_products_count(self, obj: Category) -> int:
         return obj.product_set.count() if hasattr(obj, 'product_set') else 0
     
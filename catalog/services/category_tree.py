@@ -0,0 +1,229 @@
+"""
+Category Tree Service
+
+Snapshot của toàn bộ cây categories (id, parent, name, slug) được load
+bằng một query duy nhất và lưu trong Django cache. Các truy vấn cây như
+descendants, ancestors (breadcrumbs) hay "products trong subtree" được
+giải quyết trong memory, không tốn thêm query nào.
+
+Snapshot được đánh version: mỗi process giữ bản đã build của version gần
+nhất và chỉ build lại khi version trong cache thay đổi. Snapshot bị
+invalidate khi Category được save hoặc delete (xem catalog.signals).
+"""
+import threading
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY_PREFIX = 'category_tree'
+VERSION_CACHE_KEY = f'{CACHE_KEY_PREFIX}:version'
+
+
+def get_cache_timeout():
+    return getattr(settings, 'CATEGORY_TREE_CACHE_TIMEOUT', 60 * 60)
+
+
+def get_snapshot_cache_key(version):
+    return f'{CACHE_KEY_PREFIX}:{version}'
+
+
+class CategoryTree:
+    """
+    Cây categories trong memory.
+
+    Args:
+        version (str): Version của snapshot
+        nodes (list): Các tuple (id, parent_id, name, slug, is_active)
+            theo thứ tự mặc định của Category (name)
+    """
+
+    def __init__(self, version, nodes):
+        self.version = version
+        self.nodes = {}
+        self.children = {}
+        for category_id, parent_id, name, slug, is_active in nodes:
+            self.nodes[category_id] = {
+                'id': category_id,
+                'parent_id': parent_id,
+                'name': name,
+                'slug': slug,
+                'is_active': is_active,
+            }
+            self.children.setdefault(parent_id, []).append(category_id)
+        self.slugs = {node['slug']: category_id for category_id, node in self.nodes.items()}
+        self._descendants = {}
+
+    def __contains__(self, category_id):
+        return category_id in self.nodes
+
+    def get_id(self, value):
+        """Trả về category id từ id hoặc slug, None nếu không tồn tại."""
+        if value in self.nodes:
+            return value
+        if isinstance(value, str):
+            if value.isdigit() and int(value) in self.nodes:
+                return int(value)
+            return self.slugs.get(value)
+        return None
+
+    def descendant_ids(self, category_id):
+        """
+        Danh sách id các categories con cháu theo thứ tự duyệt cây
+        (pre-order), không bao gồm chính category.
+        """
+        if category_id not in self._descendants:
+            result = []
+            stack = list(reversed(self.children.get(category_id, [])))
+            seen = {category_id}
+            while stack:
+                child_id = stack.pop()
+                # Bảo vệ khi dữ liệu có vòng lặp parent
+                if child_id in seen:
+                    continue
+                seen.add(child_id)
+                result.append(child_id)
+                stack.extend(reversed(self.children.get(child_id, [])))
+            self._descendants[category_id] = result
+        return self._descendants[category_id]
+
+    def subtree_ids(self, category_id):
+        """Id của category và tất cả categories con cháu."""
+        if category_id not in self.nodes:
+            return []
+        return [category_id, *self.descendant_ids(category_id)]
+
+    def ancestor_ids(self, category_id):
+        """Id các categories tổ tiên, từ gốc đến parent trực tiếp."""
+        ancestors = []
+        node = self.nodes.get(category_id)
+        while node and node['parent_id'] in self.nodes and node['parent_id'] not in ancestors:
+            ancestors.append(node['parent_id'])
+            node = self.nodes[node['parent_id']]
+        ancestors.reverse()
+        return ancestors
+
+    def breadcrumbs(self, category_id):
+        """
+        Breadcrumbs từ gốc đến category.
+
+        Returns:
+            list: Các dict {'id', 'name', 'slug'}
+        """
+        if category_id not in self.nodes:
+            return []
+        return [
+            {key: self.nodes[node_id][key] for key in ('id', 'name', 'slug')}
+            for node_id in [*self.ancestor_ids(category_id), category_id]
+        ]
+
+
+_local_tree = None
+_local_lock = threading.Lock()
+
+
+def load_category_nodes():
+    Category = apps.get_model('catalog', 'Category')
+    return list(
+        Category.objects.order_by('name', 'pk').values_list(
+            'pk', 'parent_id', 'name', 'slug', 'is_active'
+        )
+    )
+
+
+def get_category_tree():
+    """
+    Trả về snapshot hiện tại của cây categories.
+
+    Không tốn query nào khi snapshot đã có trong cache; ngược lại load
+    toàn bộ categories bằng một query và lưu vào cache.
+    """
+    global _local_tree
+
+    version = cache.get(VERSION_CACHE_KEY)
+    tree = _local_tree
+    if version is not None and tree is not None and tree.version == version:
+        return tree
+
+    nodes = cache.get(get_snapshot_cache_key(version)) if version is not None else None
+    if nodes is None:
+        version = uuid.uuid4().hex
+        nodes = load_category_nodes()
+        cache.set_many({
+            get_snapshot_cache_key(version): nodes,
+            VERSION_CACHE_KEY: version,
+        }, get_cache_timeout())
+
+    tree = CategoryTree(version, nodes)
+    with _local_lock:
+        _local_tree = tree
+    return tree
+
+
+def invalidate_category_tree():
+    """Bỏ snapshot hiện tại, sẽ được load lại ở lần truy cập tiếp theo."""
+    global _local_tree
+    cache.delete(VERSION_CACHE_KEY)
+    with _local_lock:
+        _local_tree = None
+
+
+def get_subtree_category_ids(category):
+    """
+    Id của category (instance, id hoặc slug) và tất cả con cháu.
+
+    Dùng cho các filter "products trong subtree", ví dụ
+    `Product.objects.filter(category_id__in=get_subtree_category_ids(c))`.
+    """
+    tree = get_category_tree()
+    category_id = getattr(category, 'pk', category)
+    return tree.subtree_ids(tree.get_id(category_id))
+
+
+def load_descendants(category, queryset=None):
+    """
+    Load tất cả categories con cháu bằng một query.
+
+    Cache `parent` và `children` của các instances được gán sẵn từ cây,
+    vì vậy serialize lồng nhau các descendants không tốn thêm query.
+
+    Returns:
+        list: Các Category instances theo thứ tự pre-order
+    """
+    Category = apps.get_model('catalog', 'Category')
+    tree = get_category_tree()
+    descendant_ids = tree.descendant_ids(category.pk)
+    if not descendant_ids:
+        return []
+
+    if queryset is None:
+        queryset = Category.objects.all()
+    instances = queryset.in_bulk(descendant_ids)
+    instances[category.pk] = category
+
+    parent_field = Category._meta.get_field('parent')
+    for category_id in [category.pk, *descendant_ids]:
+        instance = instances.get(category_id)
+        if instance is None:
+            continue
+        children = [
+            instances[child_id]
+            for child_id in tree.children.get(category_id, [])
+            if child_id in instances
+        ]
+        for child in children:
+            parent_field.set_cached_value(child, instance)
+        instance._prefetched_objects_cache = {
+            **getattr(instance, '_prefetched_objects_cache', {}),
+            'children': _prefetched_children(instance, children),
+        }
+
+    return [instances[pk] for pk in descendant_ids if pk in instances]
+
+
+def _prefetched_children(instance, children):
+    queryset = instance.children.all()
+    queryset._result_cache = children
+    queryset._prefetch_done = True
+    return queryset
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.utils.response_cache import purge_instance_cache_tags
+
+from .models import Attribute, AttributeValue, Brand, Category, Tag
+from .services.category_tree import invalidate_category_tree
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree_on_change(sender, **kwargs):
+    """
+    Invalidate category tree snapshot khi category được tạo, cập nhật hoặc xóa.
+    """
+    invalidate_category_tree()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Attribute)
+@receiver(post_delete, sender=Attribute)
+@receiver(post_save, sender=AttributeValue)
+@receiver(post_delete, sender=AttributeValue)
+def purge_catalog_response_cache(sender, instance, **kwargs):
+    """
+    Purge cached responses gắn với object (và listings của model) khi dữ liệu catalog thay đổi.
+    """
+    purge_instance_cache_tags(instance)
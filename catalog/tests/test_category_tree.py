@@ -0,0 +1,123 @@
+"""
+Tests cho category tree snapshot.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+
+from catalog.models import Category
+from catalog.services.category_tree import (
+    get_category_tree, get_subtree_category_ids, invalidate_category_tree
+)
+from products.models import Product
+from products.viewsets import ProductPublicViewSet
+
+User = get_user_model()
+
+
+class CategoryTreeTest(TestCase):
+    """Test descendants, breadcrumbs và subtree filter"""
+
+    def setUp(self):
+        cache.clear()
+        invalidate_category_tree()
+        self.addCleanup(invalidate_category_tree)
+
+        # electronics > computers > laptops > gaming
+        #             > phones
+        self.electronics = Category.objects.create(name='Electronics', slug='electronics')
+        self.computers = Category.objects.create(
+            name='Computers', slug='computers', parent=self.electronics
+        )
+        self.laptops = Category.objects.create(
+            name='Laptops', slug='laptops', parent=self.computers
+        )
+        self.gaming = Category.objects.create(
+            name='Gaming', slug='gaming', parent=self.laptops
+        )
+        self.phones = Category.objects.create(
+            name='Phones', slug='phones', parent=self.electronics
+        )
+        self.books = Category.objects.create(name='Books', slug='books')
+        self.client = APIClient()
+
+    def test_descendants_in_pre_order(self):
+        """Test descendants theo thứ tự duyệt cây"""
+        self.assertEqual(
+            [c.slug for c in self.electronics.get_descendants],
+            ['computers', 'laptops', 'gaming', 'phones']
+        )
+        self.assertEqual(self.books.get_descendants, [])
+
+    def test_descendants_single_query_when_tree_cached(self):
+        """Test load descendants chỉ tốn một query khi tree đã cache"""
+        get_category_tree()
+        with CaptureQueriesContext(connection) as queries:
+            descendants = self.electronics.get_descendants
+            # parent và children đã được gán sẵn từ tree
+            self.assertEqual(descendants[2].parent.parent.slug, 'computers')
+            self.assertEqual([c.slug for c in descendants[0].children.all()], ['laptops'])
+        self.assertEqual(len(queries), 1)
+
+    def test_breadcrumbs_without_queries(self):
+        """Test breadcrumbs không tốn query"""
+        get_category_tree()
+        with CaptureQueriesContext(connection) as queries:
+            breadcrumbs = self.gaming.get_breadcrumbs()
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(
+            [crumb['slug'] for crumb in breadcrumbs],
+            ['electronics', 'computers', 'laptops', 'gaming']
+        )
+
+    def test_tree_invalidated_on_save_and_delete(self):
+        """Test snapshot được làm mới khi category thay đổi"""
+        self.assertEqual(
+            set(get_subtree_category_ids(self.computers)),
+            {self.computers.pk, self.laptops.pk, self.gaming.pk}
+        )
+
+        self.gaming.parent = self.phones
+        self.gaming.save()
+        self.assertNotIn(self.gaming.pk, get_subtree_category_ids(self.computers))
+        self.assertIn(self.gaming.pk, get_subtree_category_ids('phones'))
+
+        self.laptops.delete()
+        self.assertEqual(get_subtree_category_ids(self.computers), [self.computers.pk])
+
+    def test_descendants_endpoint(self):
+        """Test endpoint descendants"""
+        response = self.client.get(f'/api/v1/categories/{self.electronics.slug}/descendants')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [c['slug'] for c in response.data['data']],
+            ['computers', 'laptops', 'gaming', 'phones']
+        )
+
+    def test_products_filtered_by_subtree(self):
+        """Test lọc products theo category subtree"""
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        for name, category in [('Laptop', self.gaming), ('Phone', self.phones), ('Novel', self.books)]:
+            Product.objects.create(
+                name=name, description=name, price=Decimal('10.00'),
+                seller=seller, category=category, status='active'
+            )
+
+        view = ProductPublicViewSet.as_view({'get': 'list'})
+        factory = APIRequestFactory()
+
+        response = view(factory.get('/api/v1/products/', {'category_tree': 'computers'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['name'] for p in response.data['data']['results']], ['Laptop'])
+
+        response = view(factory.get('/api/v1/products/', {'category_tree': self.electronics.pk}))
+        self.assertEqual(
+            sorted(p['name'] for p in response.data['data']['results']), ['Laptop', 'Phone']
+        )
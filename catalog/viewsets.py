@@ -15,6 +15,7 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from core.viewsets.base import StandardizedModelViewSet
 from core.mixins.swagger_helpers import SwaggerSchemaMixin
+from core.mixins.views import ResponseCacheMixin
 from core.optimization.mixins import QueryOptimizationMixin
 from core.optimization.decorators import log_slow_queries, cached_property_with_ttl
 from core.permissions import IsAdminOrReadOnly
@@ -29,7 +30,7 @@ from .serializers import (
 
 
 @extend_schema(tags=['Categories'])
-class CategoryViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
+class CategoryViewSet(ResponseCacheMixin, StandardizedModelViewSet, QueryOptimizationMixin):
     """
     ViewSet để quản lý Category resources.
     
@@ -47,6 +48,7 @@ class CategoryViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
     """
     queryset = Category.objects.all()
     permission_classes = [IsAdminOrReadOnly]
+    cache_response_actions = ('list', 'retrieve', 'children', 'descendants')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     lookup_field = 'slug'
     search_fields = ['name', 'description']
@@ -102,7 +104,7 @@ class CategoryViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
 
 
 @extend_schema(tags=['Brands'])
-class BrandViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
+class BrandViewSet(ResponseCacheMixin, StandardizedModelViewSet, QueryOptimizationMixin):
     """
     ViewSet để quản lý Brand resources.
     
@@ -118,6 +120,7 @@ class BrandViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
     """
     queryset = Brand.objects.all()
     permission_classes = [IsAdminOrReadOnly]
+    cache_response_actions = ('list', 'retrieve')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     lookup_field = 'slug'
     search_fields = ['name', 'description']
@@ -133,7 +136,7 @@ class BrandViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
 
 
 @extend_schema(tags=['Tags'])
-class TagViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
+class TagViewSet(ResponseCacheMixin, StandardizedModelViewSet, QueryOptimizationMixin):
     """
     ViewSet để quản lý Tag resources.
     
@@ -150,6 +153,7 @@ class TagViewSet(StandardizedModelViewSet, QueryOptimizationMixin):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_response_actions = ('list', 'retrieve')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     lookup_field = 'slug'
     search_fields = ['name']
@@ -6,11 +6,18 @@ tính nhất quán trong việc xử lý request và response.
 """
 
 import functools
+import hashlib
 import json
 import logging
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, JsonResponse
 from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from core.utils.cache import require_shared_cache
 from core.utils.response import success_response, error_response
 
 logger = logging.getLogger('api')
@@ -255,3 +262,126 @@ def paginated_response(page_param='page', limit_param='limit', default_page=1, d
             
         return wrapper
     return decorator
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+IDEMPOTENCY_CACHE_PREFIX = 'idempotency'
+
+# Thời gian lưu response cho mỗi key (24 giờ)
+DEFAULT_IDEMPOTENCY_TTL = 60 * 60 * 24
+
+# Thời gian giữ khóa khi request đầu tiên đang chạy
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+
+def _request_fingerprint(request):
+    """Hash của method, path và body để phát hiện key bị dùng lại cho request khác."""
+    if isinstance(request, Request):
+        body = json.dumps(request.data, cls=DjangoJSONEncoder, sort_keys=True, default=str)
+    else:
+        body = request.body.decode('utf-8', errors='replace')
+    signature = json.dumps([request.method, request.get_full_path(), body])
+    return hashlib.sha256(signature.encode('utf-8')).hexdigest()
+
+
+def _store_idempotent_response(response, cache_key, fingerprint, ttl):
+    """Lưu response của request đầu tiên (bỏ qua lỗi 5xx để client thử lại)."""
+    if isinstance(response, Response) and response.status_code < 500:
+        cache.set(cache_key, {
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'data': response.data,
+        }, getattr(settings, 'IDEMPOTENCY_KEY_TTL', DEFAULT_IDEMPOTENCY_TTL) if ttl is None else ttl)
+    return response
+
+
+def idempotent(ttl=None, header=IDEMPOTENCY_HEADER, methods=('POST',), max_key_length=255):
+    """
+    Decorator hỗ trợ header `Idempotency-Key` cho các endpoints tạo dữ liệu.
+    
+    Request đầu tiên với một key chạy view bình thường, response (2xx/4xx)
+    được lưu trong cache cùng fingerprint của request. Các request lặp lại
+    với cùng key (client retry khi mạng chập chờn) nhận lại response đã lưu
+    với header `Idempotent-Replayed: true` mà không chạy lại view:
+    
+    - Cùng key nhưng body/path khác: 422
+    - Request đầu tiên vẫn đang chạy: 409
+    - Response 5xx không được lưu để client có thể thử lại
+    
+    Keys và khóa nằm trong cache 'default', cache này phải được chia sẻ
+    giữa các processes (Redis, Memcached...): request có key trên
+    LocMemCache raise `ImproperlyConfigured` thay vì có thể tạo trùng dữ liệu.
+    
+    Key có phạm vi theo user và path. Request không có header chạy như cũ.
+    Dùng được cho function views và methods của views/viewsets.
+    
+    Args:
+        ttl (int, optional): Thời gian lưu response (giây), mặc định
+            setting `IDEMPOTENCY_KEY_TTL` hoặc 24 giờ
+        header (str): Tên header chứa key
+        methods (tuple): Các HTTP methods áp dụng
+        max_key_length (int): Độ dài tối đa của key
+        
+    Returns:
+        function: Decorated view function
+        
+    Example:
+        ```python
+        class OrderSelfViewSet(StandardizedModelViewSet):
+            @idempotent()
+            def create(self, request, *args, **kwargs):
+                ...
+        ```
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            # Function view (request, ...) hoặc method (self, request, ...)
+            request = next(arg for arg in args[:2] if isinstance(arg, (HttpRequest, Request)))
+            key = request.headers.get(header)
+            if request.method not in methods or not key:
+                return view_func(*args, **kwargs)
+            
+            if len(key) > max_key_length:
+                return error_response(
+                    message=f"{header} không hợp lệ",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Retry tới process khác phải thấy key đã lưu, nếu không view chạy lại
+            require_shared_cache(f"{header} support")
+            
+            user = getattr(request, 'user', None)
+            scope = json.dumps([getattr(user, 'pk', None), request.path, key])
+            cache_key = f"{IDEMPOTENCY_CACHE_PREFIX}:{hashlib.sha256(scope.encode('utf-8')).hexdigest()}"
+            fingerprint = _request_fingerprint(request)
+            
+            entry = cache.get(cache_key)
+            if entry is None:
+                lock_key = f'{cache_key}:lock'
+                if not cache.add(lock_key, fingerprint, IDEMPOTENCY_LOCK_TIMEOUT):
+                    return error_response(
+                        message="Request với Idempotency-Key này đang được xử lý",
+                        status_code=status.HTTP_409_CONFLICT
+                    )
+                try:
+                    # Request đầu tiên có thể vừa xong giữa hai lần đọc cache
+                    entry = cache.get(cache_key)
+                    if entry is None:
+                        return _store_idempotent_response(
+                            view_func(*args, **kwargs), cache_key, fingerprint, ttl
+                        )
+                finally:
+                    cache.delete(lock_key)
+            
+            if entry['fingerprint'] != fingerprint:
+                return error_response(
+                    message=f"{header} đã được dùng cho một request khác",
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            return Response(entry['data'], status=entry['status'], headers={'Idempotent-Replayed': 'true'})
+        
+        return wrapper
+    return decorator
+
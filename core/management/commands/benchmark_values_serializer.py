@@ -0,0 +1,90 @@
+"""
+Django management command để so sánh values fast path với serializer thông thường
+"""
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.utils.values_benchmark import DEFAULT_PAGE_SIZES, run_values_serializer_benchmark
+from orders.models import Order
+from orders.serializers import OrderSummarySerializer
+from reports.models import TrafficLog
+from reports.serializers import TrafficLogSerializer
+
+
+class Command(BaseCommand):
+    help = 'Benchmark values fast path vs ModelSerializer on TrafficLog and Order list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=5000,
+            help='Number of fixture TrafficLog/Order rows to generate (rolled back afterwards)',
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            action='append',
+            dest='page_sizes',
+            help='Rows per page to benchmark (repeatable, defaults to 20, 100, 500)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of runs per page size, the median is reported',
+        )
+
+    def create_fixture(self, rows, batch_size=5000):
+        run_id = uuid.uuid4().hex[:8]
+        user = get_user_model().objects.create_user(
+            username=f'bench-{run_id}', email=f'bench-{run_id}@example.com', password=None
+        )
+        for start in range(0, rows, batch_size):
+            indexes = range(start, min(start + batch_size, rows))
+            TrafficLog.objects.bulk_create([
+                TrafficLog(
+                    endpoint=f'/api/v1/products/{index}/', method='GET', ip_address='127.0.0.1',
+                    user_agent='benchmark', duration_ms=index % 1000,
+                )
+                for index in indexes
+            ])
+            Order.objects.bulk_create([
+                Order(
+                    user=user, order_number=f'BENCH-{run_id}-{index}',
+                    total_amount=Decimal('10.00') + index % 100,
+                )
+                for index in indexes
+            ])
+
+    def handle(self, *args, **options):
+        page_sizes = options['page_sizes'] or DEFAULT_PAGE_SIZES
+        self.stdout.write(f"Benchmarking list serialization on {options['rows']} rows...")
+
+        targets = [
+            ('traffic logs', TrafficLog.objects.order_by('-timestamp', '-id'), TrafficLogSerializer, ()),
+            ('orders', Order.objects.order_by('-created_at', '-id'), OrderSummarySerializer, ('user',)),
+        ]
+        with transaction.atomic():
+            self.create_fixture(options['rows'])
+            results = [
+                (name, run_values_serializer_benchmark(
+                    queryset, serializer_class, page_sizes=page_sizes,
+                    select_related=select_related, repeat=options['repeat'],
+                ))
+                for name, queryset, serializer_class, select_related in targets
+            ]
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'endpoint':<14} {'rows':>6} {'serializer ms':>14} {'values ms':>10} {'speedup':>8}")
+        for name, rows in results:
+            for result in rows:
+                speedup = result['serializer_ms'] / result['values_ms'] if result['values_ms'] else 0
+                self.stdout.write(
+                    f"{name:<14} {result['rows']:>6} {result['serializer_ms']:>14.2f} "
+                    f"{result['values_ms']:>10.2f} {speedup:>7.1f}x"
+                )
@@ -1,5 +1,18 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import models
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework.response import Response
 from rest_framework import status
+
+from core.utils.response_cache import (
+    build_response_cache_key, get_cached_response, instance_cache_tag,
+    model_cache_tag, response_cache_enabled, store_response
+)
+from core.utils.values_serializer import ValuesPlanError, ValuesSerializer
 # from django.utils.decorators import method_decorator
 # from django.views.decorators.csrf import csrf_exempt
 #
@@ -249,6 +262,305 @@ class PermissionByActionMixin:
             return super().get_permissions()
 
 
+class PaginationByActionMixin:
+    """
+    Mixin cho phép xác định pagination_class khác nhau cho các action khác nhau.
+    
+    Dùng để bật keyset pagination (`CursorPagination`) cho từng endpoint có
+    listing lớn mà không thay đổi pagination của các actions còn lại.
+    
+    Attributes:
+        pagination_class_by_action (dict): Dictionary ánh xạ tên action
+            đến pagination class sẽ được sử dụng.
+            
+    Example:
+        ```python
+        class OrderViewSet(PaginationByActionMixin, ModelViewSet):
+            pagination_class_by_action = {
+                'list': CursorPagination,  # Không COUNT/OFFSET cho listing lớn
+            }
+        ```
+    """
+    pagination_class_by_action = {}
+    
+    @property
+    def paginator(self):
+        """
+        Paginator instance cho action hiện tại.
+        
+        Returns:
+            Pagination object, hoặc None nếu view không phân trang.
+        """
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class_by_action.get(
+                getattr(self, 'action', None), self.pagination_class
+            )
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
+
+
+class ResponseCacheMixin:
+    """
+    Mixin cache responses của các read actions cho anonymous users.
+    
+    Request GET/HEAD của anonymous user tới một action trong
+    `cache_response_actions` được trả về từ cache (sau authentication,
+    permissions và throttling, trước khi handler chạy). Responses được gắn
+    cache tags để signals invalidate chính xác:
+    
+    - Mọi action trừ `retrieve` (listings, children...): tag của model
+      (`product`) và `response_cache_tags`
+    - Objects được serialize: `<model>:<pk>` và tag của các quan hệ trong
+      `cache_tag_relations` (ví dụ `category:5`)
+    
+    Responses có ETag và Last-Modified; request có If-None-Match hoặc
+    If-Modified-Since khớp nhận 304.
+    
+    Attributes:
+        cache_response_actions (tuple): Các actions được cache
+        cache_tag_relations (tuple): Các ForeignKey có tag được gắn theo object
+        response_cache_tags (tuple): Tags thêm cho responses trừ `retrieve`
+        response_cache_timeout (int, optional): TTL, mặc định `RESPONSE_CACHE_TIMEOUT`
+        
+    Example:
+        ```python
+        class BrandViewSet(ResponseCacheMixin, StandardizedModelViewSet):
+            cache_response_actions = ('list', 'retrieve')
+        ```
+    """
+    cache_response_actions = ()
+    cache_tag_relations = ()
+    response_cache_tags = ()
+    response_cache_timeout = None
+    
+    def should_cache_response(self, request):
+        """Chỉ cache GET/HEAD của anonymous users cho các actions đã khai báo."""
+        return (
+            response_cache_enabled()
+            and request.method in ('GET', 'HEAD')
+            and getattr(self, 'action', None) in self.cache_response_actions
+            and not request.user.is_authenticated
+        )
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = None
+        self.response_cache_tag_set = set()
+        if not self.should_cache_response(request):
+            return
+        
+        self.response_cache_key = build_response_cache_key(request)
+        entry = get_cached_response(self.response_cache_key)
+        if entry is None:
+            if self.action != 'retrieve':
+                self.response_cache_tag_set.update(
+                    (model_cache_tag(self.get_queryset().model), *self.response_cache_tags)
+                )
+            return
+        
+        # Thay handler của request này bằng response đã cache
+        response = Response(entry['data'], status=entry['status'])
+        response.response_cache_entry = entry
+        self.on_response_cache_hit(request, response)
+        setattr(self, request.method.lower(), lambda *args, **kwargs: response)
+    
+    def on_response_cache_hit(self, request, response):
+        """
+        Hook khi response được lấy từ cache (handler không chạy).
+        
+        Override để giữ các side effects của handler, ví dụ tracking lượt xem.
+        """
+    
+    def add_response_cache_tags(self, instances):
+        """Gắn tags của một object hoặc list/queryset objects vào response hiện tại."""
+        if isinstance(instances, models.Model):
+            instances = [instances]
+        elif not isinstance(instances, (list, tuple, models.QuerySet)):
+            return
+        
+        for instance in instances:
+            if not isinstance(instance, models.Model):
+                continue
+            self.response_cache_tag_set.add(instance_cache_tag(instance))
+            for relation in self.cache_tag_relations:
+                field = instance._meta.get_field(relation)
+                related_id = getattr(instance, field.attname)
+                if related_id is not None:
+                    self.response_cache_tag_set.add(f'{field.related_model._meta.model_name}:{related_id}')
+    
+    def get_serializer(self, *args, **kwargs):
+        if args and getattr(self, 'response_cache_key', None):
+            self.add_response_cache_tags(args[0])
+        return super().get_serializer(*args, **kwargs)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        key = getattr(self, 'response_cache_key', None)
+        if key and isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+            entry = getattr(response, 'response_cache_entry', None)
+            if entry is None:
+                entry = store_response(
+                    key, response.data, response.status_code,
+                    self.response_cache_tag_set, self.response_cache_timeout
+                )
+            
+            not_modified = get_conditional_response(
+                request, etag=entry['etag'], last_modified=entry['last_modified']
+            )
+            if not_modified is not None:
+                response = not_modified
+            response['ETag'] = entry['etag']
+            response['Last-Modified'] = http_date(entry['last_modified'])
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Mixin hỗ trợ conditional GET (ETag / Last-Modified) cho các actions đọc.
+    
+    Validators được tính từ các timestamp fields (mặc định `updated_at`),
+    không cần serialize response:
+    
+    - Danh sách: một query aggregate `MAX(updated_at)` và `COUNT` trên
+      queryset đã lọc (count để phát hiện rows bị xóa)
+    - Một object: đọc trực tiếp từ instance (hoặc một aggregate khi có
+      `last_modified_related_fields`)
+    
+    Khi validators khớp với If-None-Match / If-Modified-Since, view trả về
+    304 trước khi serializer chạy.
+    
+    Attributes:
+        conditional_get_actions (tuple): Các actions hỗ trợ conditional GET
+        last_modified_field (str): Timestamp field của model
+        last_modified_related_fields (tuple): Timestamp lookups của dữ liệu
+            liên quan cũng có trong response, ví dụ `items__updated_at`
+            
+    Example:
+        ```python
+        class OrderSelfViewSet(StandardizedModelViewSet):
+            conditional_get_actions = ('list', 'retrieve')
+        ```
+    """
+    conditional_get_actions = ()
+    last_modified_field = 'updated_at'
+    last_modified_related_fields = ()
+    
+    def get_conditional_validators(self, queryset=None, instance=None):
+        """
+        Tính validators cho queryset hoặc instance của request hiện tại.
+        
+        Returns:
+            dict hoặc None: {'etag', 'last_modified'}, None nếu action không
+            hỗ trợ conditional GET hoặc không có dữ liệu
+        """
+        request = self.request
+        if request.method not in ('GET', 'HEAD') or getattr(self, 'action', None) not in self.conditional_get_actions:
+            return None
+        
+        if instance is not None and not self.last_modified_related_fields:
+            count, timestamps = 1, [getattr(instance, self.last_modified_field)]
+        else:
+            if instance is not None:
+                queryset = type(instance)._default_manager.filter(pk=instance.pk)
+            fields = (self.last_modified_field, *self.last_modified_related_fields)
+            result = queryset.aggregate(
+                count=models.Count('pk', distinct=bool(self.last_modified_related_fields)),
+                **{f'last_modified_{index}': models.Max(field) for index, field in enumerate(fields)}
+            )
+            count = result.pop('count')
+            timestamps = list(result.values())
+        
+        timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+        if not timestamps:
+            return None
+        
+        # Response khác nhau theo user, URL và renderer
+        renderer = getattr(request, 'accepted_media_type', '')
+        signature = json.dumps([
+            build_response_cache_key(request), request.user.pk, renderer, count,
+            [timestamp.isoformat() for timestamp in timestamps]
+        ])
+        return {
+            'etag': 'W/"%s"' % hashlib.sha1(signature.encode('utf-8')).hexdigest(),
+            'last_modified': int(max(timestamps).timestamp()),
+        }
+    
+    def get_not_modified_response(self, request, validators):
+        """Response 304 nếu validators khớp với conditional headers của request."""
+        if validators is None:
+            return None
+        response = get_conditional_response(
+            request, etag=validators['etag'], last_modified=validators['last_modified']
+        )
+        if response is not None:
+            self.set_conditional_headers(response, validators)
+        return response
+    
+    def set_conditional_headers(self, response, validators):
+        """Thêm ETag và Last-Modified vào response."""
+        if validators is not None:
+            response['ETag'] = validators['etag']
+            response['Last-Modified'] = http_date(validators['last_modified'])
+        return response
+
+
+class ValuesSerializerMixin:
+    """
+    Mixin bật values fast path cho các list actions chỉ đọc.
+    
+    Với các actions trong `values_list_actions`, queryset được đọc bằng
+    `.values()` và output được dựng bằng `ValuesSerializer` theo plan compile
+    từ serializer class của action (xem `core.utils.values_serializer`), thay
+    vì tạo model instances và chạy serializer cho từng object. Response giữ
+    nguyên định dạng. Nếu serializer không compile được, view dùng đường
+    serializer thông thường.
+    
+    Attributes:
+        values_list_actions (tuple): Các actions dùng fast path
+        
+    Settings:
+        VALUES_SERIALIZER_ENABLED (bool): Tắt fast path cho toàn hệ thống
+        
+    Example:
+        ```python
+        class TrafficLogViewSet(StandardizedModelViewSet):
+            values_list_actions = ('list',)
+        ```
+    """
+    values_list_actions = ()
+    
+    def get_values_serializer(self):
+        """
+        ValuesSerializer cho action hiện tại, None nếu action không dùng fast path.
+        """
+        if (
+            getattr(self, 'action', None) not in self.values_list_actions
+            or not getattr(settings, 'VALUES_SERIALIZER_ENABLED', True)
+        ):
+            return None
+        try:
+            return ValuesSerializer(self.get_serializer_class(), context=self.get_serializer_context())
+        except ValuesPlanError:
+            return None
+    
+    def get_values_queryset(self, queryset, values_serializer):
+        """
+        Queryset `.values()` cho fast path, kèm các field sắp xếp khi
+        paginator cần đọc chúng từ row (CursorPagination).
+        """
+        extra_lookups = ()
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            ordering = paginator.get_ordering(self.request, queryset, self)
+            extra_lookups = [field.lstrip('-') for field in ordering]
+        return values_serializer.get_queryset(queryset, extra_lookups)
+    
+    def serialize_list(self, objects, values_serializer=None):
+        """Data của list response, qua fast path nếu có `values_serializer`."""
+        if values_serializer is not None:
+            return values_serializer.serialize(objects)
+        return self.get_serializer(objects, many=True).data
+
+
 class SerializerByActionMixin:
     """
     Mixin cho phép xác định serializer_class khác nhau cho các action khác nhau.
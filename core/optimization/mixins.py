@@ -158,49 +158,17 @@ class CountOptimizedPaginationMixin:
     Mixin that optimizes count queries for pagination.
     
     Django's pagination performs a COUNT(*) query which can be expensive on large tables.
-    This mixin provides an optimized counting approach for pagination, using an estimate
-    when possible and falling back to exact count only when necessary.
+    Views using this mixin ask the standard pagination classes for the 'estimated'
+    count strategy (query planner row estimates, see core.pagination.counts), falling
+    back to an exact count for small results or databases without estimates.
+    
+    Attributes:
+        use_estimated_count (bool): Set to False to always use exact count.
     """
     
-    use_estimated_count = True  # Set to False to always use exact count
+    use_estimated_count = True
     
-    def paginate_queryset(self, queryset, page_size):
-        """
-        Override the paginate_queryset method to use an optimized count query.
-        
-        Args:
-            queryset: The queryset to paginate.
-            page_size: Number of items per page.
-            
-        Returns:
-            tuple: (paginated queryset, page, paginator)
-        """
-        if hasattr(self, 'paginator') and self.use_estimated_count:
-            # Try to get the paginator to use our optimized count method
-            if hasattr(self.paginator, 'count') and callable(self.paginator.count):
-                original_count = self.paginator.count
-                
-                def optimized_count(queryset):
-                    try:
-                        # For PostgreSQL, we can use an estimated count
-                        if 'postgresql' in queryset.db.settings_dict['ENGINE']:
-                            with queryset.db.connection.cursor() as cursor:
-                                cursor.execute(
-                                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
-                                    [queryset.model._meta.db_table]
-                                )
-                                row = cursor.fetchone()
-                                if row and row[0] > 0:
-                                    return row[0]
-                    except Exception:
-                        # Fall back to exact count on any error
-                        pass
-                        
-                    # Fall back to original count method
-                    return original_count(queryset)
-                
-                # Replace the count method with our optimized version
-                self.paginator.count = optimized_count
-                
-        # Call the original paginate_queryset method
-        return super().paginate_queryset(queryset, page_size)
+    @property
+    def pagination_count_strategy(self):
+        """Count strategy read by CountStrategyPaginationMixin."""
+        return 'estimated' if self.use_estimated_count else 'exact'
@@ -0,0 +1,100 @@
+"""
+Benchmark deep-page latency: page-number pagination so với keyset pagination.
+
+Với mỗi trang cần đo, page-number pagination chạy `COUNT(*)` và
+`OFFSET (page - 1) * page_size`; keyset pagination nhận cursor của trang đó
+(như khi client đi theo link `next`) và chỉ chạy một query có `WHERE` trên
+các field sắp xếp. Cursor được tính trước và không tính vào thời gian đo.
+"""
+import statistics
+import time
+from urllib.parse import parse_qs, urlparse
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .standard import CursorPagination, StandardResultsSetPagination
+
+DEFAULT_PAGES = (1, 10, 100, 500)
+
+
+def _median_ms(callback, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callback()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def _request(params):
+    return Request(APIRequestFactory().get('/', params))
+
+
+class _OrderingView:
+    """View tối thiểu để CursorPagination đọc `ordering`."""
+    filter_backends = []
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+def get_cursor_for_page(queryset, page, page_size, view=None):
+    """
+    Cursor trỏ tới `page` (1-based), None cho trang đầu tiên.
+    """
+    if page <= 1:
+        return None
+
+    paginator = CursorPagination()
+    paginator.base_url = 'http://testserver/'
+    paginator.fields = paginator.get_ordering(_request({}), queryset, view)
+    last_row = queryset.order_by(*paginator.fields)[(page - 1) * page_size - 1]
+    url = paginator.encode_cursor(paginator.get_position(last_row))
+    return parse_qs(urlparse(url).query)[paginator.cursor_query_param][0]
+
+
+def run_pagination_benchmark(queryset, pages=DEFAULT_PAGES, page_size=20, ordering=None, repeat=5):
+    """
+    Đo latency của từng trang với hai kiểu pagination.
+
+    Args:
+        queryset: Queryset cần phân trang
+        pages (iterable): Các số trang cần đo
+        page_size (int): Số items mỗi trang
+        ordering (list, optional): Ordering, mặc định `CursorPagination.ordering`
+        repeat (int): Số lần chạy mỗi trang, lấy median
+
+    Returns:
+        list: Các dict {'page', 'offset_ms', 'keyset_ms', 'rows'}
+    """
+    view = _OrderingView(ordering) if ordering else None
+    ordered = queryset.order_by(*CursorPagination().get_ordering(_request({}), queryset, view))
+    results = []
+
+    for page in pages:
+        cursor = get_cursor_for_page(queryset, page, page_size, view)
+        offset_params = {'page': page, 'page_size': page_size}
+        keyset_params = {'page_size': page_size}
+        if cursor:
+            keyset_params['cursor'] = cursor
+
+        def offset_page():
+            return StandardResultsSetPagination().paginate_queryset(ordered, _request(offset_params))
+
+        def keyset_page():
+            return CursorPagination().paginate_queryset(queryset, _request(keyset_params), view)
+
+        offset_rows = [row.pk for row in offset_page()]
+        keyset_rows = [row.pk for row in keyset_page()]
+        if offset_rows != keyset_rows:
+            raise ValueError(f'Page {page} differs between paginators')
+
+        results.append({
+            'page': page,
+            'offset_ms': _median_ms(offset_page, repeat),
+            'keyset_ms': _median_ms(keyset_page, repeat),
+            'rows': len(keyset_rows),
+        })
+
+    return results
@@ -0,0 +1,145 @@
+"""
+Count strategies cho paginated responses.
+
+Page-number pagination cần tổng số rows để tính `count` và `total_pages`.
+Trên bảng lớn, `COUNT(*)` có thể tốn hơn cả query lấy trang. Module này
+cung cấp các strategy có thể cấu hình:
+
+- `exact`: `COUNT(*)` như mặc định của Django
+- `cached`: `COUNT(*)` được cache theo SQL đã chuẩn hóa (bỏ ORDER BY) và TTL
+- `estimated`: số rows ước lượng từ `EXPLAIN` của PostgreSQL; dùng exact
+  khi database không hỗ trợ hoặc ước lượng nhỏ hơn ngưỡng
+
+Mỗi strategy trả về `(count, tên strategy đã tạo ra count)`.
+"""
+import hashlib
+import inspect
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections, transaction
+from django.db.models import QuerySet
+from django.utils.inspect import method_has_no_args
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = 'pagination_count'
+
+
+class ExactCountStrategy:
+    """COUNT(*) chính xác (hoặc len() nếu object_list không phải queryset)."""
+    name = 'exact'
+
+    def count(self, queryset):
+        # Cùng cách Paginator.count của Django xử lý lists và querysets
+        count = getattr(queryset, 'count', None)
+        if callable(count) and not inspect.isbuiltin(count) and method_has_no_args(count):
+            return count(), ExactCountStrategy.name
+        return len(queryset), ExactCountStrategy.name
+
+
+class CachedCountStrategy(ExactCountStrategy):
+    """
+    COUNT(*) chính xác được cache theo SQL và params của queryset.
+
+    Hai requests có cùng filters (bất kể thứ tự query params hay ordering)
+    sinh ra cùng SQL nên dùng chung một cache key.
+    """
+    name = 'cached'
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60
+        )
+
+    def get_cache_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        signature = f'{queryset.db}:{sql}:{params!r}'
+        return f'{CACHE_KEY_PREFIX}:{hashlib.sha1(signature.encode("utf-8")).hexdigest()}'
+
+    def count(self, queryset):
+        if not isinstance(queryset, QuerySet):
+            return super().count(queryset)
+        try:
+            cache_key = self.get_cache_key(queryset)
+        except EmptyResultSet:
+            return super().count(queryset)
+        count = cache.get(cache_key)
+        if count is not None:
+            return count, self.name
+
+        count, strategy = super().count(queryset)
+        cache.set(cache_key, count, self.timeout)
+        return count, strategy
+
+
+class EstimatedCountStrategy(ExactCountStrategy):
+    """
+    Số rows ước lượng từ query planner (`EXPLAIN (FORMAT JSON)`).
+
+    Khác với `pg_class.reltuples`, ước lượng áp dụng cho cả queryset đã lọc.
+    Ước lượng dưới `threshold` được thay bằng COUNT(*) vì khi đó COUNT rẻ và
+    sai số tương đối của planner lớn.
+    """
+    name = 'estimated'
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold if threshold is not None else getattr(
+            settings, 'PAGINATION_COUNT_ESTIMATE_THRESHOLD', 1000
+        )
+
+    def estimate(self, queryset):
+        """
+        Returns:
+            int hoặc None nếu không ước lượng được
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        try:
+            # Savepoint để lỗi EXPLAIN không làm hỏng transaction hiện tại
+            with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError:
+            logger.warning('Could not estimate count for %s', queryset.model.__name__, exc_info=True)
+            return None
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def count(self, queryset):
+        if not isinstance(queryset, QuerySet):
+            return super().count(queryset)
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return super().count(queryset)
+        return estimate, self.name
+
+
+COUNT_STRATEGIES = {
+    'exact': ExactCountStrategy,
+    'cached': CachedCountStrategy,
+    'estimated': EstimatedCountStrategy,
+}
+
+
+def get_count_strategy(name=None):
+    """
+    Khởi tạo count strategy theo tên, mặc định theo setting
+    `PAGINATION_COUNT_STRATEGY` ('exact').
+    """
+    name = name or getattr(settings, 'PAGINATION_COUNT_STRATEGY', 'exact')
+    try:
+        return COUNT_STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown pagination count strategy '{name}'")
@@ -1,14 +1,59 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import datetime
+import json
+from functools import partial, reduce
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counts import get_count_strategy
 
 
-class StandardResultsSetPagination(PageNumberPagination):
+class CountStrategyPaginator(DjangoPaginator):
     """
-    Standard pagination for most API endpoints.
+    Django Paginator lấy `count` từ một count strategy.
+
+    `count_strategy_used` cho biết strategy nào thực sự tạo ra count
+    (ví dụ 'estimated' có thể rơi về 'exact' với kết quả nhỏ).
     """
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+
+    def __init__(self, *args, count_strategy=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy or get_count_strategy()
+        self.count_strategy_used = None
+
+    @cached_property
+    def count(self):
+        count, self.count_strategy_used = self.count_strategy.count(self.object_list)
+        return count
+
+
+class CountStrategyPaginationMixin:
+    """
+    Page-number pagination với count strategy có thể cấu hình.
+
+    Strategy được chọn theo thứ tự: `view.pagination_count_strategy`,
+    `count_strategy` của class, setting `PAGINATION_COUNT_STRATEGY`.
+    Response chuẩn hóa có thêm `count_strategy`.
+    """
+    count_strategy = None
+
+    def get_count_strategy(self, view=None):
+        name = getattr(view, 'pagination_count_strategy', None) or self.count_strategy
+        return get_count_strategy(name)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CountStrategyPaginator, count_strategy=self.get_count_strategy(view)
+        )
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
         """
@@ -17,6 +62,7 @@ class StandardResultsSetPagination(PageNumberPagination):
         return Response({
             'status': 'success',
             'count': self.page.paginator.count,
+            'count_strategy': self.page.paginator.count_strategy_used,
             'total_pages': self.page.paginator.num_pages,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
@@ -24,7 +70,16 @@ class StandardResultsSetPagination(PageNumberPagination):
         })
 
 
-class LargeResultsSetPagination(PageNumberPagination):
+class StandardResultsSetPagination(CountStrategyPaginationMixin, PageNumberPagination):
+    """
+    Standard pagination for most API endpoints.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class LargeResultsSetPagination(CountStrategyPaginationMixin, PageNumberPagination):
     """
     Pagination for endpoints that need to return more results.
     """
@@ -32,21 +87,8 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 200
 
-    def get_paginated_response(self, data):
-        """
-        Return a standardized paginated response.
-        """
-        return Response({
-            'status': 'success',
-            'count': self.page.paginator.count,
-            'total_pages': self.page.paginator.num_pages,
-            'next': self.get_next_link(),
-            'previous': self.get_previous_link(),
-            'results': data
-        })
 
-
-class SmallResultsSetPagination(PageNumberPagination):
+class SmallResultsSetPagination(CountStrategyPaginationMixin, PageNumberPagination):
     """
     Pagination for endpoints that need to return fewer results.
     """
@@ -54,15 +96,219 @@ class SmallResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 50
 
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """Giữ đủ microseconds của datetime (DjangoJSONEncoder cắt còn milliseconds)."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination cho các listings lớn.
+
+    Thay vì `COUNT(*)` và `OFFSET`, mỗi trang lọc theo giá trị các field
+    sắp xếp của item cuối trang trước, ví dụ với ordering `-created_at, id`:
+    `WHERE created_at < x OR (created_at = x AND id > y)`. Chi phí một trang
+    không phụ thuộc vào độ sâu khi có index trên các field sắp xếp.
+
+    Ordering lấy từ `?ordering=` (qua OrderingFilter của view), `view.ordering`
+    hoặc `ordering` của class, luôn được thêm `unique_field` làm tie-breaker.
+    Các field sắp xếp phải NOT NULL. Response giữ cấu trúc chuẩn,
+    `count` và `total_pages` là None vì không chạy COUNT.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at',)
+    unique_field = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(request, queryset, view)
+
+        position, self.reverse = self.decode_cursor(request)
+        fields = self._invert(self.fields) if self.reverse else self.fields
+
+        queryset = queryset.order_by(*fields)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(fields, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        # Trang lùi luôn có trang tiếp theo (trang vừa rời khỏi)
+        if self.reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Danh sách field sắp xếp, kết thúc bằng `unique_field`.
+        """
+        ordering = None
+        if view is not None:
+            for backend in getattr(view, 'filter_backends', []):
+                if issubclass(backend, OrderingFilter):
+                    ordering = backend().get_ordering(request, queryset, view)
+                    break
+            ordering = ordering or getattr(view, 'ordering', None)
+        ordering = ordering or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        fields = [field for field in ordering if field.lstrip('-') not in ('?', 'pk')]
+        names = [field.lstrip('-') for field in fields]
+        if self.unique_field not in names:
+            # Tie-breaker cùng chiều với field đầu tiên
+            descending = bool(fields) and fields[0].startswith('-')
+            fields.append(f'-{self.unique_field}' if descending else self.unique_field)
+        else:
+            fields = fields[:names.index(self.unique_field) + 1]
+        return fields
+
+    @staticmethod
+    def _invert(fields):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in fields]
+
+    @staticmethod
+    def get_keyset_filter(fields, position):
+        """
+        Điều kiện lấy các rows đứng sau `position` theo `fields`.
+        """
+        conditions = []
+        for index, field in enumerate(fields):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                previous.lstrip('-'): position[offset]
+                for offset, previous in enumerate(fields[:index])
+            }
+            conditions.append(Q(**equal, **{f'{name}__{lookup}': position[index]}))
+        keyset = reduce(lambda left, right: left | right, conditions)
+
+        # Bound riêng trên field đầu tiên để database dùng được index range scan
+        first = fields[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': position[0]}) & keyset
+
+    def get_position(self, instance):
+        position = []
+        for field in self.fields:
+            name = field.lstrip('-')
+            if isinstance(instance, dict) and name in instance:
+                # Row `.values()`: lookup là key
+                position.append(instance[name])
+                continue
+            value = instance
+            for attr in name.split('__'):
+                value = value.get(attr) if isinstance(value, dict) else getattr(value, attr)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, position, reverse=False):
+        payload = json.dumps(
+            {'p': position, 'r': int(reverse)}, cls=_CursorEncoder, separators=(',', ':')
+        )
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Returns:
+            tuple: (position hoặc None, reverse)
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            position = payload['p']
+            if not isinstance(position, list) or len(position) != len(self.fields):
+                raise ValueError
+            return position, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
     def get_paginated_response(self, data):
         """
         Return a standardized paginated response.
         """
         return Response({
             'status': 'success',
-            'count': self.page.paginator.count,
-            'total_pages': self.page.paginator.num_pages,
+            'count': None,
+            'count_strategy': None,
+            'total_pages': None,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'results': data
         })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'status': {'type': 'string', 'example': 'success'},
+                'count': {'type': 'integer', 'nullable': True},
+                'count_strategy': {'type': 'string', 'nullable': True},
+                'total_pages': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor của trang, lấy từ link next/previous',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
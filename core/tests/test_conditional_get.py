@@ -0,0 +1,111 @@
+"""
+Tests cho conditional GET (ETag / Last-Modified) của StandardizedModelViewSet.
+"""
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from cart.viewsets import CartSelfViewSet
+from notifications.models import Notification
+from notifications.viewsets import NotificationViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='password'
+        )
+        self.product = Product.objects.create(
+            name='Laptop', description='x', price=Decimal('10'), seller=self.other, status='active'
+        )
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=self.cart, product=self.product, quantity=1)
+        self.notification_list = NotificationViewSet.as_view({'get': 'list'})
+        self.cart_view = CartSelfViewSet.as_view({'get': 'list'})
+
+    def get(self, view, path, user=None, etag=None, **kwargs):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        request = self.factory.get(path, **headers)
+        force_authenticate(request, user=user or self.user)
+        response = view(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_list_returns_304_without_serializing(self):
+        Notification.objects.create(user=self.user, message='Hello')
+        response = self.get(self.notification_list, '/api/v1/notifications/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        with mock.patch.object(NotificationViewSet, 'get_serializer') as get_serializer, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.get(self.notification_list, '/api/v1/notifications/', etag=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        get_serializer.assert_not_called()
+        # Chỉ một query aggregate, không COUNT/SELECT trang
+        self.assertEqual(len([q for q in queries if 'notification' in q['sql'].lower()]), 1)
+
+    def test_list_validators_change_with_data(self):
+        first = Notification.objects.create(user=self.user, message='Hello')
+        etag = self.get(self.notification_list, '/api/v1/notifications/')['ETag']
+
+        Notification.objects.create(user=self.user, message='Second')
+        self.assertEqual(self.get(self.notification_list, '/api/v1/notifications/', etag=etag).status_code, 200)
+
+        etag = self.get(self.notification_list, '/api/v1/notifications/')['ETag']
+        first.delete()
+        self.assertEqual(self.get(self.notification_list, '/api/v1/notifications/', etag=etag).status_code, 200)
+
+    def test_list_validators_change_when_notification_is_edited(self):
+        notification = Notification.objects.create(user=self.user, message='Hello')
+        etag = self.get(self.notification_list, '/api/v1/notifications/')['ETag']
+
+        notification.message = 'Edited'
+        notification.save()
+        self.assertEqual(self.get(self.notification_list, '/api/v1/notifications/', etag=etag).status_code, 200)
+
+    def test_etag_differs_per_user(self):
+        Notification.objects.create(user=self.user, message='Hello')
+        Notification.objects.create(user=self.other, message='Hello')
+        mine = self.get(self.notification_list, '/api/v1/notifications/')['ETag']
+        response = self.get(self.notification_list, '/api/v1/notifications/', user=self.other, etag=mine)
+        self.assertEqual(response.status_code, 200)
+
+    def test_cart_validators_follow_items_and_products(self):
+        etag = self.get(self.cart_view, '/api/v1/cart/me/')['ETag']
+        self.assertEqual(self.get(self.cart_view, '/api/v1/cart/me/', etag=etag).status_code, 304)
+
+        self.product.price = Decimal('12')
+        self.product.save()
+        response = self.get(self.cart_view, '/api/v1/cart/me/', etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_retrieve_uses_instance_timestamp(self):
+        notification = Notification.objects.create(user=self.user, message='Hello')
+        view = NotificationViewSet.as_view({'get': 'retrieve'})
+        path = f'/api/v1/notifications/{notification.pk}/'
+        etag = self.get(view, path, pk=notification.pk)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(view, path, etag=etag, pk=notification.pk)
+        self.assertEqual(response.status_code, 304)
+        # Chỉ query lấy object (get_object vẫn kiểm tra quyền truy cập)
+        self.assertEqual(len(queries), 1)
@@ -0,0 +1,105 @@
+"""
+Tests cho decorator idempotent (header Idempotency-Key).
+"""
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from orders.models import Order
+from orders.viewsets import OrderSelfViewSet
+from payments.models import Payment
+from payments.viewsets import PaymentViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.path.join(tempfile.gettempdir(), 'test_idempotency_keys'),
+}})
+class IdempotencyKeyTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        product = Product.objects.create(
+            name='Laptop', description='x', price=Decimal('10.00'), seller=seller, status='active', stock=10
+        )
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=product, quantity=1)
+        self.create_order = OrderSelfViewSet.as_view({'post': 'create'})
+
+    def post(self, view, path, data, key=None, user=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        request = self.factory.post(path, data, format='json', **headers)
+        force_authenticate(request, user=user or self.user)
+        response = view(request)
+        response.render()
+        return response
+
+    def test_replay_returns_stored_response_without_running_view(self):
+        first = self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc')
+        self.assertEqual(first.status_code, 201)
+
+        with self.assertNumQueries(0):
+            replay = self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc')
+
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_process_local_cache_is_rejected(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(ImproperlyConfigured):
+                self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc')
+            # Request không có key không cần cache
+            response = self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'})
+        self.assertEqual(response.status_code, 201)
+
+    def test_same_key_with_different_body(self):
+        self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc')
+        response = self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hue'}, key='abc')
+        self.assertEqual(response.status_code, 422)
+
+    def test_keys_are_scoped_per_user(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='password')
+        self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc')
+        response = self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc', user=other)
+        # User khác có giỏ hàng trống: view được chạy
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+
+    def test_in_flight_request_returns_conflict(self):
+        with mock.patch('core.decorators.api.cache') as mocked_cache:
+            mocked_cache.get.return_value = None
+            # Khóa đang được request đầu tiên giữ
+            mocked_cache.add.return_value = False
+            response = self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'}, key='abc')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Order.objects.exists())
+
+    def test_payment_checkout_replay(self):
+        self.post(self.create_order, '/api/v1/orders/me/', {'shipping_address': 'Hanoi'})
+        order = Order.objects.get()
+        checkout = PaymentViewSet.as_view({'post': 'checkout'})
+        for _ in range(2):
+            response = self.post(checkout, '/api/v1/payments/checkout', {'order_id': order.pk}, key='pay-1')
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(Payment.objects.count(), 1)
@@ -1,5 +1,9 @@
+import operator
+
+from django.db.models import Q
 from django.test import TestCase
 from django.http import HttpRequest
+from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -9,6 +13,9 @@ from rest_framework.pagination import PageNumberPagination
 from core.pagination.standard import StandardResultsSetPagination, CursorPagination
 
 
+LOOKUPS = {'': operator.eq, 'gt': operator.gt, 'gte': operator.ge, 'lt': operator.lt, 'lte': operator.le}
+
+
 class MockObject:
     """Mock object for testing pagination."""
     def __init__(self, id, name):
@@ -54,7 +61,7 @@ class TestStandardResultsSetPagination(TestCase):
         
     def test_default_page_size(self):
         """Test that default page size is applied correctly."""
-        request = self.factory.get('/')
+        request = Request(self.factory.get('/'))
         result = self.pagination.paginate_queryset(self.queryset, request)
         
         # Check that only the default page size (should be 20) items are returned
@@ -64,7 +71,7 @@ class TestStandardResultsSetPagination(TestCase):
     
     def test_custom_page_size(self):
         """Test that custom page_size parameter works."""
-        request = self.factory.get('/?page_size=10')
+        request = Request(self.factory.get('/?page_size=10'))
         result = self.pagination.paginate_queryset(self.queryset, request)
         
         # Check that only 10 items are returned
@@ -75,7 +82,7 @@ class TestStandardResultsSetPagination(TestCase):
     def test_max_page_size(self):
         """Test that page_size cannot exceed max_page_size."""
         # Request a page size larger than the max (which should be 100)
-        request = self.factory.get('/?page_size=200')
+        request = Request(self.factory.get('/?page_size=200'))
         result = self.pagination.paginate_queryset(self.queryset, request)
         
         # Should be capped at max_page_size (100)
@@ -84,7 +91,7 @@ class TestStandardResultsSetPagination(TestCase):
     
     def test_second_page(self):
         """Test pagination of second page."""
-        request = self.factory.get('/?page=2&page_size=10')
+        request = Request(self.factory.get('/?page=2&page_size=10'))
         result = self.pagination.paginate_queryset(self.queryset, request)
         
         # Should return the second page (items 11-20)
@@ -94,7 +101,7 @@ class TestStandardResultsSetPagination(TestCase):
     
     def test_get_paginated_response(self):
         """Test that get_paginated_response returns correct structure."""
-        request = self.factory.get('/?page=2&page_size=10')
+        request = Request(self.factory.get('/?page=2&page_size=10'))
         self.pagination.paginate_queryset(self.queryset, request)
         
         response = self.pagination.get_paginated_response([
@@ -135,38 +142,36 @@ class TestCursorPagination(TestCase):
             obj.created_at = i  # Simple ordering field
             self.objects.append(obj)
         
-        # Create mock queryset
-        self.queryset = MockQuerySet(self.objects)
-        
-        # Add support for cursor pagination to the mock queryset
-        def filter_func(**kwargs):
-            # Simple filter implementation for cursor pagination
-            if 'created_at__gt' in kwargs:
-                return MockQuerySet([obj for obj in self.objects if obj.created_at > kwargs['created_at__gt']])
-            if 'created_at__lt' in kwargs:
-                return MockQuerySet([obj for obj in self.objects if obj.created_at < kwargs['created_at__lt']])
-            return self.queryset
-            
-        self.queryset.filter = filter_func
-        
-        # Add order_by method
-        def order_by(*args):
-            # Simple order_by implementation
-            reverse = False
-            field = args[0]
-            if field.startswith('-'):
-                reverse = True
-                field = field[1:]
-            
-            # Sort the items
-            items = sorted(self.objects, key=lambda obj: getattr(obj, field), reverse=reverse)
-            return MockQuerySet(items)
-            
-        self.queryset.order_by = order_by
+        # Add support for keyset cursor pagination to the mock queryset
+        def matches(obj, condition):
+            if isinstance(condition, Q):
+                results = [matches(obj, child) for child in condition.children]
+                result = all(results) if condition.connector == Q.AND else any(results)
+                return not result if condition.negated else result
+            lookup, value = condition
+            field, _, comparison = lookup.partition('__')
+            return LOOKUPS[comparison](getattr(obj, field), value)
+
+        def keyset_queryset(items):
+            queryset = MockQuerySet(items)
+            queryset.filter = lambda condition: keyset_queryset(
+                [obj for obj in items if matches(obj, condition)]
+            )
+            queryset.order_by = lambda *fields: keyset_queryset(order_by(items, fields))
+            return queryset
+
+        def order_by(items, fields):
+            # Sort ổn định theo từng field, field cuối trước
+            items = list(items)
+            for field in reversed(fields):
+                items.sort(key=lambda obj: getattr(obj, field.lstrip('-')), reverse=field.startswith('-'))
+            return items
+
+        self.queryset = keyset_queryset(self.objects)
     
     def test_default_page_size(self):
         """Test that default page size is applied correctly."""
-        request = self.factory.get('/')
+        request = Request(self.factory.get('/'))
         result = self.pagination.paginate_queryset(self.queryset, request)
         
         # Check that only the default page size items are returned
@@ -175,23 +180,23 @@ class TestCursorPagination(TestCase):
     def test_next_page(self):
         """Test navigation to the next page using cursor."""
         # Get the first page
-        request = self.factory.get('/')
+        request = Request(self.factory.get('/'))
         self.pagination.paginate_queryset(self.queryset, request)
         response_data = self.pagination.get_paginated_response([]).data
         
         # Get the cursor for the next page
         next_url = response_data['next']
-        next_request = self.factory.get(next_url.split('?')[1])
+        next_request = Request(self.factory.get(next_url))
         
         # Get the second page
         result = self.pagination.paginate_queryset(self.queryset, next_request)
         
-        # Check that the second page starts after the first page
-        self.assertGreater(result[0].id, self.pagination.page_size)
+        # Check that the second page continues where the first page ended
+        self.assertEqual(result[0].id, len(self.objects) - self.pagination.page_size)
     
     def test_get_paginated_response_structure(self):
         """Test that get_paginated_response returns correct structure for cursor pagination."""
-        request = self.factory.get('/')
+        request = Request(self.factory.get('/'))
         self.pagination.paginate_queryset(self.queryset, request)
         
         response = self.pagination.get_paginated_response([
@@ -212,3 +217,143 @@ class TestCursorPagination(TestCase):
         
         # Check results
         self.assertEqual(len(response.data['results']), self.pagination.page_size)
+
+
+class TestCursorPaginationKeyset(TestCase):
+    """Test keyset pagination trên queryset thật."""
+    
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from django.utils import timezone
+        
+        User = get_user_model()
+        self.User = User
+        now = timezone.now()
+        # Từng cặp users có cùng date_joined để kiểm tra tie-breaker theo id
+        for i in range(25):
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@example.com', password='password'
+            )
+        for i, user in enumerate(User.objects.order_by('id')):
+            User.objects.filter(pk=user.pk).update(date_joined=now - timezone.timedelta(minutes=i // 2))
+        self.queryset = User.objects.all()
+        self.factory = APIRequestFactory()
+    
+    def paginate(self, url):
+        pagination = CursorPagination()
+        pagination.ordering = ('-date_joined',)
+        request = Request(self.factory.get(url))
+        page = pagination.paginate_queryset(self.queryset, request)
+        return [user.pk for user in page], pagination.get_paginated_response([]).data
+    
+    def test_walk_forward_and_backward(self):
+        """Test đi hết các trang theo next rồi quay lại theo previous."""
+        expected = list(self.queryset.order_by('-date_joined', '-id').values_list('pk', flat=True))
+        
+        pages = []
+        url = '/?page_size=10'
+        while url:
+            ids, data = self.paginate(url)
+            pages.append((ids, data))
+            url = data['next']
+        
+        self.assertEqual([pk for ids, _ in pages for pk in ids], expected)
+        self.assertEqual([len(ids) for ids, _ in pages], [10, 10, 5])
+        self.assertIsNone(pages[0][1]['previous'])
+        self.assertIsNone(pages[0][1]['count'])
+        
+        ids, data = self.paginate(pages[2][1]['previous'])
+        self.assertEqual(ids, pages[1][0])
+        ids, data = self.paginate(data['previous'])
+        self.assertEqual(ids, pages[0][0])
+        self.assertIsNone(data['previous'])
+    
+    def test_single_query_per_page(self):
+        """Test mỗi trang chỉ chạy một query, không COUNT."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        _, data = self.paginate('/?page_size=10')
+        with CaptureQueriesContext(connection) as queries:
+            self.paginate(data['next'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries.captured_queries[0]['sql'].upper())
+    
+    def test_invalid_cursor(self):
+        """Test cursor không hợp lệ trả về NotFound."""
+        from rest_framework.exceptions import NotFound
+        
+        with self.assertRaises(NotFound):
+            self.paginate('/?cursor=not-a-cursor')
+    
+    def test_benchmark_matches_page_number_pagination(self):
+        """Test benchmark trả về cùng rows với page-number pagination."""
+        from core.pagination.benchmark import run_pagination_benchmark
+        
+        results = run_pagination_benchmark(
+            self.queryset, pages=[1, 2, 3], page_size=10, ordering=['-date_joined'], repeat=1
+        )
+        self.assertEqual([result['rows'] for result in results], [10, 10, 5])
+
+
+class TestCountStrategies(TestCase):
+    """Test count strategies của page-number pagination."""
+    
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from django.core.cache import cache
+        
+        cache.clear()
+        User = get_user_model()
+        for i in range(15):
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@example.com', password='password'
+            )
+        self.queryset = User.objects.order_by('id')
+        self.factory = APIRequestFactory()
+    
+    def paginate(self, strategy, url='/?page_size=10'):
+        pagination = StandardResultsSetPagination()
+        pagination.count_strategy = strategy
+        pagination.paginate_queryset(self.queryset, Request(self.factory.get(url)))
+        return pagination.get_paginated_response([]).data
+    
+    def test_exact(self):
+        """Test exact count được báo cáo trong response."""
+        data = self.paginate('exact')
+        self.assertEqual(data['count'], 15)
+        self.assertEqual(data['count_strategy'], 'exact')
+        self.assertEqual(data['total_pages'], 2)
+    
+    def test_cached_count_reused_across_pages_and_ordering(self):
+        """Test cached count dùng lại cho cùng filters, khác trang hay ordering."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.assertEqual(self.paginate('cached')['count_strategy'], 'exact')
+        
+        self.queryset = self.queryset.order_by('-id')
+        with CaptureQueriesContext(connection) as queries:
+            data = self.paginate('cached', '/?page_size=10&page=2')
+        self.assertEqual((data['count'], data['count_strategy']), (15, 'cached'))
+        self.assertFalse(any('COUNT' in q['sql'].upper() for q in queries.captured_queries))
+        
+        # Filters khác dùng cache key khác
+        self.queryset = self.queryset.filter(username__startswith='user1')
+        data = self.paginate('cached')
+        self.assertEqual((data['count'], data['count_strategy']), (6, 'exact'))
+    
+    def test_estimated_falls_back_to_exact(self):
+        """Test estimated dùng exact khi database không có ước lượng hoặc kết quả nhỏ."""
+        data = self.paginate('estimated')
+        self.assertEqual((data['count'], data['count_strategy']), (15, 'exact'))
+    
+    def test_view_selects_strategy(self):
+        """Test view chọn strategy qua CountOptimizedPaginationMixin."""
+        from rest_framework.request import Request
+        from core.optimization.mixins import CountOptimizedPaginationMixin
+        
+        view = CountOptimizedPaginationMixin()
+        pagination = StandardResultsSetPagination()
+        pagination.paginate_queryset(self.queryset, Request(self.factory.get('/')), view)
+        self.assertEqual(pagination.page.paginator.count_strategy.name, 'estimated')
@@ -0,0 +1,166 @@
+"""
+Tests cho response cache của các read endpoints anonymous.
+"""
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalog.models import Brand, Category
+from catalog.viewsets import BrandViewSet
+from core.utils.response_cache import get_tag_versions, purge_cache_tags, response_cache_enabled
+from products.models import Product, ProductImage
+from products.viewsets import ProductPublicViewSet
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': os.path.join(tempfile.gettempdir(), 'test_response_cache'),
+}})
+class ResponseCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.category = Category.objects.create(name='Laptops')
+        self.product = self.create_product('Laptop A')
+        self.other = self.create_product('Laptop B')
+        self.product_list = ProductPublicViewSet.as_view({'get': 'list'})
+        self.product_detail = ProductPublicViewSet.as_view({'get': 'retrieve'})
+
+    def create_product(self, name):
+        return Product.objects.create(
+            name=name, description=name, price=Decimal('10'), seller=self.seller,
+            category=self.category, status='active'
+        )
+
+    def get(self, view, path='/api/v1/products/', params=None, user=None, headers=None, **kwargs):
+        request = self.factory.get(path, params or {}, **(headers or {}))
+        if user is not None:
+            force_authenticate(request, user=user)
+        response = view(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def get_detail(self, product, **kwargs):
+        return self.get(self.product_detail, f'/api/v1/products/{product.pk}/', pk=product.pk, **kwargs)
+
+    def test_anonymous_list_served_from_cache(self):
+        first = self.get(self.product_list)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get(self.product_list)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_key_normalizes_query_string(self):
+        self.get(self.product_list, params={'ordering': 'price', 'page_size': 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.get(self.product_list, '/api/v1/products/?page_size=1&ordering=price')
+        self.assertEqual(len(queries), 0)
+
+    def test_authenticated_requests_not_cached(self):
+        self.get(self.product_list, user=self.seller)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(self.product_list, user=self.seller)
+        self.assertGreater(len(queries), 0)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_save_purges_only_affected_tags(self):
+        """Test save product chỉ purge listings và chi tiết của chính product đó"""
+        self.get(self.product_list)
+        self.get_detail(self.product)
+        self.get_detail(self.other)
+
+        self.product.name = 'Laptop A2'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_detail(self.other)
+        self.assertEqual(len(queries), 0)
+
+        self.assertEqual(self.get_detail(self.product).data['data']['name'], 'Laptop A2')
+        names = [row['name'] for row in self.get(self.product_list).data['data']['results']]
+        self.assertIn('Laptop A2', names)
+
+    def test_related_changes_purge_product_responses(self):
+        self.get_detail(self.product)
+        self.category.name = 'Notebooks'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        self.assertEqual(self.get_detail(self.product).data['data']['category_name'], 'Notebooks')
+
+        self.get_detail(self.product)
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductImage.objects.create(product=self.product, image='products/a.jpg', is_primary=True)
+        self.assertEqual(len(self.get_detail(self.product).data['data']['images']), 1)
+
+    def test_conditional_requests_return_304(self):
+        response = self.get(self.product_list)
+        etag = response['ETag']
+
+        not_modified = self.get(self.product_list, headers={'HTTP_IF_NONE_MATCH': etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], etag)
+
+        since = self.get(self.product_list, headers={'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']})
+        self.assertEqual(since.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_product('Laptop C')
+        self.assertEqual(self.get(self.product_list, headers={'HTTP_IF_NONE_MATCH': etag}).status_code, 200)
+
+    def test_cached_detail_still_tracks_views(self):
+        self.get_detail(self.product)
+        with mock.patch('products.viewsets.record_product_view') as record:
+            self.get_detail(self.product)
+        self.assertEqual(record.call_args[0][1].pk, self.product.pk)
+
+    def test_catalog_endpoints_cached(self):
+        brand_list = BrandViewSet.as_view({'get': 'list'})
+        Brand.objects.create(name='Acme')
+        self.get(brand_list, '/api/v1/brands/')
+        with CaptureQueriesContext(connection) as queries:
+            self.get(brand_list, '/api/v1/brands/')
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Brand.objects.create(name='Globex')
+        self.assertEqual(len(self.get(brand_list, '/api/v1/brands/').data['data']['results']), 2)
+
+    def test_purge_waits_for_commit(self):
+        before = get_tag_versions(['product'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            purge_cache_tags('product')
+            self.assertEqual(get_tag_versions(['product']), before)
+
+        callbacks[0]()
+        self.assertNotEqual(get_tag_versions(['product']), before)
+
+
+class ResponseCacheSettingTest(TestCase):
+
+    def test_process_local_cache_disables_by_default(self):
+        self.assertFalse(response_cache_enabled())
+
+    def test_process_local_cache_rejected_when_enabled(self):
+        with override_settings(RESPONSE_CACHE_ENABLED=True):
+            with self.assertRaises(ImproperlyConfigured):
+                response_cache_enabled()
@@ -0,0 +1,94 @@
+"""
+Tests cho slug allocation utilities.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Brand, Category
+from core.utils.slugs import allocate_slug, next_free_slug
+from pages.models import Page
+from products.models import Product
+
+
+class NextFreeSlugTest(TestCase):
+
+    def test_next_free_slug(self):
+        """Test dùng base nếu chưa có, ngược lại suffix lớn nhất + 1"""
+        self.assertEqual(next_free_slug('shirt', set()), 'shirt')
+        taken = {'shirt', 'shirt-1', 'shirt-7', 'shirt-blue', 'shirt-blue-2'}
+        self.assertEqual(next_free_slug('shirt', taken), 'shirt-8')
+        self.assertEqual(next_free_slug('shirt', taken), 'shirt-9')
+        self.assertEqual(next_free_slug('shirt-blue', taken), 'shirt-blue-3')
+
+
+class UniqueSlugMixinTest(TestCase):
+
+    def setUp(self):
+        self.seller = get_user_model().objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+
+    def create_product(self, name):
+        return Product.objects.create(name=name, description='x', price=1, seller=self.seller)
+
+    def test_product_slug_uses_one_query(self):
+        """Test số query tìm slug không tăng theo số slugs trùng"""
+        for _ in range(5):
+            self.create_product('T-Shirt')
+        Product.objects.create(
+            name='Blue', slug='t-shirt-blue', description='x', price=1, seller=self.seller
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            product = self.create_product('T-Shirt')
+
+        self.assertEqual(product.slug, 't-shirt-5')
+        slug_queries = [q for q in queries if '^t-shirt' in q['sql']]
+        self.assertEqual(len(slug_queries), 1)
+
+    def test_catalog_and_page_models(self):
+        Category.objects.create(name='Shoes')
+        Brand.objects.create(name='Acme')
+        self.assertEqual(Category.objects.create(name='Shoes').slug, 'shoes-1')
+        self.assertEqual(Brand.objects.create(name='Acme').slug, 'acme-1')
+        self.assertEqual(Page.objects.create(title='About Us', content_html='x').slug, 'about-us')
+
+    def test_explicit_slug_is_kept(self):
+        self.assertEqual(Brand.objects.create(name='Acme', slug='custom').slug, 'custom')
+
+    def test_slug_truncated_to_max_length(self):
+        name = 'a' * 130
+        first = Category.objects.create(name=name[:100])
+        second = Category.objects.create(name=name[:100])
+        self.assertEqual(first.slug, 'a' * 100)
+        self.assertEqual(second.slug, 'a' * 100 + '-1')
+
+        max_length = Product._meta.get_field('slug').max_length
+        Product.objects.create(
+            name='x', slug='b' * max_length, description='x', price=1, seller=self.seller
+        )
+        # Base bị cắt để thêm suffix; base ngắn hơn chưa được dùng
+        self.assertEqual(allocate_slug(Product, 'b' * (max_length + 10)), 'b' * (max_length - 2))
+
+    def test_retries_when_slug_taken_concurrently(self):
+        """Test slug được cấp lại khi request khác vừa lấy cùng slug"""
+        Brand.objects.create(name='Acme')
+        stale = iter(['acme', 'acme'])
+
+        def allocate(model, value, field='slug', exclude_pk=None):
+            # Lần đầu trả về slug đã bị lấy, như khi hai requests chạy đồng thời
+            return next(stale, None) or allocate_slug(model, value, field, exclude_pk)
+
+        with mock.patch('core.utils.slugs.allocate_slug', side_effect=allocate):
+            brand = Brand.objects.create(name='Acme')
+
+        self.assertEqual(brand.slug, 'acme-1')
+
+    def test_other_integrity_errors_are_raised(self):
+        Category.objects.create(name='Shoes')
+        with self.assertRaises(IntegrityError):
+            Category.objects.create(name='Boots', pk=Category.objects.get().pk)
@@ -0,0 +1,135 @@
+"""
+Tests cho values fast path của các list actions (ValuesSerializerMixin).
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.utils.values_serializer import ValuesPlanError, ValuesSerializer, compile_values_plan
+from inventory.models import StockItem, Warehouse
+from inventory.viewsets import StockItemViewSet
+from orders.models import Order, OrderItem
+from orders.serializers import OrderSummarySerializer
+from orders.viewsets import OrderViewSet
+from products.models import Product
+from reports.models import ProductReport, TrafficLog
+from reports.viewsets import ProductReportViewSet, TrafficLogViewSet
+
+User = get_user_model()
+
+
+class ValuesSerializerTest(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='password'
+        )
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.products = [
+            Product.objects.create(
+                name=f'Product {index}', description='x', price=Decimal('10.50') + index,
+                seller=self.seller, status='active', stock=index
+            )
+            for index in range(3)
+        ]
+
+    def get(self, viewset, path='/'):
+        request = self.factory.get(path)
+        force_authenticate(request, user=self.admin)
+        response = viewset.as_view({'get': 'list'})(request)
+        response.render()
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def assert_same_output(self, viewset, path='/'):
+        """Fast path trả về đúng data của serializer thông thường."""
+        fast = self.get(viewset, path)
+        with override_settings(VALUES_SERIALIZER_ENABLED=False):
+            regular = self.get(viewset, path)
+        self.assertEqual(fast, regular)
+        return fast
+
+    def test_traffic_logs(self):
+        for index in range(3):
+            TrafficLog.objects.create(
+                endpoint=f'/api/v1/products/{index}/', method='GET',
+                ip_address='10.0.0.1', user_agent='test', duration_ms=index * 100
+            )
+        data = self.assert_same_output(TrafficLogViewSet, '/?ordering=duration_ms')
+        self.assertEqual(len(data['data']['results']), 3)
+
+    def test_stock_items_with_nested_and_property_fields(self):
+        warehouse = Warehouse.objects.create(name='Main', location='HN')
+        for product in self.products:
+            StockItem.objects.get_or_create(
+                product=product, warehouse=warehouse,
+                defaults={'quantity': product.stock, 'low_stock_threshold': 1}
+            )
+        data = self.assert_same_output(StockItemViewSet)
+        item = data['data']['results'][0]
+        self.assertEqual(item['warehouse']['name'], 'Main')
+        self.assertIn('stock_status', item)
+
+    def test_orders_with_cursor_pagination_and_annotation(self):
+        for index in range(3):
+            order = Order.objects.create(user=self.seller, total_amount=Decimal('20.00') + index)
+            for product in self.products[:index + 1]:
+                OrderItem.objects.create(order=order, product=product, quantity=1, price=product.price)
+
+        data = self.assert_same_output(OrderViewSet, '/?page_size=2')
+        self.assertEqual([order['items_count'] for order in data['data']['results']], [3, 2])
+
+        # Trang tiếp theo theo cursor của row `.values()`
+        next_link = data['data']['next']
+        page = self.assert_same_output(OrderViewSet, next_link.replace('http://testserver', ''))
+        self.assertEqual([order['items_count'] for order in page['data']['results']], [1])
+
+    def test_product_reports_serialize_nested_products_in_batch(self):
+        for product in self.products:
+            ProductReport.objects.create(product=product, sold_quantity=product.stock)
+        data = self.assert_same_output(ProductReportViewSet)
+        self.assertEqual(data['data']['results'][0]['product']['name'], 'Product 2')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get(ProductReportViewSet)
+        # Products của cả trang được load bằng một query
+        product_queries = [q for q in queries if 'FROM "products_product"' in q['sql']]
+        self.assertEqual(len(product_queries), 1)
+
+    def test_plan_is_compiled_once_per_class(self):
+        plan = compile_values_plan(OrderSummarySerializer)
+        self.assertIs(compile_values_plan(OrderSummarySerializer), plan)
+        self.assertIn('user__email', plan.lookups)
+
+    def test_unsupported_method_field(self):
+        class UnsupportedSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = TrafficLog
+                fields = ['id', 'label']
+
+            def get_label(self, obj):
+                return obj.endpoint
+
+        with self.assertRaises(ValuesPlanError):
+            ValuesSerializer(UnsupportedSerializer)
+
+    def test_benchmark_checks_output(self):
+        from core.utils.values_benchmark import run_values_serializer_benchmark
+
+        for index in range(5):
+            Order.objects.create(user=self.seller, total_amount=Decimal('20.00') + index)
+        results = run_values_serializer_benchmark(
+            Order.objects.order_by('-created_at', '-id'), OrderSummarySerializer,
+            page_sizes=[2, 10], select_related=['user'], repeat=1
+        )
+        self.assertEqual([result['rows'] for result in results], [2, 5])
@@ -0,0 +1,36 @@
+"""
+Cache Utilities.
+
+Các tính năng lưu trạng thái dùng chung giữa các requests trong Django
+cache (view buffer, giỏ hàng anonymous, idempotency keys, response cache)
+chỉ đúng khi cache được chia sẻ giữa các processes (Redis, Memcached,
+database, file). `LocMemCache` (mặc định khi không cấu hình `CACHES`) và
+`DummyCache` chỉ tồn tại trong một process.
+"""
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.exceptions import ImproperlyConfigured
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS):
+    """Cache `alias` có được chia sẻ giữa các processes không."""
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    return backend not in PROCESS_LOCAL_CACHES
+
+
+def require_shared_cache(feature, alias=DEFAULT_CACHE_ALIAS):
+    """
+    Raises:
+        ImproperlyConfigured: Cache `alias` chỉ tồn tại trong process
+    """
+    if not is_shared_cache(alias):
+        raise ImproperlyConfigured(
+            f"{feature} requires a cache shared between processes "
+            f"(CACHES['{alias}'] is process-local)"
+        )
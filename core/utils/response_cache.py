@@ -0,0 +1,157 @@
+"""
+HTTP Response Cache Utilities.
+
+Module này lưu responses của các read actions (anonymous) vào Django cache
+và invalidate chúng theo cache tags.
+
+- Cache key gồm host, path, query string đã chuẩn hóa (sắp xếp theo tên
+  param) và ngôn ngữ hiện tại.
+- Mỗi tag (`product`, `product:123`, `category:5`...) có một version trong
+  cache. Entry lưu version của các tags tại thời điểm lưu và chỉ hợp lệ
+  khi tất cả versions vẫn khớp.
+- `purge_cache_tags` đổi version của tags nên mọi entry gắn tag đó hết hạn
+  ngay mà không cần biết các cache keys cụ thể; trong transaction, purge
+  chạy sau khi commit.
+- Tag versions phải được mọi process thấy nên response cache chỉ bật
+  mặc định khi cache được chia sẻ giữa processes (`RESPONSE_CACHE_ENABLED`).
+
+Quy ước tags:
+    `<model_name>` cho listings của model, `<model_name>:<pk>` cho một object.
+"""
+
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import translation
+
+from core.utils.cache import is_shared_cache, require_shared_cache
+
+CACHE_KEY_PREFIX = 'response_cache'
+
+DEFAULT_TIMEOUT = 300
+
+
+def response_cache_enabled():
+    """
+    Setting `RESPONSE_CACHE_ENABLED`, mặc định bật khi cache được chia sẻ
+    giữa các processes.
+
+    Raises:
+        ImproperlyConfigured: Bật trên cache chỉ tồn tại trong process (purge
+            ở một worker không invalidate responses của worker khác)
+    """
+    enabled = getattr(settings, 'RESPONSE_CACHE_ENABLED', None)
+    if enabled is None:
+        return is_shared_cache()
+    if enabled:
+        require_shared_cache('RESPONSE_CACHE_ENABLED')
+    return enabled
+
+
+def get_response_cache_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def model_cache_tag(model):
+    """Tag cho listings của model, ví dụ `product`."""
+    return model._meta.model_name
+
+
+def instance_cache_tag(instance):
+    """Tag cho một object, ví dụ `product:123`."""
+    return f'{instance._meta.model_name}:{instance.pk}'
+
+
+def build_response_cache_key(request):
+    """
+    Cache key cho request: host, path, query string đã chuẩn hóa và ngôn ngữ.
+    """
+    query = sorted(
+        (key, values) for key, values in request.query_params.lists()
+    )
+    signature = json.dumps(
+        [request.get_host(), request.path, query, translation.get_language()],
+        separators=(',', ':')
+    )
+    return f'{CACHE_KEY_PREFIX}:{hashlib.sha1(signature.encode("utf-8")).hexdigest()}'
+
+
+def _tag_key(tag):
+    return f'{CACHE_KEY_PREFIX}:tag:{tag}'
+
+
+def get_tag_versions(tags):
+    """
+    Version hiện tại của các tags, khởi tạo version mới cho tags chưa có.
+
+    Returns:
+        dict: {tag: version}
+    """
+    keys = {_tag_key(tag): tag for tag in tags}
+    stored = cache.get_many(keys)
+    versions = {keys[key]: version for key, version in stored.items()}
+    for key, tag in keys.items():
+        if key not in stored:
+            # add() để không ghi đè version vừa được request khác tạo
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[tag] = cache.get(key)
+    return versions
+
+
+def purge_cache_tags(*tags):
+    """
+    Invalidate tất cả cached responses gắn một trong các tags.
+
+    Trong transaction, versions được đổi sau khi commit: đổi trước commit thì
+    request đồng thời có thể cache lại dữ liệu cũ với version mới.
+    """
+    if tags:
+        transaction.on_commit(
+            lambda: cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+        )
+
+
+def purge_instance_cache_tags(instance):
+    """Invalidate listings của model và responses gắn object này."""
+    purge_cache_tags(model_cache_tag(type(instance)), instance_cache_tag(instance))
+
+
+def get_cached_response(key):
+    """
+    Entry còn hợp lệ cho cache key, None nếu không có hoặc đã bị purge.
+
+    Returns:
+        dict hoặc None: {'data', 'status', 'etag', 'last_modified', 'tags'}
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if get_tag_versions(entry['tags']) != entry['tags']:
+        return None
+    return entry
+
+
+def store_response(key, data, status_code, tags, timeout=None):
+    """
+    Lưu response data kèm validators (ETag từ nội dung, Last-Modified là
+    thời điểm lưu: mọi thay đổi sau đó đều purge entry).
+
+    Returns:
+        dict: Entry đã lưu
+    """
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    entry = {
+        'data': data,
+        'status': status_code,
+        'etag': '"%s"' % hashlib.sha1(content.encode('utf-8')).hexdigest(),
+        'last_modified': int(time.time()),
+        'tags': get_tag_versions(tags),
+    }
+    cache.set(key, entry, get_response_cache_timeout() if timeout is None else timeout)
+    return entry
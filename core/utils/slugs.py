@@ -0,0 +1,132 @@
+"""
+Slug Allocation Utilities.
+
+Module này cấp slug duy nhất cho các models tự sinh slug khi save
+(Product, Category, Brand, Tag, Attribute, Page).
+
+Thay vì thử lần lượt `base`, `base-1`, `base-2`... với một query `exists()`
+cho mỗi lần thử, allocator lấy tất cả slugs dạng `base` hoặc `base-<số>`
+bằng một query và dùng suffix lớn nhất + 1. Hai requests đồng thời vẫn có
+thể nhận cùng slug; khi đó unique index báo `IntegrityError` và
+`UniqueSlugMixin` tính lại slug rồi save lại.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Số lần save lại khi slug vừa cấp bị request khác lấy mất
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def _slug_pattern_q(field, bases):
+    """Q khớp `base` hoặc `base-<số>` cho mỗi base (slugs chỉ gồm [-a-zA-Z0-9_])."""
+    condition = Q()
+    for base in bases:
+        condition |= Q(**{f'{field}__regex': rf'^{base}(-[0-9]+)?$'})
+    return condition
+
+
+def load_taken_slugs(queryset, bases, field='slug'):
+    """
+    Một query lấy các slugs đã dùng có thể xung đột với các base slugs.
+
+    Args:
+        queryset: Queryset của model chứa slug (có thể đã exclude instance hiện tại)
+        bases (iterable): Các base slugs
+        field (str): Tên slug field
+
+    Returns:
+        set: Các slugs dạng `base` hoặc `base-<số>` đã tồn tại
+    """
+    bases = {base for base in bases if base}
+    if not bases:
+        return set()
+    return set(queryset.filter(_slug_pattern_q(field, bases)).values_list(field, flat=True))
+
+
+def next_free_slug(base, taken):
+    """
+    Slug tiếp theo cho `base` dựa trên các slugs đã dùng.
+
+    Trả về `base` nếu chưa dùng, ngược lại `base-<suffix lớn nhất + 1>`.
+    `taken` được cập nhật với slug vừa cấp để dùng cho nhiều lần cấp liên tiếp.
+    """
+    if base not in taken:
+        slug = base
+    else:
+        prefix = f'{base}-'
+        suffix = max(
+            (int(value[len(prefix):]) for value in taken
+             if value.startswith(prefix) and value[len(prefix):].isdigit()),
+            default=0
+        )
+        slug = f'{prefix}{suffix + 1}'
+    taken.add(slug)
+    return slug
+
+
+def allocate_slug(model, value, field='slug', exclude_pk=None):
+    """
+    Cấp slug duy nhất cho `value` bằng một query (thêm một query mỗi lần
+    phải cắt ngắn base để vừa `max_length`).
+
+    Args:
+        model: Model class chứa slug field
+        value (str): Giá trị nguồn (name, title...)
+        field (str): Tên slug field
+        exclude_pk: Primary key của instance đang save (không tính slug của chính nó)
+
+    Returns:
+        str: Slug chưa được sử dụng
+    """
+    max_length = model._meta.get_field(field).max_length
+    base = (slugify(value) or model._meta.model_name)[:max_length].strip('-')
+
+    queryset = model._default_manager.all()
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    while True:
+        slug = next_free_slug(base, load_taken_slugs(queryset, [base], field))
+        if len(slug) <= max_length:
+            return slug
+        # Cắt base để suffix vừa max_length; base ngắn hơn có thể có slugs khác
+        base = base[:max_length - (len(slug) - len(base))].strip('-')
+
+
+class UniqueSlugMixin:
+    """
+    Mixin cho models tự sinh slug khi save.
+
+    Nếu slug trống, slug được cấp từ `slug_source_field` bằng `allocate_slug`.
+    Save chạy trong savepoint; nếu request khác vừa lấy slug đó, slug được
+    cấp lại và save được thử lại tối đa `SLUG_SAVE_ATTEMPTS` lần.
+
+    Example:
+        ```python
+        class Brand(UniqueSlugMixin, models.Model):
+            slug_source_field = 'name'
+        ```
+    """
+    slug_field = 'slug'
+    slug_source_field = 'name'
+
+    def save(self, *args, **kwargs):
+        if getattr(self, self.slug_field):
+            return super().save(*args, **kwargs)
+
+        model = type(self)
+        source = getattr(self, self.slug_source_field)
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            slug = allocate_slug(model, source, self.slug_field, exclude_pk=self.pk)
+            setattr(self, self.slug_field, slug)
+            try:
+                with transaction.atomic(using=kwargs.get('using')):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = model._default_manager.filter(
+                    **{self.slug_field: slug}
+                ).exclude(pk=self.pk).exists()
+                if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
@@ -0,0 +1,64 @@
+"""
+Benchmark values fast path so với serializer thông thường.
+
+Mỗi lần đo gồm cả query và serialize một trang: đường thông thường tạo
+model instances (kèm `select_related` của các relations trong plan) rồi chạy
+`serializer_class(objects, many=True).data`; fast path đọc `.values()` và
+dựng dicts bằng `ValuesSerializer`.
+"""
+import statistics
+import time
+
+from .values_serializer import ValuesSerializer
+
+DEFAULT_PAGE_SIZES = (20, 100, 500)
+
+
+def _median_ms(callback, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callback()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_values_serializer_benchmark(queryset, serializer_class, page_sizes=DEFAULT_PAGE_SIZES,
+                                    select_related=(), context=None, repeat=5):
+    """
+    Đo latency của từng kích thước trang với hai đường serialize.
+
+    Args:
+        queryset: Queryset đã sắp xếp
+        serializer_class: Serializer class của list action
+        page_sizes (iterable): Số rows mỗi trang cần đo
+        select_related (iterable): Relations cho đường thông thường
+        context (dict, optional): Context của serializer
+        repeat (int): Số lần chạy mỗi kích thước, lấy median
+
+    Returns:
+        list: Các dict {'rows', 'serializer_ms', 'values_ms'}
+    """
+    context = context or {}
+    instances = queryset.select_related(*select_related) if select_related else queryset
+    results = []
+
+    for page_size in page_sizes:
+        def serializer_page():
+            return serializer_class(list(instances[:page_size]), many=True, context=context).data
+
+        def values_page():
+            values_serializer = ValuesSerializer(serializer_class, context=context)
+            return values_serializer.serialize(values_serializer.get_queryset(queryset)[:page_size])
+
+        expected = serializer_page()
+        if values_page() != expected:
+            raise ValueError(f'{serializer_class.__name__} output differs for {page_size} rows')
+
+        results.append({
+            'rows': len(expected),
+            'serializer_ms': _median_ms(serializer_page, repeat),
+            'values_ms': _median_ms(values_page, repeat),
+        })
+
+    return results
@@ -0,0 +1,323 @@
+"""
+Values Serializer Fast Path.
+
+Dựng output của một serializer trực tiếp từ rows `.values()` cho các list
+endpoints chỉ đọc: không tạo model instances và không đi qua
+`Serializer.to_representation` cho từng object.
+
+Plan được compile một lần cho mỗi serializer class:
+
+- Model field (kể cả `source` qua ForeignKey như `user.email`): một lookup
+  (`user__email`) và `to_representation` của chính field đó, nên định dạng
+  Decimal/datetime giữ nguyên
+- `PrimaryKeyRelatedField`: cột khóa ngoại
+- Nested serializer qua ForeignKey: compile đệ quy với prefix `<fk>__`. Nếu
+  nested serializer không compile được (method fields cần request,
+  prefetch...), các objects liên quan được load bằng một query cho cả trang
+  và serialize theo lô bằng chính nested serializer đó
+  (`setup_eager_loading(queryset)` của nested serializer được dùng nếu có)
+- Method field / property: khai báo các columns cần trong
+  `Meta.values_source_fields`; method/property được gọi với một object nhẹ
+  chỉ chứa các columns đó
+- `Meta.values_annotations`: field đọc từ annotation (ví dụ `Count`)
+
+Serializer có field không thuộc các trường hợp trên không dùng được fast
+path (`ValuesPlanError`), view quay lại đường serializer thông thường.
+
+Example:
+    ```python
+    class OrderSummarySerializer(serializers.ModelSerializer):
+        class Meta:
+            model = Order
+            fields = ['id', 'user_email', 'status', 'status_display', 'items_count']
+            values_source_fields = {'status_display': ('status',)}
+            values_annotations = {'items_count': Count('items')}
+    ```
+"""
+import logging
+from collections import namedtuple
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+logger = logging.getLogger(__name__)
+
+# Các loại field trong plan
+COLUMN, PRIMARY_KEY, ANNOTATION, SOURCE, NESTED, BATCH = range(6)
+
+FieldPlan = namedtuple('FieldPlan', ['name', 'kind', 'lookup', 'convert', 'extra'])
+
+ValuesPlan = namedtuple('ValuesPlan', ['fields', 'lookups', 'annotations'])
+
+_plans = {}
+
+
+class ValuesPlanError(ValueError):
+    """Serializer có field không biểu diễn được bằng `.values()`."""
+
+
+def _identity(value):
+    return value
+
+
+def _resolve_lookup(model, attrs):
+    """
+    Lookup cho source attrs đi qua các ForeignKey/OneToOne.
+
+    Returns:
+        tuple: (lookup, lookups của các relations nullable trên đường đi)
+    """
+    nullable = []
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.pk if attr == 'pk' else model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise ValuesPlanError(f"{model.__name__}.{attr} không phải model field")
+        if not model_field.concrete:
+            raise ValuesPlanError(f"{model.__name__}.{attr} không phải cột")
+
+        if index == len(attrs) - 1:
+            if model_field.is_relation:
+                raise ValuesPlanError(f"{model.__name__}.{attr} là relation")
+        else:
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise ValuesPlanError(f"{model.__name__}.{attr} không phải ForeignKey")
+            if model_field.null:
+                nullable.append('__'.join(attrs[:index + 1]))
+            model = model_field.related_model
+
+    return '__'.join(model_field.name if attr == 'pk' else attr for attr in attrs), nullable
+
+
+def _resolve_relation(model, attrs):
+    """ForeignKey/OneToOne của source attrs (giá trị trong `.values()` là pk)."""
+    if len(attrs) != 1:
+        raise ValuesPlanError('Relation field phải có source là một ForeignKey')
+    try:
+        model_field = model._meta.get_field(attrs[0])
+    except FieldDoesNotExist:
+        raise ValuesPlanError(f"{model.__name__}.{attrs[0]} không phải model field")
+    if not model_field.concrete or not (model_field.many_to_one or model_field.one_to_one):
+        raise ValuesPlanError(f"{model.__name__}.{attrs[0]} không phải ForeignKey")
+    return model_field
+
+
+def _compile_fields(serializer, model, prefix='', path=()):
+    meta = getattr(serializer, 'Meta', None)
+    annotations = getattr(meta, 'values_annotations', {})
+    source_fields = getattr(meta, 'values_source_fields', {})
+
+    plan, lookups, plan_annotations = [], [], {}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if name in annotations:
+            if prefix:
+                raise ValuesPlanError('values_annotations chỉ hỗ trợ serializer gốc')
+            plan_annotations[name] = annotations[name]
+            convert = _identity if isinstance(field, (serializers.SerializerMethodField, serializers.ReadOnlyField)) \
+                else field.to_representation
+            plan.append(FieldPlan(name, ANNOTATION, name, convert, None))
+
+        elif name in source_fields:
+            attrs = source_fields[name]
+            attr_lookups = [prefix + _resolve_lookup(model, [attr])[0] for attr in attrs]
+            lookups.extend(attr_lookups)
+            if isinstance(field, serializers.SerializerMethodField):
+                getter = (path, field.method_name)
+                convert = _identity
+            else:
+                prop = getattr(model, field.source, None)
+                if not isinstance(prop, property):
+                    raise ValuesPlanError(f"{model.__name__}.{field.source} không phải property")
+                getter = prop.fget
+                convert = field.to_representation
+            plan.append(FieldPlan(name, SOURCE, None, convert, (tuple(zip(attrs, attr_lookups)), getter)))
+
+        elif isinstance(field, serializers.SerializerMethodField):
+            raise ValuesPlanError(f"Method field '{name}' chưa khai báo values_source_fields")
+
+        elif isinstance(field, serializers.BaseSerializer):
+            plan.append(_compile_nested(name, field, model, prefix, path, lookups))
+
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            lookup = _resolve_relation(model, field.source_attrs).name
+            lookups.append(prefix + lookup)
+            convert = field.pk_field.to_representation if field.pk_field is not None else _identity
+            plan.append(FieldPlan(name, PRIMARY_KEY, prefix + lookup, convert, None))
+
+        elif isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField)) or field.source == '*':
+            raise ValuesPlanError(f"Field '{name}' không hỗ trợ")
+
+        else:
+            lookup, nullable = _resolve_lookup(model, field.source_attrs)
+            lookups.append(prefix + lookup)
+            lookups.extend(prefix + relation for relation in nullable)
+            plan.append(FieldPlan(
+                name, COLUMN, prefix + lookup, field.to_representation,
+                (tuple(prefix + relation for relation in nullable), field)
+            ))
+
+    return plan, lookups, plan_annotations
+
+
+def _compile_nested(name, field, model, prefix, path, lookups):
+    if isinstance(field, serializers.ListSerializer):
+        raise ValuesPlanError(f"Nested field '{name}' many=True không hỗ trợ")
+    model_field = _resolve_relation(model, field.source_attrs)
+
+    fk_lookup = prefix + model_field.name
+    lookups.append(fk_lookup)
+    try:
+        nested, nested_lookups, _ = _compile_fields(
+            field, model_field.related_model, prefix=f'{fk_lookup}__', path=(*path, name)
+        )
+    except ValuesPlanError as exc:
+        if prefix:
+            raise
+        logger.debug('Nested field %s serialized in batch: %s', name, exc)
+        return FieldPlan(name, BATCH, fk_lookup, None, (model_field.related_model, type(field)))
+
+    lookups.extend(nested_lookups)
+    return FieldPlan(name, NESTED, fk_lookup, None, tuple(nested))
+
+
+def compile_values_plan(serializer_class):
+    """
+    Plan của serializer class, compile một lần cho mỗi process.
+
+    Raises:
+        ValuesPlanError: Serializer có field không hỗ trợ
+    """
+    if serializer_class not in _plans:
+        try:
+            model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+            if model is None:
+                raise ValuesPlanError('Serializer không có Meta.model')
+            fields, lookups, annotations = _compile_fields(serializer_class(), model)
+            _plans[serializer_class] = ValuesPlan(tuple(fields), tuple(dict.fromkeys(lookups)), annotations)
+        except ValuesPlanError as exc:
+            logger.warning('%s cannot use the values fast path: %s', serializer_class.__name__, exc)
+            _plans[serializer_class] = ValuesPlanError(str(exc))
+
+    plan = _plans[serializer_class]
+    if isinstance(plan, ValuesPlanError):
+        raise plan
+    return plan
+
+
+def _skip_missing_relation(field):
+    """
+    Giá trị khi relation trên đường đi là NULL, cùng quy tắc với
+    `Field.get_attribute` của DRF: default, None nếu allow_null, bỏ field
+    nếu không required.
+    """
+    if field.default is not empty:
+        return field.get_default()
+    if field.allow_null or field.required:
+        return None
+    raise KeyError(field.field_name)
+
+
+class ValuesSerializer:
+    """
+    Serializer chỉ đọc dùng plan của `serializer_class`.
+
+    Args:
+        serializer_class: Serializer class có output cần dựng lại
+        context (dict): Context của serializer (request...)
+
+    Raises:
+        ValuesPlanError: Serializer không dùng được fast path
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.plan = compile_values_plan(serializer_class)
+        self.serializer = serializer_class(context=context or {})
+        self._methods = {}
+
+    def get_queryset(self, queryset, extra_lookups=()):
+        """
+        Queryset `.values()` với các lookups của plan (và `extra_lookups`, ví
+        dụ các field sắp xếp mà CursorPagination đọc từ row cuối trang).
+        """
+        lookups = list(dict.fromkeys((*self.plan.lookups, *extra_lookups)))
+        return queryset.prefetch_related(None).values(*lookups, **self.plan.annotations)
+
+    def get_method(self, path, method_name):
+        """Method field của serializer (hoặc nested serializer theo `path`) đã bind context."""
+        key = (path, method_name)
+        if key not in self._methods:
+            serializer = self.serializer
+            for name in path:
+                serializer = serializer.fields[name]
+            self._methods[key] = getattr(serializer, method_name)
+        return self._methods[key]
+
+    def load_batches(self, rows):
+        """
+        Serialize các nested objects không compile được bằng một query mỗi field.
+
+        Returns:
+            dict: {field name: {pk: data}}
+        """
+        batches = {}
+        for field in self.plan.fields:
+            if field.kind != BATCH:
+                continue
+            model, nested_class = field.extra
+            ids = {row[field.lookup] for row in rows} - {None}
+            if not ids:
+                batches[field.name] = {}
+                continue
+            queryset = model._default_manager.filter(pk__in=ids)
+            setup_eager_loading = getattr(nested_class, 'setup_eager_loading', None)
+            if setup_eager_loading is not None:
+                queryset = setup_eager_loading(queryset)
+            instances = list(queryset)
+            data = nested_class(instances, many=True, context=self.serializer.context).data
+            batches[field.name] = {instance.pk: item for instance, item in zip(instances, data)}
+        return batches
+
+    def build(self, row, fields, batches):
+        item = {}
+        for field in fields:
+            kind = field.kind
+            if kind == COLUMN:
+                nullable, serializer_field = field.extra
+                if nullable and any(row[lookup] is None for lookup in nullable):
+                    try:
+                        item[field.name] = _skip_missing_relation(serializer_field)
+                    except KeyError:
+                        pass
+                    continue
+                value = row[field.lookup]
+                item[field.name] = None if value is None else field.convert(value)
+            elif kind == PRIMARY_KEY or kind == ANNOTATION:
+                value = row[field.lookup]
+                item[field.name] = None if value is None else field.convert(value)
+            elif kind == SOURCE:
+                columns, getter = field.extra
+                obj = SimpleNamespace(**{attr: row[lookup] for attr, lookup in columns})
+                if isinstance(getter, tuple):
+                    value = self.get_method(*getter)(obj)
+                else:
+                    value = getter(obj)
+                item[field.name] = None if value is None else field.convert(value)
+            elif kind == NESTED:
+                item[field.name] = None if row[field.lookup] is None else self.build(row, field.extra, batches)
+            elif kind == BATCH:
+                item[field.name] = batches[field.name].get(row[field.lookup])
+        return item
+
+    def serialize(self, rows):
+        """
+        Returns:
+            list: Các dicts giống `serializer_class(instances, many=True).data`
+        """
+        rows = list(rows)
+        batches = self.load_batches(rows)
+        return [self.build(row, self.plan.fields, batches) for row in rows]
@@ -10,7 +10,10 @@ from rest_framework import viewsets, status, mixins
 from rest_framework.response import Response
 
 from core.utils.response import success_response, error_response, paginated_response
-from core.mixins.views import ApiResponseMixin, SerializerContextMixin, PermissionByActionMixin
+from core.mixins.views import (
+    ApiResponseMixin, SerializerContextMixin, PermissionByActionMixin, PaginationByActionMixin,
+    ConditionalGetMixin, ValuesSerializerMixin
+)
 
 
 class StandardizedViewSet(ApiResponseMixin, SerializerContextMixin, PermissionByActionMixin, viewsets.ViewSet):
@@ -34,12 +37,15 @@ class StandardizedViewSet(ApiResponseMixin, SerializerContextMixin, PermissionBy
         return self.serializer_class
 
 
-class StandardizedModelViewSet(StandardizedViewSet, viewsets.ModelViewSet):
+class StandardizedModelViewSet(ValuesSerializerMixin, ConditionalGetMixin, PaginationByActionMixin, StandardizedViewSet, viewsets.ModelViewSet):
     """
     ModelViewSet chuẩn hóa cho CRUD operations.
     
     ViewSet này tích hợp đầy đủ các chức năng CRUD với định dạng
-    response chuẩn hóa.
+    response chuẩn hóa. `list` và `retrieve` hỗ trợ conditional GET
+    cho các actions trong `conditional_get_actions` (xem ConditionalGetMixin),
+    `list` dùng values fast path khi có trong `values_list_actions`
+    (xem ValuesSerializerMixin).
     """
     
     def list(self, request, *args, **kwargs):
@@ -47,21 +53,29 @@ class StandardizedModelViewSet(StandardizedViewSet, viewsets.ModelViewSet):
         List resources với response phân trang chuẩn hóa.
         """
         queryset = self.filter_queryset(self.get_queryset())
+        validators = self.get_conditional_validators(queryset=queryset)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+        
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            queryset = self.get_values_queryset(queryset, values_serializer)
+        
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            paginated_data = self.get_paginated_response(serializer.data)
-            return self.success_response(
+            paginated_data = self.get_paginated_response(self.serialize_list(page, values_serializer))
+            response = self.success_response(
                 data=paginated_data.data,
                 status_code=status.HTTP_200_OK
             )
-            
-        serializer = self.get_serializer(queryset, many=True)
-        return self.success_response(
-            data=serializer.data,
-            status_code=status.HTTP_200_OK
-        )
+        else:
+            response = self.success_response(
+                data=self.serialize_list(queryset, values_serializer),
+                status_code=status.HTTP_200_OK
+            )
+        return self.set_conditional_headers(response, validators)
     
     def create(self, request, *args, **kwargs):
         """
@@ -82,12 +96,17 @@ class StandardizedModelViewSet(StandardizedViewSet, viewsets.ModelViewSet):
         Retrieve resource với response chuẩn hóa.
         """
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
+        validators = self.get_conditional_validators(instance=instance)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
         
-        return self.success_response(
+        serializer = self.get_serializer(instance)
+        response = self.success_response(
             data=serializer.data,
             status_code=status.HTTP_200_OK
         )
+        return self.set_conditional_headers(response, validators)
     
     def update(self, request, *args, **kwargs):
         """
@@ -132,12 +151,12 @@ class StandardizedModelViewSet(StandardizedViewSet, viewsets.ModelViewSet):
         )
 
 
-class ReadOnlyStandardizedModelViewSet(StandardizedViewSet, viewsets.ReadOnlyModelViewSet):
+class ReadOnlyStandardizedModelViewSet(ValuesSerializerMixin, ConditionalGetMixin, PaginationByActionMixin, StandardizedViewSet, viewsets.ReadOnlyModelViewSet):
     """
     ModelViewSet chuẩn hóa chỉ đọc.
     
     ViewSet này chỉ hỗ trợ các operations list và retrieve với
-    định dạng response chuẩn hóa.
+    định dạng response chuẩn hóa và conditional GET.
     """
     
     def list(self, request, *args, **kwargs):
@@ -145,30 +164,43 @@ class ReadOnlyStandardizedModelViewSet(StandardizedViewSet, viewsets.ReadOnlyMod
         List resources với response phân trang chuẩn hóa.
         """
         queryset = self.filter_queryset(self.get_queryset())
+        validators = self.get_conditional_validators(queryset=queryset)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+        
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            queryset = self.get_values_queryset(queryset, values_serializer)
+        
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            paginated_data = self.get_paginated_response(serializer.data)
-            return self.success_response(
+            paginated_data = self.get_paginated_response(self.serialize_list(page, values_serializer))
+            response = self.success_response(
                 data=paginated_data.data,
                 status_code=status.HTTP_200_OK
             )
-            
-        serializer = self.get_serializer(queryset, many=True)
-        return self.success_response(
-            data=serializer.data,
-            status_code=status.HTTP_200_OK
-        )
+        else:
+            response = self.success_response(
+                data=self.serialize_list(queryset, values_serializer),
+                status_code=status.HTTP_200_OK
+            )
+        return self.set_conditional_headers(response, validators)
     
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve resource với response chuẩn hóa.
         """
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
+        validators = self.get_conditional_validators(instance=instance)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
         
-        return self.success_response(
+        serializer = self.get_serializer(instance)
+        response = self.success_response(
             data=serializer.data,
             status_code=status.HTTP_200_OK
         )
+        return self.set_conditional_headers(response, validators)
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
 from . import models
-from .models import Warehouse, StockItem, StockMovement, InventoryAuditLog
+from .models import Warehouse, StockItem, StockMovement, StockReservation, InventoryAuditLog
 
 
 class StockItemInline(admin.TabularInline):
@@ -57,7 +57,7 @@ class LowStockFilter(admin.SimpleListFilter):
 
 
 class StockItemAdmin(admin.ModelAdmin):
-    list_display = ('product_name', 'warehouse_name', 'quantity', 'low_stock_threshold', 
+    list_display = ('product_name', 'warehouse_name', 'quantity', 'reserved', 'low_stock_threshold', 
                    'is_tracked', 'stock_status', 'last_updated')
     list_filter = ('warehouse', 'is_tracked', LowStockFilter)
     search_fields = ('product__name', 'warehouse__name')
@@ -103,6 +103,17 @@ class StockMovementAdmin(admin.ModelAdmin):
     related_order_display.short_description = _('Order')
 
 
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ('product', 'stock_item', 'order', 'quantity', 'status', 'expires_at', 'created_at')
+    list_filter = ('status', 'stock_item__warehouse')
+    raw_id_fields = ('stock_item', 'product', 'order')
+    readonly_fields = ('stock_item', 'product', 'order', 'cart_id', 'quantity', 'status',
+                      'expires_at', 'created_at', 'updated_at')
+    
+    def has_add_permission(self, request):
+        return False
+
+
 class InventoryAuditLogAdmin(admin.ModelAdmin):
     list_display = ('stock_item_name', 'change_type', 'old_quantity', 'new_quantity', 
                    'changed_by', 'created_at')
@@ -128,4 +139,5 @@ class InventoryAuditLogAdmin(admin.ModelAdmin):
 admin.site.register(Warehouse, WarehouseAdmin)
 admin.site.register(StockItem, StockItemAdmin)
 admin.site.register(StockMovement, StockMovementAdmin)
+admin.site.register(StockReservation, StockReservationAdmin)
 admin.site.register(InventoryAuditLog, InventoryAuditLogAdmin)
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+Django management command để stress test stock reservations trên một SKU
+"""
+from django.core.management.base import BaseCommand
+
+from inventory.services.benchmark import create_fixture, delete_fixture, run_reservation_stress
+
+
+class Command(BaseCommand):
+    help = 'Race many threads reserving one SKU and report throughput and overselling'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stock', type=int, default=500, help='Stock of the fixture SKU')
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--attempts', type=int, default=50, help='Reservations attempted per thread')
+        parser.add_argument('--quantity', type=int, default=1, help='Quantity per reservation')
+
+    def handle(self, *args, **options):
+        stock_item = create_fixture(options['stock'])
+        self.stdout.write(
+            f"Racing {options['threads']} threads x {options['attempts']} reservations "
+            f"on one SKU with stock {options['stock']}..."
+        )
+        try:
+            report = run_reservation_stress(
+                stock_item, threads=options['threads'], attempts=options['attempts'],
+                quantity=options['quantity']
+            )
+        finally:
+            delete_fixture(stock_item)
+
+        self.stdout.write(
+            f"attempts={report['attempts']} reserved={report['reserved']} rejected={report['rejected']} "
+            f"errors={report['errors']}"
+        )
+        self.stdout.write(
+            f"elapsed={report['elapsed_s']:.2f}s throughput={report['holds_per_second']:.0f} attempts/s"
+        )
+        if report['oversold'] or report['reserved_quantity'] != report['held_quantity']:
+            self.stdout.write(self.style.ERROR(
+                f"Inconsistent: reserved={report['reserved_quantity']} held={report['held_quantity']}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"No overselling: reserved {report['reserved_quantity']} of {options['stock']}"
+            ))
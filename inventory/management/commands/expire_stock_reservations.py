@@ -0,0 +1,30 @@
+"""
+Django management command để trả các stock reservations đã hết hạn
+"""
+from django.core.management.base import BaseCommand
+
+from inventory.services.reservations import DEFAULT_EXPIRE_BATCH_SIZE, expire_reservations, run_periodic_expiry
+
+
+class Command(BaseCommand):
+    help = 'Release stock reservations held past STOCK_RESERVATION_TTL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_EXPIRE_BATCH_SIZE)
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Run continuously, expiring holds every N seconds (0 = run once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        if interval > 0:
+            self.stdout.write(f'Expiring stock reservations every {interval}s...')
+            run_periodic_expiry(interval, batch_size=options['batch_size'])
+            return
+
+        expired = expire_reservations(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} stock reservations'))
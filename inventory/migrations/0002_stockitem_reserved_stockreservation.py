@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        ('orders', '0001_initial'),
+        ('products', '0009_alter_productimage_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockitem',
+            name='reserved',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reserved'),
+        ),
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cart_id', models.PositiveIntegerField(blank=True, null=True, verbose_name='Cart ID')),
+                ('quantity', models.PositiveIntegerField(verbose_name='Quantity')),
+                ('status', models.CharField(choices=[('HELD', 'Held'), ('CONFIRMED', 'Confirmed'), ('RELEASED', 'Released'), ('EXPIRED', 'Expired')], default='HELD', max_length=20, verbose_name='Status')),
+                ('expires_at', models.DateTimeField(verbose_name='Expires At')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='orders.order', verbose_name='Order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='products.product', verbose_name='Product')),
+                ('stock_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='inventory.stockitem', verbose_name='Stock Item')),
+            ],
+            options={
+                'verbose_name': 'Stock Reservation',
+                'verbose_name_plural': 'Stock Reservations',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='inventory_s_status_c656ef_idx'), models.Index(fields=['order', 'status'], name='inventory_s_order_i_9b314c_idx')],
+            },
+        ),
+    ]
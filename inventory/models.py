@@ -68,6 +68,8 @@ class StockItem(models.Model):
         verbose_name=_("Warehouse")
     )
     quantity = models.PositiveIntegerField(_("Quantity"), default=0)
+    # Số lượng đang được giữ cho các đơn hàng chưa xác nhận (StockReservation HELD)
+    reserved = models.PositiveIntegerField(_("Reserved"), default=0)
     low_stock_threshold = models.PositiveIntegerField(_("Low Stock Threshold"), default=5)
     is_tracked = models.BooleanField(_("Track Inventory"), default=True)
     last_updated = models.DateTimeField(_("Last Updated"), auto_now=True)
@@ -82,6 +84,11 @@ class StockItem(models.Model):
     def __str__(self):
         return f"{self.product} - {self.warehouse} ({self.quantity})"
     
+    @property
+    def available(self):
+        """Quantity that can still be reserved"""
+        return max(0, self.quantity - self.reserved)
+    
     @property
     def is_low_stock(self):
         """Check if the item is below its low stock threshold"""
@@ -172,6 +179,68 @@ class StockMovement(models.Model):
             )
 
 
+class StockReservation(models.Model):
+    """
+    Model for stock held for an order in one warehouse until the order is
+    confirmed, cancelled or the hold expires (see `inventory.services.reservations`)
+    """
+    STATUS_HELD = 'HELD'
+    STATUS_CONFIRMED = 'CONFIRMED'
+    STATUS_RELEASED = 'RELEASED'
+    STATUS_EXPIRED = 'EXPIRED'
+    
+    STATUS_CHOICES = [
+        (STATUS_HELD, _('Held')),
+        (STATUS_CONFIRMED, _('Confirmed')),
+        (STATUS_RELEASED, _('Released')),
+        (STATUS_EXPIRED, _('Expired')),
+    ]
+    
+    stock_item = models.ForeignKey(
+        StockItem,
+        on_delete=models.CASCADE,
+        related_name='reservations',
+        verbose_name=_("Stock Item")
+    )
+    product = models.ForeignKey(
+        'products.Product',
+        on_delete=models.CASCADE,
+        related_name='stock_reservations',
+        verbose_name=_("Product")
+    )
+    order = models.ForeignKey(
+        'orders.Order',
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='stock_reservations',
+        verbose_name=_("Order")
+    )
+    cart_id = models.PositiveIntegerField(_("Cart ID"), null=True, blank=True)
+    quantity = models.PositiveIntegerField(_("Quantity"))
+    status = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_HELD
+    )
+    expires_at = models.DateTimeField(_("Expires At"))
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Stock Reservation")
+        verbose_name_plural = _("Stock Reservations")
+        ordering = ['-created_at']
+        indexes = [
+            # Sweeper tìm holds hết hạn
+            models.Index(fields=['status', 'expires_at']),
+            models.Index(fields=['order', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.product} - {self.quantity} ({self.get_status_display()})"
+
+
 class InventoryAuditLog(models.Model):
     """
     Model for tracking all changes to inventory quantities
@@ -96,6 +96,11 @@ class StockItemSerializer(serializers.ModelSerializer):
             'stock_status', 'last_updated', 'created_at'
         ]
         read_only_fields = ['id', 'last_updated', 'created_at', 'is_low_stock', 'stock_status']
+        # Values fast path (StockItemViewSet.list)
+        values_source_fields = {
+            'is_low_stock': ('quantity', 'low_stock_threshold', 'is_tracked'),
+            'stock_status': ('quantity', 'low_stock_threshold', 'is_tracked'),
+        }
     
     def get_stock_status(self, obj):
         """Lấy trạng thái tồn kho của sản phẩm"""
@@ -0,0 +1,100 @@
+"""
+Stress test cho stock reservations: nhiều threads cùng giữ tồn kho của một SKU.
+
+Mỗi thread dùng connection database riêng và gọi `reserve_quantities` liên
+tục; kết quả cho biết số holds thành công/bị từ chối, throughput và tồn kho
+có bị giữ quá hay không. Cần database hỗ trợ ghi đồng thời (PostgreSQL).
+Chạy qua `manage.py benchmark_stock_reservations`.
+"""
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from products.models import Product
+
+from ..models import StockItem, StockReservation, Warehouse
+from .reservations import ReservationError, reserve_quantities
+
+
+def create_fixture(stock):
+    """Product, kho và StockItem có `stock` sản phẩm cho một lần stress test."""
+    run_id = uuid.uuid4().hex[:8]
+    seller = get_user_model().objects.create_user(
+        username=f'bench-{run_id}', email=f'bench-{run_id}@example.com', password=None
+    )
+    product = Product.objects.create(
+        name=f'Bench {run_id}', description='Stock reservation benchmark', price=1,
+        seller=seller, status='active', stock=stock, sku=f'BENCH-{run_id}', track_inventory=True
+    )
+    warehouse = Warehouse.objects.create(name=f'Bench {run_id}', location='-', is_default=False)
+    # Signal của Product tạo StockItem ở kho mặc định, chỉ giữ kho của benchmark
+    StockItem.objects.filter(product=product).delete()
+    stock_item = StockItem.objects.create(product=product, warehouse=warehouse, quantity=stock)
+    return stock_item
+
+
+def delete_fixture(stock_item):
+    product, warehouse = stock_item.product, stock_item.warehouse
+    seller = product.seller
+    warehouse.delete()
+    product.delete()
+    seller.delete()
+
+
+def run_reservation_stress(stock_item, threads=16, attempts=50, quantity=1):
+    """
+    Cho `threads` threads mỗi thread thử giữ `quantity` sản phẩm `attempts` lần.
+
+    Returns:
+        dict: attempts, reserved, rejected, errors, elapsed_s, holds_per_second,
+        reserved_quantity (StockItem.reserved sau khi chạy), oversold
+    """
+    results = {'reserved': 0, 'rejected': 0, 'errors': 0}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads)
+
+    def worker():
+        reserved = rejected = errors = 0
+        try:
+            start_barrier.wait()
+            for _ in range(attempts):
+                try:
+                    reserve_quantities({stock_item.product_id: quantity})
+                    reserved += 1
+                except ReservationError:
+                    rejected += 1
+                except Exception:
+                    errors += 1
+        finally:
+            connection.close()
+            with lock:
+                results['reserved'] += reserved
+                results['rejected'] += rejected
+                results['errors'] += errors
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stock_item.refresh_from_db()
+    held = sum(
+        StockReservation.objects.filter(stock_item=stock_item, status=StockReservation.STATUS_HELD)
+        .values_list('quantity', flat=True)
+    )
+    total = threads * attempts
+    return {
+        'attempts': total,
+        **results,
+        'elapsed_s': elapsed,
+        'holds_per_second': total / elapsed if elapsed else 0,
+        'reserved_quantity': stock_item.reserved,
+        'held_quantity': held,
+        'oversold': stock_item.reserved > stock_item.quantity,
+    }
@@ -0,0 +1,295 @@
+"""
+Stock Reservations
+
+Giữ tồn kho theo SKU và kho (StockItem) cho đơn hàng trong lúc chờ xác nhận:
+
+- `reserve(cart)` / `reserve_quantities()`: phân bổ số lượng của mỗi
+  product vào các kho (kho mặc định trước) và giữ bằng một
+  `UPDATE ... SET reserved = reserved + n WHERE quantity - reserved >= n`
+  cho mỗi StockItem; không đọc-rồi-ghi nên nhiều request cùng lúc trên một
+  SKU không giữ quá tồn kho. Một UPDATE không khớp rollback toàn bộ
+- `confirm(order)`: chuyển holds thành xuất kho (trừ `quantity` và
+  `reserved`, ghi StockMovement OUT); holds đã hết hạn được giữ lại
+  trước, `ReservationError` nếu không còn đủ tồn kho
+- `release(order)`: trả holds khi đơn hàng bị hủy hoặc bị xóa
+- `expire_reservations()`: trả các holds quá `STOCK_RESERVATION_TTL` giây
+  (mặc định 900), chạy bằng `manage.py expire_stock_reservations`
+
+Chỉ các products có `track_inventory` và StockItem `is_tracked` ở kho
+đang hoạt động được giữ tồn kho.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+from products.models import Product
+
+from ..models import StockItem, StockMovement, StockReservation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPIRE_BATCH_SIZE = 500
+
+
+class ReservationError(Exception):
+    """
+    Không đủ tồn kho để giữ cho đơn hàng.
+
+    Attributes:
+        message (str): Thông báo cho user
+        errors (dict): Lỗi theo product id
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors or {}
+
+
+def reservations_enabled():
+    """Checkout giữ tồn kho theo kho khi setting `STOCK_RESERVATIONS_ENABLED` bật."""
+    return getattr(settings, 'STOCK_RESERVATIONS_ENABLED', False)
+
+
+def get_reservation_ttl():
+    return timedelta(seconds=getattr(settings, 'STOCK_RESERVATION_TTL', 900))
+
+
+def _allocate(quantities):
+    """
+    Phân bổ số lượng của mỗi product vào các StockItems theo tồn kho khả dụng
+    đọc được (một query).
+
+    Returns:
+        list: [(stock_item_id, product_id, quantity), ...]
+
+    Raises:
+        ReservationError: Tổng tồn kho khả dụng không đủ
+    """
+    tracked = set(
+        Product.objects.filter(pk__in=list(quantities), track_inventory=True).values_list('pk', flat=True)
+    )
+    stock_items = defaultdict(list)
+    rows = StockItem.objects.filter(
+        product_id__in=tracked, is_tracked=True, warehouse__is_active=True
+    ).order_by('product_id', '-warehouse__is_default', 'warehouse_id').values_list(
+        'pk', 'product_id', 'quantity', 'reserved'
+    )
+    for stock_item_id, product_id, quantity, reserved in rows:
+        stock_items[product_id].append((stock_item_id, quantity - reserved))
+
+    allocations, errors = [], {}
+    for product_id in sorted(tracked):
+        remaining = quantities[product_id]
+        for stock_item_id, available in stock_items[product_id]:
+            if remaining <= 0:
+                break
+            take = min(remaining, available)
+            if take > 0:
+                allocations.append((stock_item_id, product_id, take))
+                remaining -= take
+        if remaining > 0:
+            errors[product_id] = "Không đủ tồn kho"
+    if errors:
+        raise ReservationError("Một số sản phẩm không đủ tồn kho", errors)
+    return allocations
+
+
+@transaction.atomic
+def reserve_quantities(quantities, order=None, cart_id=None, ttl=None, now=None):
+    """
+    Giữ tồn kho cho {product_id: quantity}.
+
+    Args:
+        quantities (dict): Số lượng cần giữ theo product id
+        order: Order được giữ tồn kho (tùy chọn)
+        cart_id (int): Cart tạo ra holds (tùy chọn)
+        ttl (timedelta): Thời gian giữ, mặc định `STOCK_RESERVATION_TTL`
+
+    Returns:
+        list[StockReservation]: Các holds vừa tạo
+
+    Raises:
+        ReservationError: Không đủ tồn kho (không hold nào được tạo)
+    """
+    quantities = {product_id: quantity for product_id, quantity in quantities.items() if quantity > 0}
+    if not quantities:
+        return []
+
+    allocations = _allocate(quantities)
+    # Lock theo thứ tự stock item id để hai checkout không deadlock
+    for stock_item_id, product_id, quantity in sorted(allocations):
+        updated = StockItem.objects.filter(
+            pk=stock_item_id, quantity__gte=F('reserved') + quantity
+        ).update(reserved=F('reserved') + quantity)
+        if not updated:
+            raise ReservationError("Tồn kho đã thay đổi, vui lòng thử lại", {product_id: "Không đủ tồn kho"})
+
+    expires_at = (now or timezone.now()) + (ttl or get_reservation_ttl())
+    return StockReservation.objects.bulk_create([
+        StockReservation(
+            stock_item_id=stock_item_id, product_id=product_id, order=order, cart_id=cart_id,
+            quantity=quantity, expires_at=expires_at
+        )
+        for stock_item_id, product_id, quantity in allocations
+    ])
+
+
+def reserve(cart, order=None, ttl=None):
+    """Giữ tồn kho cho các items của giỏ hàng, xem `reserve_quantities`."""
+    quantities = defaultdict(int)
+    for product_id, quantity in cart.items.values_list('product_id', 'quantity'):
+        quantities[product_id] += quantity
+    return reserve_quantities(quantities, order=order, cart_id=cart.pk, ttl=ttl)
+
+
+def _lock_held(queryset):
+    return list(
+        queryset.filter(status=StockReservation.STATUS_HELD)
+        .select_for_update().order_by('stock_item_id', 'pk')
+        .values_list('pk', 'stock_item_id', 'quantity')
+    )
+
+
+def _update_stock_items(holds, fields):
+    """Trừ số lượng của holds khỏi `fields` của các StockItems bằng một UPDATE."""
+    per_item = defaultdict(int)
+    for _, stock_item_id, quantity in holds:
+        per_item[stock_item_id] += quantity
+    output_field = StockItem._meta.get_field('quantity')
+    StockItem.objects.filter(pk__in=per_item).update(**{
+        field: Case(
+            *(When(pk=stock_item_id, then=F(field) - quantity) for stock_item_id, quantity in per_item.items()),
+            default=F(field),
+            output_field=output_field,
+        )
+        for field in fields
+    })
+
+
+def _release(queryset, status):
+    holds = _lock_held(queryset)
+    if not holds:
+        return 0
+    _update_stock_items(holds, ('reserved',))
+    StockReservation.objects.filter(pk__in=[pk for pk, _, _ in holds]).update(
+        status=status, updated_at=timezone.now()
+    )
+    return len(holds)
+
+
+def _reserve_expired(order):
+    """
+    Giữ lại tồn kho cho đơn hàng có holds đã hết hạn (hoặc bị trả) nhưng
+    chưa được xác nhận, theo số lượng của các holds cũ.
+
+    Raises:
+        ReservationError: Không còn đủ tồn kho cho đơn hàng
+    """
+    reservations = StockReservation.objects.filter(order=order)
+    if reservations.filter(status=StockReservation.STATUS_CONFIRMED).exists():
+        return
+    quantities = defaultdict(int)
+    lapsed = reservations.filter(status__in=(StockReservation.STATUS_EXPIRED, StockReservation.STATUS_RELEASED))
+    for product_id, quantity in lapsed.values_list('product_id', 'quantity'):
+        quantities[product_id] += quantity
+    if quantities:
+        reserve_quantities(quantities, order=order)
+
+
+@transaction.atomic
+def confirm(order, user=None):
+    """
+    Chuyển các holds của đơn hàng thành xuất kho.
+
+    Nếu holds của đơn hàng đã hết hạn trước khi xác nhận, tồn kho được giữ
+    lại trước khi xuất kho.
+
+    Returns:
+        int: Số holds đã xác nhận
+
+    Raises:
+        ReservationError: Holds đã hết hạn và không còn đủ tồn kho
+    """
+    reservations = StockReservation.objects.filter(order=order)
+    holds = _lock_held(reservations)
+    if not holds:
+        _reserve_expired(order)
+        holds = _lock_held(reservations)
+    if not holds:
+        return 0
+    _update_stock_items(holds, ('quantity', 'reserved'))
+    StockReservation.objects.filter(pk__in=[pk for pk, _, _ in holds]).update(
+        status=StockReservation.STATUS_CONFIRMED, updated_at=timezone.now()
+    )
+    # bulk_create không chạy StockMovement.save() (vốn cũng trừ quantity)
+    StockMovement.objects.bulk_create([
+        StockMovement(
+            stock_item_id=stock_item_id, movement_type=StockMovement.MOVEMENT_OUT, quantity=quantity,
+            reason=f"Order {order.order_number}", related_order=order, created_by=user
+        )
+        for _, stock_item_id, quantity in holds
+    ])
+    return len(holds)
+
+
+@transaction.atomic
+def release(order):
+    """
+    Trả các holds của đơn hàng (đơn hàng bị hủy).
+
+    Returns:
+        int: Số holds đã trả
+    """
+    return _release(StockReservation.objects.filter(order=order), StockReservation.STATUS_RELEASED)
+
+
+def expire_reservations(batch_size=DEFAULT_EXPIRE_BATCH_SIZE, now=None):
+    """
+    Trả các holds đã hết hạn theo từng batch, mỗi batch một transaction.
+
+    Returns:
+        int: Số holds đã trả
+    """
+    now = now or timezone.now()
+    total = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                StockReservation.objects.filter(status=StockReservation.STATUS_HELD, expires_at__lt=now)
+                .order_by('expires_at', 'pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            total += _release(StockReservation.objects.filter(pk__in=batch), StockReservation.STATUS_EXPIRED)
+        if len(batch) < batch_size:
+            break
+    return total
+
+
+def run_periodic_expiry(interval, iterations=None, **options):
+    """
+    Trả các holds hết hạn định kỳ mỗi `interval` giây.
+
+    Args:
+        interval (int): Số giây giữa hai lần chạy.
+        iterations (int, optional): Số lần chạy, None để chạy liên tục.
+        **options: Truyền cho `expire_reservations`.
+    """
+    count = 0
+    while iterations is None or count < iterations:
+        try:
+            expired = expire_reservations(**options)
+            if expired:
+                logger.info("Expired %s stock reservations", expired)
+        except Exception:
+            logger.exception("Stock reservation expiry failed")
+        count += 1
+        if iterations is None or count < iterations:
+            time.sleep(interval)
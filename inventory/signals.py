@@ -1,10 +1,14 @@
-from django.db.models.signals import post_save
+import logging
+
+from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from django.db import transaction
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 # Dynamically import these models to avoid circular imports
 try:
     from products.models import Product
@@ -53,6 +57,85 @@ try:
             except Exception as e:
                 # Log error, but don't block product creation
                 print(f"Error creating stock item for product {instance}: {str(e)}")
+
+    from products.signals import products_bulk_created
+
+    @receiver(products_bulk_created, sender=Product)
+    def create_stock_items_for_imported_products(sender, products, **kwargs):
+        """
+        Bulk version of create_stock_item_for_new_product for products created by bulk_create.
+        """
+        try:
+            default_warehouse = Warehouse.objects.filter(is_default=True).first()
+            if not default_warehouse:
+                default_warehouse = Warehouse.objects.create(
+                    name="Main Warehouse",
+                    location="Default Location",
+                    description="Default warehouse created automatically",
+                    is_default=True,
+                    is_active=True
+                )
+
+            with transaction.atomic():
+                stock_items = StockItem.objects.bulk_create([
+                    StockItem(
+                        product=product,
+                        warehouse=default_warehouse,
+                        quantity=0,
+                        low_stock_threshold=5,
+                        is_tracked=True
+                    )
+                    for product in products
+                ])
+
+                system_user = User.objects.filter(is_superuser=True).first()
+                InventoryAuditLog.objects.bulk_create([
+                    InventoryAuditLog(
+                        stock_item=stock_item,
+                        change_type='SYSTEM',
+                        changed_by=system_user,
+                        old_quantity=0,
+                        new_quantity=0,
+                        note="Initial stock item created for imported product"
+                    )
+                    for stock_item in stock_items
+                ])
+        except Exception:
+            # Log error, but don't block product import
+            logger.exception("Error creating stock items for %s imported products", len(products))
+    from orders.models import Order
+    from payments.models import Payment
+    from .services.reservations import confirm, release, reservations_enabled
+
+    # Trạng thái đơn hàng mà holds tồn kho được chuyển thành xuất kho
+    RESERVATION_CONFIRM_STATUSES = ('processing', 'shipped', 'delivered', 'completed')
+
+    @receiver(post_save, sender=Order)
+    def sync_stock_reservations(sender, instance, created, **kwargs):
+        """
+        Convert or release the order's stock holds when its status changes.
+        """
+        if created or not reservations_enabled():
+            return
+        if instance.status == 'cancelled':
+            release(instance)
+        elif instance.status in RESERVATION_CONFIRM_STATUSES:
+            confirm(instance)
+
+    @receiver(pre_delete, sender=Order)
+    def release_stock_reservations_on_delete(sender, instance, **kwargs):
+        """
+        Return the order's stock holds before the order (and its holds) is deleted.
+        """
+        release(instance)
+
+    @receiver(post_save, sender=Payment)
+    def confirm_stock_reservations_on_payment(sender, instance, **kwargs):
+        """
+        Convert the order's stock holds once its payment is completed.
+        """
+        if reservations_enabled() and instance.status == 'completed':
+            confirm(instance.order)
 except ImportError:
     # Silently pass if Product model doesn't exist yet (during migrations)
     pass
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Tests cho stock reservations (holds theo kho, xác nhận/trả/hết hạn, checkout).
+"""
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from cart.models import Cart, CartItem
+from inventory.models import StockItem, StockMovement, StockReservation, Warehouse
+from inventory.services.benchmark import run_reservation_stress
+from inventory.services.reservations import (
+    ReservationError, confirm, expire_reservations, release, reserve, reserve_quantities
+)
+from orders.models import Order
+from orders.services.checkout import CheckoutError, checkout_cart
+from products.models import Product
+
+User = get_user_model()
+
+
+class ReservationTestMixin:
+
+    def create_stock(self, *quantities):
+        """Product với một StockItem cho mỗi số lượng, kho đầu tiên là kho mặc định."""
+        seller = User.objects.create_user(
+            username=f'seller{Product.objects.count()}', email=f'seller{Product.objects.count()}@example.com',
+            password='password'
+        )
+        product = Product.objects.create(
+            name='Phone', description='x', price=Decimal('100.00'), seller=seller, status='active',
+            stock=sum(quantities), sku=f'PHONE-{Product.objects.count()}'
+        )
+        StockItem.objects.filter(product=product).delete()
+        stock_items = []
+        for index, quantity in enumerate(quantities):
+            warehouse = Warehouse.objects.create(name=f'Warehouse {index}', location='-', is_default=index == 0)
+            stock_items.append(StockItem.objects.create(product=product, warehouse=warehouse, quantity=quantity))
+        return product, stock_items
+
+
+class ReservationTest(ReservationTestMixin, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.product, self.stock_items = self.create_stock(3, 5)
+
+    def reserved(self):
+        return [StockItem.objects.get(pk=item.pk).reserved for item in self.stock_items]
+
+    def test_reserve_splits_across_warehouses(self):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=4)
+
+        holds = reserve(cart)
+
+        self.assertEqual([(hold.stock_item_id, hold.quantity) for hold in holds],
+                         [(self.stock_items[0].pk, 3), (self.stock_items[1].pk, 1)])
+        self.assertEqual(self.reserved(), [3, 1])
+
+        with self.assertRaises(ReservationError) as error:
+            reserve_quantities({self.product.pk: 5})
+        self.assertIn(self.product.pk, error.exception.errors)
+        self.assertEqual(self.reserved(), [3, 1])
+
+    def test_conditional_update_rejects_stale_allocation(self):
+        # Tồn kho bị request khác giữ sau khi đã phân bổ
+        reserve_quantities({self.product.pk: 3})
+        StockItem.objects.filter(pk=self.stock_items[1].pk).update(reserved=5)
+        with self.assertRaises(ReservationError):
+            reserve_quantities({self.product.pk: 1})
+        self.assertEqual(StockReservation.objects.count(), 1)
+
+    def test_confirm_and_release(self):
+        order = Order.objects.create(user=self.user, order_number='ORD-1')
+        reserve_quantities({self.product.pk: 4}, order=order)
+
+        self.assertEqual(confirm(order), 2)
+        self.assertEqual(
+            [(item.quantity, item.reserved) for item in StockItem.objects.filter(product=self.product).order_by('pk')],
+            [(0, 0), (4, 0)]
+        )
+        self.assertEqual(StockMovement.objects.filter(related_order=order).count(), 2)
+        self.assertEqual(release(order), 0)
+
+        other = Order.objects.create(user=self.user, order_number='ORD-2')
+        reserve_quantities({self.product.pk: 2}, order=other)
+        self.assertEqual(release(other), 1)
+        self.assertEqual(self.reserved(), [0, 0])
+        self.assertEqual(StockReservation.objects.get(order=other).status, StockReservation.STATUS_RELEASED)
+
+    def test_confirm_after_expiry_reserves_again(self):
+        order = Order.objects.create(user=self.user, order_number='ORD-1')
+        reserve_quantities({self.product.pk: 4}, order=order, ttl=timedelta(seconds=60),
+                           now=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(expire_reservations(), 2)
+
+        self.assertEqual(confirm(order), 2)
+        self.assertEqual(
+            [(item.quantity, item.reserved) for item in StockItem.objects.filter(product=self.product).order_by('pk')],
+            [(0, 0), (4, 0)]
+        )
+        self.assertEqual(StockMovement.objects.filter(related_order=order).count(), 2)
+        self.assertEqual(confirm(order), 0)
+
+        # Tồn kho đã bán cho đơn khác trong lúc holds hết hạn
+        other = Order.objects.create(user=self.user, order_number='ORD-2')
+        reserve_quantities({self.product.pk: 2}, order=other, ttl=timedelta(seconds=60),
+                           now=timezone.now() - timedelta(minutes=5))
+        expire_reservations()
+        reserve_quantities({self.product.pk: 3})
+        with self.assertRaises(ReservationError):
+            confirm(other)
+        self.assertFalse(StockMovement.objects.filter(related_order=other).exists())
+
+    def test_deleting_order_releases_holds(self):
+        order = Order.objects.create(user=self.user, order_number='ORD-1')
+        reserve_quantities({self.product.pk: 4}, order=order)
+
+        order.delete()
+
+        self.assertEqual(self.reserved(), [0, 0])
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_expired_holds_are_released(self):
+        reserve_quantities({self.product.pk: 2}, ttl=timedelta(seconds=60), now=timezone.now() - timedelta(minutes=5))
+        reserve_quantities({self.product.pk: 1})
+
+        out = StringIO()
+        call_command('expire_stock_reservations', '--batch-size', '1', stdout=out)
+
+        self.assertIn('Expired 1 stock reservations', out.getvalue())
+        self.assertEqual(self.reserved(), [1, 0])
+        self.assertEqual(expire_reservations(), 0)
+
+    @override_settings(STOCK_RESERVATIONS_ENABLED=True)
+    def test_checkout_reserves_and_order_status_converts_holds(self):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=2)
+
+        order = checkout_cart(self.user, {'shipping_address': 'Hanoi'})
+        self.assertEqual(self.reserved(), [2, 0])
+
+        order.status = 'cancelled'
+        order.save()
+        self.assertEqual(self.reserved(), [0, 0])
+
+        StockItem.objects.filter(product=self.product).update(quantity=0)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=1)
+        with self.assertRaises(CheckoutError):
+            checkout_cart(self.user, {'shipping_address': 'Hanoi'})
+        self.assertEqual(Order.objects.count(), 1)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'Concurrent writes need PostgreSQL')
+class ReservationConcurrencyTest(ReservationTestMixin, TransactionTestCase):
+
+    def test_threads_racing_on_one_sku_never_oversell(self):
+        _, (stock_item,) = self.create_stock(100)
+
+        report = run_reservation_stress(stock_item, threads=16, attempts=20)
+
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual(report['reserved'], 100)
+        self.assertEqual(report['rejected'], report['attempts'] - 100)
+        self.assertEqual(report['reserved_quantity'], 100)
+        self.assertEqual(report['held_quantity'], 100)
+        self.assertFalse(report['oversold'])
@@ -113,6 +113,7 @@ class StockItemViewSet(QueryOptimizationMixin, StandardizedModelViewSet):
     ordering = ['product__name', 'warehouse__name']
     
     select_related_fields = ['product', 'warehouse']
+    values_list_actions = ('list',)
     
     def get_serializer_class(self):
         """
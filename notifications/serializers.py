@@ -9,4 +9,4 @@ class NotificationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Notification
-        fields = ['id', 'user', 'message', 'created_at']
+        fields = ['id', 'user', 'message', 'created_at', 'updated_at']
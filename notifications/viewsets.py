@@ -38,6 +38,8 @@ class NotificationViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     search_fields = ['message']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    # Admin có thể sửa notifications, updated_at và count làm validators
+    conditional_get_actions = ('list', 'retrieve')
     
     def get_queryset(self):
         """
@@ -0,0 +1,23 @@
+"""
+Django management command để tính lại cột tóm tắt items của các đơn hàng
+"""
+from django.core.management.base import BaseCommand
+
+from orders.models import Order, refresh_order_summaries
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Recompute Order.items_count and Order.first_item_name from order items'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        order_ids = list(Order.objects.order_by('pk').values_list('pk', flat=True))
+        total = 0
+        for start in range(0, len(order_ids), chunk_size):
+            total += refresh_order_summaries(order_ids[start:start + chunk_size])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed summaries for {total} orders'))
@@ -0,0 +1,143 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        ('products', '0010_product_schema_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='order',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Order', 'verbose_name_plural': 'Orders'},
+        ),
+        migrations.AlterModelOptions(
+            name='orderitem',
+            options={'ordering': ['id'], 'verbose_name': 'Order Item', 'verbose_name_plural': 'Order Items'},
+        ),
+        migrations.RemoveField(
+            model_name='order',
+            name='user_id',
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='admin_notes',
+            field=models.TextField(blank=True, verbose_name='Admin Notes'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='billing_address',
+            field=models.TextField(blank=True, verbose_name='Billing Address'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Delivered At'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='notes',
+            field=models.TextField(blank=True, verbose_name='Notes'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='order_number',
+            field=models.CharField(blank=True, max_length=50, unique=True, verbose_name='Order Number'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='shipped_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Shipped At'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='shipping_address',
+            field=models.TextField(blank=True, verbose_name='Shipping Address'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='shipping_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Shipping Amount'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Subtotal'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='tax_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Tax Amount'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Total Amount'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='orders', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_name',
+            field=models.CharField(default='', max_length=255, verbose_name='Product Name'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='product_sku',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Product SKU'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='pending', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='orders.order', verbose_name='Order'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Unit Price'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='products.product', verbose_name='Product'),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='quantity',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Quantity'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderNumberCounter',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False, verbose_name='Day')),
+                ('last_value', models.PositiveIntegerField(default=0, verbose_name='Last Value')),
+            ],
+            options={
+                'verbose_name': 'Order Number Counter',
+                'verbose_name_plural': 'Order Number Counters',
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_ordernumbercounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='discount_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Discount Amount'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:47
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_order_summaries(apps, schema_editor):
+    """Tính items_count/first_item_name cho các đơn hàng đã có (như `refresh_order_summaries`)."""
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    alias = schema_editor.connection.alias
+
+    items = OrderItem.objects.using(alias).filter(order=models.OuterRef('pk'))
+    Order.objects.using(alias).update(
+        items_count=Coalesce(
+            models.Subquery(items.order_by().values('order').annotate(count=models.Count('pk')).values('count')),
+            0
+        ),
+        first_item_name=Coalesce(
+            models.Subquery(items.order_by('id').values('product_name')[:1]), models.Value('')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_order_discount_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='first_item_name',
+            field=models.CharField(blank=True, max_length=255, verbose_name='First Item Name'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='items_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Items Count'),
+        ),
+        migrations.RunPython(fill_order_summaries, migrations.RunPython.noop, elidable=True),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
-from products.models import Product
+from products.models import Product, primary_image_prefetch
 from users.models import User
 
 
@@ -45,6 +47,13 @@ class Order(models.Model):
         validators=[MinValueValidator(Decimal('0.00'))],
         verbose_name='Subtotal'
     )
+    discount_amount = models.DecimalField(
+        max_digits=10, 
+        decimal_places=2, 
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(Decimal('0.00'))],
+        verbose_name='Discount Amount'
+    )
     tax_amount = models.DecimalField(
         max_digits=10, 
         decimal_places=2, 
@@ -67,6 +76,11 @@ class Order(models.Model):
         verbose_name='Total Amount'
     )
     
+    # Tóm tắt items, cập nhật khi ghi order items (xem `refresh_order_summaries`)
+    # để danh sách đơn hàng không phải đọc bảng order items
+    items_count = models.PositiveIntegerField(default=0, verbose_name='Items Count')
+    first_item_name = models.CharField(max_length=255, blank=True, verbose_name='First Item Name')
+    
     # Shipping information
     shipping_address = models.TextField(blank=True, verbose_name='Shipping Address')
     billing_address = models.TextField(blank=True, verbose_name='Billing Address')
@@ -85,22 +99,21 @@ class Order(models.Model):
         return f"Order #{self.order_number or self.id} - {self.user.email}"
     
     def save(self, *args, **kwargs):
-        # Auto-generate order number if not provided
+        # Cấp order number trước khi insert (một lần ghi cho mỗi đơn hàng)
         if not self.order_number:
-            # Generate order number based on ID and timestamp
-            # This will be updated after save to include the ID
-            pass
+            from .services.order_numbers import next_order_number
+            self.order_number = next_order_number()
         super().save(*args, **kwargs)
-        
-        # Generate order number after save to include ID
-        if not self.order_number:
-            self.order_number = f"ORD-{self.created_at.strftime('%Y%m%d')}-{self.id:06d}"
-            super().save(update_fields=['order_number'])
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
+        indexes = [
+            # Keyset pagination theo (-created_at, -id)
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['user', '-created_at', '-id']),
+        ]
 
 
 class OrderItem(models.Model):
@@ -148,8 +161,67 @@ class OrderItem(models.Model):
             # self.product_sku = getattr(self.product, 'sku', '')
         
         super().save(*args, **kwargs)
+        refresh_order_summaries([self.order_id])
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        refresh_order_summaries([self.order_id])
+        return result
 
     class Meta:
         ordering = ['id']
         verbose_name = 'Order Item'
         verbose_name_plural = 'Order Items'
+
+
+
+class OrderNumberCounter(models.Model):
+    """
+    Bộ đếm order number theo ngày, xem `orders.services.order_numbers`.
+    """
+    day = models.DateField(primary_key=True, verbose_name='Day')
+    last_value = models.PositiveIntegerField(default=0, verbose_name='Last Value')
+
+    def __str__(self):
+        return f"{self.day}: {self.last_value}"
+
+    class Meta:
+        verbose_name = 'Order Number Counter'
+        verbose_name_plural = 'Order Number Counters'
+
+
+def refresh_order_summaries(order_ids):
+    """
+    Tính lại `items_count`/`first_item_name` của các đơn hàng bằng một `UPDATE`.
+
+    `OrderItem.save()`/`delete()` tự gọi; code ghi order items bằng
+    `bulk_create`/`update()`/queryset `delete()` cần gọi trực tiếp (hoặc set
+    các fields khi tạo Order như checkout).
+    """
+    items = OrderItem.objects.filter(order=models.OuterRef('pk'))
+    return Order.objects.filter(pk__in=order_ids).update(
+        items_count=Coalesce(
+            models.Subquery(items.order_by().values('order').annotate(count=models.Count('pk')).values('count')),
+            0
+        ),
+        first_item_name=Coalesce(
+            models.Subquery(items.order_by('id').values('product_name')[:1]), models.Value('')
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def order_items_prefetch(lookup='items'):
+    """
+    Prefetch order items kèm các relations mà OrderSerializer đọc (product,
+    category, seller, primary image), số queries không phụ thuộc số items.
+
+    Example:
+        Order.objects.prefetch_related(order_items_prefetch())
+    """
+    return models.Prefetch(
+        lookup,
+        queryset=OrderItem.objects.select_related(
+            'product__category', 'product__seller'
+        ).prefetch_related(primary_image_prefetch('product__images'))
+    )
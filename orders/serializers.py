@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from django.db.models import Sum
 from decimal import Decimal
-from products.serializers import ProductSummarySerializer
+from products.serializers import ProductItemListSerializer, ProductSummarySerializer
 from products.models import Product
 from .models import Order, OrderItem
 
@@ -21,6 +21,7 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = OrderItem
+        list_serializer_class = ProductItemListSerializer
         fields = [
             'id', 'product', 'product_id', 'product_name', 'product_sku',
             'quantity', 'price', 'subtotal', 'created_at'
@@ -39,7 +40,7 @@ class OrderSerializer(serializers.ModelSerializer):
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_full_name = serializers.SerializerMethodField(read_only=True)
     status_display = serializers.SerializerMethodField(read_only=True)
-    items_count = serializers.SerializerMethodField(read_only=True)
+    items_count = serializers.IntegerField(read_only=True)
     can_cancel = serializers.SerializerMethodField(read_only=True)
     can_edit = serializers.SerializerMethodField(read_only=True)
 
@@ -47,7 +48,7 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = [
             'id', 'order_number', 'user', 'user_email', 'user_full_name',
-            'status', 'status_display', 'subtotal', 'tax_amount', 
+            'status', 'status_display', 'subtotal', 'discount_amount', 'tax_amount', 
             'shipping_amount', 'total_amount', 'shipping_address',
             'billing_address', 'notes', 'items_count', 'can_cancel', 
             'can_edit', 'created_at', 'updated_at', 'shipped_at', 
@@ -75,9 +76,6 @@ class OrderSerializer(serializers.ModelSerializer):
         }
         return status_choices.get(obj.status, obj.status)
     
-    def get_items_count(self, obj):
-        return obj.items.count()
-    
     def get_can_cancel(self, obj):
         """User có thể hủy đơn hàng nếu đang ở trạng thái pending hoặc processing"""
         return obj.status in ['pending', 'processing']
@@ -87,13 +85,33 @@ class OrderSerializer(serializers.ModelSerializer):
         return obj.status == 'pending'
 
 
-class OrderCreateSerializer(serializers.ModelSerializer):
+class PricingOptionsSerializer(serializers.Serializer):
+    """
+    Tham số tính giá của giỏ hàng (xem `orders.services.pricing`).
     """
-    Serializer để tạo đơn hàng mới từ giỏ hàng.
+    coupon_code = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    voucher_code = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    country = serializers.CharField(max_length=2, required=False, help_text="Mã quốc gia 2 ký tự (VD: VN)")
+    province = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    shipping_method_id = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_country(self, value):
+        if len(value) != 2:
+            raise serializers.ValidationError("Mã quốc gia phải là 2 ký tự")
+        return value.upper()
+
+
+class OrderCreateSerializer(PricingOptionsSerializer, serializers.ModelSerializer):
+    """
+    Serializer để tạo đơn hàng mới từ giỏ hàng, kèm tham số tính giá
+    (coupon/voucher, địa chỉ giao hàng cho phí vận chuyển).
     """
     class Meta:
         model = Order
-        fields = ['shipping_address', 'billing_address', 'notes']
+        fields = [
+            'shipping_address', 'billing_address', 'notes',
+            'coupon_code', 'voucher_code', 'country', 'province', 'shipping_method_id'
+        ]
     
     def validate_shipping_address(self, value):
         if not value or not value.strip():
@@ -174,18 +192,20 @@ class OrderSummarySerializer(serializers.ModelSerializer):
     """
     user_email = serializers.CharField(source='user.email', read_only=True)
     status_display = serializers.SerializerMethodField(read_only=True)
-    items_count = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Order
+        # items_count/first_item_name là cột tóm tắt của Order, không đọc order items
         fields = [
             'id', 'order_number', 'user_email', 'status', 'status_display',
-            'total_amount', 'items_count', 'created_at'
+            'total_amount', 'items_count', 'first_item_name', 'created_at'
         ]
         read_only_fields = [
             'id', 'order_number', 'user_email', 'status', 'status_display',
-            'total_amount', 'items_count', 'created_at'
+            'total_amount', 'items_count', 'first_item_name', 'created_at'
         ]
+        # Values fast path (OrderViewSet.list)
+        values_source_fields = {'status_display': ('status',)}
     
     def get_status_display(self, obj):
         status_choices = {
@@ -197,6 +217,3 @@ class OrderSummarySerializer(serializers.ModelSerializer):
             'cancelled': 'Đã hủy'
         }
         return status_choices.get(obj.status, obj.status)
-    
-    def get_items_count(self, obj):
-        return obj.items.count()
@@ -0,0 +1,245 @@
+"""
+Checkout Service
+
+Tạo đơn hàng từ giỏ hàng của user trong một transaction:
+
+1. Load cart items kèm product (`select_related`) và lock các rows bằng
+   `select_for_update`, sắp xếp theo product id để hai checkout cùng chứa
+   các products giống nhau luôn lock theo cùng thứ tự (không deadlock)
+2. Kiểm tra product còn bán và đủ tồn kho
+3. Tính tổng tiền (discount, shipping, tax) bằng `orders.services.pricing`,
+   cùng công thức với quote endpoint của giỏ hàng
+4. Trừ tồn kho bằng một `UPDATE` có điều kiện `stock >= quantity` cho tất cả
+   products (`F()`, không đọc-rồi-ghi)
+5. Ghi nhận lượt dùng coupon/voucher bằng `UPDATE` có điều kiện
+6. Tạo Order (order number được cấp trước transaction), `bulk_create` các
+   OrderItems và xóa cart items
+7. Khi `STOCK_RESERVATIONS_ENABLED` bật, giữ tồn kho theo kho cho đơn hàng
+   (`inventory.services.reservations`); holds được xác nhận hoặc trả khi
+   đơn hàng được thanh toán/xử lý hoặc bị hủy
+
+Số queries không phụ thuộc số dòng trong giỏ hàng. Lỗi ở bất kỳ bước nào
+rollback toàn bộ, không để lại đơn hàng ghi dở.
+
+Vì `update()`/`bulk_create` không gửi `post_save`, listing projection và
+response cache của các products được cập nhật trực tiếp.
+"""
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+
+from cart.models import Cart, CartItem
+from cart.services.totals import invalidate_cart_totals
+from core.utils.response_cache import model_cache_tag, purge_cache_tags
+from inventory.services.reservations import ReservationError, reservations_enabled, reserve_quantities
+from products.models import Product
+from products.services.listings import sync_product_listings
+from promotions.models import Coupon, UsageLog, Voucher
+
+from ..models import Order, OrderItem
+from .order_numbers import next_order_number
+from .pricing import PricingError, quote_cart_items
+
+# Các keys của order data dùng để tính giá, không phải fields của Order
+PRICING_OPTIONS = ('coupon_code', 'voucher_code', 'country', 'province', 'shipping_method_id')
+
+
+class CheckoutError(Exception):
+    """
+    Giỏ hàng không checkout được (trống, hết hàng...).
+
+    Attributes:
+        message (str): Thông báo cho user
+        errors (dict): Lỗi theo product id
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors or {}
+
+
+def calculate_totals(items, user=None, **pricing_options):
+    """
+    Tổng tiền đơn hàng từ các cart items (đã load product).
+
+    Args:
+        items (list): Cart items
+        user: User đặt hàng (chủ voucher)
+        **pricing_options: coupon_code, voucher_code, country, province,
+            shipping_method_id
+
+    Returns:
+        tuple: ({'subtotal', 'discount_amount', 'tax_amount', 'shipping_amount',
+        'total_amount'}, coupon, voucher)
+
+    Raises:
+        CheckoutError: Coupon/voucher không hợp lệ hoặc không giao được
+    """
+    try:
+        quote, coupon, voucher = quote_cart_items(items, user, **pricing_options)
+    except PricingError as exc:
+        raise CheckoutError(exc.message, exc.errors)
+    totals = {
+        field: quote[field]
+        for field in ('subtotal', 'discount_amount', 'tax_amount', 'shipping_amount', 'total_amount')
+    }
+    return totals, coupon, voucher
+
+
+def lock_cart_items(cart):
+    """
+    Cart items kèm product, lock cart items và products theo thứ tự product id.
+    """
+    return list(
+        CartItem.objects.filter(cart=cart)
+        .select_related('product')
+        .select_for_update(of=('self', 'product'))
+        .order_by('product_id')
+    )
+
+
+def validate_items(items):
+    """
+    Raises:
+        CheckoutError: Product không còn bán hoặc không đủ tồn kho
+    """
+    errors = {}
+    for item in items:
+        product = item.product
+        if product.status != 'active':
+            errors[product.pk] = f"Sản phẩm '{product.name}' không còn được bán"
+        elif product.track_inventory and product.stock < item.quantity:
+            errors[product.pk] = f"Sản phẩm '{product.name}' chỉ còn {product.stock} trong kho"
+    if errors:
+        raise CheckoutError("Một số sản phẩm trong giỏ hàng không đủ điều kiện đặt hàng", errors)
+
+
+def decrement_stock(items):
+    """
+    Trừ tồn kho của các products theo dõi tồn kho bằng một query.
+
+    Mỗi product chỉ được trừ khi `stock >= quantity`; nếu số rows được cập
+    nhật ít hơn số products, transaction bị rollback.
+    """
+    quantities = {item.product_id: item.quantity for item in items if item.product.track_inventory}
+    if not quantities:
+        return
+
+    condition = Q()
+    for product_id, quantity in quantities.items():
+        condition |= Q(pk=product_id, stock__gte=quantity)
+    updated = Product.objects.filter(condition).update(
+        stock=Case(
+            *(When(pk=product_id, then=F('stock') - quantity) for product_id, quantity in quantities.items()),
+            default=F('stock'),
+            output_field=Product._meta.get_field('stock'),
+        ),
+        updated_at=timezone.now(),
+    )
+    if updated != len(quantities):
+        raise CheckoutError("Tồn kho đã thay đổi, vui lòng thử lại")
+
+
+def redeem_promotions(order, user, coupon=None, voucher=None):
+    """
+    Ghi nhận lượt dùng coupon/voucher của đơn hàng.
+
+    `used_count`/`is_used` được cập nhật bằng `UPDATE` có điều kiện nên hai
+    checkout cùng lúc không dùng quá `max_uses` hoặc dùng một voucher hai lần.
+    Usage logs được tạo bằng `bulk_create` (không chạy `UsageLog.save()`/signals
+    vốn cũng tăng các counters này).
+    """
+    logs = []
+    if coupon is not None:
+        updated = Coupon.objects.filter(pk=coupon.pk).filter(
+            Q(max_uses=0) | Q(used_count__lt=F('max_uses'))
+        ).update(used_count=F('used_count') + 1, updated_at=timezone.now())
+        if not updated:
+            raise CheckoutError("Mã giảm giá đã hết lượt sử dụng", {'coupon_code': [coupon.code]})
+        logs.append(UsageLog(promo_type='coupon', coupon=coupon))
+    if voucher is not None:
+        if not Voucher.objects.filter(pk=voucher.pk, is_used=False).update(is_used=True):
+            raise CheckoutError("Phiếu giảm giá đã được sử dụng", {'voucher_code': [voucher.code]})
+        logs.append(UsageLog(promo_type='voucher', voucher=voucher))
+
+    customer = getattr(user, 'customer', None) if logs else None
+    if customer is not None:
+        # Discount của cả đơn ghi vào log đầu tiên
+        for index, log in enumerate(logs):
+            log.customer = customer
+            log.order = order
+            log.discount_amount = order.discount_amount if index == 0 else 0
+        UsageLog.objects.bulk_create(logs)
+
+
+def checkout_cart(user, order_data):
+    """
+    Tạo đơn hàng từ giỏ hàng của user.
+
+    Args:
+        user: User đặt hàng
+        order_data (dict): Dữ liệu đã validate của OrderCreateSerializer
+
+    Returns:
+        Order: Đơn hàng vừa tạo
+
+    Raises:
+        CheckoutError: Giỏ hàng trống hoặc không đủ điều kiện đặt hàng
+    """
+    # Cấp trước khi mở transaction để không giữ lock counter suốt checkout
+    order_number = next_order_number()
+    order_data = dict(order_data)
+    pricing_options = {key: order_data.pop(key, None) for key in PRICING_OPTIONS}
+    pricing_options = {key: value for key, value in pricing_options.items() if value}
+    with transaction.atomic():
+        return _checkout(user, order_data, pricing_options, order_number)
+
+
+def _checkout(user, order_data, pricing_options, order_number):
+    cart, _ = Cart.objects.get_or_create(user=user)
+    items = lock_cart_items(cart)
+    if not items:
+        raise CheckoutError("Giỏ hàng đang trống")
+
+    validate_items(items)
+    totals, coupon, voucher = calculate_totals(items, user, **pricing_options)
+    decrement_stock(items)
+
+    # Order items được tạo bằng bulk_create nên cột tóm tắt được set trực tiếp
+    order = Order.objects.create(
+        user=user, order_number=order_number, status='pending',
+        items_count=len(items), first_item_name=items[0].product.name, **totals, **order_data
+    )
+    redeem_promotions(order, user, coupon, voucher)
+    if reservations_enabled():
+        try:
+            reserve_quantities(
+                {item.product_id: item.quantity for item in items}, order=order, cart_id=cart.pk
+            )
+        except ReservationError as exc:
+            raise CheckoutError(exc.message, exc.errors)
+    OrderItem.objects.bulk_create([
+        OrderItem(
+            order=order,
+            product=item.product,
+            quantity=item.quantity,
+            price=item.product.price,
+            product_name=item.product.name,
+            product_sku=item.product.sku or '',
+        )
+        for item in items
+    ])
+
+    # Xóa giỏ hàng sau khi tạo đơn hàng (updated_at cho conditional GET của cart)
+    CartItem.objects.filter(pk__in=[item.pk for item in items]).delete()
+    Cart.objects.filter(pk=cart.pk).update(updated_at=timezone.now())
+    invalidate_cart_totals(cart.pk)
+
+    # Side effects mà post_save của Product thường đảm nhận
+    product_ids = [item.product_id for item in items]
+    sync_product_listings(product_ids)
+    purge_cache_tags(
+        model_cache_tag(Product), *(f'{model_cache_tag(Product)}:{product_id}' for product_id in product_ids)
+    )
+    return order
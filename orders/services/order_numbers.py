@@ -0,0 +1,99 @@
+"""
+Order Number Allocation
+
+Order number có dạng `ORD-YYYYMMDD-NNNNNN`, với `NNNNNN` là số thứ tự trong
+ngày lấy từ bảng `OrderNumberCounter` (một row mỗi ngày). Number được cấp
+trước khi insert nên mỗi đơn hàng chỉ cần một lần ghi và `post_save` chỉ
+chạy một lần.
+
+- `allocate_order_numbers(count)` cấp một block numbers liên tiếp bằng một
+  lần lock row counter, dùng cho tạo đơn hàng hàng loạt
+- `next_order_number()` lấy number từ block đã cấp trong process; kích thước
+  block là setting `ORDER_NUMBER_BLOCK_SIZE` (mặc định 100), nên row counter
+  chỉ bị lock một lần cho mỗi block thay vì mỗi đơn hàng. Đổi lại numbers
+  giữa các workers không tăng dần theo thời gian tạo và có thể bị bỏ trống
+  khi process khởi động lại hoặc transaction dùng number bị rollback. Đặt
+  `ORDER_NUMBER_BLOCK_SIZE = 1` nếu cần numbers liên tục.
+
+Caller không được giữ transaction mở khi gọi `next_order_number()` (cấp
+number trước `transaction.atomic()`, xem `checkout_cart`): khi block của
+process đã hết, number được cấp trong transaction của caller và row counter
+bị lock tới khi transaction đó kết thúc, chặn mọi checkout khác trong ngày.
+"""
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import Order, OrderNumberCounter
+
+ORDER_NUMBER_PREFIX = 'ORD'
+
+DEFAULT_ORDER_NUMBER_BLOCK_SIZE = 100
+
+_blocks = {}
+_blocks_lock = threading.Lock()
+
+
+def format_order_number(day, value):
+    return f"{ORDER_NUMBER_PREFIX}-{day.strftime('%Y%m%d')}-{value:06d}"
+
+
+def _initial_counter_value(day):
+    """
+    Số thứ tự lớn nhất đã dùng trong ngày, để counter mới không trùng với
+    các order numbers đã tồn tại (ví dụ được cấp theo id trước đây).
+    """
+    prefix = format_order_number(day, 0)[:-6]
+    numbers = Order.objects.filter(order_number__startswith=prefix).values_list('order_number', flat=True)
+    suffixes = [int(number[len(prefix):]) for number in numbers if number[len(prefix):].isdigit()]
+    return max(suffixes, default=0)
+
+
+def allocate_order_numbers(count=1, day=None):
+    """
+    Cấp `count` order numbers liên tiếp của ngày `day` (mặc định hôm nay).
+
+    Returns:
+        list: Các order numbers đã cấp
+    """
+    day = day or timezone.localdate()
+    with transaction.atomic():
+        counter = OrderNumberCounter.objects.select_for_update().filter(day=day).first()
+        if counter is None:
+            counter, _ = OrderNumberCounter.objects.select_for_update().get_or_create(
+                day=day, defaults={'last_value': _initial_counter_value(day)}
+            )
+        start = counter.last_value + 1
+        counter.last_value += count
+        counter.save(update_fields=['last_value'])
+    return [format_order_number(day, value) for value in range(start, start + count)]
+
+
+def get_order_number_block_size():
+    return getattr(settings, 'ORDER_NUMBER_BLOCK_SIZE', DEFAULT_ORDER_NUMBER_BLOCK_SIZE)
+
+
+def next_order_number():
+    """
+    Order number tiếp theo từ block của process, cấp block mới khi hết.
+
+    Phải được gọi ngoài transaction: block đã cấp vẫn được dùng trong
+    transaction, nhưng khi block hết thì chỉ cấp một number trong
+    transaction của caller và row counter bị lock tới khi transaction đó
+    kết thúc.
+    """
+    day = timezone.localdate()
+    with _blocks_lock:
+        block = _blocks.get(day)
+        if not block:
+            if connection.in_atomic_block:
+                # Counter được rollback cùng transaction bên ngoài: không giữ
+                # block vì process khác có thể cấp lại các numbers đó
+                return allocate_order_numbers(1, day)[0]
+            block = allocate_order_numbers(get_order_number_block_size(), day)
+            # Chỉ giữ block của ngày hiện tại
+            _blocks.clear()
+            _blocks[day] = block
+        return block.pop(0)
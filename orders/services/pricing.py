@@ -0,0 +1,330 @@
+"""
+Pricing Service
+
+Tính tổng tiền của một giỏ hàng (snapshot các dòng product/quantity/giá) trong
+một lần duyệt các dòng:
+
+- Subtotal từng dòng và toàn giỏ, tổng trọng lượng
+- Discount của coupon (trên subtotal) và voucher (trên subtotal của các dòng
+  thuộc campaign của voucher, nếu có)
+- Phí vận chuyển theo `ShippingZone` của địa chỉ và `ShippingRate` theo
+  tổng trọng lượng; `PricingError` nếu không rate nào khớp (miễn phí khi
+  chưa cấu hình shipping rate nào)
+- Thuế theo `ORDER_TAX_RATE` trên subtotal sau discount
+
+Mọi phép tính dùng `Decimal`, làm tròn 2 chữ số (`ROUND_HALF_UP`).
+
+Reference data (shipping zones/rates, campaigns đang active và products/
+categories của chúng, tax rate) được load một lần và giữ trong memory của
+process. Signals save/delete của các models đó tăng version trong cache để
+mọi process load lại; `PRICING_REFERENCE_TTL` giới hạn thời gian một snapshot
+được dùng. Coupon/voucher được đọc theo code ở mỗi lần tính vì trạng thái sử
+dụng của chúng thay đổi liên tục.
+
+Được dùng bởi quote endpoint của giỏ hàng (`GET /api/v1/cart/me/quote/`) và
+checkout (`orders.services.checkout`), nên số tiền hiển thị ở trang giỏ hàng
+trùng với số tiền của đơn hàng.
+"""
+import threading
+import time
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from promotions.models import Coupon, PromotionCampaign, Voucher, calculate_discount_amount
+from shipping.models import ShippingRate, ShippingZone
+
+REFERENCE_VERSION_KEY = 'pricing:reference:version'
+DEFAULT_REFERENCE_TTL = 300
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+PriceLine = namedtuple('PriceLine', ['product_id', 'category_id', 'quantity', 'unit_price', 'weight'])
+
+ShippingOption = namedtuple('ShippingOption', ['method_id', 'method_name', 'min_weight', 'max_weight', 'price'])
+
+Campaign = namedtuple('Campaign', ['id', 'start_date', 'end_date', 'product_ids', 'category_ids'])
+
+ReferenceData = namedtuple('ReferenceData', ['version', 'loaded_at', 'zones', 'rates', 'campaigns', 'tax_rate'])
+
+_reference = None
+_reference_lock = threading.Lock()
+
+
+class PricingError(Exception):
+    """
+    Không tính được giá (coupon/voucher không hợp lệ, không có phương thức
+    vận chuyển...).
+
+    Attributes:
+        message (str): Thông báo cho user
+        errors (dict): Lỗi theo field
+    """
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors or {}
+
+
+def money(amount):
+    """Làm tròn số tiền về 2 chữ số."""
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def get_tax_rate():
+    """Thuế suất (ví dụ `Decimal('0.10')` cho 10%), mặc định 0."""
+    return Decimal(str(getattr(settings, 'ORDER_TAX_RATE', '0')))
+
+
+def _load_reference_data(version):
+    zones = tuple(
+        (
+            zone['id'],
+            frozenset(code.strip().upper() for code in zone['countries'].split(',') if code.strip()),
+            frozenset(name.strip().upper() for name in zone['provinces'].split(',') if name.strip()),
+        )
+        for zone in ShippingZone.objects.filter(is_active=True).order_by('id').values('id', 'countries', 'provinces')
+    )
+
+    rates = {}
+    rate_rows = ShippingRate.objects.filter(
+        is_active=True, shipping_method__is_active=True
+    ).order_by('price', 'id').values_list(
+        'shipping_zone_id', 'shipping_method_id', 'shipping_method__name', 'min_weight', 'max_weight', 'price'
+    )
+    for zone_id, *option in rate_rows:
+        rates.setdefault(zone_id, []).append(ShippingOption(*option))
+
+    campaign_rows = list(
+        PromotionCampaign.objects.filter(is_active=True).values_list('id', 'start_date', 'end_date')
+    )
+    campaign_ids = [row[0] for row in campaign_rows]
+    product_ids, category_ids = {}, {}
+    for through, field, target in (
+        (PromotionCampaign.products.through, 'product_id', product_ids),
+        (PromotionCampaign.categories.through, 'category_id', category_ids),
+    ):
+        for campaign_id, related_id in through.objects.filter(
+            promotioncampaign_id__in=campaign_ids
+        ).values_list('promotioncampaign_id', field):
+            target.setdefault(campaign_id, set()).add(related_id)
+
+    campaigns = {
+        campaign_id: Campaign(
+            campaign_id, start_date, end_date,
+            frozenset(product_ids.get(campaign_id, ())), frozenset(category_ids.get(campaign_id, ()))
+        )
+        for campaign_id, start_date, end_date in campaign_rows
+    }
+    return ReferenceData(
+        version, time.monotonic(), zones,
+        {zone_id: tuple(options) for zone_id, options in rates.items()},
+        campaigns, get_tax_rate()
+    )
+
+
+def get_reference_data():
+    """
+    Reference data của pricing, load lại khi version trong cache đổi hoặc
+    snapshot cũ hơn `PRICING_REFERENCE_TTL` giây.
+
+    Returns:
+        ReferenceData
+    """
+    global _reference
+    version = cache.get(REFERENCE_VERSION_KEY, 0)
+    ttl = getattr(settings, 'PRICING_REFERENCE_TTL', DEFAULT_REFERENCE_TTL)
+
+    reference = _reference
+    if reference is None or reference.version != version or time.monotonic() - reference.loaded_at > ttl:
+        with _reference_lock:
+            reference = _reference
+            if reference is None or reference.version != version or time.monotonic() - reference.loaded_at > ttl:
+                reference = _reference = _load_reference_data(version)
+    return reference
+
+
+def invalidate_reference_data():
+    """Bỏ snapshot của process hiện tại và báo các process khác load lại."""
+    global _reference
+    _reference = None
+    try:
+        cache.incr(REFERENCE_VERSION_KEY)
+    except ValueError:
+        cache.set(REFERENCE_VERSION_KEY, 1, None)
+
+
+def lines_from_cart_items(items):
+    """Snapshot các cart items (đã `select_related('product')`)."""
+    return [
+        PriceLine(
+            item.product_id, item.product.category_id, item.quantity,
+            item.product.price, item.product.weight or ZERO
+        )
+        for item in items
+    ]
+
+
+def find_shipping_options(reference, country, province='', weight=ZERO):
+    """
+    Các phương thức vận chuyển cho địa chỉ và trọng lượng, rẻ nhất trước.
+
+    Zone khớp khi country thuộc zone và zone không giới hạn provinces hoặc
+    province thuộc zone (cùng quy tắc với `/shipping/rates/calculate/`).
+    """
+    country, province = country.upper(), (province or '').upper()
+    options = []
+    for zone_id, countries, provinces in reference.zones:
+        if country in countries and (not provinces or province in provinces):
+            options.extend(
+                option for option in reference.rates.get(zone_id, ())
+                if option.min_weight <= weight <= option.max_weight
+            )
+    return sorted(options, key=lambda option: option.price)
+
+
+def _campaign_is_valid(campaign, now):
+    if campaign is None:
+        return False
+    if campaign.start_date and campaign.start_date > now:
+        return False
+    return not (campaign.end_date and campaign.end_date < now)
+
+
+def get_coupon(code):
+    """
+    Raises:
+        PricingError: Coupon không tồn tại hoặc hết hạn/hết lượt
+    """
+    coupon = Coupon.objects.filter(code=code).first()
+    if coupon is None or not coupon.is_valid:
+        raise PricingError("Mã giảm giá không hợp lệ hoặc đã hết hạn", {'coupon_code': [code]})
+    return coupon
+
+
+def get_voucher(code, user):
+    """
+    Raises:
+        PricingError: Voucher không tồn tại, không thuộc user hoặc đã dùng/hết hạn
+    """
+    voucher = Voucher.objects.filter(code=code, owner__user=user).first()
+    if voucher is None or not voucher.is_valid:
+        raise PricingError("Phiếu giảm giá không hợp lệ hoặc đã hết hạn", {'voucher_code': [code]})
+    return voucher
+
+
+def calculate_quote(lines, coupon=None, voucher=None, country=None, province='', shipping_method_id=None,
+                    reference=None, now=None):
+    """
+    Tính tổng tiền cho các dòng của giỏ hàng.
+
+    Args:
+        lines (list[PriceLine]): Snapshot các dòng
+        coupon (Coupon): Coupon áp dụng trên subtotal
+        voucher (Voucher): Voucher áp dụng trên các dòng thuộc campaign của nó
+        country (str): Mã quốc gia giao hàng; mặc định `PRICING_DEFAULT_COUNTRY`
+        province (str): Tỉnh/thành giao hàng
+        shipping_method_id (int): Phương thức vận chuyển; mặc định rẻ nhất
+        reference (ReferenceData): Mặc định `get_reference_data()`
+        now (datetime): Thời điểm kiểm tra hiệu lực campaign
+
+    Returns:
+        dict: subtotal, discount_amount, shipping_amount, tax_amount,
+        total_amount, total_weight, shipping_method, lines. Khi chưa cấu
+        hình shipping rate nào, shipping_method là None và shipping_amount 0
+
+    Raises:
+        PricingError: Coupon/voucher không đạt điều kiện hoặc không có
+            phương thức vận chuyển cho địa chỉ/trọng lượng
+    """
+    reference = reference or get_reference_data()
+    now = now or timezone.now()
+
+    campaign = None
+    if voucher is not None and voucher.campaign_id is not None:
+        campaign = reference.campaigns.get(voucher.campaign_id)
+        if not _campaign_is_valid(campaign, now):
+            raise PricingError("Chương trình khuyến mãi của phiếu giảm giá đã kết thúc", {'voucher_code': [voucher.code]})
+    restricted = campaign is not None and bool(campaign.product_ids or campaign.category_ids)
+
+    # Một lần duyệt: subtotal, trọng lượng, phần subtotal thuộc campaign
+    subtotal = eligible_subtotal = total_weight = ZERO
+    line_totals = []
+    for line in lines:
+        line_total = money(line.unit_price * line.quantity)
+        subtotal += line_total
+        total_weight += line.weight * line.quantity
+        if not restricted or line.product_id in campaign.product_ids or line.category_id in campaign.category_ids:
+            eligible_subtotal += line_total
+        line_totals.append({'product_id': line.product_id, 'quantity': line.quantity,
+                            'unit_price': line.unit_price, 'subtotal': line_total})
+
+    discount_amount = ZERO
+    if coupon is not None:
+        if subtotal < coupon.min_order_amount:
+            raise PricingError(
+                f"Đơn hàng cần tối thiểu {coupon.min_order_amount} để áp dụng mã giảm giá này",
+                {'coupon_code': [coupon.code]}
+            )
+        discount_amount += calculate_discount_amount(coupon.discount_type, coupon.value, subtotal)
+    if voucher is not None:
+        if subtotal < voucher.min_order_amount:
+            raise PricingError(
+                f"Đơn hàng cần tối thiểu {voucher.min_order_amount} để áp dụng phiếu giảm giá này",
+                {'voucher_code': [voucher.code]}
+            )
+        discount_amount += calculate_discount_amount(voucher.discount_type, voucher.value, eligible_subtotal)
+    discount_amount = min(discount_amount, subtotal)
+
+    shipping_method = None
+    shipping_amount = ZERO
+    options = find_shipping_options(
+        reference, country or getattr(settings, 'PRICING_DEFAULT_COUNTRY', 'VN'), province, total_weight
+    )
+    if shipping_method_id is not None:
+        options = [option for option in options if option.method_id == shipping_method_id]
+        if not options:
+            raise PricingError(
+                "Phương thức vận chuyển không hỗ trợ địa chỉ hoặc trọng lượng này",
+                {'shipping_method_id': [shipping_method_id]}
+            )
+    if options:
+        shipping_method = {'id': options[0].method_id, 'name': options[0].method_name}
+        shipping_amount = money(options[0].price)
+    elif any(reference.rates.values()):
+        raise PricingError(
+            "Không có phương thức vận chuyển cho địa chỉ hoặc trọng lượng này",
+            {'country': [country or getattr(settings, 'PRICING_DEFAULT_COUNTRY', 'VN')]}
+        )
+
+    tax_amount = money((subtotal - discount_amount) * reference.tax_rate)
+    return {
+        'subtotal': subtotal,
+        'discount_amount': discount_amount,
+        'shipping_amount': shipping_amount,
+        'tax_amount': tax_amount,
+        'total_amount': subtotal - discount_amount + shipping_amount + tax_amount,
+        'total_weight': total_weight,
+        'shipping_method': shipping_method,
+        'lines': line_totals,
+    }
+
+
+def quote_cart_items(items, user, coupon_code=None, voucher_code=None, **options):
+    """
+    Tính tổng tiền cho các cart items của user, đọc coupon/voucher theo code.
+
+    Returns:
+        tuple: (quote dict, coupon, voucher)
+    """
+    coupon = get_coupon(coupon_code) if coupon_code else None
+    voucher = get_voucher(voucher_code, user) if voucher_code else None
+    quote = calculate_quote(lines_from_cart_items(items), coupon=coupon, voucher=voucher, **options)
+    quote['coupon_code'] = coupon.code if coupon else None
+    quote['voucher_code'] = voucher.code if voucher else None
+    return quote, coupon, voucher
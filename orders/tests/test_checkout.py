@@ -0,0 +1,111 @@
+"""
+Tests cho checkout pipeline của OrderSelfViewSet.create.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+from orders.services.checkout import CheckoutError, checkout_cart, decrement_stock
+from orders.services.order_numbers import next_order_number
+from orders.services.pricing import get_reference_data
+from orders.viewsets import OrderSelfViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+class CheckoutTest(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.cart = Cart.objects.create(user=self.user)
+        self.view = OrderSelfViewSet.as_view({'post': 'create'})
+
+    def add_products(self, count, stock=10, quantity=2):
+        products = []
+        start = Product.objects.count()
+        for index in range(start, start + count):
+            product = Product.objects.create(
+                name=f'Product {index}', description='x', price=Decimal('10.00') + index,
+                seller=self.seller, status='active', stock=stock, sku=f'SKU-{index}'
+            )
+            CartItem.objects.create(cart=self.cart, product=product, quantity=quantity)
+            products.append(product)
+        return products
+
+    def post(self, data=None):
+        request = self.factory.post('/api/v1/orders/me/', data or {'shipping_address': 'Hanoi'}, format='json')
+        force_authenticate(request, user=self.user)
+        response = self.view(request)
+        response.render()
+        return response
+
+    def test_creates_order_and_decrements_stock(self):
+        products = self.add_products(2)
+        response = self.post()
+
+        self.assertEqual(response.status_code, 201, response.data)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(order.subtotal, Decimal('42.00'))
+        self.assertEqual(order.total_amount, Decimal('42.00'))
+        self.assertEqual(
+            list(order.items.values_list('product_id', 'quantity', 'price', 'product_sku')),
+            [(products[0].pk, 2, Decimal('10.00'), 'SKU-0'), (products[1].pk, 2, Decimal('11.00'), 'SKU-1')]
+        )
+        self.assertEqual(response.data['data']['items_count'], 2)
+        self.assertEqual(list(Product.objects.order_by('pk').values_list('stock', flat=True)), [8, 8])
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+
+    def test_query_count_does_not_depend_on_cart_size(self):
+        # Row counter order number của ngày được tạo ở lần cấp đầu tiên,
+        # reference data của pricing được load ở lần tính giá đầu tiên
+        next_order_number()
+        get_reference_data()
+        self.add_products(2)
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.post().status_code, 201)
+
+        self.add_products(8)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(self.post().status_code, 201)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_insufficient_stock_rolls_back(self):
+        products = self.add_products(2, stock=1)
+        Product.objects.filter(pk=products[0].pk).update(stock=5)
+
+        response = self.post()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(products[1].pk, response.data['errors'])
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Product.objects.get(pk=products[0].pk).stock, 5)
+        self.assertEqual(CartItem.objects.filter(cart=self.cart).count(), 2)
+
+    def test_concurrent_stock_change_rolls_back(self):
+        products = self.add_products(1, stock=3)
+        items = list(CartItem.objects.filter(cart=self.cart).select_related('product'))
+        # Stock bị request khác trừ sau khi đã validate
+        Product.objects.filter(pk=products[0].pk).update(stock=1)
+        with self.assertRaises(CheckoutError):
+            decrement_stock(items)
+        self.assertEqual(Product.objects.get(pk=products[0].pk).stock, 1)
+
+    def test_empty_cart(self):
+        with self.assertRaises(CheckoutError):
+            checkout_cart(self.user, {'shipping_address': 'Hanoi'})
+        self.assertEqual(self.post().status_code, 400)
+        self.assertFalse(OrderItem.objects.exists())
@@ -0,0 +1,107 @@
+"""
+Tests cho read path của lịch sử đơn hàng (prefetch theo action, cột tóm tắt items).
+"""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from orders.models import Order, OrderItem
+from orders.viewsets import OrderSelfViewSet
+from products.models import Product
+
+User = get_user_model()
+
+
+class OrderHistoryTest(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.products = [
+            Product.objects.create(
+                name=f'Product {index}', description='x', price=Decimal('10.00'),
+                seller=seller, status='active', stock=10, sku=f'SKU-{index}'
+            )
+            for index in range(3)
+        ]
+
+    def create_orders(self, count, items=2):
+        orders = []
+        for _ in range(count):
+            order = Order.objects.create(user=self.user, total_amount=Decimal('20.00'))
+            for product in self.products[:items]:
+                OrderItem.objects.create(order=order, product=product, quantity=1, price=product.price)
+            orders.append(order)
+        return orders
+
+    def get(self, action, path='/', **kwargs):
+        request = self.factory.get(path)
+        force_authenticate(request, user=self.user)
+        response = OrderSelfViewSet.as_view({'get': action})(request, **kwargs)
+        response.render()
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_summary_columns_follow_items(self):
+        order = self.create_orders(1, items=3)[0]
+        order.refresh_from_db()
+        self.assertEqual((order.items_count, order.first_item_name), (3, 'Product 0'))
+
+        order.items.order_by('id').first().delete()
+        order.refresh_from_db()
+        self.assertEqual((order.items_count, order.first_item_name), (2, 'Product 1'))
+
+        Order.objects.filter(pk=order.pk).update(items_count=0, first_item_name='')
+        call_command('refresh_order_summaries', stdout=StringIO())
+        order.refresh_from_db()
+        self.assertEqual((order.items_count, order.first_item_name), (2, 'Product 1'))
+
+    def assert_list_queries_constant(self, action):
+        self.create_orders(2)
+        with CaptureQueriesContext(connection) as small:
+            response = self.get(action)
+        data = response.data.get('data', response.data)
+        self.assertEqual(data['results'][0]['items_count'], 2)
+        self.assertEqual(data['results'][0]['first_item_name'], 'Product 0')
+
+        self.create_orders(5, items=3)
+        with CaptureQueriesContext(connection) as large:
+            self.get(action)
+
+        self.assertEqual(len(small), len(large))
+        self.assertFalse([query for query in large if 'orders_orderitem' in query['sql']])
+        self.assertFalse([query for query in large if 'FROM "users_user"' in query['sql']])
+        return large
+
+    def test_list_reads_summary_columns(self):
+        queries = self.assert_list_queries_constant('list')
+        # Conditional GET validators, count và trang kết quả
+        self.assertEqual(len(queries), 3)
+
+    def test_history_reads_summary_columns(self):
+        queries = self.assert_list_queries_constant('history')
+        # Conditional GET validators và trang kết quả (cursor pagination)
+        self.assertEqual(len(queries), 2)
+
+    def test_retrieve_prefetches_items(self):
+        small, large = self.create_orders(1, items=1)[0], self.create_orders(1, items=3)[0]
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.get('retrieve', pk=small.pk)
+        with CaptureQueriesContext(connection) as large_queries:
+            data = self.get('retrieve', pk=large.pk).data['data']
+
+        self.assertEqual(len(data['items']), 3)
+        self.assertEqual(data['items_count'], 3)
+        self.assertEqual(len(small_queries), len(large_queries))
@@ -0,0 +1,90 @@
+"""
+Tests cho cấp order number trước khi insert.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from orders.models import Order, OrderNumberCounter
+from orders.services import order_numbers
+from orders.services.order_numbers import allocate_order_numbers, format_order_number, next_order_number
+
+User = get_user_model()
+
+
+class OrderNumberTest(TestCase):
+
+    def setUp(self):
+        order_numbers._blocks.clear()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.today = timezone.localdate()
+
+    def test_order_is_inserted_once_with_number(self):
+        with CaptureQueriesContext(connection) as queries:
+            order = Order.objects.create(user=self.user)
+
+        self.assertEqual(order.order_number, format_order_number(self.today, 1))
+        writes = [q['sql'] for q in queries if 'orders_order"' in q['sql'] and not q['sql'].startswith('SELECT')]
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('INSERT'))
+        self.assertEqual(Order.objects.get(pk=order.pk).order_number, order.order_number)
+
+    def test_numbers_are_sequential_per_day(self):
+        numbers = [Order.objects.create(user=self.user).order_number for _ in range(3)]
+        self.assertEqual(numbers, [format_order_number(self.today, value) for value in (1, 2, 3)])
+        self.assertEqual(OrderNumberCounter.objects.get(day=self.today).last_value, 3)
+
+    def test_new_counter_continues_after_existing_numbers(self):
+        Order.objects.create(user=self.user, order_number=format_order_number(self.today, 41))
+        self.assertEqual(next_order_number(), format_order_number(self.today, 42))
+
+    def test_allocate_block(self):
+        first = allocate_order_numbers(5)
+        second = allocate_order_numbers(2)
+        self.assertEqual(first[-1], format_order_number(self.today, 5))
+        self.assertEqual(second, [format_order_number(self.today, value) for value in (6, 7)])
+
+    @override_settings(ORDER_NUMBER_BLOCK_SIZE=3)
+    def test_process_block_outside_transactions(self):
+        with mock.patch.object(order_numbers, 'connection') as mocked_connection:
+            mocked_connection.in_atomic_block = False
+            numbers = [next_order_number() for _ in range(4)]
+
+        self.assertEqual(numbers, [format_order_number(self.today, value) for value in (1, 2, 3, 4)])
+        # Hai lần cấp block (3 + 3)
+        self.assertEqual(OrderNumberCounter.objects.get(day=self.today).last_value, 6)
+
+    @override_settings(ORDER_NUMBER_BLOCK_SIZE=3)
+    def test_no_block_inside_transaction(self):
+        next_order_number()
+        self.assertEqual(OrderNumberCounter.objects.get(day=self.today).last_value, 1)
+        self.assertEqual(order_numbers._blocks, {})
+
+    @override_settings(ORDER_NUMBER_BLOCK_SIZE=3)
+    def test_process_block_used_inside_transaction(self):
+        with mock.patch.object(order_numbers, 'connection') as mocked_connection:
+            mocked_connection.in_atomic_block = False
+            next_order_number()
+
+        with CaptureQueriesContext(connection) as queries:
+            numbers = [next_order_number() for _ in range(2)]
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(numbers, [format_order_number(self.today, value) for value in (2, 3)])
+        self.assertEqual(OrderNumberCounter.objects.get(day=self.today).last_value, 3)
+
+    def test_default_block_size(self):
+        with mock.patch.object(order_numbers, 'connection') as mocked_connection:
+            mocked_connection.in_atomic_block = False
+            next_order_number()
+
+        self.assertEqual(
+            OrderNumberCounter.objects.get(day=self.today).last_value,
+            order_numbers.DEFAULT_ORDER_NUMBER_BLOCK_SIZE
+        )
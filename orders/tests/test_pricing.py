@@ -0,0 +1,154 @@
+"""
+Tests cho pricing engine, quote endpoint của giỏ hàng và tổng tiền khi checkout.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from cart.viewsets import CartSelfViewSet
+from catalog.models import Category
+from customers.models import Customer
+from orders.models import Order
+from orders.services.pricing import get_reference_data, invalidate_reference_data
+from orders.viewsets import OrderSelfViewSet
+from products.models import Product
+from promotions.models import Coupon, PromotionCampaign, UsageLog, Voucher
+from shipping.models import ShippingMethod, ShippingRate, ShippingZone
+
+User = get_user_model()
+
+
+@override_settings(ORDER_TAX_RATE='0.10', PRICING_DEFAULT_COUNTRY='VN')
+class PricingTest(TestCase):
+
+    def setUp(self):
+        invalidate_reference_data()
+        self.addCleanup(invalidate_reference_data)
+
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.category = Category.objects.create(name='Books', slug='books')
+        self.book = Product.objects.create(
+            name='Book', description='x', price=Decimal('100.00'), seller=seller, status='active',
+            stock=10, sku='BOOK', weight=Decimal('1.50'), category=self.category
+        )
+        self.pen = Product.objects.create(
+            name='Pen', description='x', price=Decimal('10.00'), seller=seller, status='active',
+            stock=10, sku='PEN', weight=Decimal('0.10')
+        )
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.book, quantity=2)
+        CartItem.objects.create(cart=cart, product=self.pen, quantity=5)
+
+        zone = ShippingZone.objects.create(name='Vietnam', countries='VN')
+        self.standard = ShippingMethod.objects.create(name='Standard')
+        self.express = ShippingMethod.objects.create(name='Express')
+        ShippingRate.objects.create(
+            shipping_method=self.standard, shipping_zone=zone, min_weight=0, max_weight=3, price=Decimal('20.00')
+        )
+        ShippingRate.objects.create(
+            shipping_method=self.standard, shipping_zone=zone, min_weight=3, max_weight=999, price=Decimal('35.00')
+        )
+        ShippingRate.objects.create(
+            shipping_method=self.express, shipping_zone=zone, min_weight=0, max_weight=999, price=Decimal('60.00')
+        )
+
+    def quote(self, **params):
+        request = self.factory.get('/api/v1/cart/me/quote/', params)
+        force_authenticate(request, user=self.user)
+        response = CartSelfViewSet.as_view({'get': 'quote'})(request)
+        response.render()
+        return response
+
+    def create_order(self, **data):
+        request = self.factory.post('/api/v1/orders/me/', {'shipping_address': 'Hanoi', **data}, format='json')
+        force_authenticate(request, user=self.user)
+        response = OrderSelfViewSet.as_view({'post': 'create'})(request)
+        response.render()
+        return response
+
+    def test_quote_totals(self):
+        Coupon.objects.create(code='SAVE10', discount_type='percent', value=Decimal('10.00'))
+
+        response = self.quote(coupon_code='SAVE10')
+
+        self.assertEqual(response.status_code, 200, response.data)
+        quote = response.data['data']
+        self.assertEqual(quote['subtotal'], Decimal('250.00'))
+        self.assertEqual(quote['discount_amount'], Decimal('25.00'))
+        # 2 x 1.5kg + 5 x 0.1kg = 3.5kg -> rate 3-999kg rẻ nhất
+        self.assertEqual(quote['total_weight'], Decimal('3.50'))
+        self.assertEqual(quote['shipping_method']['id'], self.standard.pk)
+        self.assertEqual(quote['shipping_amount'], Decimal('35.00'))
+        self.assertEqual(quote['tax_amount'], Decimal('22.50'))
+        self.assertEqual(quote['total_amount'], Decimal('282.50'))
+
+        express = self.quote(shipping_method_id=self.express.pk).data['data']
+        self.assertEqual(express['shipping_amount'], Decimal('60.00'))
+
+    def test_order_totals_match_quote(self):
+        Coupon.objects.create(code='SAVE10', discount_type='percent', value=Decimal('10.00'), max_uses=1)
+        quote = self.quote(coupon_code='SAVE10').data['data']
+
+        response = self.create_order(coupon_code='SAVE10')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        order = Order.objects.get(user=self.user)
+        for field in ('subtotal', 'discount_amount', 'shipping_amount', 'tax_amount', 'total_amount'):
+            self.assertEqual(getattr(order, field), quote[field], field)
+        self.assertEqual(Coupon.objects.get(code='SAVE10').used_count, 1)
+
+    def test_voucher_applies_to_campaign_items(self):
+        customer, _ = Customer.objects.get_or_create(user=self.user)
+        campaign = PromotionCampaign.objects.create(name='Book week')
+        campaign.categories.add(self.category)
+        Voucher.objects.create(
+            code='BOOKS20', owner=customer, campaign=campaign, discount_type='percent',
+            value=Decimal('20.00'), expired_at=timezone.now() + timedelta(days=1)
+        )
+
+        quote = self.quote(voucher_code='BOOKS20').data['data']
+        # 20% của 2 x 100 (pens không thuộc campaign)
+        self.assertEqual(quote['discount_amount'], Decimal('40.00'))
+
+        response = self.create_order(voucher_code='BOOKS20')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertTrue(Voucher.objects.get(code='BOOKS20').is_used)
+        log = UsageLog.objects.get(voucher__code='BOOKS20')
+        self.assertEqual(log.discount_amount, Decimal('40.00'))
+
+        # Voucher đã dùng không áp dụng được nữa
+        self.assertEqual(self.quote(voucher_code='BOOKS20').status_code, 400)
+
+    def test_invalid_promotions_and_shipping(self):
+        Coupon.objects.create(code='BIG', discount_type='fixed', value=Decimal('50.00'),
+                              min_order_amount=Decimal('1000.00'))
+
+        self.assertIn('coupon_code', self.quote(coupon_code='MISSING').data['errors'])
+        self.assertIn('coupon_code', self.quote(coupon_code='BIG').data['errors'])
+        # Không có zone cho địa chỉ
+        self.assertIn('country', self.quote(country='US').data['errors'])
+        self.assertIn('shipping_method_id', self.quote(country='US', shipping_method_id=self.standard.pk).data['errors'])
+
+        response = self.create_order(coupon_code='BIG')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Product.objects.get(pk=self.book.pk).stock, 10)
+
+    def test_reference_data_is_cached_until_invalidated(self):
+        reference = get_reference_data()
+        with self.assertNumQueries(0):
+            self.assertIs(get_reference_data(), reference)
+
+        ShippingZone.objects.create(name='Thailand', countries='TH')
+        self.assertEqual(len(get_reference_data().zones), len(reference.zones) + 1)
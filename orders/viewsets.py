@@ -16,13 +16,15 @@ from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from core.viewsets.base import StandardizedModelViewSet
+from core.pagination.standard import CursorPagination
 from core.mixins.swagger_helpers import SwaggerSchemaMixin
 from core.optimization.mixins import QueryOptimizationMixin
 from core.optimization.decorators import log_slow_queries, cached_property_with_ttl
 from core.permissions import IsOwnerOrAdminUser
+from core.decorators.api import idempotent
 
-from cart.models import Cart, CartItem
-from .models import Order, OrderItem
+from .models import Order, OrderItem, order_items_prefetch
+from .services.checkout import CheckoutError, checkout_cart
 from .serializers import (
     OrderSerializer, OrderSummarySerializer,
     OrderItemSerializer, OrderCreateSerializer,
@@ -30,6 +32,22 @@ from .serializers import (
 )
 
 
+# Actions trả về OrderSummarySerializer: không cần order items
+ORDER_SUMMARY_ACTIONS = ('list', 'history')
+
+
+def order_queryset_for_action(queryset, action):
+    """
+    Prefetch plan của Order theo action: summary lists chỉ join user (items
+    đọc từ cột tóm tắt), các actions trả về OrderSerializer prefetch items kèm
+    products, số queries không phụ thuộc số đơn hàng/items.
+    """
+    queryset = queryset.select_related('user')
+    if action in ORDER_SUMMARY_ACTIONS:
+        return queryset
+    return queryset.prefetch_related(order_items_prefetch())
+
+
 @extend_schema(tags=['Order Management'])
 class OrderViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     """
@@ -54,6 +72,13 @@ class OrderViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     search_fields = ['order_number', 'user__email', 'user__first_name', 'user__last_name']
     ordering_fields = ['created_at', 'status', 'total_amount']
     ordering = ['-created_at']
+    # Listing admin rất lớn, dùng keyset pagination thay cho OFFSET
+    pagination_class_by_action = {'list': CursorPagination}
+    values_list_actions = ('list',)
+    
+    def get_queryset(self):
+        """Danh sách chỉ đọc cột tóm tắt; chi tiết prefetch items kèm products."""
+        return order_queryset_for_action(Order.objects.all(), self.action)
     
     def get_serializer_class(self):
         """Trả về serializer class phù hợp với action."""
@@ -117,13 +142,17 @@ class OrderSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     search_fields = ['order_number']
     ordering_fields = ['created_at', 'status', 'total_amount']
     ordering = ['-created_at']
+    pagination_class_by_action = {'history': CursorPagination}
+    values_list_actions = ('list',)
+    # Mobile clients poll đơn hàng: trả 304 khi updated_at không đổi
+    conditional_get_actions = ('list', 'retrieve', 'history')
     http_method_names = ['get', 'post', 'put', 'patch', 'head', 'options']
     
     def get_queryset(self):
         """Chỉ trả về đơn hàng của user hiện tại."""
         if self.is_swagger_generation:
             return Order.objects.none()
-        return Order.objects.filter(user=self.request.user)
+        return order_queryset_for_action(Order.objects.filter(user=self.request.user), self.action)
     
     def get_serializer_class(self):
         """Trả về serializer class phù hợp với action."""
@@ -135,58 +164,33 @@ class OrderSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
             return OrderSummarySerializer
         return OrderSerializer
     
+    @idempotent()
     def create(self, request, *args, **kwargs):
         """
         Tạo đơn hàng mới từ giỏ hàng của user.
+        
+        Client nên gửi header `Idempotency-Key` để retry không tạo đơn trùng.
+        Checkout chạy trong một transaction (xem `orders.services.checkout`):
+        lock cart items và products, trừ tồn kho, tạo order items bằng
+        `bulk_create`. Số queries không phụ thuộc số items trong giỏ hàng.
         """
-        cart, created = Cart.objects.get_or_create(user=request.user)
-        cart_items = CartItem.objects.filter(cart=cart)
-
-        if not cart_items.exists():
-            return self.error_response(
-                message="Giỏ hàng đang trống",
-                status_code=status.HTTP_400_BAD_REQUEST
-            )
-
         # Validate order data
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # Calculate totals
-        subtotal = Decimal('0.00')
-        for item in cart_items:
-            subtotal += item.product.price * item.quantity
-
-        # Simple calculation (có thể mở rộng thêm logic tính tax, shipping)
-        tax_amount = Decimal('0.00')  # Có thể tính theo % của subtotal
-        shipping_amount = Decimal('0.00')  # Có thể tính theo địa chỉ
-        total_amount = subtotal + tax_amount + shipping_amount
-
-        # Tạo đơn hàng mới
-        order = Order.objects.create(
-            user=request.user,
-            status='pending',
-            subtotal=subtotal,
-            tax_amount=tax_amount,
-            shipping_amount=shipping_amount,
-            total_amount=total_amount,
-            **serializer.validated_data
-        )
-        
-        # Tạo các order items từ cart items
-        for item in cart_items:
-            OrderItem.objects.create(
-                order=order,
-                product=item.product,
-                quantity=item.quantity,
-                price=item.product.price,
-                product_name=item.product.name
+        try:
+            order = checkout_cart(request.user, serializer.validated_data)
+        except CheckoutError as exc:
+            return self.error_response(
+                message=exc.message,
+                errors=exc.errors or None,
+                status_code=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Xóa giỏ hàng sau khi tạo đơn hàng
-        cart_items.delete()
 
         # Trả về response với full order data
+        order = Order.objects.select_related('user').prefetch_related(
+            order_items_prefetch()
+        ).get(pk=order.pk)
         order_serializer = OrderSerializer(order)
         return self.success_response(
             data=order_serializer.data,
@@ -267,15 +271,21 @@ class OrderSelfViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         Lấy lịch sử đơn hàng của user với pagination.
         """
         queryset = self.get_queryset()
+        validators = self.get_conditional_validators(queryset=queryset)
+        not_modified = self.get_not_modified_response(request, validators)
+        if not_modified is not None:
+            return not_modified
+        
         page = self.paginate_queryset(queryset)
         
         if page is not None:
             serializer = OrderSummarySerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = OrderSummarySerializer(queryset, many=True)
-        return self.success_response(
-            data=serializer.data,
-            message="Lịch sử đơn hàng",
-            status_code=status.HTTP_200_OK
-        )
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = OrderSummarySerializer(queryset, many=True)
+            response = self.success_response(
+                data=serializer.data,
+                message="Lịch sử đơn hàng",
+                status_code=status.HTTP_200_OK
+            )
+        return self.set_conditional_headers(response, validators)
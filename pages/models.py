@@ -2,11 +2,15 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
+from core.utils.slugs import UniqueSlugMixin
 
-class Page(models.Model):
+
+class Page(UniqueSlugMixin, models.Model):
     """
     Model for static content pages like About Us, Privacy Policy, etc.
     """
+    slug_source_field = 'title'
+
     title = models.CharField(max_length=255, verbose_name=_('Title'))
     slug = models.SlugField(
         max_length=255,
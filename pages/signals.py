@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.utils.response_cache import purge_instance_cache_tags
+
+from .models import Banner, MenuItem, Page
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def purge_pages_response_cache(sender, instance, **kwargs):
+    """
+    Purge cached responses của page, banner hoặc menu item khi được tạo, cập nhật hoặc xóa.
+    """
+    purge_instance_cache_tags(instance)
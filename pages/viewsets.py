@@ -17,6 +17,7 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
 
 from core.viewsets.base import StandardizedModelViewSet
 from core.mixins.swagger_helpers import SwaggerSchemaMixin
+from core.mixins.views import ResponseCacheMixin
 from core.optimization.mixins import QueryOptimizationMixin
 from core.optimization.decorators import log_slow_queries, cached_property_with_ttl
 from core.permissions import IsAdminOrReadOnly
@@ -116,7 +117,7 @@ class PageViewSet(StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizatio
 
 
 @extend_schema(tags=['Pages'])
-class BannerViewSet(StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizationMixin):
+class BannerViewSet(ResponseCacheMixin, StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizationMixin):
     """
     ViewSet để quản lý Banner resources.
     
@@ -134,6 +135,7 @@ class BannerViewSet(StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizat
     queryset = Banner.objects.all()
     serializer_class = BannerSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_response_actions = ('list', 'retrieve', 'by_position')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title']
     filterset_fields = ['position', 'is_active']
@@ -184,7 +186,7 @@ class BannerViewSet(StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizat
 
 
 @extend_schema(tags=['Pages'])
-class MenuItemViewSet(StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizationMixin):
+class MenuItemViewSet(ResponseCacheMixin, StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimizationMixin):
     """
     ViewSet để quản lý MenuItem resources.
     
@@ -202,6 +204,7 @@ class MenuItemViewSet(StandardizedModelViewSet, SwaggerSchemaMixin, QueryOptimiz
     queryset = MenuItem.objects.all()
     serializer_class = MenuItemSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_response_actions = ('list', 'retrieve', 'by_type')
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['label', 'url']
     filterset_fields = ['menu_type', 'is_active', 'parent']
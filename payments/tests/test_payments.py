@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from rest_framework import status
 from payments.models import Payment
+from payments.viewsets import PaymentViewSet
 from orders.models import Order, OrderItem
 from products.models import Product, Category
 
@@ -11,8 +12,9 @@ class PaymentTests(APITestCase):
     def setUp(self):
         self.user = User.objects.create_user(username="buyer", password="password")
         self.category = Category.objects.create(name="Electronics")
-        self.product = Product.objects.create(name="Laptop", description="Gaming Laptop", price=1200, category=self.category, stock=10)
-        self.order = Order.objects.create(user=self.user, status="pending")
+        self.seller = User.objects.create_user(username="seller", email="seller@example.com", password="password")
+        self.product = Product.objects.create(name="Laptop", description="Gaming Laptop", price=1200, category=self.category, stock=10, seller=self.seller)
+        self.order = Order.objects.create(user=self.user, status="pending", total_amount=1230)
         OrderItem.objects.create(order=self.order, product=self.product, quantity=1, price=self.product.price)
         self.client.force_authenticate(user=self.user)
 
@@ -22,6 +24,14 @@ class PaymentTests(APITestCase):
         response = self.client.post("/api/payments/checkout/", data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_checkout_charges_order_total(self):
+        """Test số tiền thanh toán là tổng đơn hàng (gồm phí vận chuyển), không phải tổng các items"""
+        request = APIRequestFactory().post("/api/v1/payments/checkout", {"order_id": self.order.id}, format="json")
+        force_authenticate(request, user=self.user)
+        response = PaymentViewSet.as_view({"post": "checkout"})(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Payment.objects.get().amount, self.order.total_amount)
+
     def test_payment_status(self):
         """Test kiểm tra trạng thái thanh toán"""
         self.client.post("/api/payments/checkout/", {"order_id": self.order.id})
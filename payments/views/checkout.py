@@ -6,6 +6,7 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.decorators.api import idempotent
 from orders.models import Order
 from ..models import Payment
 
@@ -16,6 +17,7 @@ class PaymentCheckoutView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent()
     def post(self, request):
         order_id = request.data.get("order_id")
 
@@ -29,7 +31,7 @@ class PaymentCheckoutView(APIView):
             payment = Payment.objects.create(
                 order=order,
                 transaction_id=transaction_id,
-                amount=sum(item.price * item.quantity for item in order.items.all()),
+                amount=order.total_amount,  # Đã gồm phí vận chuyển và giảm giá
                 status="completed"  # Giả lập thanh toán thành công
             )
 
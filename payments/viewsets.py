@@ -10,6 +10,7 @@ from rest_framework import permissions, status
 from rest_framework.decorators import action
 
 from core.viewsets.base import StandardizedModelViewSet
+from core.decorators.api import idempotent
 from core.mixins.swagger_helpers import SwaggerSchemaMixin
 from drf_spectacular.utils import extend_schema
 from orders.models import Order
@@ -48,6 +49,7 @@ class PaymentViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         return queryset
     
     @action(detail=False, methods=['post'], url_path='checkout')
+    @idempotent()
     def checkout(self, request):
         """
         Thực hiện thanh toán cho một đơn hàng.
@@ -73,7 +75,7 @@ class PaymentViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
             payment = Payment.objects.create(
                 order=order,
                 transaction_id=transaction_id,
-                amount=sum(item.price * item.quantity for item in order.items.all()),
+                amount=order.total_amount,  # Đã gồm phí vận chuyển và giảm giá
                 status="completed"  # Giả lập thanh toán thành công
             )
 
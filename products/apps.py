@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ProductsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'products'
+    verbose_name = 'Products'
+
+    def ready(self):
+        import products.signals  # noqa
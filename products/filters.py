@@ -0,0 +1,16 @@
+import django_filters
+
+from .models import ProductListing
+
+
+class ProductListingFilter(django_filters.FilterSet):
+    """
+    Filters của public product listing áp dụng trên `ProductListing`.
+
+    Cùng các field filters như `ProductPublicViewSet.filterset_fields`, trừ
+    `attribute_values` (projection không có M2M, request đó đọc từ Product).
+    """
+
+    class Meta:
+        model = ProductListing
+        fields = ['category', 'brand', 'seller', 'is_featured', 'price']
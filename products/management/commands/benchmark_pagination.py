@@ -0,0 +1,88 @@
+"""
+Django management command để so sánh deep-page latency của page-number và keyset pagination
+"""
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.pagination.benchmark import DEFAULT_PAGES, run_pagination_benchmark
+from products.models import Product, ProductView
+
+
+class Command(BaseCommand):
+    help = 'Benchmark deep-page latency of page-number vs keyset pagination on ProductView'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=200000,
+            help='Number of fixture ProductView rows to generate (rolled back afterwards)',
+        )
+        parser.add_argument(
+            '--page',
+            type=int,
+            action='append',
+            dest='pages',
+            help='Page number to benchmark (repeatable, defaults to 1, 10, 100, 500)',
+        )
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of runs per page, the median is reported',
+        )
+
+    def create_fixture(self, rows, batch_size=5000):
+        run_id = uuid.uuid4().hex[:8]
+        seller = get_user_model().objects.create_user(
+            username=f'bench-{run_id}', email=f'bench-{run_id}@example.com', password=None
+        )
+        products = Product.objects.bulk_create([
+            Product(
+                name=f'Bench product {index}', slug=f'bench-{run_id}-{index}',
+                sku=f'BENCH-{run_id}-{index}', description='Benchmark fixture',
+                price=10, seller=seller, status='active',
+            )
+            for index in range(100)
+        ])
+
+        started = timezone.now()
+        for start in range(0, rows, batch_size):
+            ProductView.objects.bulk_create([
+                ProductView(
+                    product=products[index % len(products)],
+                    ip_address='127.0.0.1',
+                    # Nhiều views trùng thời điểm để kiểm tra tie-breaker
+                    viewed_at=started - timedelta(seconds=index // 3),
+                )
+                for index in range(start, min(start + batch_size, rows))
+            ])
+
+    def handle(self, *args, **options):
+        pages = options['pages'] or DEFAULT_PAGES
+        self.stdout.write(f"Benchmarking pagination on {options['rows']} ProductView rows...")
+
+        with transaction.atomic():
+            self.create_fixture(options['rows'])
+            results = run_pagination_benchmark(
+                ProductView.objects.all(),
+                pages=pages,
+                page_size=options['page_size'],
+                ordering=['-viewed_at'],
+                repeat=options['repeat'],
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'page':>6} {'offset ms':>10} {'keyset ms':>10} {'speedup':>8}")
+        for result in results:
+            speedup = result['offset_ms'] / result['keyset_ms'] if result['keyset_ms'] else 0
+            self.stdout.write(
+                f"{result['page']:>6} {result['offset_ms']:>10.2f} "
+                f"{result['keyset_ms']:>10.2f} {speedup:>7.1f}x"
+            )
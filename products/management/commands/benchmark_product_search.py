@@ -0,0 +1,56 @@
+"""
+Django management command để so sánh latency của search engine với SearchFilter cũ
+"""
+
+from django.core.management.base import BaseCommand
+
+from products.search.backends import get_search_backend
+from products.search.benchmark import DEFAULT_QUERIES, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark product search engine against the legacy icontains SearchFilter'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--products',
+            type=int,
+            default=100000,
+            help='Number of fixture products to generate (rolled back afterwards)',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Query to benchmark (repeatable, defaults to a built-in set)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of runs per query, the median is reported',
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(
+            f"Benchmarking {backend.__class__.__name__} on {options['products']} products..."
+        )
+
+        report = run_benchmark(
+            product_count=options['products'],
+            queries=options['queries'] or DEFAULT_QUERIES,
+            repeat=options['repeat'],
+        )
+
+        self.stdout.write(f"Index build: {report['index_build_ms']:.1f} ms")
+        self.stdout.write(
+            f"{'query':<20} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8} "
+            f"{'legacy hits':>12} {'engine hits':>12}"
+        )
+        for result in report['results']:
+            speedup = result['legacy_ms'] / result['engine_ms'] if result['engine_ms'] else 0
+            self.stdout.write(
+                f"{result['query']:<20} {result['legacy_ms']:>10.2f} {result['engine_ms']:>10.2f} "
+                f"{speedup:>7.1f}x {result['legacy_count']:>12} {result['engine_count']:>12}"
+            )
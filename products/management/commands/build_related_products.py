@@ -0,0 +1,35 @@
+"""
+Django management command để build related products index cho active products
+"""
+
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.services.related_products import build_related_products_index
+
+
+class Command(BaseCommand):
+    help = 'Precompute related product ids (co-purchases and category siblings) into the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--category',
+            type=int,
+            help='Only rebuild products of this category id',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of index entries written to the cache per batch',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.filter(status='active')
+        if options['category']:
+            queryset = queryset.filter(category_id=options['category'])
+
+        built = build_related_products_index(queryset, batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Built related products index for {built} products')
+        )
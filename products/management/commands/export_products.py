@@ -0,0 +1,30 @@
+"""
+Django management command để export products ra CSV hoặc JSONL
+"""
+import sys
+
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.services.bulk_import import FORMATS, export_products
+
+
+class Command(BaseCommand):
+    help = 'Export products to a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seller', type=int, help='Only export products of this seller id')
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--output', help='Output file path, stdout by default')
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options['seller']:
+            queryset = queryset.filter(seller_id=options['seller'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(export_products(queryset, options['format']))
+            self.stdout.write(self.style.SUCCESS(f"Exported products to {options['output']}"))
+        else:
+            sys.stdout.writelines(export_products(queryset, options['format']))
@@ -0,0 +1,40 @@
+"""
+Django management command để flush product view events từ buffer xuống database
+"""
+
+from django.core.management.base import BaseCommand
+
+from products.services.view_tracking import (
+    LocalViewBuffer, flush_product_views, get_view_buffer, run_periodic_flush
+)
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered product views into ProductView rows and views_count'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Run continuously, flushing every N seconds (0 = flush once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        if isinstance(get_view_buffer(), LocalViewBuffer):
+            self.stdout.write(self.style.WARNING(
+                'Product views use the in-process buffer and are flushed by the web processes; '
+                'configure a shared cache to flush them from this command'
+            ))
+
+        if interval > 0:
+            self.stdout.write(f'Flushing product views every {interval}s...')
+            run_periodic_flush(interval)
+            return
+
+        flushed = flush_product_views()
+        self.stdout.write(
+            self.style.SUCCESS(f'Flushed {flushed} product views')
+        )
@@ -0,0 +1,58 @@
+"""
+Django management command để import products của một seller từ CSV hoặc JSONL
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services.bulk_import import (
+    DEFAULT_CHUNK_SIZE, FORMATS, ProductImportError, detect_format, import_products
+)
+
+
+class Command(BaseCommand):
+    help = 'Import products for a seller from a CSV or JSONL file (upsert by SKU)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('seller', help='Seller id or email')
+        parser.add_argument('file', help='Path to the CSV or JSONL file')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format, detected from the file extension by default',
+        )
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate rows without writing to the database',
+        )
+
+    def get_seller(self, value):
+        User = get_user_model()
+        lookup = {'pk': value} if value.isdigit() else {'email': value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"Seller '{value}' does not exist")
+
+    def handle(self, *args, **options):
+        seller = self.get_seller(options['seller'])
+        file_format = options['format'] or detect_format(options['file'])
+
+        try:
+            with open(options['file'], encoding='utf-8-sig', newline='') as stream:
+                result = import_products(
+                    seller, stream, file_format,
+                    chunk_size=options['chunk_size'], dry_run=options['dry_run'],
+                )
+        except (OSError, ProductImportError) as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+
+        prefix = '[dry run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{result['rows']} rows: {result['created']} created, "
+            f"{result['updated']} updated, {len(result['errors'])} errors"
+        ))
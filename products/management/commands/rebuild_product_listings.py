@@ -0,0 +1,17 @@
+"""
+Django management command để dựng lại bảng ProductListing cho public listings
+"""
+from django.core.management.base import BaseCommand
+
+from products.services.listings import DEFAULT_CHUNK_SIZE, rebuild_product_listings
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ProductListing projection used by public product listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        total = rebuild_product_listings(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt listings for {total} active products'))
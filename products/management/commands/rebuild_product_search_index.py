@@ -0,0 +1,18 @@
+"""
+Django management command để build lại product search index
+"""
+
+from django.core.management.base import BaseCommand
+
+from products.search.backends import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the product full-text search index (tsvector column or in-memory index)'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt product search index with {backend.__class__.__name__}')
+        )
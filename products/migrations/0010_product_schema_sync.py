@@ -0,0 +1,297 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:46
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+        ('products', '0009_alter_productimage_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductFavorite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Added At')),
+            ],
+            options={
+                'verbose_name': 'Product Favorite',
+                'verbose_name_plural': 'Product Favorites',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductView',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(verbose_name='IP Address')),
+                ('user_agent', models.TextField(blank=True, verbose_name='User Agent')),
+                ('viewed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Viewed At')),
+            ],
+            options={
+                'verbose_name': 'Product View',
+                'verbose_name_plural': 'Product Views',
+                'ordering': ['-viewed_at'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='product',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Product', 'verbose_name_plural': 'Products'},
+        ),
+        migrations.AlterModelOptions(
+            name='productimage',
+            options={'ordering': ['sort_order', 'created_at'], 'verbose_name': 'Product Image', 'verbose_name_plural': 'Product Images'},
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='barcode',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Barcode'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='compare_price',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Original price for discount display', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))], verbose_name='Compare Price'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='cost_price',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Internal cost price (seller only)', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='Cost Price'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='height',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='Height (cm)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='is_digital',
+            field=models.BooleanField(default=False, verbose_name='Digital Product'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='is_featured',
+            field=models.BooleanField(default=False, verbose_name='Featured Product'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='length',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='Length (cm)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='low_stock_threshold',
+            field=models.PositiveIntegerField(default=10, verbose_name='Low Stock Alert Threshold'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='meta_description',
+            field=models.CharField(blank=True, max_length=320, verbose_name='Meta Description'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='meta_title',
+            field=models.CharField(blank=True, max_length=160, verbose_name='Meta Title'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='published_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Published At'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=3, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)], verbose_name='Average Rating'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reviews Count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='sales_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Sales Count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='seller',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='products', to=settings.AUTH_USER_MODEL, verbose_name='Seller'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='short_description',
+            field=models.TextField(blank=True, help_text='Brief description for product lists', max_length=500, verbose_name='Short Description'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='sku',
+            field=models.CharField(blank=True, help_text='Stock Keeping Unit', max_length=100, unique=True, verbose_name='SKU'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=255, unique=True, verbose_name='URL Slug'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('active', 'Active'), ('inactive', 'Inactive'), ('out_of_stock', 'Out of Stock'), ('discontinued', 'Discontinued')], default='draft', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='track_inventory',
+            field=models.BooleanField(default=True, verbose_name='Track Inventory'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Views Count'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='weight',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='Weight (kg)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='width',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='Width (cm)'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='caption',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Caption'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='sort_order',
+            field=models.PositiveIntegerField(default=0, verbose_name='Sort Order'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='catalog.category', verbose_name='Category'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='description',
+            field=models.TextField(verbose_name='Description'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='name',
+            field=models.CharField(max_length=255, verbose_name='Product Name'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))], verbose_name='Price'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='stock',
+            field=models.PositiveIntegerField(default=0, verbose_name='Stock Quantity'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+        migrations.AlterField(
+            model_name='productimage',
+            name='alt_text',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Alt Text'),
+        ),
+        migrations.AlterField(
+            model_name='productimage',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='productimage',
+            name='image',
+            field=models.ImageField(upload_to='products/images/', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='productimage',
+            name='is_primary',
+            field=models.BooleanField(default=False, verbose_name='Primary Image'),
+        ),
+        migrations.AlterField(
+            model_name='productimage',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='products.product', verbose_name='Product'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['seller', 'status'], name='products_pr_seller__2449b8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'status'], name='products_pr_categor_75eeb5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['status', 'is_featured'], name='products_pr_status_28f1d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['slug'], name='products_pr_slug_3edc0c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['sku'], name='products_pr_sku_ca0cdc_idx'),
+        ),
+        migrations.AddField(
+            model_name='productfavorite',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorited_by', to='products.product', verbose_name='Product'),
+        ),
+        migrations.AddField(
+            model_name='productfavorite',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorite_products', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AddField(
+            model_name='productview',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_views', to='products.product', verbose_name='Product'),
+        ),
+        migrations.AddField(
+            model_name='productview',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='product_views', to=settings.AUTH_USER_MODEL, verbose_name='User'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='productfavorite',
+            unique_together={('user', 'product')},
+        ),
+        migrations.AddIndex(
+            model_name='productview',
+            index=models.Index(fields=['user', 'viewed_at'], name='products_pr_user_id_80dce9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productview',
+            index=models.Index(fields=['product', 'viewed_at'], name='products_pr_product_0c74ab_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:46
+
+from functools import reduce
+from operator import add
+
+import django.contrib.postgres.search
+import products.search.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Tính search_vector cho các products đã có (chỉ PostgreSQL có tsvector)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    from django.contrib.postgres.search import SearchVector
+    from products.search.backends import SEARCH_FIELDS
+
+    config = getattr(settings, 'PRODUCT_SEARCH_CONFIG', 'simple')
+    vector = reduce(add, (
+        SearchVector(field, weight=weight, config=config) for field, weight, _ in SEARCH_FIELDS
+    ))
+    Product = apps.get_model('products', 'Product')
+    Product.objects.using(schema_editor.connection.alias).update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_product_schema_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True, verbose_name='Search Vector'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=products.search.indexes.SearchVectorIndex(fields=['search_vector'], name='products_pr_search__98d711_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+        ('products', '0011_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='attribute_values',
+            field=models.ManyToManyField(blank=True, related_name='products', to='catalog.attributevalue', verbose_name='Attribute Values'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='brand',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='catalog.brand', verbose_name='Brand'),
+        ),
+    ]
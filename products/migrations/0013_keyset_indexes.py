@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+        ('products', '0012_product_brand_attribute_values'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at', '-id'], name='products_pr_created_e6f9fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productview',
+            index=models.Index(fields=['-viewed_at', '-id'], name='products_pr_viewed__50e9c4_idx'),
+        ),
+    ]
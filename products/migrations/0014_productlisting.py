@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def get_stock_status(row):
+    if not row['track_inventory']:
+        return 'available'
+    elif row['stock'] <= 0:
+        return 'out_of_stock'
+    elif row['stock'] <= row['low_stock_threshold']:
+        return 'low_stock'
+    return 'in_stock'
+
+
+def get_discount_percentage(row):
+    compare_price, price = row['compare_price'], row['price']
+    if compare_price and compare_price > price:
+        return round(((compare_price - price) / compare_price) * 100, 1)
+    return 0
+
+
+def fill_product_listings(apps, schema_editor):
+    """
+    Dựng projection cho các products active đã có, cùng giá trị với
+    `products.services.listings.build_listing`, để public listing
+    (PRODUCT_LISTING_PROJECTION) không trống sau khi migrate.
+    """
+    Product = apps.get_model('products', 'Product')
+    ProductImage = apps.get_model('products', 'ProductImage')
+    ProductListing = apps.get_model('products', 'ProductListing')
+    alias = schema_editor.connection.alias
+
+    primary_images = {}
+    images = ProductImage.objects.using(alias).filter(
+        is_primary=True, product__status='active'
+    ).order_by('sort_order', 'created_at').values_list('product_id', 'image')
+    for product_id, image in images:
+        primary_images.setdefault(product_id, image or '')
+
+    rows = Product.objects.using(alias).filter(status='active').order_by('pk').values(
+        'pk', 'name', 'slug', 'short_description', 'price', 'compare_price', 'stock',
+        'track_inventory', 'low_stock_threshold', 'category_id', 'category__name', 'brand_id',
+        'seller_id', 'seller__first_name', 'seller__last_name', 'seller__email', 'is_featured',
+        'rating', 'reviews_count', 'views_count', 'sales_count', 'created_at'
+    )
+    listings = []
+    for row in rows.iterator(chunk_size=1000):
+        seller_name = f"{row['seller__first_name']} {row['seller__last_name']}".strip()
+        listings.append(ProductListing(
+            product_id=row['pk'],
+            name=row['name'],
+            slug=row['slug'],
+            short_description=row['short_description'],
+            price=row['price'],
+            compare_price=row['compare_price'],
+            discount_percentage=get_discount_percentage(row),
+            stock_status=get_stock_status(row),
+            category_id=row['category_id'],
+            category_name=row['category__name'] or '',
+            brand_id=row['brand_id'],
+            seller_id=row['seller_id'],
+            seller_name=seller_name or row['seller__email'],
+            primary_image=primary_images.get(row['pk'], ''),
+            is_featured=row['is_featured'],
+            rating=row['rating'],
+            reviews_count=row['reviews_count'],
+            views_count=row['views_count'],
+            sales_count=row['sales_count'],
+            created_at=row['created_at'],
+        ))
+        if len(listings) >= 1000:
+            ProductListing.objects.using(alias).bulk_create(listings)
+            listings = []
+    ProductListing.objects.using(alias).bulk_create(listings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+        ('products', '0013_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductListing',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='products.product', verbose_name='Product')),
+                ('name', models.CharField(max_length=255, verbose_name='Product Name')),
+                ('slug', models.SlugField(max_length=255, verbose_name='URL Slug')),
+                ('short_description', models.TextField(blank=True, max_length=500, verbose_name='Short Description')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Price')),
+                ('compare_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Compare Price')),
+                ('discount_percentage', models.DecimalField(decimal_places=1, default=0, max_digits=5, verbose_name='Discount Percentage')),
+                ('stock_status', models.CharField(max_length=20, verbose_name='Stock Status')),
+                ('category_name', models.CharField(blank=True, max_length=100, verbose_name='Category Name')),
+                ('seller_name', models.CharField(max_length=255, verbose_name='Seller Name')),
+                ('primary_image', models.CharField(blank=True, help_text='Đường dẫn file trong storage', max_length=255, verbose_name='Primary Image')),
+                ('is_featured', models.BooleanField(default=False, verbose_name='Featured Product')),
+                ('rating', models.DecimalField(decimal_places=2, default=0, max_digits=3, verbose_name='Average Rating')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Reviews Count')),
+                ('views_count', models.PositiveIntegerField(default=0, verbose_name='Views Count')),
+                ('sales_count', models.PositiveIntegerField(default=0, verbose_name='Sales Count')),
+                ('created_at', models.DateTimeField(verbose_name='Created At')),
+                ('synced_at', models.DateTimeField(auto_now=True, verbose_name='Synced At')),
+                ('brand', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='catalog.brand', verbose_name='Brand')),
+                ('category', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='catalog.category', verbose_name='Category')),
+                ('seller', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Seller')),
+            ],
+            options={
+                'verbose_name': 'Product Listing',
+                'verbose_name_plural': 'Product Listings',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', '-product'], name='products_pr_created_20fd5d_idx'), models.Index(fields=['category', '-created_at'], name='products_pr_categor_d507bc_idx'), models.Index(fields=['brand', '-created_at'], name='products_pr_brand_i_7482f4_idx'), models.Index(fields=['seller', '-created_at'], name='products_pr_seller__fd195f_idx'), models.Index(fields=['is_featured', '-created_at'], name='products_pr_is_feat_6f4c47_idx'), models.Index(fields=['price'], name='products_pr_price_9e02a8_idx')],
+            },
+        ),
+        migrations.RunPython(fill_product_listings, migrations.RunPython.noop, elidable=True),
+    ]
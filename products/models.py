@@ -1,12 +1,21 @@
-from catalog.models import Category
+from catalog.models import AttributeValue, Brand, Category
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F, Prefetch
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.utils.text import slugify
+from django.utils import timezone
 from decimal import Decimal
 from users.models import User
+from core.utils.slugs import UniqueSlugMixin
 
+from .search.indexes import SearchVectorIndex
 
-class Product(models.Model):
+
+# Attribute chứa kết quả của primary_image_prefetch()
+PRIMARY_IMAGES_ATTR = 'prefetched_primary_images'
+
+
+class Product(UniqueSlugMixin, models.Model):
     """
     Product model with seller management and user features.
     """
@@ -78,6 +87,20 @@ class Product(models.Model):
         related_name='products',
         verbose_name='Category'
     )
+    brand = models.ForeignKey(
+        Brand,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='products',
+        verbose_name='Brand'
+    )
+    attribute_values = models.ManyToManyField(
+        AttributeValue,
+        blank=True,
+        related_name='products',
+        verbose_name='Attribute Values'
+    )
     sku = models.CharField(
         max_length=100, 
         unique=True, 
@@ -153,6 +176,14 @@ class Product(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     published_at = models.DateTimeField(null=True, blank=True, verbose_name='Published At')
     
+    # Full-text search (PostgreSQL tsvector, cập nhật khi save)
+    search_vector = SearchVectorField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Search Vector'
+    )
+    
     # Weight and dimensions
     weight = models.DecimalField(
         max_digits=8, 
@@ -186,17 +217,18 @@ class Product(models.Model):
     def __str__(self):
         return f"{self.name} ({self.seller.email})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lưu giá trị ban đầu để signals biết status/category có thay đổi không
+        instance._loaded_values = {
+            field: instance.__dict__[field]
+            for field in ('status', 'category_id')
+            if field in instance.__dict__
+        }
+        return instance
+    
     def save(self, *args, **kwargs):
-        # Auto-generate slug from name
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Product.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        
         # Auto-generate SKU if not provided
         if not self.sku:
             # Generate SKU based on seller ID and product name
@@ -205,7 +237,6 @@ class Product(models.Model):
         
         # Set published_at when status changes to active
         if self.status == 'active' and not self.published_at:
-            from django.utils import timezone
             self.published_at = timezone.now()
         
         super().save(*args, **kwargs)
@@ -234,12 +265,19 @@ class Product(models.Model):
     @property
     def primary_image(self):
         """Get primary product image"""
+        # Dùng kết quả của primary_image_prefetch() nếu queryset đã prefetch
+        prefetched = getattr(self, PRIMARY_IMAGES_ATTR, None)
+        if prefetched is not None:
+            return prefetched[0] if prefetched else None
+        if 'images' in getattr(self, '_prefetched_objects_cache', {}):
+            return next((image for image in self.images.all() if image.is_primary), None)
         return self.images.filter(is_primary=True).first()
     
-    def increment_views(self):
+    def increment_views(self, count=1):
         """Increment product views count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        # Cộng trực tiếp trong database để không mất lượt xem khi ghi đồng thời
+        Product.objects.filter(pk=self.pk).update(views_count=F('views_count') + count)
+        self.views_count += count
     
     def update_rating(self):
         """Update average rating from reviews"""
@@ -272,6 +310,9 @@ class Product(models.Model):
             models.Index(fields=['status', 'is_featured']),
             models.Index(fields=['slug']),
             models.Index(fields=['sku']),
+            # Keyset pagination theo (-created_at, -id)
+            models.Index(fields=['-created_at', '-id']),
+            SearchVectorIndex(fields=['search_vector']),
         ]
 
 
@@ -331,6 +372,27 @@ class ProductImage(models.Model):
         ordering = ['sort_order', 'created_at']
 
 
+def primary_image_prefetch(lookup='images'):
+    """
+    Prefetch primary image của products vào `prefetched_primary_images`.
+
+    Dùng cho list views để `Product.primary_image` không phát sinh
+    query cho từng product.
+
+    Args:
+        lookup (str): Đường dẫn tới relation images, ví dụ
+            'product__images' khi queryset là ProductFavorite.
+
+    Example:
+        Product.objects.prefetch_related(primary_image_prefetch())
+    """
+    return Prefetch(
+        lookup,
+        queryset=ProductImage.objects.filter(is_primary=True),
+        to_attr=PRIMARY_IMAGES_ATTR
+    )
+
+
 class ProductFavorite(models.Model):
     """
     User favorite products model.
@@ -379,7 +441,8 @@ class ProductView(models.Model):
     )
     ip_address = models.GenericIPAddressField(verbose_name='IP Address')
     user_agent = models.TextField(blank=True, verbose_name='User Agent')
-    viewed_at = models.DateTimeField(auto_now_add=True, verbose_name='Viewed At')
+    # default thay vì auto_now_add để giữ thời điểm xem khi flush từ buffer
+    viewed_at = models.DateTimeField(default=timezone.now, verbose_name='Viewed At')
     
     def __str__(self):
         user_info = self.user.email if self.user else f"Anonymous ({self.ip_address})"
@@ -392,4 +455,79 @@ class ProductView(models.Model):
         indexes = [
             models.Index(fields=['user', 'viewed_at']),
             models.Index(fields=['product', 'viewed_at']),
+            models.Index(fields=['-viewed_at', '-id']),
+        ]
+
+
+class ProductListing(models.Model):
+    """
+    Read model cho public product listings.
+    
+    Một row cho mỗi product active, chứa sẵn các fields của
+    `ProductSummarySerializer` (tên category/seller, primary image,
+    discount, stock status) để listing chỉ đọc một bảng bằng `.values()`.
+    Được đồng bộ bởi signals trong products.signals, hoặc dựng lại bằng
+    `manage.py rebuild_product_listings`.
+    """
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='listing',
+        verbose_name='Product'
+    )
+    name = models.CharField(max_length=255, verbose_name='Product Name')
+    slug = models.SlugField(max_length=255, verbose_name='URL Slug')
+    short_description = models.TextField(max_length=500, blank=True, verbose_name='Short Description')
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='Price')
+    compare_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, verbose_name='Compare Price'
+    )
+    discount_percentage = models.DecimalField(
+        max_digits=5, decimal_places=1, default=0, verbose_name='Discount Percentage'
+    )
+    stock_status = models.CharField(max_length=20, verbose_name='Stock Status')
+    
+    # Dùng cho filters; không có FK constraint vì row được ghi lại khi nguồn thay đổi
+    category = models.ForeignKey(
+        Category, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+', verbose_name='Category'
+    )
+    category_name = models.CharField(max_length=100, blank=True, verbose_name='Category Name')
+    brand = models.ForeignKey(
+        Brand, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+', verbose_name='Brand'
+    )
+    seller = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False,
+        related_name='+', verbose_name='Seller'
+    )
+    seller_name = models.CharField(max_length=255, verbose_name='Seller Name')
+    primary_image = models.CharField(
+        max_length=255, blank=True, verbose_name='Primary Image',
+        help_text='Đường dẫn file trong storage'
+    )
+    
+    is_featured = models.BooleanField(default=False, verbose_name='Featured Product')
+    rating = models.DecimalField(max_digits=3, decimal_places=2, default=0, verbose_name='Average Rating')
+    reviews_count = models.PositiveIntegerField(default=0, verbose_name='Reviews Count')
+    views_count = models.PositiveIntegerField(default=0, verbose_name='Views Count')
+    sales_count = models.PositiveIntegerField(default=0, verbose_name='Sales Count')
+    created_at = models.DateTimeField(verbose_name='Created At')
+    synced_at = models.DateTimeField(auto_now=True, verbose_name='Synced At')
+    
+    def __str__(self):
+        return self.name
+    
+    class Meta:
+        verbose_name = 'Product Listing'
+        verbose_name_plural = 'Product Listings'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-product']),
+            models.Index(fields=['category', '-created_at']),
+            models.Index(fields=['brand', '-created_at']),
+            models.Index(fields=['seller', '-created_at']),
+            models.Index(fields=['is_featured', '-created_at']),
+            models.Index(fields=['price']),
         ]
@@ -0,0 +1,13 @@
+"""
+Product search engine.
+
+Module này cung cấp full-text search cho products với backend có thể thay đổi:
+- `products.search.backends.PostgresSearchBackend`: dùng cột `search_vector`
+  (tsvector, GIN index) và `SearchRank` của PostgreSQL.
+- `products.search.backends.InMemorySearchBackend`: inverted index thuần Python,
+  dùng cho tests và SQLite.
+
+Backend được chọn qua setting `PRODUCT_SEARCH_BACKEND` ('postgres' hoặc 'memory'),
+mặc định theo database đang dùng. Xem `products.search.filters.ProductSearchFilter`
+để dùng trong ViewSets.
+"""
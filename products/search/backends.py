@@ -0,0 +1,314 @@
+"""
+Search backends cho products.
+
+Mỗi backend nhận một Product queryset và chuỗi tìm kiếm, trả về queryset
+đã được lọc và annotate `search_rank` (càng cao càng liên quan).
+Tất cả các từ trong query đều phải khớp (AND) và được so khớp theo prefix,
+ví dụ "lap" khớp "laptop".
+"""
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# (field, PostgreSQL weight, trọng số cho InMemorySearchBackend)
+SEARCH_FIELDS = (
+    ('name', 'A', 3.0),
+    ('short_description', 'B', 2.0),
+    ('description', 'C', 1.0),
+)
+
+
+def tokenize(text):
+    """Tách text thành các tokens chữ thường."""
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def get_product_model():
+    return apps.get_model('products', 'Product')
+
+
+class BaseSearchBackend:
+    """
+    Interface chung cho các search backends.
+    """
+
+    def search(self, queryset, query):
+        """
+        Lọc queryset theo query và annotate `search_rank`.
+
+        Args:
+            queryset: Product queryset cần tìm kiếm
+            query (str): Chuỗi tìm kiếm của người dùng
+
+        Returns:
+            QuerySet: Queryset đã lọc, có field `search_rank`
+        """
+        raise NotImplementedError
+
+    def empty(self, queryset):
+        """Queryset rỗng vẫn có `search_rank` để có thể order_by."""
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def update_product(self, product):
+        """Cập nhật index cho một product sau khi save."""
+        raise NotImplementedError
+
+    def update_products(self, product_ids):
+        """Cập nhật index cho nhiều products (ví dụ sau bulk_create/bulk_update)."""
+        for product in get_product_model().objects.filter(pk__in=product_ids):
+            self.update_product(product)
+
+    def remove_product(self, product_id):
+        """Xóa product khỏi index."""
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Build lại toàn bộ index."""
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Full-text search bằng tsvector của PostgreSQL.
+
+    Cột `Product.search_vector` được cập nhật khi product được save và
+    được đánh GIN index, nên truy vấn không cần scan toàn bảng.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or getattr(settings, 'PRODUCT_SEARCH_CONFIG', 'simple')
+
+    def build_vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        vector = None
+        for field, weight, _ in SEARCH_FIELDS:
+            field_vector = SearchVector(field, weight=weight, config=self.config)
+            vector = field_vector if vector is None else vector + field_vector
+        return vector
+
+    def build_query(self, query):
+        from django.contrib.postgres.search import SearchQuery
+
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        # Tokens chỉ gồm ký tự \w nên an toàn khi dùng raw tsquery
+        raw_query = ' & '.join(f'{token}:*' for token in tokens)
+        return SearchQuery(raw_query, search_type='raw', config=self.config)
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchRank
+
+        search_query = self.build_query(query)
+        if search_query is None:
+            return self.empty(queryset)
+        return queryset.filter(
+            search_vector=search_query
+        ).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        )
+
+    def update_product(self, product):
+        get_product_model().objects.filter(pk=product.pk).update(
+            search_vector=self.build_vector()
+        )
+
+    def update_products(self, product_ids):
+        get_product_model().objects.filter(pk__in=product_ids).update(
+            search_vector=self.build_vector()
+        )
+
+    def remove_product(self, product_id):
+        # Row đã bị xóa cùng với vector
+        pass
+
+    def rebuild(self):
+        get_product_model().objects.update(search_vector=self.build_vector())
+
+
+class InMemorySearchBackend(BaseSearchBackend):
+    """
+    Inverted index thuần Python.
+
+    Dùng cho tests và SQLite. Index được build lười ở lần tìm kiếm đầu tiên
+    và cập nhật qua signals của process hiện tại, vì vậy không phù hợp
+    khi chạy nhiều web processes.
+
+    Điểm của một product là tổng `trọng số field * idf` của các terms khớp.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._postings = defaultdict(dict)   # term -> {product_id: weight}
+        self._doc_terms = {}                 # product_id -> set(term)
+        self._sorted_terms = []
+        self._terms_dirty = False
+
+    def _index_document(self, product_id, values):
+        weights = defaultdict(float)
+        for (field, _, field_weight), text in zip(SEARCH_FIELDS, values):
+            for token in tokenize(text):
+                weights[token] += field_weight
+
+        for term, weight in weights.items():
+            self._postings[term][product_id] = weight
+        self._doc_terms[product_id] = set(weights)
+        self._terms_dirty = True
+
+    def _unindex_document(self, product_id):
+        for term in self._doc_terms.pop(product_id, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[term]
+        self._terms_dirty = True
+
+    def _ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def _expand_prefix(self, token):
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+
+        start = bisect.bisect_left(self._sorted_terms, token)
+        terms = []
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def rank(self, query):
+        """
+        Tính điểm cho các products khớp query.
+
+        Returns:
+            list: Các tuple (product_id, score) theo điểm giảm dần
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            self._ensure_built()
+            total_documents = max(len(self._doc_terms), 1)
+            scores = None
+
+            for token in tokens:
+                token_scores = defaultdict(float)
+                for term in self._expand_prefix(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + total_documents / len(postings))
+                    for product_id, weight in postings.items():
+                        token_scores[product_id] += weight * idf
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        product_id: score + token_scores[product_id]
+                        for product_id, score in scores.items()
+                        if product_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def search(self, queryset, query):
+        ranked = self.rank(query)
+        if not ranked:
+            return self.empty(queryset)
+
+        # Một biểu thức CASE duy nhất thay vì hàng nghìn When() để việc
+        # clone/compile queryset không tốn chi phí theo số kết quả. Ids và
+        # điểm là số nên được viết thẳng vào SQL: không có bind parameter
+        # nào, tập kết quả không bị giới hạn bởi số parameters tối đa của
+        # database và phân trang trên toàn bộ các products khớp
+        column = '{}.{}'.format(
+            connection.ops.quote_name(queryset.model._meta.db_table),
+            connection.ops.quote_name(queryset.model._meta.pk.column)
+        )
+        ids = ','.join(str(int(product_id)) for product_id, _ in ranked)
+        branches = ' '.join(
+            f'WHEN {int(product_id)} THEN {float(score)!r}' for product_id, score in ranked
+        )
+
+        return queryset.filter(
+            RawSQL(f'{column} IN ({ids})', [], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f'CASE {column} {branches} ELSE 0 END', [], output_field=FloatField())
+        )
+
+    def update_product(self, product):
+        with self._lock:
+            if not self._built:
+                return
+            self._unindex_document(product.pk)
+            self._index_document(
+                product.pk,
+                [getattr(product, field) for field, _, _ in SEARCH_FIELDS]
+            )
+
+    def remove_product(self, product_id):
+        with self._lock:
+            if self._built:
+                self._unindex_document(product_id)
+
+    def rebuild(self):
+        fields = [field for field, _, _ in SEARCH_FIELDS]
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_terms = {}
+            rows = get_product_model().objects.values_list('pk', *fields)
+            for product_id, *values in rows.iterator(chunk_size=2000):
+                self._index_document(product_id, values)
+            self._built = True
+
+
+SEARCH_BACKENDS = {
+    'postgres': PostgresSearchBackend,
+    'memory': InMemorySearchBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    """
+    Trả về search backend theo setting `PRODUCT_SEARCH_BACKEND`.
+
+    Mặc định dùng 'postgres' khi database là PostgreSQL, ngược lại 'memory'.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                default = 'postgres' if connection.vendor == 'postgresql' else 'memory'
+                name = getattr(settings, 'PRODUCT_SEARCH_BACKEND', default)
+                _backend = SEARCH_BACKENDS[name]()
+    return _backend
+
+
+def reset_search_backend():
+    """Bỏ backend instance hiện tại (dùng khi đổi setting trong tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = None
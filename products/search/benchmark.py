@@ -0,0 +1,127 @@
+"""
+Benchmark search engine so với DRF `SearchFilter` (icontains) cũ.
+
+Tạo fixture products trong một transaction, đo latency của trang kết quả
+đầu tiên (COUNT + 20 rows như pagination) cho từng query, rồi rollback.
+Chạy qua `manage.py benchmark_product_search`.
+"""
+import random
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ..models import Product
+from .backends import get_search_backend
+
+VOCABULARY = [
+    'laptop', 'gaming', 'phone', 'wireless', 'bluetooth', 'headphone', 'camera',
+    'keyboard', 'mouse', 'monitor', 'charger', 'cable', 'speaker', 'watch',
+    'tablet', 'printer', 'router', 'backpack', 'shoe', 'shirt', 'jacket',
+    'kitchen', 'blender', 'coffee', 'lamp', 'desk', 'chair', 'sofa', 'pillow',
+    'blanket', 'book', 'novel', 'pen', 'notebook', 'bottle', 'bag', 'wallet',
+    'sunglasses', 'helmet', 'bicycle', 'tent', 'garden', 'drill', 'hammer',
+]
+
+DEFAULT_QUERIES = ['laptop', 'wireless head', 'coffee blender', 'gam', 'nonexistentterm']
+
+PAGE_SIZE = 20
+
+
+class _SearchView:
+    search_fields = ['name', 'description', 'short_description']
+
+
+def _random_text(rng, words):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def create_fixture(product_count, seed=42, batch_size=5000):
+    """Tạo `product_count` active products với nội dung ngẫu nhiên."""
+    rng = random.Random(seed)
+    User = get_user_model()
+    seller = User.objects.create_user(
+        username=f'bench-{uuid.uuid4().hex[:8]}',
+        email=f'bench-{uuid.uuid4().hex[:8]}@example.com',
+        password=None
+    )
+    run_id = uuid.uuid4().hex[:8]
+
+    for start in range(0, product_count, batch_size):
+        Product.objects.bulk_create([
+            Product(
+                name=_random_text(rng, 3),
+                slug=f'bench-{run_id}-{index}',
+                sku=f'BENCH-{run_id}-{index}',
+                short_description=_random_text(rng, 8),
+                description=_random_text(rng, 40),
+                price=rng.randint(1, 1000),
+                seller=seller,
+                status='active',
+            )
+            for index in range(start, min(start + batch_size, product_count))
+        ])
+
+
+def _time_page(build_queryset, repeat):
+    """Median ms để build queryset, đếm kết quả và lấy trang đầu tiên."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        queryset = build_queryset()
+        queryset.count()
+        list(queryset.values_list('pk', flat=True)[:PAGE_SIZE])
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(product_count=100000, queries=None, repeat=5):
+    """
+    Chạy benchmark và trả về kết quả cho từng query.
+
+    Returns:
+        dict: {'index_build_ms': float, 'results': [
+            {'query', 'legacy_ms', 'engine_ms', 'legacy_count', 'engine_count'}
+        ]}
+    """
+    queries = queries or DEFAULT_QUERIES
+    backend = get_search_backend()
+    legacy_filter = SearchFilter()
+    factory = APIRequestFactory()
+    report = {'product_count': product_count, 'results': []}
+
+    with transaction.atomic():
+        create_fixture(product_count)
+
+        started = time.perf_counter()
+        backend.rebuild()
+        report['index_build_ms'] = (time.perf_counter() - started) * 1000
+
+        base_queryset = Product.objects.filter(status='active')
+        for query in queries:
+            request = Request(factory.get('/', {'search': query}))
+
+            def legacy_queryset():
+                return legacy_filter.filter_queryset(request, base_queryset, _SearchView())
+
+            def engine_queryset():
+                return backend.search(base_queryset, query).order_by('-search_rank')
+
+            report['results'].append({
+                'query': query,
+                'legacy_ms': _time_page(legacy_queryset, repeat),
+                'engine_ms': _time_page(engine_queryset, repeat),
+                'legacy_count': legacy_queryset().count(),
+                'engine_count': engine_queryset().count(),
+            })
+
+        transaction.set_rollback(True)
+
+    # Index trong memory vẫn chứa fixture đã rollback
+    backend.rebuild()
+    return report
@@ -0,0 +1,42 @@
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .backends import get_search_backend
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    Filter backend tìm kiếm products qua search engine thay cho `SearchFilter`.
+
+    Kết quả được sắp xếp theo `search_rank` trừ khi client truyền
+    `ordering` rõ ràng. Nên đặt sau `OrderingFilter` trong `filter_backends`
+    để thứ tự theo rank không bị ordering mặc định ghi đè.
+    """
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_terms(request)
+        if not query:
+            return queryset
+
+        queryset = get_search_backend().search(queryset, query)
+        if not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Full-text search trên name, short_description và description (hỗ trợ prefix)',
+                'schema': {
+                    'type': 'string',
+                },
+            },
+        ]
@@ -0,0 +1,16 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+
+
+class SearchVectorIndex(GinIndex):
+    """
+    GIN index cho cột tsvector trên PostgreSQL.
+
+    Trên các database khác (SQLite khi chạy tests) tạo index thường
+    để schema vẫn được tạo thành công.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return models.Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
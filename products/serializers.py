@@ -4,7 +4,71 @@ from typing import Optional, Dict, Any
 from decimal import Decimal
 from drf_spectacular.utils import extend_schema_field
 
-from .models import Product, ProductImage, ProductFavorite, ProductView
+from .models import Product, ProductImage, ProductFavorite, ProductView, primary_image_prefetch
+from .services.related_products import get_related_products
+
+
+def get_favorited_product_ids(request, products):
+    """
+    Lấy tập id các products mà user hiện tại đã yêu thích trong một query.
+
+    Args:
+        request: Request hiện tại (có thể None).
+        products: Iterable các Product instances cần kiểm tra.
+
+    Returns:
+        set: Tập product id đã được user yêu thích.
+    """
+    if not request or not request.user.is_authenticated:
+        return set()
+
+    product_ids = [product.pk for product in products]
+    if not product_ids:
+        return set()
+
+    return set(
+        ProductFavorite.objects.filter(
+            user=request.user,
+            product_id__in=product_ids
+        ).values_list('product_id', flat=True)
+    )
+
+
+class ProductSummaryListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer cho product list views.
+
+    Resolve favorite set của user một lần cho cả page thay vì
+    một query ``exists()`` cho mỗi product.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        products = list(iterable)
+        self.child.favorited_ids = get_favorited_product_ids(
+            self.context.get('request'),
+            products
+        )
+        return super().to_representation(products)
+
+
+class ProductItemListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer cho các items có field `product` là
+    ProductSummarySerializer (order items, cart items...).
+
+    Resolve favorite set của user một lần cho products của tất cả items
+    thay vì một query cho mỗi item.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        items = list(iterable)
+        self.child.fields['product'].favorited_ids = get_favorited_product_ids(
+            self.context.get('request'),
+            [item.product for item in items]
+        )
+        return super().to_representation(items)
 
 
 class ProductImageSerializer(serializers.ModelSerializer):
@@ -44,9 +108,13 @@ class ProductSummarySerializer(serializers.ModelSerializer):
     is_favorited = serializers.SerializerMethodField(read_only=True)
     discount_percentage = serializers.SerializerMethodField(read_only=True)
     stock_status = serializers.SerializerMethodField(read_only=True)
+
+    # Được ProductSummaryListSerializer gán khi serialize nhiều products
+    favorited_ids = None
     
     class Meta:
         model = Product
+        list_serializer_class = ProductSummaryListSerializer
         fields = [
             'id', 'name', 'slug', 'short_description', 'price', 'compare_price',
             'category_name', 'seller_name', 'rating', 'reviews_count',
@@ -60,6 +128,11 @@ class ProductSummarySerializer(serializers.ModelSerializer):
             'stock_status', 'is_featured', 'created_at'
         ]
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Relations mà các fields cần, dùng khi serialize nested products theo lô."""
+        return queryset.select_related('category', 'seller').prefetch_related(primary_image_prefetch())
+    
     @extend_schema_field(serializers.CharField)
     def get_seller_name(self, obj):
         return f"{obj.seller.first_name} {obj.seller.last_name}".strip() or obj.seller.email
@@ -76,6 +149,9 @@ class ProductSummarySerializer(serializers.ModelSerializer):
     
     @extend_schema_field(serializers.BooleanField)
     def get_is_favorited(self, obj):
+        if self.favorited_ids is not None:
+            return obj.pk in self.favorited_ids
+        
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return ProductFavorite.objects.filter(
@@ -118,7 +194,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'slug', 'description', 'short_description',
             'price', 'compare_price', 'category', 'category_name',
-            'sku', 'barcode', 'seller_info', 'status', 'is_featured',
+            'brand', 'attribute_values', 'sku', 'barcode', 'seller_info', 'status', 'is_featured',
             'is_digital', 'rating', 'reviews_count', 'views_count',
             'sales_count', 'stock', 'track_inventory', 'weight',
             'length', 'width', 'height', 'images', 'is_favorited',
@@ -168,11 +244,8 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         return False
     
     def get_related_products(self, obj):
-        # Get related products from same category (max 4)
-        related = Product.objects.filter(
-            category=obj.category,
-            status='active'
-        ).exclude(id=obj.id)[:4]
+        # Related products được tính trước và cache theo list id (max 4)
+        related = get_related_products(obj)
         
         return ProductSummarySerializer(
             related, 
@@ -189,8 +262,8 @@ class ProductCreateSerializer(serializers.ModelSerializer):
         model = Product
         fields = [
             'name', 'description', 'short_description', 'price', 'compare_price',
-            'category', 'stock', 'low_stock_threshold', 'track_inventory',
-            'barcode', 'is_digital', 'weight', 'length', 'width', 'height',
+            'category', 'brand', 'attribute_values', 'stock', 'low_stock_threshold',
+            'track_inventory', 'barcode', 'is_digital', 'weight', 'length', 'width', 'height',
             'meta_title', 'meta_description'
         ]
 
@@ -230,8 +303,8 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
         model = Product
         fields = [
             'name', 'description', 'short_description', 'price', 'compare_price',
-            'category', 'stock', 'low_stock_threshold', 'track_inventory',
-            'barcode', 'status', 'is_featured', 'is_digital', 'weight',
+            'category', 'brand', 'attribute_values', 'stock', 'low_stock_threshold',
+            'track_inventory', 'barcode', 'status', 'is_featured', 'is_digital', 'weight',
             'length', 'width', 'height', 'meta_title', 'meta_description'
         ]
     
@@ -271,6 +344,52 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
+class ProductImportRowSerializer(serializers.ModelSerializer):
+    """
+    Validate một dòng trong file import products (seller).
+    
+    Không chạm database: `category`/`brand` nhận id hoặc slug và được resolve
+    theo từng chunk, uniqueness của `sku`/`slug` được kiểm tra theo chunk
+    trong products.services.bulk_import.
+    """
+    sku = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    category = serializers.CharField(required=False, allow_blank=True)
+    brand = serializers.CharField(required=False, allow_blank=True)
+    status = serializers.ChoiceField(
+        choices=['draft', 'active', 'inactive', 'out_of_stock'], required=False
+    )
+    
+    class Meta:
+        model = Product
+        fields = [
+            'sku', 'name', 'description', 'short_description', 'price', 'compare_price',
+            'cost_price', 'category', 'brand', 'stock', 'low_stock_threshold',
+            'track_inventory', 'barcode', 'status', 'is_digital', 'weight', 'length',
+            'width', 'height', 'meta_title', 'meta_description'
+        ]
+    
+    def to_internal_value(self, data):
+        # CSV biểu diễn giá trị rỗng bằng chuỗi rỗng
+        data = {key: value for key, value in data.items() if value not in ('', None)}
+        return super().to_internal_value(data)
+    
+    def validate_price(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Giá phải lớn hơn 0")
+        return value
+    
+    def validate(self, data):
+        price = data.get('price')
+        compare_price = data.get('compare_price')
+        
+        if compare_price and price and compare_price <= price:
+            raise serializers.ValidationError({
+                'compare_price': 'Giá so sánh phải lớn hơn giá bán'
+            })
+        
+        return data
+
+
 class ProductFavoriteSerializer(serializers.ModelSerializer):
     """
     Serializer cho ProductFavorite.
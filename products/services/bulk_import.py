@@ -0,0 +1,300 @@
+"""
+Bulk Product Import/Export Service
+
+Import products của một seller từ CSV hoặc JSONL theo từng chunk:
+
+1. Đọc stream từng dòng, không load toàn bộ file vào memory
+2. Mỗi chunk chạy một query lấy products đã có theo SKU, một query cho
+   categories/brands và một query kiểm tra slug đã tồn tại
+3. Validate từng dòng bằng `ProductImportRowSerializer` (không query database)
+4. Slug (cùng quy tắc với `UniqueSlugMixin`) và SKU được tính trong memory,
+   ghi bằng `bulk_create`/`bulk_update`
+
+Dòng có SKU đã tồn tại của seller được cập nhật (chỉ các cột có trong dòng),
+dòng không có SKU được tạo mới với SKU sinh tự động. Dòng lỗi bị bỏ qua và
+được báo cáo kèm số dòng.
+
+Vì `bulk_create` không gửi `post_save`, các side effects (search index,
+related products, response cache, listing projection, facets, stock items)
+được xử lý theo chunk và signal `products_bulk_created` được gửi cho các
+apps khác.
+"""
+import csv
+import io
+import json
+import uuid
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from catalog.models import Brand, Category
+
+from core.utils.response_cache import instance_cache_tag, model_cache_tag, purge_cache_tags
+from core.utils.slugs import load_taken_slugs, next_free_slug
+
+from ..models import Product
+from ..search.backends import get_search_backend
+from ..serializers import ProductImportRowSerializer
+from ..signals import products_bulk_created
+from .facets import invalidate_facets
+from .listings import sync_product_listings
+from .related_products import invalidate_category_related_products
+
+DEFAULT_CHUNK_SIZE = 1000
+
+FORMATS = ('csv', 'jsonl')
+
+EXPORT_FIELDS = [
+    'sku', 'name', 'slug', 'description', 'short_description', 'price', 'compare_price',
+    'cost_price', 'category', 'brand', 'stock', 'low_stock_threshold', 'track_inventory',
+    'barcode', 'status', 'is_digital', 'weight', 'length', 'width', 'height',
+    'meta_title', 'meta_description'
+]
+
+# Field trong export -> lookup trong values_list
+EXPORT_LOOKUPS = {'category': 'category__slug', 'brand': 'brand__slug'}
+
+
+class ProductImportError(ValueError):
+    """File import không đọc được (sai format, thiếu header...)."""
+
+
+def detect_format(filename, default='csv'):
+    """Đoán format từ phần mở rộng của file."""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    return default
+
+
+def iter_rows(stream, file_format):
+    """
+    Đọc từng dòng dữ liệu từ một text stream.
+
+    Yields:
+        tuple: (số dòng trong file, dict dữ liệu hoặc None nếu dòng lỗi)
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames:
+            raise ProductImportError('File CSV không có header')
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key}
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ProductImportError(f"Format không được hỗ trợ: {file_format}")
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def resolve_references(model, values):
+    """
+    Map giá trị id/slug -> instance cho categories hoặc brands bằng một query.
+    """
+    values = {str(value).strip() for value in values if value}
+    if not values:
+        return {}
+    ids = [int(value) for value in values if value.isdigit()]
+    instances = model.objects.filter(Q(slug__in=values) | Q(pk__in=ids))
+    resolved = {}
+    for instance in instances:
+        resolved[instance.slug] = instance
+        resolved[str(instance.pk)] = instance
+    return resolved
+
+
+class ProductImporter:
+    """
+    Import products cho một seller.
+
+    Args:
+        seller: User sở hữu các products được import
+        chunk_size (int): Số dòng mỗi chunk
+        dry_run (bool): Chỉ validate, không ghi database
+    """
+
+    def __init__(self, seller, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+        self.seller = seller
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.result = {'rows': 0, 'created': 0, 'updated': 0, 'errors': []}
+        # Slugs đã cấp trong lần import này (các chunk trước chưa commit khi dry_run)
+        self.allocated_slugs = set()
+
+    def run(self, stream, file_format='csv'):
+        """
+        Import từ text stream.
+
+        Returns:
+            dict: {'rows', 'created', 'updated', 'errors': [{'row', 'errors'}]}
+        """
+        for chunk in chunked(iter_rows(stream, file_format), self.chunk_size):
+            self.import_chunk(chunk)
+
+        if not self.dry_run and (self.result['created'] or self.result['updated']):
+            invalidate_facets()
+        return self.result
+
+    def add_error(self, line_number, errors):
+        self.result['errors'].append({'row': line_number, 'errors': errors})
+
+    def import_chunk(self, chunk):
+        self.result['rows'] += len(chunk)
+        rows = []
+        for line_number, data in chunk:
+            if data is None:
+                self.add_error(line_number, {'non_field_errors': ['Dòng không hợp lệ']})
+            else:
+                rows.append((line_number, data))
+
+        skus = {str(data.get('sku') or '').strip() for _, data in rows} - {''}
+        existing = Product.objects.filter(sku__in=skus).in_bulk(field_name='sku') if skus else {}
+        categories = resolve_references(Category, [data.get('category') for _, data in rows])
+        brands = resolve_references(Brand, [data.get('brand') for _, data in rows])
+
+        to_create, to_update, update_fields = [], [], set()
+        seen_skus = set()
+        for line_number, data in rows:
+            sku = str(data.get('sku') or '').strip()
+            instance = existing.get(sku)
+            if sku in seen_skus:
+                self.add_error(line_number, {'sku': ['SKU bị trùng trong file']})
+                continue
+            if instance is not None and instance.seller_id != self.seller.pk:
+                self.add_error(line_number, {'sku': ['SKU đã được sử dụng']})
+                continue
+
+            serializer = ProductImportRowSerializer(data=data, partial=instance is not None)
+            if not serializer.is_valid():
+                self.add_error(line_number, serializer.errors)
+                continue
+
+            values = dict(serializer.validated_data)
+            errors = {}
+            for field, references in (('category', categories), ('brand', brands)):
+                if field in values:
+                    reference = values.pop(field)
+                    values[field] = references.get(reference.strip()) if reference else None
+                    if reference and values[field] is None:
+                        errors[field] = [f"Không tìm thấy {field} '{reference}'"]
+            if errors:
+                self.add_error(line_number, errors)
+                continue
+
+            if sku:
+                seen_skus.add(sku)
+            if instance is None:
+                to_create.append(self.build_product(values))
+            else:
+                values.pop('sku', None)
+                for field, value in values.items():
+                    setattr(instance, field, value)
+                    update_fields.add(field)
+                if values.get('status') == 'active' and not instance.published_at:
+                    instance.published_at = timezone.now()
+                    update_fields.add('published_at')
+                to_update.append(instance)
+
+        self.assign_slugs(to_create)
+        if not self.dry_run:
+            self.write(to_create, to_update, update_fields)
+        self.result['created'] += len(to_create)
+        self.result['updated'] += len(to_update)
+
+    def build_product(self, values):
+        product = Product(seller=self.seller, **values)
+        if not product.sku:
+            product.sku = f"SKU-{self.seller.pk}-{uuid.uuid4().hex[:8].upper()}"
+        if product.status == 'active':
+            product.published_at = timezone.now()
+        return product
+
+    def assign_slugs(self, products):
+        base_slugs = {slugify(product.name) or 'product' for product in products}
+        taken = load_taken_slugs(Product.objects.all(), base_slugs) | self.allocated_slugs
+        for product in products:
+            product.slug = next_free_slug(slugify(product.name) or 'product', taken)
+            self.allocated_slugs.add(product.slug)
+
+    @transaction.atomic
+    def write(self, to_create, to_update, update_fields):
+        now = timezone.now()
+        created = Product.objects.bulk_create(to_create)
+        if to_update:
+            for product in to_update:
+                product.updated_at = now
+            Product.objects.bulk_update(to_update, [*update_fields, 'updated_at'])
+
+        changed = [*created, *to_update]
+        if not changed:
+            return
+
+        # Side effects mà post_save thường đảm nhận
+        get_search_backend().update_products([product.pk for product in changed])
+        invalidate_category_related_products({product.category_id for product in changed})
+        purge_cache_tags(
+            model_cache_tag(Product), *(instance_cache_tag(product) for product in to_update)
+        )
+        sync_product_listings([product.pk for product in changed])
+        if created:
+            products_bulk_created.send(sender=Product, products=created)
+
+
+def import_products(seller, stream, file_format='csv', chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """Import products từ text stream, xem `ProductImporter`."""
+    return ProductImporter(seller, chunk_size=chunk_size, dry_run=dry_run).run(stream, file_format)
+
+
+def iter_export_rows(queryset, chunk_size=2000):
+    """Stream các dict theo EXPORT_FIELDS, đọc database theo từng chunk."""
+    lookups = [EXPORT_LOOKUPS.get(field, field) for field in EXPORT_FIELDS]
+    rows = queryset.order_by('pk').values_list(*lookups).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield dict(zip(EXPORT_FIELDS, row))
+
+
+def export_products(queryset, file_format='csv', chunk_size=2000):
+    """
+    Export products thành các dòng text (CSV có header hoặc JSONL).
+
+    Yields:
+        str: Từng dòng của file export
+    """
+    if file_format == 'jsonl':
+        for row in iter_export_rows(queryset, chunk_size):
+            yield json.dumps(row, default=str, ensure_ascii=False) + '\n'
+        return
+
+    if file_format != 'csv':
+        raise ProductImportError(f"Format không được hỗ trợ: {file_format}")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in iter_export_rows(queryset, chunk_size):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
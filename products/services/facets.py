@@ -0,0 +1,194 @@
+"""
+Product Facets Service
+
+Tính số lượng products theo brand, category, attribute value và khoảng giá
+cho một listing đã được lọc. Mỗi loại facet là một aggregate query có
+GROUP BY (khoảng giá dùng một query với nhiều COUNT có điều kiện), nên
+một lần tính facets tốn 4 queries bất kể số lượng products.
+
+Kết quả được cache theo chữ ký đã chuẩn hóa của các filters trong request.
+Mọi key đều gắn với một generation number; khi product hoặc dữ liệu catalog
+thay đổi chỉ cần tăng generation (một `cache.incr`) thay vì tìm và xóa
+từng key (xem products.signals).
+"""
+import hashlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from ..models import Product
+
+CACHE_KEY_PREFIX = 'product_facets'
+GENERATION_CACHE_KEY = f'{CACHE_KEY_PREFIX}:generation'
+
+# Query params không ảnh hưởng tới tập products được đếm
+IGNORED_PARAMS = {'page', 'page_size', 'ordering', 'format', 'facets'}
+
+DEFAULT_PRICE_BUCKETS = (50, 100, 200, 500, 1000)
+
+
+def get_cache_timeout():
+    return getattr(settings, 'PRODUCT_FACETS_CACHE_TIMEOUT', 60 * 15)
+
+
+def get_price_buckets():
+    """Các mốc giá tăng dần, ví dụ (50, 100) -> [<50, 50-100, >=100]."""
+    boundaries = getattr(settings, 'PRODUCT_FACET_PRICE_BUCKETS', DEFAULT_PRICE_BUCKETS)
+    boundaries = [Decimal(str(boundary)) for boundary in boundaries]
+    lower_bounds = [None, *boundaries]
+    upper_bounds = [*boundaries, None]
+    return list(zip(lower_bounds, upper_bounds))
+
+
+def get_generation():
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        # add() để không ghi đè generation mà process khác vừa tạo
+        cache.add(GENERATION_CACHE_KEY, 1, None)
+        generation = cache.get(GENERATION_CACHE_KEY, 1)
+    return generation
+
+
+def invalidate_facets():
+    """Làm tất cả facets đã cache hết hiệu lực."""
+    try:
+        cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.add(GENERATION_CACHE_KEY, 1, None)
+
+
+def get_filter_signature(query_params):
+    """
+    Chuẩn hóa query params thành một chuỗi ổn định.
+
+    Thứ tự params và thứ tự các giá trị lặp lại không ảnh hưởng tới
+    chữ ký, params rỗng và params phân trang/sắp xếp bị bỏ qua.
+    """
+    parts = []
+    for key in sorted(query_params.keys()):
+        if key in IGNORED_PARAMS:
+            continue
+        values = sorted(
+            value.strip() for value in query_params.getlist(key) if value.strip()
+        )
+        if values:
+            parts.append(f'{key}={",".join(values)}')
+    return '&'.join(parts)
+
+
+def get_cache_key(signature):
+    digest = hashlib.sha1(signature.encode('utf-8')).hexdigest()
+    return f'{CACHE_KEY_PREFIX}:{get_generation()}:{digest}'
+
+
+def _brand_facets(products):
+    rows = products.filter(
+        brand__isnull=False
+    ).values(
+        'brand_id', 'brand__name', 'brand__slug'
+    ).annotate(count=Count('pk')).order_by('-count', 'brand__name')
+
+    return [
+        {'id': row['brand_id'], 'name': row['brand__name'],
+         'slug': row['brand__slug'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def _category_facets(products):
+    rows = products.filter(
+        category__isnull=False
+    ).values(
+        'category_id', 'category__name', 'category__slug'
+    ).annotate(count=Count('pk')).order_by('-count', 'category__name')
+
+    return [
+        {'id': row['category_id'], 'name': row['category__name'],
+         'slug': row['category__slug'], 'count': row['count']}
+        for row in rows
+    ]
+
+
+def _attribute_facets(products):
+    rows = products.filter(
+        attribute_values__attribute__is_filterable=True
+    ).values(
+        'attribute_values__attribute_id',
+        'attribute_values__attribute__name',
+        'attribute_values__attribute__slug',
+        'attribute_values__id',
+        'attribute_values__display_value',
+        'attribute_values__slug',
+    ).annotate(
+        count=Count('pk', distinct=True)
+    ).order_by('attribute_values__attribute__name', 'attribute_values__display_value')
+
+    attributes = {}
+    for row in rows:
+        attribute = attributes.setdefault(row['attribute_values__attribute_id'], {
+            'id': row['attribute_values__attribute_id'],
+            'name': row['attribute_values__attribute__name'],
+            'slug': row['attribute_values__attribute__slug'],
+            'values': [],
+        })
+        attribute['values'].append({
+            'id': row['attribute_values__id'],
+            'value': row['attribute_values__display_value'],
+            'slug': row['attribute_values__slug'],
+            'count': row['count'],
+        })
+    return list(attributes.values())
+
+
+def _price_facets(products):
+    buckets = get_price_buckets()
+    aggregates = {}
+    for index, (lower, upper) in enumerate(buckets):
+        condition = Q()
+        if lower is not None:
+            condition &= Q(price__gte=lower)
+        if upper is not None:
+            condition &= Q(price__lt=upper)
+        aggregates[f'bucket_{index}'] = Count('pk', filter=condition)
+
+    counts = products.aggregate(**aggregates)
+    return [
+        {'min': lower, 'max': upper, 'count': counts[f'bucket_{index}']}
+        for index, (lower, upper) in enumerate(buckets)
+    ]
+
+
+def compute_facets(queryset):
+    """
+    Tính facets cho một Product queryset đã được lọc.
+
+    Returns:
+        dict: {'brands': [...], 'categories': [...],
+               'attributes': [...], 'price_ranges': [...]}
+    """
+    # Subquery theo pk để bỏ ordering, annotations và prefetch của listing
+    products = Product.objects.filter(pk__in=queryset.order_by().values('pk'))
+    return {
+        'brands': _brand_facets(products),
+        'categories': _category_facets(products),
+        'attributes': _attribute_facets(products),
+        'price_ranges': _price_facets(products),
+    }
+
+
+def get_facets(queryset, query_params):
+    """
+    Lấy facets từ cache theo chữ ký filters, tính và cache nếu chưa có.
+
+    Args:
+        queryset: Product queryset đã áp dụng các filters của request
+        query_params: QueryDict của request đã tạo ra queryset
+    """
+    cache_key = get_cache_key(get_filter_signature(query_params))
+    facets = cache.get(cache_key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(cache_key, facets, get_cache_timeout())
+    return facets
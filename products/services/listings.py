@@ -0,0 +1,242 @@
+"""
+Product Listing Projection
+
+`ProductListing` giữ sẵn các fields của `ProductSummarySerializer` cho mỗi
+product active. Public listing đọc một bảng bằng `.values()` và dựng dict
+trực tiếp, không join seller/category/images và không tạo model instances.
+
+Đồng bộ:
+- Product save: `sync_product_listings([product.pk])` (tạo, cập nhật hoặc
+  xóa row tùy status)
+- ProductImage thay đổi: cập nhật primary image của product
+- Category/User đổi tên: `update_category_names` / `update_seller_names`
+- Bulk import, dữ liệu cũ: `rebuild_product_listings` hoặc
+  `manage.py rebuild_product_listings`
+"""
+from django.db import transaction
+from django.db.models import F
+from rest_framework import serializers
+
+from ..models import (
+    Product, ProductFavorite, ProductImage, ProductListing, primary_image_prefetch
+)
+from ..serializers import ProductSummarySerializer
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Fields được ghi lại khi row đã tồn tại
+SYNC_FIELDS = [
+    'name', 'slug', 'short_description', 'price', 'compare_price', 'discount_percentage',
+    'stock_status', 'category', 'category_name', 'brand', 'seller', 'seller_name',
+    'primary_image', 'is_featured', 'rating', 'reviews_count', 'views_count',
+    'sales_count', 'created_at', 'synced_at'
+]
+
+# Columns đọc cho list view
+LISTING_VALUES = (
+    'product_id', 'name', 'slug', 'short_description', 'price', 'compare_price',
+    'category_id', 'category_name', 'seller_name', 'rating', 'reviews_count',
+    'primary_image', 'discount_percentage', 'stock_status', 'is_featured', 'created_at'
+)
+
+
+def get_seller_name(user):
+    """Tên hiển thị của seller, cùng quy tắc với ProductSummarySerializer."""
+    return f"{user.first_name} {user.last_name}".strip() or user.email
+
+
+def get_stock_status(product):
+    if not product.track_inventory:
+        return 'available'
+    elif not product.is_in_stock:
+        return 'out_of_stock'
+    elif product.is_low_stock:
+        return 'low_stock'
+    return 'in_stock'
+
+
+def build_listing(product):
+    """Row projection cho product (cần category, seller và primary image đã load)."""
+    primary_image = product.primary_image
+    return ProductListing(
+        product=product,
+        name=product.name,
+        slug=product.slug,
+        short_description=product.short_description,
+        price=product.price,
+        compare_price=product.compare_price,
+        discount_percentage=product.discount_percentage,
+        stock_status=get_stock_status(product),
+        category_id=product.category_id,
+        category_name=product.category.name if product.category_id else '',
+        brand_id=product.brand_id,
+        seller_id=product.seller_id,
+        seller_name=get_seller_name(product.seller),
+        primary_image=primary_image.image.name if primary_image and primary_image.image else '',
+        is_featured=product.is_featured,
+        rating=product.rating,
+        reviews_count=product.reviews_count,
+        views_count=product.views_count,
+        sales_count=product.sales_count,
+        created_at=product.created_at,
+    )
+
+
+def get_listing_source_queryset():
+    """Products được đưa vào projection, với các relations cần cho build_listing."""
+    return Product.objects.filter(status='active').select_related(
+        'category', 'seller'
+    ).prefetch_related(primary_image_prefetch())
+
+
+@transaction.atomic
+def sync_product_listings(product_ids):
+    """
+    Đồng bộ projection của các products: upsert products active, xóa các
+    products không còn active hoặc đã bị xóa.
+
+    Returns:
+        int: Số rows đã ghi
+    """
+    product_ids = list(product_ids)
+    listings = [build_listing(product) for product in get_listing_source_queryset().filter(pk__in=product_ids)]
+    synced_ids = [listing.product_id for listing in listings]
+
+    ProductListing.objects.filter(product_id__in=product_ids).exclude(product_id__in=synced_ids).delete()
+    ProductListing.objects.bulk_create(
+        listings, update_conflicts=True, unique_fields=['product'], update_fields=SYNC_FIELDS
+    )
+    return len(listings)
+
+
+def rebuild_product_listings(chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Dựng lại toàn bộ projection theo từng chunk products.
+
+    Returns:
+        int: Số products active trong projection
+    """
+    ProductListing.objects.exclude(product__status='active').delete()
+    product_ids = Product.objects.filter(status='active').order_by('pk').values_list('pk', flat=True)
+
+    total = 0
+    chunk = []
+    for product_id in product_ids.iterator(chunk_size=chunk_size):
+        chunk.append(product_id)
+        if len(chunk) >= chunk_size:
+            total += sync_product_listings(chunk)
+            chunk = []
+    if chunk:
+        total += sync_product_listings(chunk)
+    return total
+
+
+def update_primary_image(product_id):
+    """Ghi lại primary image của product sau khi images thay đổi."""
+    image = ProductImage.objects.filter(product_id=product_id, is_primary=True).values_list('image', flat=True).first()
+    ProductListing.objects.filter(product_id=product_id).update(primary_image=image or '')
+
+
+def update_category_names(category):
+    ProductListing.objects.filter(category_id=category.pk).exclude(
+        category_name=category.name
+    ).update(category_name=category.name)
+
+
+def clear_category(category_id):
+    """Category bị xóa: products bị SET_NULL mà không gửi post_save."""
+    ProductListing.objects.filter(category_id=category_id).update(category=None, category_name='')
+
+
+def update_seller_names(user):
+    seller_name = get_seller_name(user)
+    ProductListing.objects.filter(seller_id=user.pk).exclude(
+        seller_name=seller_name
+    ).update(seller_name=seller_name)
+
+
+def increment_listing_views(product_ids, views):
+    """Cộng views_count như flush_product_views làm với Product."""
+    ProductListing.objects.filter(product_id__in=product_ids).update(
+        views_count=F('views_count') + views
+    )
+
+
+class ListingRowSerializer:
+    """
+    Dựng output của ProductSummarySerializer từ các rows `.values()`.
+
+    Các model fields dùng `to_representation` của chính
+    ProductSummarySerializer (định dạng Decimal, datetime giống hệt), các
+    method fields đọc giá trị đã tính sẵn trong projection. Plan được
+    compile một lần cho mỗi process.
+    """
+    _field_plan = None
+
+    def __init__(self, request=None):
+        self.request = request
+
+    @classmethod
+    def get_field_plan(cls):
+        """
+        List các (tên field, column, converter) theo thứ tự fields của serializer.
+
+        Column None nghĩa là field được tính khi serialize (image URL, favorite).
+        """
+        if cls._field_plan is None:
+            fields = ProductSummarySerializer().fields
+            converters = {
+                # Xử lý riêng trong serialize()
+                'category_name': None,
+                # Method field trả về 0 (int) khi không giảm giá
+                'discount_percentage': lambda value: value or 0,
+            }
+            plan = []
+            for name in ProductSummarySerializer.Meta.fields:
+                column = 'product_id' if name == 'id' else name
+                if column not in LISTING_VALUES:
+                    plan.append((name, None, None))
+                elif name in converters:
+                    plan.append((name, column, converters[name]))
+                elif isinstance(fields[name], serializers.SerializerMethodField):
+                    plan.append((name, column, lambda value: value))
+                else:
+                    plan.append((name, column, fields[name].to_representation))
+            cls._field_plan = plan
+        return cls._field_plan
+
+    def get_favorited_ids(self, rows):
+        user = getattr(self.request, 'user', None)
+        if not rows or user is None or not user.is_authenticated:
+            return set()
+        return set(ProductFavorite.objects.filter(
+            user=user, product_id__in=[row['product_id'] for row in rows]
+        ).values_list('product_id', flat=True))
+
+    def get_primary_image_url(self, path):
+        if not path:
+            return None
+        url = ProductImage._meta.get_field('image').storage.url(path)
+        return self.request.build_absolute_uri(url) if self.request else url
+
+    def serialize(self, rows):
+        rows = list(rows)
+        plan = self.get_field_plan()
+        favorited_ids = self.get_favorited_ids(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in plan:
+                if name == 'category_name':
+                    # Serializer bỏ qua field (SkipField) khi product không có category
+                    if row['category_id']:
+                        item[name] = row['category_name']
+                elif column is not None:
+                    value = row[column]
+                    item[name] = None if value is None else convert(value)
+                elif name == 'primary_image_url':
+                    item[name] = self.get_primary_image_url(row['primary_image'])
+                elif name == 'is_favorited':
+                    item[name] = row['product_id'] in favorited_ids
+            data.append(item)
+        return data
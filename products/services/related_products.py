@@ -0,0 +1,176 @@
+"""
+Related Products Service
+
+Tính trước danh sách related products cho từng product và lưu dưới dạng
+list id trong cache. Thứ tự ưu tiên:
+1. Products thường được mua cùng (co-purchases trong OrderItem)
+2. Products cùng category (bán chạy và đánh giá cao trước)
+
+Index được build offline bằng `manage.py build_related_products` và được
+làm mới dần khi product đổi status hoặc category (xem products.signals).
+Product detail chỉ cần một bulk fetch theo list id đã cache.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from ..models import Product, primary_image_prefetch
+
+RELATED_PRODUCTS_LIMIT = 4
+
+CACHE_KEY_PREFIX = 'related_products'
+
+
+def get_cache_timeout():
+    return getattr(settings, 'RELATED_PRODUCTS_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def get_cache_key(product_id):
+    return f'{CACHE_KEY_PREFIX}:{product_id}'
+
+
+def compute_related_product_ids(product, limit=RELATED_PRODUCTS_LIMIT):
+    """
+    Tính list id related products cho một product.
+
+    Args:
+        product: Product cần tính related products
+        limit (int): Số lượng related products tối đa
+
+    Returns:
+        list: Danh sách product id theo thứ tự ưu tiên
+    """
+    OrderItem = apps.get_model('orders', 'OrderItem')
+
+    co_purchased_ids = list(
+        OrderItem.objects.filter(
+            order__items__product=product,
+            product__status='active'
+        ).exclude(
+            product=product
+        ).exclude(
+            order__status='cancelled'
+        ).values('product_id').annotate(
+            times=Count('order', distinct=True)
+        ).order_by('-times', 'product_id').values_list('product_id', flat=True)[:limit]
+    )
+
+    related_ids = co_purchased_ids
+    if len(related_ids) < limit and product.category_id:
+        related_ids += list(
+            Product.objects.filter(
+                category_id=product.category_id,
+                status='active'
+            ).exclude(
+                pk__in=[product.pk, *related_ids]
+            ).order_by(
+                '-sales_count', '-rating', '-created_at'
+            ).values_list('pk', flat=True)[:limit - len(related_ids)]
+        )
+
+    return related_ids
+
+
+def get_related_product_ids(product):
+    """
+    Lấy list id related products từ cache, tính và cache lại nếu chưa có.
+    """
+    cache_key = get_cache_key(product.pk)
+    related_ids = cache.get(cache_key)
+    if related_ids is None:
+        related_ids = compute_related_product_ids(product)
+        cache.set(cache_key, related_ids, get_cache_timeout())
+    return related_ids
+
+
+def get_related_products(product):
+    """
+    Lấy related products bằng một bulk fetch theo list id đã cache.
+
+    Returns:
+        list: Danh sách Product instances theo thứ tự trong index
+    """
+    related_ids = get_related_product_ids(product)
+    if not related_ids:
+        return []
+
+    products = Product.objects.filter(
+        pk__in=related_ids,
+        status='active'
+    ).select_related(
+        'category', 'seller'
+    ).prefetch_related(primary_image_prefetch()).in_bulk()
+
+    return [products[pk] for pk in related_ids if pk in products]
+
+
+def invalidate_related_products(product_ids):
+    """Xóa index của các products, sẽ được tính lại khi cần."""
+    cache.delete_many([get_cache_key(product_id) for product_id in product_ids])
+
+
+def invalidate_category_related_products(category_ids, exclude_id=None):
+    """Invalidate index của tất cả products thuộc các categories."""
+    category_ids = {category_id for category_id in category_ids if category_id}
+    if not category_ids:
+        return
+
+    sibling_ids = Product.objects.filter(
+        category_id__in=category_ids
+    ).exclude(pk=exclude_id).values_list('pk', flat=True)
+    invalidate_related_products(sibling_ids)
+
+
+def refresh_related_products_for(product, category_ids=None):
+    """
+    Làm mới index khi product thay đổi status hoặc category.
+
+    Tính lại index của chính product và invalidate index của các
+    products cùng category (cũ và mới), vì product có thể vừa được
+    thêm vào hoặc bị loại khỏi danh sách related của chúng.
+
+    Args:
+        product: Product vừa thay đổi
+        category_ids (iterable, optional): Các category bị ảnh hưởng,
+            mặc định là category hiện tại của product
+    """
+    invalidate_category_related_products(
+        category_ids or [product.category_id],
+        exclude_id=product.pk
+    )
+
+    if product.status == 'active':
+        cache.set(
+            get_cache_key(product.pk),
+            compute_related_product_ids(product),
+            get_cache_timeout()
+        )
+    else:
+        invalidate_related_products([product.pk])
+
+
+def build_related_products_index(queryset=None, batch_size=500):
+    """
+    Build index cho tất cả active products (hoặc queryset chỉ định).
+
+    Returns:
+        int: Số products đã được build index
+    """
+    if queryset is None:
+        queryset = Product.objects.filter(status='active')
+
+    built = 0
+    batch = {}
+    for product in queryset.only('pk', 'category_id').iterator(chunk_size=batch_size):
+        batch[get_cache_key(product.pk)] = compute_related_product_ids(product)
+        if len(batch) >= batch_size:
+            cache.set_many(batch, get_cache_timeout())
+            built += len(batch)
+            batch = {}
+
+    if batch:
+        cache.set_many(batch, get_cache_timeout())
+        built += len(batch)
+
+    return built
@@ -0,0 +1,371 @@
+"""
+Product View Tracking Service
+
+Buffer các product view events thay vì ghi database trong request.
+Request chi tiết product chỉ đẩy event vào buffer; flusher định kỳ
+(`manage.py flush_product_views`) sẽ bulk_create các ProductView rows
+và cộng dồn `views_count` bằng `F()` expression cho từng product.
+
+Backend được chọn qua setting `PRODUCT_VIEW_BUFFER_BACKEND`:
+- 'cache' (mặc định khi `CACHES['default']` là cache chia sẻ như
+  Redis/Memcached): lưu events trong Django cache, dùng được giữa nhiều
+  processes. Bị từ chối trên cache chỉ tồn tại trong process (LocMemCache).
+- 'local' (mặc định khi không có cache chia sẻ): buffer trong process,
+  flush ngay trong process khi đủ `PRODUCT_VIEW_LOCAL_FLUSH_SIZE` events
+  (mặc định 100) hoặc sau `PRODUCT_VIEW_LOCAL_FLUSH_INTERVAL` giây (mặc định 60).
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict, deque, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.utils.cache import is_shared_cache, require_shared_cache
+
+from ..models import Product, ProductView
+from .listings import increment_listing_views
+
+logger = logging.getLogger(__name__)
+
+# Số event tối đa đọc từ cache trong một lần get_many
+FLUSH_CHUNK_SIZE = 500
+
+
+def get_client_ip(request):
+    """Get client IP address from request"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0]
+    else:
+        ip = request.META.get('REMOTE_ADDR')
+    return ip
+
+
+# Kết quả của `drain()`: events cần ghi, `commit()` gọi sau khi transaction
+# ghi database đã commit, `abort()` khi ghi thất bại (events được giữ lại)
+DrainedEvents = namedtuple('DrainedEvents', ['events', 'commit', 'abort'])
+
+
+def _noop():
+    pass
+
+
+EMPTY_DRAIN = DrainedEvents([], _noop, _noop)
+
+
+class LocalViewBuffer:
+    """
+    Buffer events trong memory của process hiện tại.
+
+    Có giới hạn kích thước để tránh tăng bộ nhớ vô hạn khi flusher
+    không chạy; events cũ nhất bị bỏ khi buffer đầy. Vì process khác
+    (`manage.py flush_product_views`) không đọc được buffer này, chính
+    process ghi events flush khi buffer đủ `flush_size` events hoặc đã quá
+    `flush_interval` giây kể từ lần flush trước (`should_flush`).
+    """
+
+    def __init__(self, max_size=10000, flush_size=None, flush_interval=None):
+        self._events = deque(maxlen=max_size)
+        self._pending = []
+        self._lock = threading.Lock()
+        self.flush_size = flush_size or getattr(settings, 'PRODUCT_VIEW_LOCAL_FLUSH_SIZE', 100)
+        self.flush_interval = flush_interval or getattr(settings, 'PRODUCT_VIEW_LOCAL_FLUSH_INTERVAL', 60)
+        self._last_flush = time.monotonic()
+
+    def add(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def should_flush(self):
+        with self._lock:
+            if not self._events:
+                return False
+            return (
+                len(self._events) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+    def drain(self):
+        with self._lock:
+            # Events của lần flush thất bại trước được ghi lại trước
+            self._pending.extend(self._events)
+            self._events.clear()
+            events, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+
+        def abort():
+            with self._lock:
+                self._pending = events + self._pending
+
+        return DrainedEvents(events, _noop, abort)
+
+
+class CacheViewBuffer:
+    """
+    Buffer events trong Django cache.
+
+    Mỗi event được lưu dưới một key riêng với số thứ tự lấy từ
+    `cache.incr`, vì vậy nhiều web processes có thể ghi đồng thời.
+    Flusher đọc các key từ vị trí đã flush lần trước đến vị trí hiện tại.
+    Chỉ dùng được với cache chia sẻ giữa các processes (Redis/Memcached,
+    database, file), xem `is_shared_cache`.
+
+    - Vị trí đã flush chỉ tăng đến event liên tiếp cuối cùng đọc được: event
+      có số thứ tự nhưng chưa được `set` (request đang ghi) được đọc ở lần
+      flush sau; chỉ bỏ qua khi vẫn thiếu sau `gap_timeout` giây
+    - Sequence bị evict được khởi tạo lại từ vị trí đã flush
+    - Event keys chỉ bị xóa và vị trí đã flush chỉ tăng sau khi transaction
+      ghi database commit (`DrainedEvents.commit`)
+    """
+
+    key_prefix = 'product_views'
+
+    def __init__(self, timeout=86400, gap_timeout=60):
+        self.timeout = timeout
+        self.gap_timeout = gap_timeout
+
+    @property
+    def sequence_key(self):
+        return f'{self.key_prefix}:seq'
+
+    @property
+    def flushed_key(self):
+        return f'{self.key_prefix}:flushed'
+
+    @property
+    def lock_key(self):
+        return f'{self.key_prefix}:flush_lock'
+
+    def event_key(self, position):
+        return f'{self.key_prefix}:event:{position}'
+
+    def gap_key(self, position):
+        return f'{self.key_prefix}:gap:{position}'
+
+    def should_flush(self):
+        # Flush bởi `manage.py flush_product_views`
+        return False
+
+    def _next_position(self):
+        for _ in range(2):
+            # Sequence mới (lần đầu hoặc bị evict) bắt đầu sau vị trí đã flush
+            cache.add(self.sequence_key, cache.get(self.flushed_key, 0), timeout=None)
+            try:
+                return cache.incr(self.sequence_key)
+            except ValueError:
+                # Sequence bị evict giữa add và incr
+                continue
+        raise ValueError("Product view sequence is unavailable")
+
+    def add(self, event):
+        position = self._next_position()
+        cache.set(self.event_key(position), event, timeout=self.timeout)
+
+    def _is_stale_gap(self, position, now):
+        """Event thiếu quá `gap_timeout` giây được coi là mất."""
+        cache.add(self.gap_key(position), now, timeout=self.timeout)
+        return now - cache.get(self.gap_key(position), now) >= self.gap_timeout
+
+    def drain(self):
+        # Chỉ một flusher được drain tại một thời điểm; lock được giữ đến
+        # commit/abort
+        if not cache.add(self.lock_key, 1, timeout=300):
+            return EMPTY_DRAIN
+
+        try:
+            head = cache.get(self.sequence_key, 0)
+            flushed = cache.get(self.flushed_key, 0)
+            if head < flushed:
+                logger.warning("Product view sequence restarted at %s (flushed %s)", head, flushed)
+                flushed = head
+                cache.set(self.flushed_key, head, timeout=None)
+
+            events, drained_keys = [], []
+            last = flushed
+            now = time.time()
+            for chunk_start in range(flushed + 1, head + 1, FLUSH_CHUNK_SIZE):
+                chunk_end = min(chunk_start + FLUSH_CHUNK_SIZE, head + 1)
+                keys = [self.event_key(position) for position in range(chunk_start, chunk_end)]
+                values = cache.get_many(keys)
+                for position, key in zip(range(chunk_start, chunk_end), keys):
+                    if key in values:
+                        events.append(values[key])
+                        drained_keys.append(key)
+                    elif not self._is_stale_gap(position, now):
+                        break
+                    last = position
+                else:
+                    continue
+                break
+        except Exception:
+            cache.delete(self.lock_key)
+            raise
+
+        def commit():
+            try:
+                cache.set(self.flushed_key, last, timeout=None)
+                cache.delete_many(drained_keys + [self.gap_key(position) for position in range(flushed + 1, last + 1)])
+            finally:
+                cache.delete(self.lock_key)
+
+        def abort():
+            cache.delete(self.lock_key)
+
+        return DrainedEvents(events, commit, abort)
+
+
+BUFFER_BACKENDS = {
+    'local': LocalViewBuffer,
+    'cache': CacheViewBuffer,
+}
+
+# Cache backends chỉ tồn tại trong một process
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_view_buffer():
+    """
+    Trả về buffer instance theo setting `PRODUCT_VIEW_BUFFER_BACKEND`.
+
+    Mặc định 'cache' khi cache là cache chia sẻ, ngược lại 'local' (flush
+    trong process). 'cache' trên cache chỉ tồn tại trong process bị từ chối
+    vì flusher ở process khác sẽ không bao giờ thấy events.
+    """
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                shared = is_shared_cache()
+                backend = getattr(settings, 'PRODUCT_VIEW_BUFFER_BACKEND', 'cache' if shared else 'local')
+                if backend == 'cache':
+                    require_shared_cache("PRODUCT_VIEW_BUFFER_BACKEND='cache'")
+                _buffer = BUFFER_BACKENDS[backend]()
+    return _buffer
+
+
+def reset_view_buffer():
+    """Bỏ buffer instance hiện tại (dùng khi đổi setting trong tests)."""
+    global _buffer
+    with _buffer_lock:
+        _buffer = None
+
+
+def record_product_view(request, product):
+    """
+    Ghi nhận một lượt xem product vào buffer, không truy cập database
+    (trừ khi buffer 'local' đến lúc flush trong process).
+
+    Args:
+        request: Request hiện tại
+        product: Product được xem
+    """
+    try:
+        buffer = get_view_buffer()
+        buffer.add({
+            'product_id': product.pk,
+            'user_id': request.user.pk if request.user.is_authenticated else None,
+            'ip_address': get_client_ip(request),
+            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'viewed_at': timezone.now(),
+        })
+    except Exception:
+        logger.exception("Failed to buffer product view for product %s", product.pk)
+        return
+
+    if buffer.should_flush():
+        try:
+            flush_product_views()
+        except Exception:
+            logger.exception("In-process product view flush failed")
+
+
+def flush_product_views():
+    """
+    Ghi các events đang buffer xuống database.
+
+    Tạo ProductView rows bằng bulk_create và tăng `views_count` bằng
+    `F('views_count') + n`, gom các products có cùng n vào một UPDATE.
+    Events chỉ bị xóa khỏi buffer sau khi transaction commit; ghi thất bại
+    thì events được giữ lại cho lần flush sau.
+
+    Returns:
+        int: Số events đã được flush.
+    """
+    drained = get_view_buffer().drain()
+    if not drained.events:
+        drained.commit()
+        return 0
+
+    try:
+        flushed = _write_events(drained.events)
+    except Exception:
+        drained.abort()
+        raise
+    drained.commit()
+    return flushed
+
+
+def _write_events(events):
+    """Ghi events vào database trong một transaction, trả về số events đã ghi."""
+
+    # Bỏ events của products đã bị xóa kể từ lúc được buffer
+    existing_ids = set(
+        Product.objects.filter(
+            pk__in={event['product_id'] for event in events}
+        ).values_list('pk', flat=True)
+    )
+    events = [event for event in events if event['product_id'] in existing_ids]
+
+    views_per_product = Counter(event['product_id'] for event in events)
+    products_per_increment = defaultdict(list)
+    for product_id, views in views_per_product.items():
+        products_per_increment[views].append(product_id)
+
+    with transaction.atomic():
+        ProductView.objects.bulk_create(
+            [
+                ProductView(
+                    product_id=event['product_id'],
+                    user_id=event['user_id'],
+                    ip_address=event['ip_address'],
+                    user_agent=event['user_agent'],
+                    viewed_at=event['viewed_at'],
+                )
+                for event in events
+            ],
+            batch_size=FLUSH_CHUNK_SIZE
+        )
+        for views, product_ids in products_per_increment.items():
+            Product.objects.filter(pk__in=product_ids).update(
+                views_count=F('views_count') + views
+            )
+            increment_listing_views(product_ids, views)
+
+    return len(events)
+
+
+def run_periodic_flush(interval, iterations=None):
+    """
+    Flush buffer định kỳ mỗi `interval` giây.
+
+    Args:
+        interval (int): Số giây giữa hai lần flush.
+        iterations (int, optional): Số lần flush, None để chạy liên tục.
+    """
+    count = 0
+    while iterations is None or count < iterations:
+        try:
+            flushed = flush_product_views()
+            if flushed:
+                logger.info("Flushed %s product views", flushed)
+        except Exception:
+            logger.exception("Product view flush failed")
+        count += 1
+        if iterations is None or count < iterations:
+            time.sleep(interval)
@@ -0,0 +1,154 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import Signal, receiver
+
+from catalog.models import Attribute, AttributeValue, Brand, Category
+from users.models import User
+
+from core.utils.response_cache import (
+    model_cache_tag, purge_cache_tags, purge_instance_cache_tags
+)
+
+from .models import Product, ProductImage
+from .search.backends import SEARCH_FIELDS, get_search_backend
+from .services.facets import invalidate_facets
+from .services.listings import (
+    clear_category, sync_product_listings, update_category_names, update_primary_image,
+    update_seller_names
+)
+from .services.related_products import (
+    invalidate_category_related_products, invalidate_related_products,
+    refresh_related_products_for
+)
+
+# Gửi sau khi products được tạo bằng bulk_create (không có post_save),
+# kwargs: products (list các Product đã có pk)
+products_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Product)
+def refresh_related_products_on_change(sender, instance, created, **kwargs):
+    """
+    Làm mới related products index khi product active được tạo,
+    hoặc khi status/category của product thay đổi.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    old_status = loaded.get('status', instance.status)
+    old_category_id = loaded.get('category_id', instance.category_id)
+
+    if created:
+        changed = instance.status == 'active'
+    else:
+        changed = old_status != instance.status or old_category_id != instance.category_id
+
+    if changed:
+        refresh_related_products_for(
+            instance,
+            category_ids=[old_category_id, instance.category_id]
+        )
+
+    instance._loaded_values = {
+        'status': instance.status,
+        'category_id': instance.category_id,
+    }
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_related_products_on_delete(sender, instance, **kwargs):
+    """Invalidate index của product bị xóa và các products cùng category."""
+    invalidate_related_products([instance.pk])
+    invalidate_category_related_products([instance.category_id], exclude_id=instance.pk)
+
+
+@receiver(post_save, sender=Product)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Cập nhật search index khi các field được tìm kiếm có thể đã thay đổi."""
+    search_fields = {field for field, _, _ in SEARCH_FIELDS}
+    if update_fields is not None and not search_fields.intersection(update_fields):
+        return
+    get_search_backend().update_product(instance)
+
+
+@receiver(post_delete, sender=Product)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend().remove_product(instance.pk)
+
+
+# Fields ảnh hưởng tới facet counts của product
+FACET_FIELDS = {'status', 'price', 'category', 'category_id', 'brand', 'brand_id'}
+
+
+@receiver(post_save, sender=Product)
+def invalidate_facets_on_save(sender, instance, update_fields=None, **kwargs):
+    """Invalidate facets khi product thay đổi (bỏ qua update chỉ số như views)."""
+    if update_fields is not None and not FACET_FIELDS.intersection(update_fields):
+        return
+    invalidate_facets()
+
+
+@receiver(post_delete, sender=Product)
+@receiver(m2m_changed, sender=Product.attribute_values.through)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=Attribute)
+@receiver(post_delete, sender=Attribute)
+@receiver(post_save, sender=AttributeValue)
+@receiver(post_delete, sender=AttributeValue)
+def invalidate_facets_on_change(sender, **kwargs):
+    """Invalidate facets khi product bị xóa hoặc dữ liệu catalog thay đổi."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidate_facets()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def purge_product_response_cache(sender, instance, **kwargs):
+    """Purge cached listings và responses chi tiết của product."""
+    purge_instance_cache_tags(instance)
+
+
+@receiver(m2m_changed, sender=Product.attribute_values.through)
+def purge_product_response_cache_on_attributes(sender, instance, action, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Product):
+        purge_instance_cache_tags(instance)
+    else:
+        purge_cache_tags(model_cache_tag(Product))
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def purge_product_response_cache_on_image_change(sender, instance, **kwargs):
+    purge_cache_tags(model_cache_tag(Product), f'{model_cache_tag(Product)}:{instance.product_id}')
+
+
+@receiver(post_save, sender=Product)
+def sync_product_listing_on_save(sender, instance, **kwargs):
+    """Tạo, cập nhật hoặc xóa row ProductListing theo status của product."""
+    sync_product_listings([instance.pk])
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def sync_product_listing_image(sender, instance, **kwargs):
+    update_primary_image(instance.product_id)
+
+
+@receiver(post_save, sender=Category)
+def sync_product_listing_category_name(sender, instance, **kwargs):
+    update_category_names(instance)
+
+
+@receiver(post_delete, sender=Category)
+def clear_product_listing_category(sender, instance, **kwargs):
+    clear_category(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def sync_product_listing_seller_name(sender, instance, update_fields=None, **kwargs):
+    """Cập nhật seller_name khi tên/email của user thay đổi (bỏ qua save chỉ last_login)."""
+    if update_fields is not None and not {'first_name', 'last_name', 'email'}.intersection(update_fields):
+        return
+    update_seller_names(instance)
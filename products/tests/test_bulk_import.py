@@ -0,0 +1,136 @@
+"""
+Tests cho bulk import/export products.
+"""
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalog.models import Brand, Category
+from products.models import Product
+from products.services.bulk_import import export_products, import_products
+from products.viewsets import ProductSellerViewSet
+
+User = get_user_model()
+
+CSV_HEADER = 'sku,name,description,price,category,brand,stock,status\n'
+
+
+class ProductBulkImportTest(TestCase):
+
+    def setUp(self):
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.other_seller = User.objects.create_user(
+            username='other', email='other@example.com', password='password'
+        )
+        self.category = Category.objects.create(name='Laptops', slug='laptops')
+        self.brand = Brand.objects.create(name='Acme', slug='acme')
+
+    def run_import(self, content, file_format='csv', **kwargs):
+        return import_products(self.seller, io.StringIO(content), file_format, **kwargs)
+
+    def test_import_csv_creates_products(self):
+        """Test import CSV tạo products với category/brand theo slug"""
+        result = self.run_import(
+            CSV_HEADER
+            + 'LAP-1,Laptop One,Fast laptop,1000,laptops,acme,5,active\n'
+            + ',Laptop Two,Light laptop,800,,,,\n'
+        )
+
+        self.assertEqual(result, {'rows': 2, 'created': 2, 'updated': 0, 'errors': []})
+        first = Product.objects.get(sku='LAP-1')
+        self.assertEqual(first.seller, self.seller)
+        self.assertEqual(first.category, self.category)
+        self.assertEqual(first.brand, self.brand)
+        self.assertEqual(first.slug, 'laptop-one')
+        self.assertIsNotNone(first.published_at)
+        second = Product.objects.get(name='Laptop Two')
+        self.assertTrue(second.sku.startswith('SKU-'))
+        self.assertEqual(second.status, 'draft')
+
+    def test_import_jsonl_updates_by_sku(self):
+        """Test dòng có SKU đã tồn tại chỉ cập nhật các cột có trong dòng"""
+        product = Product.objects.create(
+            name='Laptop', description='Old', price=100, sku='LAP-1', seller=self.seller
+        )
+        content = json.dumps({'sku': 'LAP-1', 'price': '150.00'}) + '\n'
+
+        result = self.run_import(content, 'jsonl')
+
+        self.assertEqual(result['updated'], 1)
+        product.refresh_from_db()
+        self.assertEqual(product.price, 150)
+        self.assertEqual(product.description, 'Old')
+
+    def test_import_reports_row_errors(self):
+        """Test dòng lỗi được bỏ qua và báo cáo theo số dòng"""
+        Product.objects.create(
+            name='Foreign', description='x', price=1, sku='OTHER-1', seller=self.other_seller
+        )
+        result = self.run_import(
+            CSV_HEADER
+            + 'A-1,Valid,Desc,10,,,,\n'
+            + 'A-2,Bad price,Desc,-5,,,,\n'
+            + 'A-3,Unknown,Desc,10,missing,,,\n'
+            + 'OTHER-1,Taken,Desc,10,,,,\n'
+            + 'A-1,Duplicate,Desc,10,,,,\n'
+        )
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([error['row'] for error in result['errors']], [3, 4, 5, 6])
+        self.assertIn('price', result['errors'][0]['errors'])
+        self.assertIn('category', result['errors'][1]['errors'])
+
+    def test_slugs_unique_across_chunks(self):
+        """Test slugs không trùng với database và giữa các chunks"""
+        Product.objects.create(name='Phone', description='x', price=1, seller=self.seller)
+        content = 'name,description,price\n' + 'Phone,x,1\n' * 3
+
+        result = self.run_import(content, chunk_size=2)
+
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(
+            sorted(Product.objects.values_list('slug', flat=True)),
+            ['phone', 'phone-1', 'phone-2', 'phone-3']
+        )
+
+    def test_dry_run_does_not_write(self):
+        result = self.run_import(CSV_HEADER + 'A-1,Valid,Desc,10,,,,\n', dry_run=True)
+        self.assertEqual(result['created'], 1)
+        self.assertFalse(Product.objects.exists())
+
+    def test_export_round_trip(self):
+        """Test file export có thể import lại"""
+        self.run_import(CSV_HEADER + 'LAP-1,Laptop One,Fast laptop,1000,laptops,acme,5,active\n')
+        exported = ''.join(export_products(Product.objects.all(), 'csv'))
+        self.assertIn('laptops,acme', exported)
+
+        result = self.run_import(exported)
+        self.assertEqual((result['created'], result['updated'], result['errors']), (0, 1, []))
+
+        lines = list(export_products(Product.objects.all(), 'jsonl'))
+        self.assertEqual(json.loads(lines[0])['sku'], 'LAP-1')
+
+    def test_import_and_export_endpoints(self):
+        factory = APIRequestFactory()
+        upload = SimpleUploadedFile(
+            'products.csv', (CSV_HEADER + 'LAP-1,Laptop One,Desc,1000,,,,\n').encode('utf-8-sig')
+        )
+        request = factory.post('/api/v1/products/my-products/import/', {'file': upload})
+        force_authenticate(request, user=self.seller)
+        response = ProductSellerViewSet.as_view({'post': 'import_products'})(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['created'], 1)
+
+        request = factory.get('/api/v1/products/my-products/export/', {'file_format': 'jsonl'})
+        force_authenticate(request, user=self.seller)
+        response = ProductSellerViewSet.as_view({'get': 'export_products'})(request)
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['sku'] for row in rows], ['LAP-1'])
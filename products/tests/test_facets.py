@@ -0,0 +1,109 @@
+"""
+Tests cho product facets.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+
+from catalog.models import Attribute, AttributeValue, Brand, Category
+from products.models import Product
+from products.services.facets import get_filter_signature
+from products.viewsets import ProductPublicViewSet
+
+User = get_user_model()
+
+
+@override_settings(PRODUCT_FACET_PRICE_BUCKETS=(100, 500))
+class ProductFacetsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.laptops = Category.objects.create(name='Laptops', slug='laptops')
+        self.phones = Category.objects.create(name='Phones', slug='phones')
+        self.acme = Brand.objects.create(name='Acme', slug='acme')
+        self.globex = Brand.objects.create(name='Globex', slug='globex')
+        self.color = Attribute.objects.create(name='Color', slug='color')
+        self.black = AttributeValue.objects.create(attribute=self.color, value='Black')
+        self.white = AttributeValue.objects.create(attribute=self.color, value='White')
+
+        self.create_product('Laptop A', self.laptops, self.acme, '50', [self.black])
+        self.create_product('Laptop B', self.laptops, self.globex, '700', [self.black, self.white])
+        self.create_product('Phone A', self.phones, self.acme, '300', [self.white])
+        self.create_product('Phone B', self.phones, None, '300', [], status='draft')
+        self.client = APIClient()
+
+    def create_product(self, name, category, brand, price, values, status='active'):
+        product = Product.objects.create(
+            name=name, description=name, price=Decimal(price), seller=self.seller,
+            category=category, brand=brand, status=status
+        )
+        product.attribute_values.set(values)
+        return product
+
+    def get_facets(self, params=None):
+        response = self.client.get('/api/v1/products/facets/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_facet_counts(self):
+        """Test đếm theo brand, category, attribute value và khoảng giá"""
+        facets = self.get_facets()
+
+        self.assertEqual(
+            [(b['slug'], b['count']) for b in facets['brands']], [('acme', 2), ('globex', 1)]
+        )
+        self.assertEqual(
+            {c['slug']: c['count'] for c in facets['categories']}, {'laptops': 2, 'phones': 1}
+        )
+        color = facets['attributes'][0]
+        self.assertEqual(color['slug'], 'color')
+        self.assertEqual([(v['value'], v['count']) for v in color['values']], [('Black', 2), ('White', 2)])
+        self.assertEqual([p['count'] for p in facets['price_ranges']], [1, 1, 1])
+
+    def test_facets_follow_filters(self):
+        """Test facets chỉ đếm products khớp filters"""
+        facets = self.get_facets({'category': self.laptops.pk})
+        self.assertEqual([c['slug'] for c in facets['categories']], ['laptops'])
+        self.assertEqual(
+            [(b['slug'], b['count']) for b in facets['brands']], [('acme', 1), ('globex', 1)]
+        )
+
+    def test_facets_cached_and_invalidated(self):
+        """Test facets được cache và invalidate khi product thay đổi"""
+        self.get_facets()
+        with CaptureQueriesContext(connection) as queries:
+            self.get_facets()
+        self.assertEqual(len(queries), 0)
+
+        self.create_product('Laptop C', self.laptops, self.globex, '800', [])
+        facets = self.get_facets()
+        self.assertEqual(
+            [(b['slug'], b['count']) for b in facets['brands']], [('acme', 2), ('globex', 2)]
+        )
+
+    def test_list_includes_facets_on_request(self):
+        """Test listing trả về facets khi có ?facets=true"""
+        view = ProductPublicViewSet.as_view({'get': 'list'})
+        factory = APIRequestFactory()
+
+        response = view(factory.get('/api/v1/products/', {'brand': self.acme.pk, 'facets': 'true'}))
+        self.assertEqual(response.data['data']['count'], 2)
+        self.assertEqual([c['count'] for c in response.data['facets']['categories']], [1, 1])
+
+        response = view(factory.get('/api/v1/products/'))
+        self.assertNotIn('facets', response.data)
+
+    def test_filter_signature_is_normalized(self):
+        """Test thứ tự params và params phân trang không ảnh hưởng chữ ký"""
+        first = QueryDict('brand=2&category=1&page=3&attribute_values=5&attribute_values=4')
+        second = QueryDict('attribute_values=4&attribute_values=5&category=1&brand=2&ordering=price')
+        self.assertEqual(get_filter_signature(first), get_filter_signature(second))
@@ -0,0 +1,103 @@
+"""
+Tests cho ProductListing projection của public product listing.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalog.models import Category
+from products.models import Product, ProductFavorite, ProductImage, ProductListing
+from products.viewsets import ProductPublicViewSet
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class ProductListingProjectionTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.view = ProductPublicViewSet.as_view({'get': 'list'})
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password',
+            first_name='Ann', last_name='Lee'
+        )
+        self.buyer = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.category = Category.objects.create(name='Laptops')
+        self.discounted = Product.objects.create(
+            name='Laptop', description='x', short_description='Fast', price=Decimal('75'),
+            compare_price=Decimal('100'), seller=self.seller, category=self.category,
+            status='active', stock=2, low_stock_threshold=5
+        )
+        self.plain = Product.objects.create(
+            name='Mouse', description='x', price=Decimal('10'), seller=self.seller,
+            status='active', stock=50, is_featured=True
+        )
+        Product.objects.create(name='Draft', description='x', price=Decimal('1'), seller=self.seller)
+        ProductImage.objects.create(product=self.discounted, image='products/images/a.jpg', is_primary=True)
+        ProductFavorite.objects.create(user=self.buyer, product=self.plain)
+
+    def get_results(self, params=None, user=None):
+        request = self.factory.get('/api/v1/products/', params or {})
+        if user is not None:
+            force_authenticate(request, user=user)
+        response = self.view(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']['results']
+
+    def test_projection_matches_serializer_output(self):
+        for user in (None, self.buyer):
+            for params in ({}, {'ordering': 'price'}, {'category': self.category.pk}):
+                projected = self.get_results(params, user)
+                with override_settings(PRODUCT_LISTING_PROJECTION=False):
+                    expected = self.get_results(params, user)
+                self.assertEqual(projected, [dict(row) for row in expected])
+
+    def test_listing_reads_single_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = self.get_results({'is_featured': 'true'})
+
+        self.assertEqual([row['name'] for row in results], ['Mouse'])
+        self.assertEqual(len(queries), 2)  # COUNT + page
+        self.assertTrue(all('products_productlisting' in q['sql'] for q in queries))
+        self.assertFalse(any('JOIN' in q['sql'] for q in queries))
+
+    def test_projection_follows_source_changes(self):
+        self.discounted.status = 'inactive'
+        self.discounted.save()
+        self.assertEqual([row['name'] for row in self.get_results()], ['Mouse'])
+
+        self.category.name = 'Notebooks'
+        self.category.save()
+        self.seller.first_name = 'Anna'
+        self.seller.save()
+        self.discounted.status = 'active'
+        self.discounted.save()
+        ProductImage.objects.create(product=self.plain, image='products/images/b.jpg', is_primary=True)
+
+        rows = {row['name']: row for row in self.get_results()}
+        self.assertEqual(rows['Laptop']['category_name'], 'Notebooks')
+        self.assertEqual(rows['Mouse']['seller_name'], 'Anna Lee')
+        self.assertTrue(rows['Mouse']['primary_image_url'].endswith('products/images/b.jpg'))
+
+    def test_unsupported_params_fall_back_to_products(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_results({'facets': 'true'})
+        self.assertFalse(any('products_productlisting' in q['sql'] for q in queries))
+
+    def test_rebuild_command(self):
+        ProductListing.objects.all().delete()
+        call_command('rebuild_product_listings', stdout=open('/dev/null', 'w'))
+        self.assertEqual(
+            set(ProductListing.objects.values_list('product_id', flat=True)),
+            {self.discounted.pk, self.plain.pk}
+        )
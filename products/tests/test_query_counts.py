@@ -0,0 +1,151 @@
+"""
+Query-count regression tests cho public product listings.
+
+Các test này đảm bảo số lượng query của list endpoints không tăng
+theo số lượng products trong một page.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+
+from catalog.models import Category
+from products.models import Product, ProductFavorite, ProductImage
+from products.serializers import ProductSummarySerializer
+
+User = get_user_model()
+
+
+class FavoriteQueryCountTest(TestCase):
+    """Test is_favorited được resolve một lần cho cả page"""
+
+    def setUp(self):
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.shopper = User.objects.create_user(
+            username='shopper', email='shopper@example.com', password='password'
+        )
+        self.category = Category.objects.create(name='Electronics', slug='electronics')
+        self.products = [
+            Product.objects.create(
+                name=f'Product {index}',
+                description='Test product',
+                price=Decimal('10.00'),
+                category=self.category,
+                seller=self.seller,
+                status='active'
+            )
+            for index in range(20)
+        ]
+        for product in self.products[::2]:
+            ProductFavorite.objects.create(user=self.shopper, product=product)
+
+        request = APIRequestFactory().get('/api/v1/products/')
+        request.user = self.shopper
+        self.context = {'request': request}
+
+    def _favorite_queries(self, page_size):
+        products = Product.objects.filter(
+            pk__in=[product.pk for product in self.products[:page_size]]
+        ).select_related('category', 'seller')
+
+        with CaptureQueriesContext(connection) as queries:
+            data = ProductSummarySerializer(products, many=True, context=self.context).data
+
+        favorite_table = ProductFavorite._meta.db_table
+        return data, [q for q in queries.captured_queries if favorite_table in q['sql']]
+
+    def test_favorite_lookup_is_constant(self):
+        """Test số query favorites không phụ thuộc page size"""
+        _, small_page_queries = self._favorite_queries(5)
+        _, large_page_queries = self._favorite_queries(20)
+
+        self.assertEqual(len(small_page_queries), 1)
+        self.assertEqual(len(large_page_queries), 1)
+
+    def test_favorite_flags_are_correct(self):
+        """Test is_favorited vẫn đúng khi dùng favorite set"""
+        data, _ = self._favorite_queries(20)
+        favorited_ids = {product.pk for product in self.products[::2]}
+
+        for item in data:
+            self.assertEqual(item['is_favorited'], item['id'] in favorited_ids)
+
+    def test_anonymous_user_skips_favorite_query(self):
+        """Test anonymous user không phát sinh query favorites"""
+        from django.contrib.auth.models import AnonymousUser
+
+        self.context['request'].user = AnonymousUser()
+        data, favorite_queries = self._favorite_queries(20)
+
+        self.assertEqual(favorite_queries, [])
+        self.assertFalse(any(item['is_favorited'] for item in data))
+
+
+class ListingQueryCountTest(TestCase):
+    """Test list endpoints chạy với số query cố định"""
+
+    def setUp(self):
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.shopper = User.objects.create_user(
+            username='shopper', email='shopper@example.com', password='password'
+        )
+        category = Category.objects.create(name='Electronics', slug='electronics')
+        for index in range(20):
+            product = Product.objects.create(
+                name=f'Product {index}',
+                description='Test product',
+                price=Decimal('10.00'),
+                category=category,
+                seller=self.seller,
+                status='active',
+                is_featured=True
+            )
+            ProductImage.objects.create(
+                product=product,
+                image=f'products/images/product-{index}.jpg',
+                is_primary=True
+            )
+            ProductImage.objects.create(
+                product=product,
+                image=f'products/images/product-{index}-alt.jpg'
+            )
+            if index % 2:
+                ProductFavorite.objects.create(user=self.shopper, product=product)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.shopper)
+
+    def _count_queries(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/v1/products/featured/?page_size={page_size}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(queries), response.data['results']
+
+    def test_featured_query_count_is_constant(self):
+        """Test số query không tăng theo page size"""
+        small_page_queries, _ = self._count_queries(5)
+        large_page_queries, _ = self._count_queries(20)
+
+        self.assertEqual(small_page_queries, large_page_queries)
+
+    def test_primary_image_url_uses_prefetch(self):
+        """Test primary_image_url lấy đúng ảnh primary từ prefetch"""
+        _, results = self._count_queries(20)
+
+        for item in results:
+            self.assertTrue(item['primary_image_url'].endswith('.jpg'))
+            self.assertNotIn('-alt', item['primary_image_url'])
+
+    def test_primary_image_without_prefetch(self):
+        """Test Product.primary_image vẫn hoạt động khi không prefetch"""
+        product = Product.objects.first()
+
+        self.assertTrue(product.primary_image.is_primary)
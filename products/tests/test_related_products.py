@@ -0,0 +1,99 @@
+"""
+Tests cho related products index.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from catalog.models import Category
+from orders.models import Order, OrderItem
+from products.models import Product
+from products.services.related_products import (
+    build_related_products_index, get_cache_key, get_related_products
+)
+
+User = get_user_model()
+
+
+class RelatedProductsIndexTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.buyer = User.objects.create_user(
+            username='buyer', email='buyer@example.com', password='password'
+        )
+        self.phones = Category.objects.create(name='Phones', slug='phones')
+        self.cases = Category.objects.create(name='Cases', slug='cases')
+
+        self.phone = self.create_product('Phone', self.phones)
+        self.siblings = [self.create_product(f'Phone {index}', self.phones) for index in range(3)]
+        self.case = self.create_product('Case', self.cases)
+
+    def create_product(self, name, category, status='active'):
+        return Product.objects.create(
+            name=name,
+            description='Test product',
+            price=Decimal('10.00'),
+            category=category,
+            seller=self.seller,
+            status=status
+        )
+
+    def create_order(self, *products):
+        order = Order.objects.create(user=self.buyer)
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, quantity=1, price=product.price)
+        return order
+
+    def test_co_purchases_rank_before_category_siblings(self):
+        """Test products mua cùng được ưu tiên hơn products cùng category"""
+        self.create_order(self.phone, self.case)
+        build_related_products_index()
+
+        related = get_related_products(self.phone)
+
+        self.assertEqual(related[0], self.case)
+        self.assertEqual(set(related[1:]), set(self.siblings))
+
+    def test_related_products_use_single_bulk_fetch(self):
+        """Test related products lấy từ cache bằng một query products"""
+        build_related_products_index()
+        product_table = Product._meta.db_table
+
+        with CaptureQueriesContext(connection) as queries:
+            related = get_related_products(self.phone)
+
+        product_queries = [
+            q for q in queries.captured_queries if f'FROM "{product_table}"' in q['sql']
+        ]
+        self.assertEqual(len(related), 3)
+        self.assertEqual(len(product_queries), 1)
+
+    def test_status_change_refreshes_index(self):
+        """Test product bị inactive được loại khỏi index của siblings"""
+        build_related_products_index()
+        self.assertIn(self.siblings[0].pk, cache.get(get_cache_key(self.phone.pk)))
+
+        product = Product.objects.get(pk=self.siblings[0].pk)
+        product.status = 'inactive'
+        product.save()
+
+        self.assertIsNone(cache.get(get_cache_key(self.phone.pk)))
+        self.assertIsNone(cache.get(get_cache_key(product.pk)))
+        self.assertNotIn(product, get_related_products(self.phone))
+
+    def test_new_active_product_joins_siblings_index(self):
+        """Test product active mới xuất hiện trong related products"""
+        build_related_products_index()
+        self.siblings[0].delete()
+
+        new_product = self.create_product('Phone new', self.phones)
+
+        self.assertIn(new_product, get_related_products(self.phone))
@@ -0,0 +1,109 @@
+"""
+Tests cho product search engine.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from products.models import Product
+from products.search.backends import InMemorySearchBackend, reset_search_backend
+from products.search.benchmark import run_benchmark
+
+User = get_user_model()
+
+
+@override_settings(PRODUCT_SEARCH_BACKEND='memory')
+class InMemorySearchBackendTest(TestCase):
+
+    def setUp(self):
+        reset_search_backend()
+        self.addCleanup(reset_search_backend)
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.laptop = self.create_product(
+            'Gaming Laptop', 'Fast laptop for gaming', 'Powerful machine'
+        )
+        self.bag = self.create_product(
+            'Backpack', 'Fits a 15 inch laptop', 'Travel bag'
+        )
+        self.mouse = self.create_product(
+            'Wireless Mouse', 'Ergonomic mouse', 'Bluetooth mouse'
+        )
+        self.backend = InMemorySearchBackend()
+
+    def create_product(self, name, description, short_description, status='active'):
+        return Product.objects.create(
+            name=name,
+            description=description,
+            short_description=short_description,
+            price=Decimal('10.00'),
+            seller=self.seller,
+            status=status
+        )
+
+    def search_ids(self, query):
+        queryset = self.backend.search(Product.objects.all(), query).order_by('-search_rank')
+        return list(queryset.values_list('pk', flat=True))
+
+    def test_name_match_ranks_first(self):
+        """Test product khớp ở name được xếp trên product khớp ở description"""
+        self.assertEqual(self.search_ids('laptop'), [self.laptop.pk, self.bag.pk])
+
+    def test_prefix_matching(self):
+        """Test query là prefix của từ vẫn khớp"""
+        self.assertEqual(self.search_ids('wire'), [self.mouse.pk])
+        self.assertEqual(self.search_ids('LAP'), [self.laptop.pk, self.bag.pk])
+
+    def test_all_terms_must_match(self):
+        """Test các terms được kết hợp bằng AND"""
+        self.assertEqual(self.search_ids('laptop travel'), [self.bag.pk])
+        self.assertEqual(self.search_ids('laptop bluetooth'), [])
+
+    def test_all_matches_are_returned(self):
+        """Test kết quả không bị cắt khi có nhiều products khớp"""
+        Product.objects.bulk_create([
+            Product(name=f'Laptop {index}', description='x', price=Decimal('10.00'),
+                    seller=self.seller, status='active', sku=f'LAPTOP-{index}', slug=f'laptop-{index}')
+            for index in range(1500)
+        ])
+        queryset = self.backend.search(Product.objects.all(), 'laptop')
+        self.assertEqual(queryset.count(), 1502)
+        self.assertEqual(len(self.backend.rank('laptop')), 1502)
+
+    def test_index_follows_product_changes(self):
+        """Test index được cập nhật qua signals khi product thay đổi"""
+        from products.search.backends import get_search_backend
+        backend = get_search_backend()
+        self.backend = backend
+
+        self.assertEqual(self.search_ids('keyboard'), [])
+
+        self.mouse.name = 'Wireless Keyboard'
+        self.mouse.save()
+        self.assertEqual(self.search_ids('keyboard'), [self.mouse.pk])
+
+        self.mouse.delete()
+        self.assertEqual(self.search_ids('keyboard'), [])
+
+    def test_search_endpoint_orders_by_rank(self):
+        """Test endpoint search trả về kết quả theo rank"""
+        response = APIClient().get('/api/v1/products/search/?search=laptop')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item['id'] for item in response.data['results']],
+            [self.laptop.pk, self.bag.pk]
+        )
+
+    def test_benchmark_smoke(self):
+        """Test benchmark chạy được và rollback fixture"""
+        product_count = Product.objects.count()
+
+        report = run_benchmark(product_count=200, queries=['laptop'], repeat=1)
+
+        self.assertEqual(len(report['results']), 1)
+        self.assertGreater(report['results'][0]['engine_count'], 0)
+        self.assertEqual(Product.objects.count(), product_count)
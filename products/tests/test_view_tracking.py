@@ -0,0 +1,192 @@
+"""
+Tests cho buffered product view tracking.
+"""
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from products.models import Product, ProductView
+from products.services.view_tracking import (
+    CacheViewBuffer, LocalViewBuffer, flush_product_views, get_view_buffer, reset_view_buffer
+)
+
+User = get_user_model()
+
+
+class ViewTrackingTestMixin:
+    def setUp(self):
+        cache.clear()
+        reset_view_buffer()
+        self.addCleanup(reset_view_buffer)
+
+        self.seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password'
+        )
+        self.products = [
+            Product.objects.create(
+                name=f'Product {index}',
+                description='Test product',
+                price=Decimal('10.00'),
+                seller=self.seller,
+                status='active'
+            )
+            for index in range(3)
+        ]
+        self.client = APIClient()
+
+    def view_product(self, product, times=1):
+        for _ in range(times):
+            response = self.client.get(f'/api/v1/products/{product.pk}/')
+            self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PRODUCT_VIEW_BUFFER_BACKEND='local')
+class LocalViewBufferTest(ViewTrackingTestMixin, TestCase):
+    """Test buffer trong process"""
+
+    def test_detail_request_does_not_write(self):
+        """Test product detail GET không ghi database"""
+        with CaptureQueriesContext(connection) as queries:
+            self.view_product(self.products[0])
+
+        writes = [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+        ]
+        self.assertEqual(writes, [])
+        self.assertEqual(ProductView.objects.count(), 0)
+
+    def test_flush_creates_views_and_increments_counters(self):
+        """Test flush bulk_create views và tăng views_count"""
+        self.view_product(self.products[0], times=3)
+        self.view_product(self.products[1], times=2)
+        self.view_product(self.products[2], times=2)
+
+        self.assertEqual(flush_product_views(), 7)
+
+        self.assertEqual(ProductView.objects.count(), 7)
+        counts = dict(Product.objects.values_list('pk', 'views_count'))
+        self.assertEqual(counts[self.products[0].pk], 3)
+        self.assertEqual(counts[self.products[1].pk], 2)
+        self.assertEqual(counts[self.products[2].pk], 2)
+
+        # Buffer đã được drain
+        self.assertEqual(flush_product_views(), 0)
+
+    def test_flush_skips_deleted_products(self):
+        """Test events của product đã xóa bị bỏ qua"""
+        self.view_product(self.products[0])
+        self.view_product(self.products[1])
+        self.products[1].delete()
+
+        self.assertEqual(flush_product_views(), 1)
+        self.assertEqual(ProductView.objects.get().product_id, self.products[0].pk)
+
+
+class InProcessFlushTest(ViewTrackingTestMixin, TestCase):
+    """Test mặc định khi không có cache chia sẻ"""
+
+    def test_cache_backend_requires_shared_cache(self):
+        """Test 'cache' bị từ chối trên LocMemCache"""
+        with override_settings(PRODUCT_VIEW_BUFFER_BACKEND='cache'):
+            with self.assertRaises(ImproperlyConfigured):
+                get_view_buffer()
+
+    @override_settings(PRODUCT_VIEW_LOCAL_FLUSH_SIZE=3)
+    def test_local_buffer_flushes_in_process(self):
+        """Test buffer 'local' mặc định tự flush khi đủ events"""
+        self.assertIsInstance(get_view_buffer(), LocalViewBuffer)
+        self.view_product(self.products[0], times=2)
+        self.assertEqual(ProductView.objects.count(), 0)
+
+        self.view_product(self.products[0])
+        self.assertEqual(ProductView.objects.count(), 3)
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].views_count, 3)
+
+    @override_settings(PRODUCT_VIEW_BUFFER_BACKEND='local')
+    def test_failed_flush_keeps_events(self):
+        """Test events được giữ lại khi ghi database thất bại"""
+        self.view_product(self.products[0], times=2)
+        with mock.patch('products.services.view_tracking._write_events', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                flush_product_views()
+        self.assertEqual(flush_product_views(), 2)
+
+
+@override_settings(
+    PRODUCT_VIEW_BUFFER_BACKEND='cache',
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'test_product_view_buffer'),
+    }},
+)
+class CacheViewBufferTest(ViewTrackingTestMixin, TestCase):
+    """Test buffer trong Django cache (cache chia sẻ giữa processes)"""
+
+    def test_flush_from_cache(self):
+        """Test events trong cache được flush đầy đủ"""
+        self.view_product(self.products[0], times=2)
+
+        self.assertEqual(flush_product_views(), 2)
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].views_count, 2)
+
+    def test_drain_continues_from_last_position(self):
+        """Test drain chỉ trả về events mới từ lần drain trước"""
+        buffer = CacheViewBuffer()
+        buffer.add({'product_id': 1})
+        buffer.add({'product_id': 2})
+        self.assertEqual(self.drain(buffer), [1, 2])
+
+        buffer.add({'product_id': 3})
+        self.assertEqual(self.drain(buffer), [3])
+        self.assertEqual(self.drain(buffer), [])
+
+    def drain(self, buffer, commit=True):
+        drained = buffer.drain()
+        drained.commit() if commit else drained.abort()
+        return [event['product_id'] for event in drained.events]
+
+    def test_in_flight_event_is_not_skipped(self):
+        """Test event đã có số thứ tự nhưng chưa được set được đọc ở lần sau"""
+        buffer = CacheViewBuffer()
+        buffer.add({'product_id': 1})
+        in_flight = buffer._next_position()
+        buffer.add({'product_id': 3})
+
+        self.assertEqual(self.drain(buffer), [1])
+        cache.set(buffer.event_key(in_flight), {'product_id': 2})
+        self.assertEqual(self.drain(buffer), [2, 3])
+
+        # Event mất hẳn chỉ bị bỏ qua sau gap_timeout
+        buffer.gap_timeout = 0
+        buffer._next_position()
+        buffer.add({'product_id': 5})
+        self.assertEqual(self.drain(buffer), [5])
+
+    def test_evicted_sequence_restarts_after_flushed(self):
+        """Test sequence bị evict không làm mất các events sau đó"""
+        buffer = CacheViewBuffer()
+        buffer.add({'product_id': 1})
+        self.assertEqual(self.drain(buffer), [1])
+
+        cache.delete(buffer.sequence_key)
+        buffer.add({'product_id': 2})
+        self.assertEqual(self.drain(buffer), [2])
+
+    def test_events_kept_until_commit(self):
+        """Test abort giữ events và vị trí đã flush"""
+        buffer = CacheViewBuffer()
+        buffer.add({'product_id': 1})
+        self.assertEqual(self.drain(buffer, commit=False), [1])
+        self.assertEqual(self.drain(buffer), [1])
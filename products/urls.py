@@ -34,6 +34,14 @@ urlpatterns = [
         'get': 'featured'     # GET /api/v1/products/featured/ - Products nổi bật
     }), name='product-featured'),
     
+    path('facets/', ProductPublicViewSet.as_view({
+        'get': 'facets'       # GET /api/v1/products/facets/ - Facet counts theo filters
+    }), name='product-facets'),
+    
+    path('search/', ProductPublicViewSet.as_view({
+        'get': 'search'       # GET /api/v1/products/search/?search=... - Tìm kiếm products
+    }), name='product-search'),
+    
     path('trending/', ProductPublicViewSet.as_view({
         'get': 'trending'     # GET /api/v1/products/trending/ - Products trending
     }), name='product-trending'),
@@ -71,6 +79,15 @@ urlpatterns = [
         'delete': 'destroy'  # DELETE /api/v1/products/my-products/{id}/ - Xóa product
     }), name='product-seller-detail'),
     
+    # Seller bulk import/export
+    path('my-products/import/', ProductSellerViewSet.as_view({
+        'post': 'import_products'  # POST /api/v1/products/my-products/import/ - Import CSV/JSONL
+    }), name='product-seller-import'),
+    
+    path('my-products/export/', ProductSellerViewSet.as_view({
+        'get': 'export_products'   # GET /api/v1/products/my-products/export/ - Export CSV/JSONL
+    }), name='product-seller-export'),
+    
     # Seller product image management
     path('my-products/<int:pk>/upload-image/', ProductSellerViewSet.as_view({
         'post': 'upload_image'  # POST /api/v1/products/my-products/{id}/upload-image/ - Upload image
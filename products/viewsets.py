@@ -5,22 +5,43 @@ Module này cung cấp các ViewSets chuẩn hóa cho Product API,
 tuân thủ định dạng response và quy ước API đã được thiết lập.
 """
 
+import csv
+import io
+
+from django.conf import settings
 from django.db import models
 from django.db.models import Count, Avg, Q, Sum
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 
 from core.viewsets.base import StandardizedModelViewSet
+from core.pagination.standard import CursorPagination
 from core.permissions import IsOwnerOrReadOnly, IsAdminOrReadOnly
 from core.optimization.decorators import log_slow_queries
 from core.mixins.swagger_helpers import SwaggerSchemaMixin
+from core.mixins.views import ResponseCacheMixin
 from drf_spectacular.utils import extend_schema
 
-from .models import Product, ProductImage, ProductFavorite, ProductView
+from catalog.filters import CategorySubtreeFilter
+
+from .models import (
+    Product, ProductImage, ProductFavorite, ProductListing, ProductView, primary_image_prefetch
+)
+from .filters import ProductListingFilter
+from .search.filters import ProductSearchFilter
+from .services.bulk_import import (
+    FORMATS as EXPORT_FORMATS, ProductImportError, detect_format,
+    export_products, import_products
+)
+from .services.facets import get_facets
+from .services.listings import LISTING_VALUES, ListingRowSerializer
+from .services.view_tracking import record_product_view
 from .serializers import (
     ProductDetailSerializer, ProductSummarySerializer, ProductCreateSerializer,
     ProductUpdateSerializer, ProductFavoriteSerializer, ProductImageUploadSerializer,
@@ -28,18 +49,8 @@ from .serializers import (
 )
 
 
-def get_client_ip(request):
-    """Get client IP address from request"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
-
-
 @extend_schema(tags=['Products'])
-class ProductPublicViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
+class ProductPublicViewSet(ResponseCacheMixin, SwaggerSchemaMixin, StandardizedModelViewSet):
     """
     ViewSet public để xem products (không cần auth).
     
@@ -48,26 +59,45 @@ class ProductPublicViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     - GET /api/v1/products/{id}/ - Xem chi tiết product
     - GET /api/v1/products/featured/ - Products nổi bật
     - GET /api/v1/products/search/ - Tìm kiếm products
+    - GET /api/v1/products/facets/ - Facet counts theo filters hiện tại
     """
     serializer_class = ProductSummarySerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['category', 'seller', 'is_featured', 'price']
-    search_fields = ['name', 'description', 'short_description']
+    # ProductSearchFilter đứng sau OrderingFilter để giữ thứ tự theo search rank
+    filter_backends = [
+        DjangoFilterBackend, CategorySubtreeFilter, filters.OrderingFilter, ProductSearchFilter
+    ]
+    filterset_fields = ['category', 'brand', 'attribute_values', 'seller', 'is_featured', 'price']
     ordering_fields = ['created_at', 'price', 'rating', 'views_count', 'sales_count']
     ordering = ['-created_at']
     http_method_names = ['get', 'head', 'options']
+    facets_param = 'facets'
+    # Anonymous reads được cache, purge bởi signals của products và catalog
+    cache_response_actions = ('list', 'retrieve', 'featured', 'search', 'facets', 'trending')
+    cache_tag_relations = ('category', 'brand')
+    response_cache_tags = ('category', 'brand', 'attribute', 'attributevalue')
+    # Query params mà ProductListing projection xử lý được; params khác
+    # (search, attribute_values, facets) đọc từ Product như trước
+    listing_query_params = frozenset({
+        'category', 'brand', 'seller', 'is_featured', 'price', 'category_tree',
+        'ordering', 'page', 'page_size', 'format'
+    })
     
     def get_queryset(self):
         """Chỉ trả về products active."""
         if self.is_swagger_generation:
             return Product.objects.none()
         
-        return Product.objects.filter(
+        queryset = Product.objects.filter(
             status='active'
         ).select_related(
             'category', 'seller'
-        ).prefetch_related('images')
+        )
+        
+        # Detail cần toàn bộ images, list chỉ cần primary image
+        if self.action == 'retrieve':
+            return queryset.prefetch_related('images')
+        return queryset.prefetch_related(primary_image_prefetch())
     
     def get_serializer_class(self):
         """Trả về serializer phù hợp với action."""
@@ -75,18 +105,87 @@ class ProductPublicViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
             return ProductDetailSerializer
         return ProductSummarySerializer
     
+    def list(self, request, *args, **kwargs):
+        """
+        Danh sách products, kèm facet counts khi có `?facets=true`.
+        """
+        if self.use_listing_projection(request):
+            return self.list_from_projection(request)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = None
+        if request.query_params.get(self.facets_param, '').lower() in ('1', 'true'):
+            extra = {'facets': get_facets(queryset, request.query_params)}
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            paginated_data = self.get_paginated_response(serializer.data)
+            return self.success_response(
+                data=paginated_data.data,
+                status_code=status.HTTP_200_OK,
+                extra=extra
+            )
+        
+        serializer = self.get_serializer(queryset, many=True)
+        return self.success_response(
+            data=serializer.data,
+            status_code=status.HTTP_200_OK,
+            extra=extra
+        )
+    
+    def use_listing_projection(self, request):
+        return (
+            getattr(settings, 'PRODUCT_LISTING_PROJECTION', True)
+            and set(request.query_params) <= self.listing_query_params
+        )
+    
+    def filter_listing_queryset(self, request):
+        """Áp dụng filters và ordering của listing lên ProductListing."""
+        filterset = ProductListingFilter(
+            request.query_params, queryset=ProductListing.objects.all(), request=request
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        
+        queryset = filterset.qs
+        for backend in (CategorySubtreeFilter, filters.OrderingFilter):
+            queryset = backend().filter_queryset(request, queryset, self)
+        return queryset
+    
+    def list_from_projection(self, request):
+        """
+        Danh sách products đọc từ ProductListing: một bảng, `.values()`,
+        không dựng Product instances hay chạy ProductSummarySerializer.
+        """
+        rows = self.filter_listing_queryset(request).values(*LISTING_VALUES)
+        serializer = ListingRowSerializer(request)
+        page = self.paginate_queryset(rows)
+        
+        if page is not None:
+            paginated_data = self.get_paginated_response(serializer.serialize(page))
+            return self.success_response(
+                data=paginated_data.data,
+                status_code=status.HTTP_200_OK
+            )
+        
+        return self.success_response(
+            data=serializer.serialize(rows),
+            status_code=status.HTTP_200_OK
+        )
+    
     def retrieve(self, request, *args, **kwargs):
         """
         Xem chi tiết product và track view.
+        
+        View được đẩy vào buffer, ProductView rows và views_count
+        được ghi bởi flusher định kỳ (manage.py flush_product_views).
         """
         instance = self.get_object()
         
         # Track product view
         self.track_product_view(request, instance)
         
-        # Increment views count
-        instance.increment_views()
-        
         serializer = self.get_serializer(instance)
         return self.success_response(
             data=serializer.data,
@@ -96,19 +195,12 @@ class ProductPublicViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     
     def track_product_view(self, request, product):
         """Track product view"""
-        try:
-            ip_address = get_client_ip(request)
-            user_agent = request.META.get('HTTP_USER_AGENT', '')
-            
-            # Create product view record
-            ProductView.objects.create(
-                user=request.user if request.user.is_authenticated else None,
-                product=product,
-                ip_address=ip_address,
-                user_agent=user_agent
-            )
-        except Exception:
-            pass  # Fail silently if view tracking fails
+        record_product_view(request, product)
+    
+    def on_response_cache_hit(self, request, response):
+        """Response chi tiết lấy từ cache vẫn được tính lượt xem."""
+        if self.action == 'retrieve':
+            self.track_product_view(request, Product(pk=response.data['data']['id']))
     
     @action(detail=False, methods=['get'])
     def featured(self, request):
@@ -129,6 +221,38 @@ class ProductPublicViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
             status_code=status.HTTP_200_OK
         )
     
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Tìm kiếm products bằng full-text search (?search=...).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer(queryset, many=True)
+        return self.success_response(
+            data=serializer.data,
+            message="Kết quả tìm kiếm",
+            status_code=status.HTTP_200_OK
+        )
+    
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Facet counts (brand, category, attribute value, khoảng giá)
+        cho các products khớp với filters hiện tại.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.success_response(
+            data=get_facets(queryset, request.query_params),
+            message="Facets sản phẩm",
+            status_code=status.HTTP_200_OK
+        )
+    
     @action(detail=False, methods=['get'])
     def trending(self, request):
         """
@@ -174,7 +298,9 @@ class ProductUserViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         """
         favorites = ProductFavorite.objects.filter(
             user=request.user
-        ).select_related('product__category', 'product__seller')
+        ).select_related(
+            'product__category', 'product__seller'
+        ).prefetch_related(primary_image_prefetch('product__images'))
         
         page = self.paginate_queryset(favorites)
         if page is not None:
@@ -242,7 +368,11 @@ class ProductUserViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         recent_views = ProductView.objects.filter(
             user=request.user,
             viewed_at__gte=timezone.now() - timezone.timedelta(days=30)
-        ).select_related('product').order_by('-viewed_at')
+        ).select_related(
+            'product__category', 'product__seller'
+        ).prefetch_related(
+            primary_image_prefetch('product__images')
+        ).order_by('-viewed_at')
         
         # Get unique products (latest view first)
         seen_products = set()
@@ -293,12 +423,18 @@ class ProductUserViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
                 status='active'
             ).exclude(
                 favorited_by__user=request.user  # Exclude already favorited
-            ).order_by('-rating', '-views_count')[:10]
+            )
         else:
             # Fallback to popular products
             recommendations = Product.objects.filter(
                 status='active'
-            ).order_by('-rating', '-views_count')[:10]
+            )
+        
+        recommendations = recommendations.select_related(
+            'category', 'seller'
+        ).prefetch_related(
+            primary_image_prefetch()
+        ).order_by('-rating', '-views_count')[:10]
         
         serializer = ProductSummarySerializer(recommendations, many=True, context={'request': request})
         return self.success_response(
@@ -319,11 +455,15 @@ class ProductSellerViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     - GET/PUT/PATCH /api/v1/products/my-products/{id}/ - Quản lý product
     - DELETE /api/v1/products/my-products/{id}/ - Xóa product
     - POST /api/v1/products/my-products/{id}/upload-image/ - Upload images
+    - POST /api/v1/products/my-products/import/ - Import products từ CSV/JSONL
+    - GET /api/v1/products/my-products/export/ - Export products ra CSV/JSONL
     - GET /api/v1/products/my-products/analytics/ - Analytics overview
     """
     serializer_class = ProductDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterBackend, CategorySubtreeFilter, filters.SearchFilter, filters.OrderingFilter
+    ]
     filterset_fields = ['category', 'status', 'is_featured']
     search_fields = ['name', 'description', 'sku']
     ordering_fields = ['created_at', 'price', 'stock', 'views_count', 'sales_count']
@@ -333,7 +473,12 @@ class ProductSellerViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
         """Chỉ trả về products của seller hiện tại."""
         if self.is_swagger_generation:
             return Product.objects.none()
-        return Product.objects.filter(seller=self.request.user)
+        queryset = Product.objects.filter(
+            seller=self.request.user
+        ).select_related('category', 'seller')
+        if self.action == 'list':
+            return queryset.prefetch_related(primary_image_prefetch())
+        return queryset
     
     def get_serializer_class(self):
         """Trả về serializer phù hợp với action."""
@@ -377,6 +522,60 @@ class ProductSellerViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
             status_code=status.HTTP_200_OK
         )
     
+    @action(detail=False, methods=['post'], url_path='import',
+            parser_classes=[MultiPartParser, FormParser])
+    def import_products(self, request):
+        """
+        Import products từ file CSV hoặc JSONL (field `file`).
+        
+        Dòng có SKU đã tồn tại được cập nhật, các dòng khác được tạo mới.
+        `?dry_run=true` chỉ validate, không ghi database.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return self.error_response(
+                message="Vui lòng chọn file để import",
+                errors={'file': ['Trường này là bắt buộc.']},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        file_format = request.query_params.get('file_format') or detect_format(upload.name)
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true')
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = import_products(request.user, stream, file_format, dry_run=dry_run)
+        except (ProductImportError, UnicodeDecodeError, csv.Error) as e:
+            return self.error_response(
+                message=f"Không đọc được file import: {e}",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return self.success_response(
+            data=result,
+            message=f"Đã import {result['created']} sản phẩm mới, cập nhật {result['updated']} sản phẩm",
+            status_code=status.HTTP_200_OK
+        )
+    
+    @action(detail=False, methods=['get'], url_path='export')
+    def export_products(self, request):
+        """
+        Export products của seller (`?file_format=csv|jsonl`), stream theo từng chunk.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return self.error_response(
+                message=f"Format không được hỗ trợ: {file_format}",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type = 'text/csv' if file_format == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(
+            export_products(queryset, file_format), content_type=f'{content_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="products.{file_format}"'
+        return response
+    
     @action(detail=True, methods=['post'], 
             url_path='upload-image',
             parser_classes=[MultiPartParser, FormParser])
@@ -476,16 +675,26 @@ class ProductAdminViewSet(SwaggerSchemaMixin, StandardizedModelViewSet):
     - DELETE /api/v1/products/admin/{id}/ - Xóa product
     - PATCH /api/v1/products/admin/{id}/feature/ - Toggle featured status
     """
-    queryset = Product.objects.all()
+    queryset = Product.objects.select_related('category', 'seller')
     serializer_class = ProductDetailSerializer
     permission_classes = [permissions.IsAdminUser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class_by_action = {'list': CursorPagination}
+    filter_backends = [
+        DjangoFilterBackend, CategorySubtreeFilter, filters.SearchFilter, filters.OrderingFilter
+    ]
     filterset_fields = ['category', 'seller', 'status', 'is_featured']
     search_fields = ['name', 'description', 'sku', 'seller__email']
     ordering_fields = ['created_at', 'price', 'views_count', 'sales_count']
     ordering = ['-created_at']
     http_method_names = ['get', 'put', 'patch', 'delete', 'head', 'options']
     
+    def get_queryset(self):
+        """Prefetch primary image cho list action."""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.prefetch_related(primary_image_prefetch())
+        return queryset
+    
     def get_serializer_class(self):
         """Trả về serializer phù hợp với action."""
         if self.action in ['update', 'partial_update']:
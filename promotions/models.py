@@ -2,6 +2,24 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def calculate_discount_amount(discount_type, value, order_amount):
+    """
+    Discount amount (Decimal, làm tròn 2 chữ số) của một coupon/voucher.
+
+    Percentage bị giới hạn trong 0-100, fixed amount không vượt quá order amount.
+    """
+    value, order_amount = (
+        amount if isinstance(amount, Decimal) else Decimal(str(amount)) for amount in (value, order_amount)
+    )
+    if discount_type == 'percent':
+        percent = min(max(value, Decimal('0')), Decimal('100'))
+        discount = order_amount * percent / 100
+    else:  # fixed amount
+        discount = min(value, order_amount)
+    return max(discount, Decimal('0')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
 
 class Coupon(models.Model):
@@ -66,15 +84,8 @@ class Coupon(models.Model):
     def calculate_discount(self, order_amount):
         """Calculate the discount amount for an order"""
         if not self.is_valid or order_amount < self.min_order_amount:
-            return 0
-        
-        if self.discount_type == 'percent':
-            # Ensure percentage is between 0 and 100
-            percent = min(max(float(self.value), 0), 100)
-            return (percent / 100) * order_amount
-        else:  # fixed amount
-            # Ensure fixed discount doesn't exceed order amount
-            return min(float(self.value), order_amount)
+            return Decimal('0.00')
+        return calculate_discount_amount(self.discount_type, self.value, order_amount)
 
 
 class PromotionCampaign(models.Model):
@@ -164,15 +175,8 @@ class Voucher(models.Model):
     def calculate_discount(self, order_amount):
         """Calculate the discount amount for an order"""
         if not self.is_valid or order_amount < self.min_order_amount:
-            return 0
-        
-        if self.discount_type == 'percent':
-            # Ensure percentage is between 0 and 100
-            percent = min(max(float(self.value), 0), 100)
-            return (percent / 100) * order_amount
-        else:  # fixed amount
-            # Ensure fixed discount doesn't exceed order amount
-            return min(float(self.value), order_amount)
+            return Decimal('0.00')
+        return calculate_discount_amount(self.discount_type, self.value, order_amount)
 
 
 class UsageLog(models.Model):
@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
@@ -20,6 +20,18 @@ def create_vouchers_for_campaign(sender, instance, created, **kwargs):
     pass
 
 
+@receiver([post_save, post_delete], sender=PromotionCampaign)
+@receiver(m2m_changed, sender=PromotionCampaign.products.through)
+@receiver(m2m_changed, sender=PromotionCampaign.categories.through)
+def invalidate_pricing_reference_data(sender, **kwargs):
+    """
+    Campaigns và products/categories của chúng được pricing engine giữ trong
+    memory; báo các process load lại.
+    """
+    from orders.services.pricing import invalidate_reference_data
+    invalidate_reference_data()
+
+
 @receiver(post_save, sender=UsageLog)
 def update_promotion_usage_statistics(sender, instance, created, **kwargs):
     """
@@ -109,6 +109,8 @@ class ProductReportViewSet(StandardizedModelViewSet):
     search_fields = ['product__name']
     ordering_fields = ['sold_quantity', 'total_revenue', 'average_rating', 'last_sold_at']
     ordering = ['-sold_quantity']
+    # Nested product được serialize theo lô (một query cho cả trang)
+    values_list_actions = ('list',)
     
     @action(detail=False, methods=['get'], url_path='top-selling')
     def top_selling(self, request):
@@ -199,6 +201,7 @@ class TrafficLogViewSet(StandardizedModelViewSet):
     search_fields = ['endpoint', 'user_agent']
     ordering_fields = ['timestamp', 'duration_ms']
     ordering = ['-timestamp']
+    values_list_actions = ('list',)
     
     @action(detail=False, methods=['get'], url_path='slow-endpoints')
     def slow_endpoints(self, request):
@@ -1,9 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 # Import models - we'll need to use strings for some imports to avoid circular dependencies
-from .models import Shipment, TrackingInfo
+from .models import Shipment, ShippingMethod, ShippingRate, ShippingZone, TrackingInfo
 
 
 @receiver(post_save, sender='orders.Order')
@@ -137,4 +137,14 @@ def update_shipment_on_tracking_update(sender, instance, created, **kwargs):
         elif tracking_status == 'DELIVERED' and shipment.shipment_status != 'DELIVERED':
             shipment.shipment_status = 'DELIVERED'
             shipment.delivered_at = instance.timestamp
-            shipment.save(update_fields=['shipment_status', 'delivered_at'])
\ No newline at end of file
+            shipment.save(update_fields=['shipment_status', 'delivered_at'])
+
+@receiver([post_save, post_delete], sender=ShippingMethod)
+@receiver([post_save, post_delete], sender=ShippingZone)
+@receiver([post_save, post_delete], sender=ShippingRate)
+def invalidate_pricing_reference_data(sender, **kwargs):
+    """
+    Zones/rates được pricing engine giữ trong memory; báo các process load lại.
+    """
+    from orders.services.pricing import invalidate_reference_data
+    invalidate_reference_data()
@@ -9,6 +9,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from drf_spectacular.utils import extend_schema
 
+from cart.services.storage import SESSION_HEADER as CART_SESSION_HEADER, merge_session_cart
 from core.viewsets.base import StandardizedModelViewSet
 from .backends import EmailBackend
 from .models import UserToken, LoginHistory
@@ -155,6 +156,11 @@ class AuthViewSet(StandardizedModelViewSet):
         user.last_login = timezone.now()
         user.save(update_fields=['last_login'])
 
+        # Gộp giỏ hàng anonymous của client (cart store) vào giỏ hàng của user
+        session_key = request.headers.get(CART_SESSION_HEADER)
+        if session_key:
+            merge_session_cart(session_key, user)
+
         return self.success_response(
             data={
                 'access': str(access),